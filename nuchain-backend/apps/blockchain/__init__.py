@@ -0,0 +1,10 @@
+def get_blockchain_service():
+    """
+    Get or create the per-process blockchain service instance.
+
+    web3 and eth_account take most of a worker's boot time to import, so
+    views reach the service through here and only load them on the first
+    request that touches the chain.
+    """
+    from .services import get_blockchain_service
+    return get_blockchain_service()
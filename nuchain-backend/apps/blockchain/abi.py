@@ -35,6 +35,30 @@ NUC_TOKEN_ABI = [
         "outputs": [],
         "stateMutability": "nonpayable"
     },
+    {
+        "type": "function",
+        "name": "mintSignupBatch",
+        "inputs": [{"name": "recipients", "type": "address[]", "internalType": "address[]"}],
+        "outputs": [],
+        "stateMutability": "nonpayable"
+    },
+    {
+        "type": "function",
+        "name": "lockBatch",
+        "inputs": [
+            {"name": "users", "type": "address[]", "internalType": "address[]"},
+            {"name": "amounts", "type": "uint256[]", "internalType": "uint256[]"}
+        ],
+        "outputs": [],
+        "stateMutability": "nonpayable"
+    },
+    {
+        "type": "function",
+        "name": "resetPortfolioBatch",
+        "inputs": [{"name": "users", "type": "address[]", "internalType": "address[]"}],
+        "outputs": [],
+        "stateMutability": "nonpayable"
+    },
     {
         "type": "function",
         "name": "balanceOf",
@@ -58,9 +82,19 @@ NUC_TOKEN_ABI = [
     },
     {
         "type": "function",
-        "name": "owner",
+        "name": "OPERATOR_ROLE",
         "inputs": [],
-        "outputs": [{"name": "", "type": "address", "internalType": "address"}],
+        "outputs": [{"name": "", "type": "bytes32", "internalType": "bytes32"}],
+        "stateMutability": "view"
+    },
+    {
+        "type": "function",
+        "name": "hasRole",
+        "inputs": [
+            {"name": "role", "type": "bytes32", "internalType": "bytes32"},
+            {"name": "account", "type": "address", "internalType": "address"}
+        ],
+        "outputs": [{"name": "", "type": "bool", "internalType": "bool"}],
         "stateMutability": "view"
     },
     {
@@ -84,6 +118,16 @@ NUC_TOKEN_ABI = [
         "outputs": [{"name": "", "type": "uint8", "internalType": "uint8"}],
         "stateMutability": "view"
     },
+    {
+        "type": "event",
+        "name": "Transfer",
+        "inputs": [
+            {"name": "from", "type": "address", "indexed": True, "internalType": "address"},
+            {"name": "to", "type": "address", "indexed": True, "internalType": "address"},
+            {"name": "value", "type": "uint256", "indexed": False, "internalType": "uint256"}
+        ],
+        "anonymous": False
+    },
     {
         "type": "event",
         "name": "TokensLocked",
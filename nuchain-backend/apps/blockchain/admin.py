@@ -0,0 +1,64 @@
+from django.contrib import admin
+from .models import (
+    AdminNonce,
+    BlockchainTransaction,
+    IdempotencyKey,
+    IndexerCheckpoint,
+    OutboxEntry,
+    PooledWallet,
+    TokenBalance,
+    TokenEvent
+)
+
+@admin.register(AdminNonce)
+class AdminNonceAdmin(admin.ModelAdmin):
+    list_display = ['address', 'next_nonce', 'updated_at']
+    search_fields = ['address']
+    readonly_fields = ['updated_at']
+
+@admin.register(IndexerCheckpoint)
+class IndexerCheckpointAdmin(admin.ModelAdmin):
+    list_display = ['contract_address', 'last_block', 'updated_at']
+    readonly_fields = ['updated_at']
+
+@admin.register(TokenEvent)
+class TokenEventAdmin(admin.ModelAdmin):
+    list_display = ['event', 'address', 'amount', 'block_number', 'transaction_hash']
+    list_filter = ['event']
+    search_fields = ['address', 'to_address', 'transaction_hash']
+    readonly_fields = ['created_at']
+
+@admin.register(TokenBalance)
+class TokenBalanceAdmin(admin.ModelAdmin):
+    list_display = ['address', 'total', 'locked', 'last_block', 'updated_at']
+    search_fields = ['address']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(OutboxEntry)
+class OutboxEntryAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'user', 'wallet_address', 'amount', 'status', 'attempts', 'created_at']
+    list_filter = ['kind', 'status']
+    search_fields = ['wallet_address', 'tx_hash', 'user__username']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(BlockchainTransaction)
+class BlockchainTransactionAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'user', 'wallet_address', 'status', 'tx_hash', 'signer', 'nonce', 'latency_ms', 'created_at']
+    list_filter = ['kind', 'status', 'signer']
+    search_fields = ['wallet_address', 'tx_hash', 'user__username']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(PooledWallet)
+class PooledWalletAdmin(admin.ModelAdmin):
+    list_display = ['address', 'status', 'created_at', 'claimed_at']
+    list_filter = ['status']
+    search_fields = ['address']
+    readonly_fields = ['created_at', 'claimed_at']
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ['key', 'scope', 'status', 'response_status', 'created_at']
+    list_filter = ['status']
+    search_fields = ['key', 'scope']
+    readonly_fields = ['created_at', 'updated_at']
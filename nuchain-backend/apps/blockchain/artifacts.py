@@ -0,0 +1,86 @@
+import json
+import re
+from pathlib import Path
+from packaging.version import Version
+from .exceptions import BlockchainError
+
+# nuchain-contracts/ next to this backend, and the compiler hardhat.config.ts uses
+CONTRACTS_DIR = Path(__file__).resolve().parents[3] / 'nuchain-contracts'
+NUC_TOKEN_SOURCE = CONTRACTS_DIR / 'contracts' / 'NucToken.sol'
+SOLC_VERSION = '0.8.28'
+
+
+def load_artifact(path, source=NUC_TOKEN_SOURCE):
+    """
+    ABI and creation bytecode of the compiled NucToken.
+
+    Artifacts that can't have come from the current NucToken.sol are
+    rejected: one without runtime bytecode, or whose ABI lacks a public or
+    external function the source declares (compiled before it was added).
+
+    Args:
+        path: Hardhat-style artifact, written by `python manage.py compile_nuctoken`
+            or `npx hardhat compile` in nuchain-contracts/
+        source: NucToken.sol the artifact must match
+    """
+    try:
+        artifact = json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        raise BlockchainError(
+            f"NucToken artifact not found at {path}; run `python manage.py compile_nuctoken`"
+        )
+    if artifact.get('deployedBytecode', '0x') in ('', '0x'):
+        raise BlockchainError(f"NucToken artifact at {path} has no runtime bytecode; recompile it")
+    declared = set(re.findall(r'function\s+(\w+)\s*\([^)]*\)[^{;]*\b(?:external|public)\b', Path(source).read_text()))
+    missing = declared - {entry.get('name') for entry in artifact['abi'] if entry['type'] == 'function'}
+    if missing:
+        raise BlockchainError(
+            f"NucToken artifact at {path} is older than {source} (missing {', '.join(sorted(missing))}); recompile it"
+        )
+    return artifact['abi'], artifact['bytecode']
+
+
+def compile_artifact(path, contracts_dir=CONTRACTS_DIR):
+    """
+    Compile NucToken.sol with solc through py-solc-x, with the compiler
+    version and optimizer settings of hardhat.config.ts, and write a
+    Hardhat-style artifact to `path`.
+
+    Needs `pip install py-solc-x` (solc itself is downloaded on first use)
+    and OpenZeppelin from `npm install` in nuchain-contracts/.
+    """
+    import solcx
+
+    if Version(SOLC_VERSION) not in solcx.get_installed_solc_versions():
+        solcx.install_solc(SOLC_VERSION)
+    source_name = 'contracts/NucToken.sol'
+    output = solcx.compile_standard(
+        {
+            'language': 'Solidity',
+            'sources': {source_name: {'content': (contracts_dir / source_name).read_text()}},
+            'settings': {
+                'optimizer': {'enabled': True, 'runs': 200},
+                'remappings': ['@openzeppelin/=node_modules/@openzeppelin/'],
+                'outputSelection': {
+                    source_name: {'NucToken': ['abi', 'evm.bytecode.object', 'evm.deployedBytecode.object']}
+                },
+            },
+        },
+        base_path=contracts_dir,
+        allow_paths=[contracts_dir],
+        solc_version=SOLC_VERSION,
+    )
+    contract = output['contracts'][source_name]['NucToken']
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        '_format': 'hh-sol-artifact-1',
+        'contractName': 'NucToken',
+        'sourceName': source_name,
+        'abi': contract['abi'],
+        'bytecode': '0x' + contract['evm']['bytecode']['object'],
+        'deployedBytecode': '0x' + contract['evm']['deployedBytecode']['object'],
+        'linkReferences': {},
+        'deployedLinkReferences': {},
+    }, indent=2))
+    return path
@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+from django.core.cache import caches
+
+CACHE_KEY_PREFIX = 'nuc-balance:'
+
+
+class BalanceCache:
+    """
+    Per-wallet balance cache keyed by checksummed address.
+
+    An in-process LRU sits in front of an optional shared Django cache so
+    other workers can reuse balances one of them already fetched. Entries are
+    fresh for `ttl` seconds and can be served stale for another `stale_ttl`
+    seconds while they are refreshed.
+    """
+
+    def __init__(self, max_entries, ttl, stale_ttl, cache_alias=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.shared = caches[cache_alias] if cache_alias else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'updates': 0}
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _store_local(self, address, entry):
+        with self._lock:
+            self._entries[address] = entry
+            self._entries.move_to_end(address)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, address):
+        with self._lock:
+            entry = self._entries.get(address)
+            if entry is not None:
+                self._entries.move_to_end(address)
+        if entry is None and self.shared is not None:
+            entry = self.shared.get(CACHE_KEY_PREFIX + address)
+            if entry is not None:
+                self._store_local(address, entry)
+        return entry
+
+    def get(self, address):
+        """
+        Look up a wallet's balances.
+
+        Returns:
+            tuple: (balances, is_fresh), or None if nothing usable is cached
+        """
+        entry = self._lookup(address)
+        if entry is not None:
+            balances, stored_at = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                self._count('hits')
+                return dict(balances), True
+            if age < self.ttl + self.stale_ttl:
+                self._count('stale_hits')
+                return dict(balances), False
+
+        self._count('misses')
+        return None
+
+    def set(self, address, balances):
+        """Store freshly read balances for a wallet"""
+        entry = (dict(balances), time.time())
+        self._store_local(address, entry)
+        if self.shared is not None:
+            self.shared.set(CACHE_KEY_PREFIX + address, entry, self.ttl + self.stale_ttl)
+
+    def update(self, address, apply):
+        """
+        Update a cached entry in place after one of our own transactions.
+        `apply` receives the cached balances and returns the new ones.
+        Wallets that aren't cached are left alone.
+        """
+        entry = self._lookup(address)
+        if entry is None:
+            return
+        self._count('updates')
+        self.set(address, apply(dict(entry[0])))
+
+    def invalidate(self, address):
+        """Forget a wallet's balances"""
+        with self._lock:
+            self._entries.pop(address, None)
+        if self.shared is not None:
+            self.shared.delete(CACHE_KEY_PREFIX + address)
+
+    def stats(self):
+        """Hit, stale hit, miss and in-place update counters"""
+        with self._lock:
+            return dict(self._counters, size=len(self._entries))
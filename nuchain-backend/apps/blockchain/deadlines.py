@@ -0,0 +1,83 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from django.db import transaction
+from .exceptions import DeadlineExceeded
+
+# Error for requests whose deadline ran out before anything was sent to the chain
+SLOW_CHAIN_ERROR = 'The blockchain is responding slowly and nothing was sent. Please try again.'
+
+# Monotonic time by which the current request's blockchain work must finish
+_deadline = contextvars.ContextVar('blockchain_deadline', default=None)
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Limit blockchain work inside the block to `seconds`.
+    A nested deadline can only shorten the one around it.
+    """
+    expires = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        expires = min(expires, outer)
+    token = _deadline.set(expires)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def unbounded():
+    """Lift the deadline for work that must not be cut short once started"""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """Seconds left in the current budget, or None when there is no deadline"""
+    expires = _deadline.get()
+    if expires is None:
+        return None
+    return max(expires - time.monotonic(), 0)
+
+
+def expired():
+    return remaining() == 0
+
+
+def bounded(timeout):
+    """`timeout`, shortened to what is left of the budget"""
+    left = remaining()
+    return timeout if left is None else min(timeout, left)
+
+
+def check():
+    """Raise DeadlineExceeded if the budget has run out"""
+    if expired():
+        raise DeadlineExceeded("Request deadline exceeded")
+
+
+def after_receipt(error, on_confirmed=None, on_failed=None):
+    """
+    Finish the database side of a transaction a request stopped waiting for.
+
+    Once the request's database transaction commits, `on_confirmed` or
+    `on_failed` runs atomically in the receipt watcher's thread when the
+    transaction is mined (or reverts).
+
+    Args:
+        error: DeadlineExceeded raised after the transaction was broadcast
+    """
+    def settle(receipt):
+        succeeded = receipt.exception() is None and receipt.result().status == 1
+        hook = on_confirmed if succeeded else on_failed
+        if hook is not None:
+            with transaction.atomic():
+                hook()
+
+    transaction.on_commit(lambda: error.receipt.add_done_callback(settle))
@@ -0,0 +1,118 @@
+import threading
+from eth_tester import EthereumTester, PyEVMBackend
+from eth_tester.exceptions import TransactionFailed
+from web3 import Web3
+from web3.middleware import combine_middleware
+from web3.providers import JSONBaseProvider
+from web3.providers.eth_tester import EthereumTesterProvider
+from .artifacts import load_artifact
+from .exceptions import BlockchainError
+
+# Gas money given to each signer lane on a fresh chain
+SIGNER_FUNDING_ETH = 1000
+
+# Methods eth-tester can't run against the pending block. Every transaction is
+# mined on arrival, so the latest block is the same thing.
+PENDING_AS_LATEST = {'eth_call', 'eth_estimateGas'}
+
+
+class EvmProvider(EthereumTesterProvider, JSONBaseProvider):
+    """
+    eth-tester provider for BlockchainService.
+
+    eth-tester is not thread-safe, so requests from request threads and the
+    receipt watcher take turns. JSON-RPC batches are answered one request at
+    a time through the same middleware as single requests.
+    """
+
+    # Web3 instance the provider belongs to, needed by eth-tester's middleware for raw batches
+    w3 = None
+
+    def __init__(self, ethereum_tester):
+        super().__init__(ethereum_tester)
+        self._lock = threading.RLock()
+
+    def make_request(self, method, params):
+        if method in PENDING_AS_LATEST and params and params[-1] == 'pending':
+            params = [*params[:-1], 'latest']
+        with self._lock:
+            try:
+                return super().make_request(method, params)
+            except TransactionFailed as e:
+                # Answer like a node, so reverts reach the service as ContractLogicError
+                return {'jsonrpc': '2.0', 'id': self._current_request_id, 'error': {'code': 3, 'message': str(e)}}
+
+    def batch_request_func(self, w3, middleware_onion):
+        request = self.request_func(w3, middleware_onion)
+
+        def batch(batch_requests):
+            # Outside the batching context, or eth-tester's middleware would queue its own lookups into the batch
+            token = self._batching_context.set(None)
+            try:
+                return [request(method, params) for method, params in batch_requests]
+            finally:
+                self._batching_context.reset(token)
+
+        return batch
+
+    def make_batch_request(self, batch_requests):
+        # Raw batches, like the receipt watcher's, still need eth-tester's parameter and result formatting
+        request = combine_middleware(middleware=self._middleware, w3=self.w3, provider_request_fn=self.make_request)
+        return [
+            dict(request(method, params), id=index)
+            for index, (method, params) in enumerate(batch_requests)
+        ]
+
+    def close(self):
+        pass
+
+
+def _transact(w3, account, contract_function):
+    transaction = contract_function.build_transaction({
+        'from': account.address,
+        'nonce': w3.eth.get_transaction_count(account.address),
+    })
+    signed = account.sign_transaction(transaction)
+    receipt = w3.eth.get_transaction_receipt(w3.eth.send_raw_transaction(signed.raw_transaction))
+    if receipt.status != 1:
+        raise BlockchainError(f"Setting up the in-memory chain failed: {receipt.transactionHash.to_0x_hex()} reverted")
+    return receipt
+
+
+def start_chain(artifact_path, signers):
+    """
+    Start an in-memory EVM that mines every transaction as it arrives and
+    deploy NucToken to it.
+
+    Each signer is funded with SIGNER_FUNDING_ETH; the first deploys the
+    token (becoming its admin and first operator) and grants OPERATOR_ROLE
+    to the rest.
+
+    Args:
+        artifact_path: compiled NucToken, see load_artifact()
+        signers: eth_account accounts of the service's signer lanes
+
+    Returns:
+        tuple: (Web3, checksummed token address)
+    """
+    abi, bytecode = load_artifact(artifact_path)
+    tester = EthereumTester(PyEVMBackend())
+    provider = EvmProvider(tester)
+    w3 = provider.w3 = Web3(provider)
+
+    funder = tester.get_accounts()[0]
+    for signer in signers:
+        w3.eth.send_transaction({
+            'from': funder,
+            'to': signer.address,
+            'value': w3.to_wei(SIGNER_FUNDING_ETH, 'ether'),
+        })
+
+    deployer = signers[0]
+    receipt = _transact(w3, deployer, w3.eth.contract(abi=abi, bytecode=bytecode).constructor())
+    token = w3.eth.contract(address=receipt.contractAddress, abi=abi)
+    operator_role = token.functions.OPERATOR_ROLE().call()
+    for signer in signers[1:]:
+        _transact(w3, deployer, token.functions.grantRole(operator_role, signer.address))
+
+    return w3, Web3.to_checksum_address(receipt.contractAddress)
@@ -19,4 +19,17 @@ class InsufficientBalanceError(BlockchainError):
 
 class InsufficientGasError(BlockchainError):
     """Admin wallet doesn't have enough ETH for gas"""
-    pass
\ No newline at end of file
+    pass
+
+class DeadlineExceeded(BlockchainError):
+    """
+    The request's time budget ran out.
+    If the transaction was already broadcast, `tx_hash` is set and `receipt`
+    is a Future that resolves once it is mined; the request may answer with
+    a pending status instead of waiting.
+    """
+
+    def __init__(self, message, tx_hash=None, receipt=None):
+        super().__init__(message)
+        self.tx_hash = tx_hash
+        self.receipt = receipt
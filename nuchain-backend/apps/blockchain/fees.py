@@ -0,0 +1,133 @@
+import threading
+import time
+from decimal import Decimal
+
+# Blocks of history and reward percentile used for the priority fee
+FEE_HISTORY_BLOCKS = 5
+PRIORITY_FEE_PERCENTILE = 50
+
+# Floor for the priority fee when recent blocks paid none (0.001 gwei)
+MIN_PRIORITY_FEE = 10 ** 6
+
+# Headroom on top of eth_estimateGas results
+GAS_ESTIMATE_HEADROOM = Decimal('1.2')
+
+# Cost of setting a storage slot from zero (cold SSTORE). Each NucToken write may
+# do this to one of the wallet's slots, e.g. a first lock, which a cached estimate
+# taken on a wallet whose slot was already set did not pay for
+FRESH_STORAGE_SLOT_GAS = 22100
+
+FEE_ERRORS = (
+    'transaction underpriced',
+    'max fee per gas less than block base fee',
+    'fee cap less than block base fee',
+)
+
+
+def is_fee_error(error):
+    """Check whether the node rejected a transaction because its fees were too low"""
+    message = str(error).lower()
+    return any(text in message for text in FEE_ERRORS)
+
+
+def bump_fees(previous, current, bump_percent, max_fee_per_gas):
+    """
+    Fees for re-sending a pending transaction at the same nonce.
+
+    Nodes only accept a replacement that raises both fee fields by a minimum
+    step (10% on geth), so each is raised by `bump_percent`, or to the
+    current market fees if those are higher, and capped at `max_fee_per_gas`.
+
+    Returns:
+        dict: new maxFeePerGas and maxPriorityFeePerGas, or None when the
+        cap leaves no room for a valid bump
+    """
+    def bumped(fee):
+        return -(-fee * (100 + bump_percent) // 100)
+
+    max_fee = min(max(bumped(previous['maxFeePerGas']), current['maxFeePerGas']), max_fee_per_gas)
+    priority_fee = min(max(bumped(previous['maxPriorityFeePerGas']), current['maxPriorityFeePerGas']), max_fee)
+    if max_fee < bumped(previous['maxFeePerGas']) or priority_fee < bumped(previous['maxPriorityFeePerGas']):
+        return None
+    return {'maxFeePerGas': max_fee, 'maxPriorityFeePerGas': priority_fee}
+
+
+class FeeOracle:
+    """
+    EIP-1559 fees for outgoing transactions.
+
+    One eth_feeHistory call, at most once per `refresh_interval` (a block
+    time), gives the next block's base fee and the median priority fee of
+    recent blocks. Every transaction sent in between reuses them instead of
+    asking the node for eth_gasPrice. maxFeePerGas is twice the base fee
+    plus the tip, which stays valid through several blocks of base fee
+    increases.
+    """
+
+    def __init__(self, service, refresh_interval=2.0):
+        self.service = service
+        self.refresh_interval = refresh_interval
+        self._fees = None
+        self._fresh_until = 0
+        self._lock = threading.Lock()
+
+    def fees(self):
+        """
+        Returns:
+            dict: {'maxFeePerGas': int, 'maxPriorityFeePerGas': int} in wei
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._fees is None or now >= self._fresh_until:
+                self._fees = self._fetch()
+                self._fresh_until = now + self.refresh_interval
+            return self._fees
+
+    def _fetch(self):
+        history = self.service.w3.eth.fee_history(FEE_HISTORY_BLOCKS, 'latest', [PRIORITY_FEE_PERCENTILE])
+        # The last entry is the base fee of the block after `latest`
+        base_fee = history['baseFeePerGas'][-1]
+        rewards = sorted(reward[0] for reward in history.get('reward') or [] if reward)
+        priority_fee = max(rewards[len(rewards) // 2] if rewards else 0, MIN_PRIORITY_FEE)
+        return {
+            'maxFeePerGas': base_fee * 2 + priority_fee,
+            'maxPriorityFeePerGas': priority_fee,
+        }
+
+    def invalidate(self):
+        """Force a refresh, e.g. after the node rejected a fee as too low"""
+        with self._lock:
+            self._fresh_until = 0
+
+
+class GasEstimates:
+    """
+    Gas limits per contract function, keyed by 4-byte selector.
+
+    The first write of each function runs eth_estimateGas; later writes reuse
+    the largest estimate seen. An estimate only covers the state it ran
+    against: a lock on a wallet that already has locked tokens costs about
+    17,000 gas less than a first lock. So the cached figure gets one fresh
+    storage slot's cost on top, then headroom, which covers either case
+    without a second round trip per transaction.
+    """
+
+    def __init__(self):
+        self._estimates = {}
+        self._lock = threading.Lock()
+
+    def gas_limit(self, contract_function, params):
+        with self._lock:
+            estimate = self._estimates.get(contract_function.selector)
+        if estimate is None:
+            estimate = self.observe(
+                contract_function.selector,
+                contract_function.estimate_gas(params, block_identifier='pending')
+            )
+        return int((estimate + FRESH_STORAGE_SLOT_GAS) * GAS_ESTIMATE_HEADROOM)
+
+    def observe(self, selector, gas):
+        """Remember a gas figure for a selector, keeping the largest seen"""
+        with self._lock:
+            estimate = self._estimates[selector] = max(self._estimates.get(selector, 0), gas)
+        return estimate
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from . import deadlines
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+
+# How often a duplicate re-reads the key while the original request is running
+POLL_INTERVAL = 0.1
+
+# Credentials a response may carry (signup's JWTs); never stored, so replays leave them out
+SECRET_FIELDS = ('access', 'refresh')
+
+
+def fingerprint(request):
+    """SHA-256 of the method, path and parsed body, so a key can't be reused for a different request"""
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    body = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(f'{request.method} {request.path}\n{body}'.encode()).hexdigest()
+
+
+def _scope(request, request_fingerprint):
+    """
+    Whose key this is. Anonymous clients (signup) can't be told apart, so
+    their keys are scoped to the request itself: a client retrying with
+    the same body finds its key, while another client that happens to pick
+    the same key for its own signup doesn't collide with it.
+    """
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'anonymous:{request_fingerprint[:54]}'
+
+
+def _expired(record):
+    """Completed keys expire after the TTL; an in-progress one whose worker died is released after the lock timeout"""
+    age = timezone.now() - record.created_at
+    if record.status == 'completed':
+        return age > timedelta(seconds=settings.BLOCKCHAIN_IDEMPOTENCY_KEY_TTL)
+    return timezone.now() - record.updated_at > timedelta(seconds=settings.BLOCKCHAIN_IDEMPOTENCY_LOCK_TIMEOUT)
+
+
+def _claim(scope, key, request_fingerprint):
+    """
+    Take the key for this request.
+
+    Returns:
+        tuple: (record, claimed); claimed is False when another request
+        already holds the key and `record` is theirs
+    """
+    while True:
+        try:
+            # Committed right away so other workers see the key while the view runs
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(scope=scope, key=key, fingerprint=request_fingerprint), True
+        except IntegrityError:
+            pass
+
+        try:
+            record = IdempotencyKey.objects.get(scope=scope, key=key)
+        except IdempotencyKey.DoesNotExist:
+            continue
+        if not _expired(record):
+            return record, False
+        IdempotencyKey.objects.filter(pk=record.pk, updated_at=record.updated_at).delete()
+
+
+def purge_expired():
+    """
+    Delete completed keys past the TTL and in-progress ones whose worker
+    died, which _claim otherwise only removes when the same key comes back.
+
+    Returns:
+        int: number of keys deleted
+    """
+    now = timezone.now()
+    deleted, _ = IdempotencyKey.objects.filter(
+        Q(status='completed', created_at__lt=now - timedelta(seconds=settings.BLOCKCHAIN_IDEMPOTENCY_KEY_TTL))
+        | Q(status='in_progress', updated_at__lt=now - timedelta(seconds=settings.BLOCKCHAIN_IDEMPOTENCY_LOCK_TIMEOUT))
+    ).delete()
+    return deleted
+
+
+def _stored_body(data):
+    """The response body to keep for replays, without credentials"""
+    if isinstance(data, dict):
+        return {field: value for field, value in data.items() if field not in SECRET_FIELDS}
+    return data
+
+
+def _wait(record):
+    """Wait for the request holding the key to finish, within the request's deadline"""
+    give_up = time.monotonic() + deadlines.bounded(settings.BLOCKCHAIN_IDEMPOTENCY_WAIT)
+    while record.status == 'in_progress' and time.monotonic() < give_up:
+        time.sleep(POLL_INTERVAL)
+        try:
+            record.refresh_from_db()
+        except IdempotencyKey.DoesNotExist:
+            # The original failed and released the key
+            return None
+    return record
+
+
+def _replay(record):
+    response = Response(record.response_body, status=record.response_status)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view):
+    """
+    Make a chain-mutating view safe to retry with an Idempotency-Key header.
+
+    The first request with a key runs the view and stores its response.
+    Repeats get that response back without touching the chain, and
+    duplicates arriving while it is still running wait for it. Tokens in
+    the response are not stored, so a replayed signup has none and the
+    client logs in instead. Responses of 500 and above release the key so
+    the client can try again. Requests without the header run as before.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return view(request, *args, **kwargs)
+        if not key or len(key) > IdempotencyKey._meta.get_field('key').max_length:
+            return Response(
+                {'error': f'{HEADER} must be between 1 and 255 characters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        request_fingerprint = fingerprint(request)
+        scope = _scope(request, request_fingerprint)
+        while True:
+            record, claimed = _claim(scope, key, request_fingerprint)
+            if claimed:
+                break
+            if record.fingerprint != request_fingerprint:
+                return Response(
+                    {'error': f'This {HEADER} was already used for a different request'},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+            record = _wait(record)
+            if record is None:
+                continue
+            if record.status == 'completed':
+                return _replay(record)
+            response = Response(
+                {'error': 'A request with this Idempotency-Key is still being processed'},
+                status=status.HTTP_409_CONFLICT
+            )
+            response['Retry-After'] = '1'
+            return response
+
+        try:
+            response = view(request, *args, **kwargs)
+        except BaseException:
+            record.delete()
+            raise
+
+        if response.status_code >= 500:
+            record.delete()
+        else:
+            record.status = 'completed'
+            record.response_status = response.status_code
+            record.response_body = _stored_body(response.data)
+            record.save(update_fields=['status', 'response_status', 'response_body', 'updated_at'])
+        return response
+
+    return wrapper
@@ -0,0 +1,203 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction
+from eth_utils import event_abi_to_log_topic
+from .abi import NUC_TOKEN_ABI
+from .models import IndexerCheckpoint, TokenBalance, TokenEvent
+
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+INDEXED_EVENTS = ['Transfer', 'TokensLocked', 'TokensUnlocked', 'AccountDeleted']
+
+EVENT_TOPICS = {
+    '0x' + event_abi_to_log_topic(abi).hex(): abi['name']
+    for abi in NUC_TOKEN_ABI
+    if abi['type'] == 'event' and abi['name'] in INDEXED_EVENTS
+}
+
+
+def apply_event(balances, event):
+    """Apply one event to a dict of address -> {'total', 'locked'} balances"""
+    if event.event == 'Transfer':
+        if event.address != ZERO_ADDRESS:
+            balances[event.address]['total'] -= event.amount
+        if event.to_address != ZERO_ADDRESS:
+            balances[event.to_address]['total'] += event.amount
+    elif event.event == 'TokensLocked':
+        balances[event.address]['locked'] += event.amount
+    elif event.event == 'TokensUnlocked':
+        balances[event.address]['locked'] -= event.amount
+    # AccountDeleted is informational: the burn itself arrives as a Transfer to 0x0
+
+
+class NucEventIndexer:
+    """
+    Mirrors NucToken events into TokenEvent rows and per-wallet TokenBalance rows.
+
+    Only blocks at least `confirmations` deep are indexed. The hash of the
+    checkpoint block is re-checked on every pass, and if it changed, the
+    index is rewound and replayed. eth_getLogs ranges start at
+    `initial_range` blocks, halve when the node rejects a query and double
+    again after each success, capped at `max_range`.
+    """
+
+    def __init__(self, service, confirmations=5, start_block=0, initial_range=500, max_range=5000):
+        self.service = service
+        self.w3 = service.w3
+        self.contract = service.contract
+        # Event decoders are built once rather than for every log
+        self.events = {name: getattr(service.contract.events, name)() for name in INDEXED_EVENTS}
+        self.contract_address = service.contract_address
+        self.confirmations = confirmations
+        self.start_block = start_block
+        self.block_range = initial_range
+        self.max_range = max_range
+
+    def checkpoint(self):
+        checkpoint, _ = IndexerCheckpoint.objects.get_or_create(
+            contract_address=self.contract_address,
+            defaults={'last_block': max(self.start_block - 1, 0)}
+        )
+        return checkpoint
+
+    def run_once(self):
+        """
+        Index every confirmed block since the checkpoint.
+
+        Returns:
+            int: number of events stored
+        """
+        checkpoint = self.checkpoint()
+        self._handle_reorg(checkpoint)
+
+        target = self.w3.eth.block_number - self.confirmations
+        stored = 0
+
+        while checkpoint.last_block < target:
+            from_block = checkpoint.last_block + 1
+            to_block = min(from_block + self.block_range - 1, target)
+            try:
+                logs = self.w3.eth.get_logs({
+                    'address': self.contract_address,
+                    'fromBlock': from_block,
+                    'toBlock': to_block,
+                    'topics': [list(EVENT_TOPICS)],
+                })
+            except Exception:
+                if self.block_range == 1:
+                    raise
+                # Range too large for the node (result or block limits): shrink and retry
+                self.block_range = max(self.block_range // 2, 1)
+                continue
+
+            block_hash = self.w3.eth.get_block(to_block)['hash'].to_0x_hex()
+            stored += self._store(checkpoint, logs, to_block, block_hash)
+            self.block_range = min(self.block_range * 2, self.max_range)
+
+        return stored
+
+    def _decode(self, log):
+        name = EVENT_TOPICS[log['topics'][0].to_0x_hex()]
+        args = self.events[name].process_log(log)['args']
+        if name == 'Transfer':
+            address, to_address, amount = args['from'], args['to'], args['value']
+        else:
+            address, to_address, amount = args['user'], '', args['amount']
+
+        return TokenEvent(
+            event=name,
+            address=address,
+            to_address=to_address,
+            amount=self.service._from_wei(amount),
+            block_number=log['blockNumber'],
+            block_hash=log['blockHash'].to_0x_hex(),
+            transaction_hash=log['transactionHash'].to_0x_hex(),
+            log_index=log['logIndex'],
+        )
+
+    @transaction.atomic
+    def _store(self, checkpoint, logs, to_block, block_hash):
+        """Store one range of events, apply them to balances and advance the checkpoint"""
+        events = sorted(
+            (self._decode(log) for log in logs),
+            key=lambda event: (event.block_number, event.log_index)
+        )
+        TokenEvent.objects.bulk_create(events)
+
+        touched = {address for event in events for address in (event.address, event.to_address)}
+        touched -= {ZERO_ADDRESS, ''}
+        rows = {
+            row.address: row
+            for row in TokenBalance.objects.select_for_update().filter(address__in=touched)
+        }
+        balances = defaultdict(lambda: {'total': Decimal('0'), 'locked': Decimal('0')})
+        for address, row in rows.items():
+            balances[address] = {'total': row.total, 'locked': row.locked}
+
+        for event in events:
+            apply_event(balances, event)
+
+        self._save_balances(balances, rows, to_block)
+
+        checkpoint.last_block = to_block
+        checkpoint.last_block_hash = block_hash
+        checkpoint.save()
+        return len(events)
+
+    def _save_balances(self, balances, rows, block_number):
+        for address, values in balances.items():
+            if address == ZERO_ADDRESS:
+                continue
+            row = rows.get(address) or TokenBalance(address=address)
+            row.total = values['total']
+            row.locked = values['locked']
+            row.last_block = block_number
+            row.save()
+
+    def _handle_reorg(self, checkpoint):
+        """Rewind the index if the checkpoint block is no longer on the canonical chain"""
+        if not checkpoint.last_block_hash:
+            return
+
+        canonical = self.w3.eth.get_block(checkpoint.last_block)['hash'].to_0x_hex()
+        if canonical == checkpoint.last_block_hash:
+            return
+
+        # The reorg was deeper than our confirmation depth; replay a margin below it
+        self.rewind(checkpoint, checkpoint.last_block - max(self.confirmations, 1) * 2)
+
+    @transaction.atomic
+    def rewind(self, checkpoint, block_number):
+        """Drop events after block_number and rebuild the balances they touched"""
+        block_number = max(block_number, self.start_block - 1, 0)
+        dropped = TokenEvent.objects.filter(block_number__gt=block_number)
+        touched = set(dropped.values_list('address', flat=True))
+        touched |= set(dropped.values_list('to_address', flat=True))
+        touched -= {ZERO_ADDRESS, ''}
+        dropped.delete()
+
+        self.rebuild_balances(touched, block_number)
+
+        checkpoint.last_block = block_number
+        checkpoint.last_block_hash = ''
+        checkpoint.save()
+
+    def rebuild_balances(self, addresses, block_number):
+        """Recompute balances for addresses from the events still stored"""
+        balances = defaultdict(lambda: {'total': Decimal('0'), 'locked': Decimal('0')})
+        for address in addresses:
+            balances[address]
+
+        events = TokenEvent.objects.filter(address__in=addresses) | TokenEvent.objects.filter(to_address__in=addresses)
+        for event in events.order_by('block_number', 'log_index'):
+            apply_event(balances, event)
+
+        rows = {
+            row.address: row
+            for row in TokenBalance.objects.select_for_update().filter(address__in=addresses)
+        }
+        self._save_balances(
+            {address: values for address, values in balances.items() if address in addresses},
+            rows,
+            block_number
+        )
@@ -0,0 +1,101 @@
+import bisect
+import hashlib
+import threading
+import time
+from eth_account import Account
+from .nonces import NonceManager
+
+# Points per signer on the hash ring; more points spread wallets more evenly
+VIRTUAL_NODES = 64
+
+
+def _ring_position(key):
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], 'big')
+
+
+class SignerBalance:
+    """
+    A signer's ETH balance kept in memory.
+    Each broadcast is charged its maximum fee locally, and the real balance
+    is re-read from the node every `refresh_interval` seconds, so sending
+    does not cost an eth_getBalance round trip.
+    """
+
+    def __init__(self, fetch_balance, refresh_interval=60):
+        self.fetch_balance = fetch_balance
+        self.refresh_interval = refresh_interval
+        self._balance = None
+        self._fresh_until = 0
+        self._lock = threading.Lock()
+
+    def current(self):
+        """Balance in wei, re-read if the last reading is too old"""
+        with self._lock:
+            now = time.monotonic()
+            if self._balance is None or now >= self._fresh_until:
+                self._balance = self.fetch_balance()
+                self._fresh_until = now + self.refresh_interval
+            return self._balance
+
+    def charge(self, wei):
+        """Deduct a broadcast transaction's maximum cost"""
+        with self._lock:
+            if self._balance is not None:
+                self._balance -= wei
+
+    def invalidate(self):
+        with self._lock:
+            self._fresh_until = 0
+
+
+class SignerLane:
+    """One authorized signer account with its own nonce sequence and gas balance"""
+
+    def __init__(self, private_key, fetch_pending_nonce, fetch_balance, balance_refresh_interval=60):
+        self.account = Account.from_key(private_key)
+        self.address = self.account.address
+        self.nonces = NonceManager(self.address, lambda: fetch_pending_nonce(self.address))
+        self.balance = SignerBalance(lambda: fetch_balance(self.address), balance_refresh_interval)
+
+    def __repr__(self):
+        return f'SignerLane({self.address})'
+
+
+class LaneRouter:
+    """
+    Maps user wallets to signer lanes by consistent hashing.
+
+    Every write for a wallet goes through the same signer, so its
+    transactions stay ordered by that signer's nonces (a lock is never mined
+    ahead of the mint it depends on). Adding or removing a signer only moves
+    the wallets that hashed to it.
+    """
+
+    def __init__(self, lanes, virtual_nodes=VIRTUAL_NODES):
+        if not lanes:
+            raise ValueError("At least one signer lane is required")
+        self.lanes = list(lanes)
+        ring = sorted(
+            (_ring_position(f'{lane.address}:{index}'), lane)
+            for lane in self.lanes
+            for index in range(virtual_nodes)
+        )
+        self._positions = [position for position, _ in ring]
+        self._ring = [lane for _, lane in ring]
+
+    def __iter__(self):
+        return iter(self.lanes)
+
+    def __len__(self):
+        return len(self.lanes)
+
+    @property
+    def primary(self):
+        """First configured signer; used where no wallet is involved"""
+        return self.lanes[0]
+
+    def lane_for(self, wallet_address):
+        """Signer lane responsible for a wallet"""
+        position = _ring_position(wallet_address.lower())
+        index = bisect.bisect(self._positions, position) % len(self._ring)
+        return self._ring[index]
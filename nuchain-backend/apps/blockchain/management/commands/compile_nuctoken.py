@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.blockchain import artifacts
+
+class Command(BaseCommand):
+    help = "Compile NucToken.sol into the artifact BLOCKCHAIN_BACKEND=evm deploys (needs py-solc-x and npm install in nuchain-contracts/)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=settings.BLOCKCHAIN_EVM_ARTIFACT,
+            help='Where to write the artifact; BLOCKCHAIN_EVM_ARTIFACT by default'
+        )
+
+    def handle(self, *args, **options):
+        path = artifacts.compile_artifact(options['output'])
+        # Read back through the same checks the backend applies
+        abi, _ = artifacts.load_artifact(path)
+        self.stdout.write(self.style.SUCCESS(
+            f"Compiled NucToken with solc {artifacts.SOLC_VERSION} to {path} ({len(abi)} ABI entries)"
+        ))
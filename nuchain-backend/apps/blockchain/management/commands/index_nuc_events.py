@@ -0,0 +1,51 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.blockchain.indexer import NucEventIndexer
+from apps.blockchain.services import get_blockchain_service
+
+class Command(BaseCommand):
+    help = "Mirror NucToken events and per-wallet balances into the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Catch up to the confirmed head and exit instead of polling'
+        )
+        parser.add_argument(
+            '--confirmations',
+            type=int,
+            default=settings.BLOCKCHAIN_INDEXER_CONFIRMATIONS,
+            help='Blocks a log must be buried under before it is indexed'
+        )
+        parser.add_argument(
+            '--start-block',
+            type=int,
+            default=settings.NUC_CONTRACT_DEPLOY_BLOCK,
+            help='First block to index when there is no checkpoint yet'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between passes'
+        )
+
+    def handle(self, *args, **options):
+        indexer = NucEventIndexer(
+            get_blockchain_service(),
+            confirmations=options['confirmations'],
+            start_block=options['start_block']
+        )
+
+        while True:
+            stored = indexer.run_once()
+            checkpoint = indexer.checkpoint()
+            if stored or options['once']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Indexed {stored} events through block {checkpoint.last_block}'
+                ))
+            if options['once']:
+                return
+            time.sleep(options['poll_interval'])
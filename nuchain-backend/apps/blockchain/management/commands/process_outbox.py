@@ -0,0 +1,51 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.blockchain.outbox import OutboxProcessor
+from apps.blockchain.services import get_blockchain_service
+
+class Command(BaseCommand):
+    help = "Submit and confirm blockchain operations queued in the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process one batch and exit instead of polling'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20,
+            help='Entries to claim per pass'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.BLOCKCHAIN_OUTBOX_CONCURRENCY,
+            help='Entries whose transactions are in flight at the same time'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait when the outbox is empty'
+        )
+
+    def handle(self, *args, **options):
+        processor = OutboxProcessor(
+            get_blockchain_service(),
+            max_attempts=settings.BLOCKCHAIN_OUTBOX_MAX_ATTEMPTS,
+            concurrency=options['concurrency']
+        )
+        # Entries a previous run left waiting on a broadcast transaction
+        processor.resume()
+
+        while True:
+            processed = processor.run_once(options['batch_size'])
+            if processed or options['once']:
+                self.stdout.write(self.style.SUCCESS(f'Processed {processed} outbox entries'))
+            if options['once']:
+                return
+            if not processed:
+                time.sleep(options['poll_interval'])
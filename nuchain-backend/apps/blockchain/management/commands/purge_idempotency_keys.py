@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from apps.blockchain.idempotency import purge_expired
+
+class Command(BaseCommand):
+    help = "Delete Idempotency-Keys past BLOCKCHAIN_IDEMPOTENCY_KEY_TTL and ones left behind by crashed requests"
+
+    def handle(self, *args, **options):
+        deleted = purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired idempotency keys'))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from apps.blockchain.exceptions import BlockchainError
+from apps.blockchain.services import get_blockchain_service
+from apps.users.models import UserProfile
+
+class Command(BaseCommand):
+    help = "Compare each user's database balance with their available on-chain balance"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Wallets fetched per batched read'
+        )
+
+    def handle(self, *args, **options):
+        blockchain = get_blockchain_service()
+        profiles = list(
+            UserProfile.objects.exclude(wallet_address__isnull=True)
+            .exclude(wallet_address='')
+            .select_related('user')
+            .order_by('id')
+        )
+        chunk_size = options['chunk_size']
+        mismatches = 0
+
+        for start in range(0, len(profiles), chunk_size):
+            chunk = profiles[start:start + chunk_size]
+            try:
+                balances = blockchain.get_balances_many([profile.wallet_address for profile in chunk])
+            except BlockchainError as e:
+                self.stderr.write(self.style.ERROR(f'Blockchain error: {str(e)}'))
+                return
+
+            for profile in chunk:
+                available = balances[blockchain.w3.to_checksum_address(profile.wallet_address)]['available']
+                if available != profile.balance:
+                    mismatches += 1
+                    self.stdout.write(self.style.WARNING(
+                        f'{profile.user.username} ({profile.wallet_address}): '
+                        f'database {profile.balance:,.2f} $NUC, on-chain {available:,.2f} $NUC'
+                    ))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {len(profiles)} wallets, found {mismatches} mismatches'
+        ))
@@ -0,0 +1,59 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.blockchain import wallets
+from apps.blockchain.services import get_blockchain_service
+
+class Command(BaseCommand):
+    help = "Keep a pool of pre-generated (and optionally pre-minted) signup wallets topped up"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            type=int,
+            default=settings.BLOCKCHAIN_WALLET_POOL_SIZE,
+            help='Wallets to refill the pool to'
+        )
+        parser.add_argument(
+            '--low-water',
+            type=int,
+            default=settings.BLOCKCHAIN_WALLET_POOL_LOW_WATER,
+            help='Refill once fewer than this many wallets are ready'
+        )
+        parser.add_argument(
+            '--premint',
+            action='store_true',
+            help='Mint the 25,000 NUC signup allowance to pooled wallets ahead of time'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20,
+            help='Pre-mints broadcast back to back'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Refill once and exit instead of polling'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=10.0,
+            help='Seconds between pool checks'
+        )
+
+    def handle(self, *args, **options):
+        service = get_blockchain_service() if options['premint'] else None
+
+        while True:
+            ready = wallets.ready_count()
+            if ready < options['low_water'] or options['once']:
+                generated = wallets.generate(max(options['size'] - ready, 0))
+                minted = wallets.premint(service, options['batch_size']) if service else 0
+                self.stdout.write(self.style.SUCCESS(
+                    f'Generated {generated} wallets, pre-minted {minted}; {wallets.ready_count()} ready'
+                ))
+            if options['once']:
+                return
+            time.sleep(options['poll_interval'])
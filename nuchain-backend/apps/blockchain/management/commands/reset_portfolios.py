@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.blockchain.exceptions import BlockchainError
+from apps.blockchain.services import get_blockchain_service
+from apps.users.models import UserProfile
+
+class Command(BaseCommand):
+    help = "Reset many users' portfolios at once, unlocking their tokens with batched transactions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*', help='Users to reset')
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Reset every user with a wallet'
+        )
+
+    def handle(self, *args, **options):
+        if not options['usernames'] and not options['all']:
+            raise CommandError('Name some users or pass --all')
+
+        profiles = (
+            UserProfile.objects.exclude(wallet_address__isnull=True)
+            .exclude(wallet_address='')
+            .select_related('user')
+            .order_by('id')
+        )
+        if not options['all']:
+            profiles = profiles.filter(user__username__in=options['usernames'])
+        profiles = list(profiles)
+
+        blockchain = get_blockchain_service()
+        try:
+            tx_hashes = blockchain.reset_portfolio_batch([profile.wallet_address for profile in profiles])
+        except BlockchainError as e:
+            # Resetting an unlocked wallet is a no-op on chain, so re-running is safe
+            self.stderr.write(self.style.ERROR(f'Blockchain error: {str(e)}'))
+            return
+
+        for profile in profiles:
+            profile.reset_wallet()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Reset {len(profiles)} portfolios in {len(tx_hashes)} transactions'
+        ))
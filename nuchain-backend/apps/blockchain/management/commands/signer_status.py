@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.blockchain.exceptions import BlockchainError
+from apps.blockchain.services import get_blockchain_service
+
+class Command(BaseCommand):
+    help = "Show each signer lane's ETH balance and whether it holds OPERATOR_ROLE"
+
+    def handle(self, *args, **options):
+        blockchain = get_blockchain_service()
+        try:
+            signers = blockchain.signer_status()
+        except BlockchainError as e:
+            self.stderr.write(self.style.ERROR(f'Blockchain error: {str(e)}'))
+            return
+
+        problems = 0
+        for signer in signers:
+            line = f"{signer['address']}: {signer['eth_balance']:.6f} ETH"
+            if not signer['is_operator']:
+                problems += 1
+                self.stdout.write(self.style.ERROR(f'{line}, missing OPERATOR_ROLE'))
+            elif signer['low_balance']:
+                problems += 1
+                self.stdout.write(self.style.WARNING(f'{line}, needs topping up'))
+            else:
+                self.stdout.write(line)
+
+        # Non-zero exit so cron or a health check can alert on it
+        if problems:
+            raise CommandError(f'{problems} of {len(signers)} signers cannot send transactions')
+        self.stdout.write(self.style.SUCCESS(f'All {len(signers)} signers ready'))
@@ -0,0 +1,29 @@
+from django.conf import settings
+from .deadlines import deadline
+
+
+def deadline_for(path):
+    """Budget in seconds for a request path: the longest matching override, else the default"""
+    overrides = [prefix for prefix in settings.BLOCKCHAIN_REQUEST_DEADLINES if path.startswith(prefix)]
+    if overrides:
+        return settings.BLOCKCHAIN_REQUEST_DEADLINES[max(overrides, key=len)]
+    return settings.BLOCKCHAIN_REQUEST_DEADLINE
+
+
+class DeadlineMiddleware:
+    """
+    Gives every request a time budget that BlockchainService honors for RPC
+    calls, retries and receipt waits, so a slow chain cannot hold a worker
+    thread past it. Views answer with a pending status when it runs out
+    after a transaction was broadcast.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        seconds = deadline_for(request.path)
+        if not seconds:
+            return self.get_response(request)
+        with deadline(seconds):
+            return self.get_response(request)
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdminNonce',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('address', models.CharField(help_text='Checksummed address of the signing account', max_length=42, unique=True)),
+                ('next_nonce', models.PositiveBigIntegerField(help_text='Next nonce to hand out for this account')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Admin Nonce',
+                'verbose_name_plural': 'Admin Nonces',
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexerCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contract_address', models.CharField(max_length=42, unique=True)),
+                ('last_block', models.PositiveBigIntegerField()),
+                ('last_block_hash', models.CharField(blank=True, help_text='Hash of last_block when it was indexed, used to detect reorgs', max_length=66)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Indexer Checkpoint',
+                'verbose_name_plural': 'Indexer Checkpoints',
+            },
+        ),
+        migrations.CreateModel(
+            name='TokenBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('address', models.CharField(max_length=42, unique=True)),
+                ('total', models.DecimalField(decimal_places=18, default=0, max_digits=36)),
+                ('locked', models.DecimalField(decimal_places=18, default=0, max_digits=36)),
+                ('last_block', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Token Balance',
+                'verbose_name_plural': 'Token Balances',
+            },
+        ),
+        migrations.CreateModel(
+            name='TokenEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(choices=[('Transfer', 'Transfer'), ('TokensLocked', 'Tokens Locked'), ('TokensUnlocked', 'Tokens Unlocked'), ('AccountDeleted', 'Account Deleted')], max_length=20)),
+                ('address', models.CharField(db_index=True, help_text='Wallet the event applies to (sender for transfers)', max_length=42)),
+                ('to_address', models.CharField(blank=True, db_index=True, help_text='Recipient for transfers', max_length=42)),
+                ('amount', models.DecimalField(decimal_places=18, help_text='Amount in $NUC', max_digits=36)),
+                ('block_number', models.PositiveBigIntegerField(db_index=True)),
+                ('block_hash', models.CharField(max_length=66)),
+                ('transaction_hash', models.CharField(max_length=66)),
+                ('log_index', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Token Event',
+                'verbose_name_plural': 'Token Events',
+                'ordering': ['block_number', 'log_index'],
+                'constraints': [models.UniqueConstraint(fields=('transaction_hash', 'log_index'), name='unique_token_event_log')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0002_indexercheckpoint_tokenbalance_tokenevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('mint_signup', 'Signup Mint'), ('lock', 'Lock'), ('reset_portfolio', 'Reset Portfolio'), ('burn_account', 'Burn Account')], max_length=20)),
+                ('wallet_address', models.CharField(max_length=42)),
+                ('amount', models.DecimalField(blank=True, decimal_places=2, help_text='Amount of $NUC for locks', max_digits=10, null=True)),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='Database records to finalize or compensate, e.g. the investment id')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('confirmed', 'Confirmed'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('tx_hash', models.CharField(blank=True, max_length=66)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='outbox_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Outbox Entry',
+                'verbose_name_plural': 'Outbox Entries',
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
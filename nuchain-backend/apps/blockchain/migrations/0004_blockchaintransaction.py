@@ -0,0 +1,52 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0003_outboxentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlockchainTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('mint_signup', 'Signup Mint'), ('lock', 'Lock'), ('reset_portfolio', 'Reset Portfolio'), ('burn_account', 'Burn Account')], max_length=20)),
+                ('wallet_address', models.CharField(blank=True, max_length=42)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('submitted', 'Submitted'), ('confirmed', 'Confirmed'), ('failed', 'Failed')], db_index=True, default='queued', max_length=20)),
+                ('tx_hash', models.CharField(blank=True, db_index=True, max_length=66)),
+                ('nonce', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('gas_limit', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('gas_price', models.PositiveBigIntegerField(blank=True, help_text='Gas price in wei', null=True)),
+                ('gas_used', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('block_number', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('confirmed_at', models.DateTimeField(blank=True, null=True)),
+                ('latency_ms', models.PositiveIntegerField(blank=True, help_text='Milliseconds from broadcast to a mined receipt', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='blockchain_transactions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Blockchain Transaction',
+                'verbose_name_plural': 'Blockchain Transactions',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='outboxentry',
+            name='transaction',
+            field=models.OneToOneField(blank=True, help_text='Tracking record returned to the client', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='outbox_entry', to='blockchain.blockchaintransaction'),
+        ),
+        migrations.AddIndex(
+            model_name='blockchaintransaction',
+            index=models.Index(fields=['user', 'updated_at'], name='blockchain_tx_user_updated'),
+        ),
+    ]
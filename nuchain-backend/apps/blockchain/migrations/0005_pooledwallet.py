@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0004_blockchaintransaction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PooledWallet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('address', models.CharField(max_length=42, unique=True)),
+                ('status', models.CharField(choices=[('available', 'Available'), ('minted', 'Minted'), ('claimed', 'Claimed'), ('discarded', 'Discarded')], db_index=True, default='available', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('mint_transaction', models.OneToOneField(blank=True, help_text='Pre-mint of the signup allowance', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pooled_wallet', to='blockchain.blockchaintransaction')),
+            ],
+            options={
+                'verbose_name': 'Pooled Wallet',
+                'verbose_name_plural': 'Pooled Wallets',
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
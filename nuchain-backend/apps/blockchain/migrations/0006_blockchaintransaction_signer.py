@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0005_pooledwallet'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blockchaintransaction',
+            name='signer',
+            field=models.CharField(blank=True, help_text='Operator account that signed the transaction', max_length=42),
+        ),
+    ]
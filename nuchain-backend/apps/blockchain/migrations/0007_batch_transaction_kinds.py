@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0006_blockchaintransaction_signer'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blockchaintransaction',
+            name='kind',
+            field=models.CharField(choices=[('mint_signup', 'Signup Mint'), ('lock', 'Lock'), ('reset_portfolio', 'Reset Portfolio'), ('burn_account', 'Burn Account'), ('mint_signup_batch', 'Batch Signup Mint'), ('lock_batch', 'Batch Lock'), ('reset_portfolio_batch', 'Batch Reset Portfolio')], max_length=30),
+        ),
+    ]
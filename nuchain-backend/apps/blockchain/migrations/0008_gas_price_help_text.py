@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0007_batch_transaction_kinds'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blockchaintransaction',
+            name='gas_price',
+            field=models.PositiveBigIntegerField(blank=True, help_text='Max fee per gas in wei, then the effective gas price once mined', null=True),
+        ),
+    ]
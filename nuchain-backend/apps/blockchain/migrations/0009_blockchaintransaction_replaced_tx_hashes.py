@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0008_gas_price_help_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blockchaintransaction',
+            name='replaced_tx_hashes',
+            field=models.JSONField(blank=True, default=list, help_text='Earlier broadcasts of the same nonce, superseded by fee bumps'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 06:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0010_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboxentry',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('submitted', 'Submitted'), ('confirmed', 'Confirmed'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 06:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0011_outboxentry_submitted_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pooledwallet',
+            name='status',
+            field=models.CharField(choices=[('available', 'Available'), ('minting', 'Minting'), ('minted', 'Minted'), ('claimed', 'Claimed'), ('discarded', 'Discarded')], db_index=True, default='available', max_length=20),
+        ),
+    ]
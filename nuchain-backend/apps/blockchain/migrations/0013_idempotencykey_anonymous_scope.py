@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0012_pooledwallet_minting_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='idempotencykey',
+            name='scope',
+            field=models.CharField(help_text='Who the key belongs to: user:<id>, or anonymous:<fingerprint> for signup', max_length=64),
+        ),
+    ]
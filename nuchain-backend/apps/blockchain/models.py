@@ -0,0 +1,371 @@
+from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.contrib.auth.models import User
+
+class AdminNonce(models.Model):
+    """
+    Next nonce for an admin signer.
+    The row is locked while a nonce is reserved so gunicorn workers never hand out the same one.
+    """
+    address = models.CharField(
+        max_length=42,
+        unique=True,
+        help_text="Checksummed address of the signing account"
+    )
+    next_nonce = models.PositiveBigIntegerField(
+        help_text="Next nonce to hand out for this account"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Admin Nonce"
+        verbose_name_plural = "Admin Nonces"
+
+    def __str__(self):
+        return f"{self.address}: next nonce {self.next_nonce}"
+
+
+class IndexerCheckpoint(models.Model):
+    """Last confirmed block whose NucToken events have been indexed"""
+    contract_address = models.CharField(max_length=42, unique=True)
+    last_block = models.PositiveBigIntegerField()
+    last_block_hash = models.CharField(
+        max_length=66,
+        blank=True,
+        help_text="Hash of last_block when it was indexed, used to detect reorgs"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Indexer Checkpoint"
+        verbose_name_plural = "Indexer Checkpoints"
+
+    def __str__(self):
+        return f"{self.contract_address} indexed through block {self.last_block}"
+
+
+class TokenEvent(models.Model):
+    """A NucToken event mirrored from the chain"""
+
+    EVENT_CHOICES = [
+        ('Transfer', 'Transfer'),
+        ('TokensLocked', 'Tokens Locked'),
+        ('TokensUnlocked', 'Tokens Unlocked'),
+        ('AccountDeleted', 'Account Deleted'),
+    ]
+
+    event = models.CharField(max_length=20, choices=EVENT_CHOICES)
+    address = models.CharField(
+        max_length=42,
+        db_index=True,
+        help_text="Wallet the event applies to (sender for transfers)"
+    )
+    to_address = models.CharField(
+        max_length=42,
+        blank=True,
+        db_index=True,
+        help_text="Recipient for transfers"
+    )
+    amount = models.DecimalField(max_digits=36, decimal_places=18, help_text="Amount in $NUC")
+    block_number = models.PositiveBigIntegerField(db_index=True)
+    block_hash = models.CharField(max_length=66)
+    transaction_hash = models.CharField(max_length=66)
+    log_index = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['block_number', 'log_index']
+        constraints = [
+            models.UniqueConstraint(fields=['transaction_hash', 'log_index'], name='unique_token_event_log'),
+        ]
+        verbose_name = "Token Event"
+        verbose_name_plural = "Token Events"
+
+    def __str__(self):
+        return f"{self.event} {self.address}: {self.amount:,.2f} $NUC (block {self.block_number})"
+
+
+class TokenBalance(models.Model):
+    """Per-wallet balances rebuilt from indexed events"""
+    address = models.CharField(max_length=42, unique=True)
+    total = models.DecimalField(max_digits=36, decimal_places=18, default=0)
+    locked = models.DecimalField(max_digits=36, decimal_places=18, default=0)
+    last_block = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Token Balance"
+        verbose_name_plural = "Token Balances"
+
+    def __str__(self):
+        return f"{self.address}: {self.total:,.2f} $NUC ({self.locked:,.2f} locked)"
+
+    @property
+    def available(self):
+        """Unlocked balance, as availableBalanceOf reports it"""
+        return max(self.total - self.locked, 0)
+
+
+
+class BlockchainTransaction(models.Model):
+    """An admin transaction, tracked from the request that asked for it until it is mined"""
+
+    KIND_CHOICES = [
+        ('mint_signup', 'Signup Mint'),
+        ('lock', 'Lock'),
+        ('reset_portfolio', 'Reset Portfolio'),
+        ('burn_account', 'Burn Account'),
+        ('mint_signup_batch', 'Batch Signup Mint'),
+        ('lock_batch', 'Batch Lock'),
+        ('reset_portfolio_batch', 'Batch Reset Portfolio'),
+    ]
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('submitted', 'Submitted'),
+        ('confirmed', 'Confirmed'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='blockchain_transactions'
+    )
+    wallet_address = models.CharField(max_length=42, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued', db_index=True)
+    tx_hash = models.CharField(max_length=66, blank=True, db_index=True)
+    replaced_tx_hashes = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Earlier broadcasts of the same nonce, superseded by fee bumps"
+    )
+    signer = models.CharField(max_length=42, blank=True, help_text="Operator account that signed the transaction")
+    nonce = models.PositiveBigIntegerField(null=True, blank=True)
+    gas_limit = models.PositiveBigIntegerField(null=True, blank=True)
+    gas_price = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Max fee per gas in wei, then the effective gas price once mined"
+    )
+    gas_used = models.PositiveBigIntegerField(null=True, blank=True)
+    block_number = models.PositiveBigIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    submitted_at = models.DateTimeField(null=True, blank=True)
+    confirmed_at = models.DateTimeField(null=True, blank=True)
+    latency_ms = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Milliseconds from broadcast to a mined receipt"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'updated_at'], name='blockchain_tx_user_updated'),
+        ]
+        verbose_name = "Blockchain Transaction"
+        verbose_name_plural = "Blockchain Transactions"
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.wallet_address}: {self.status}"
+
+    def mark_submitted(self, tx_hash, nonce, gas_limit, gas_price, signer=''):
+        """Record the broadcast transaction"""
+        self.status = 'submitted'
+        self.tx_hash = tx_hash
+        self.signer = signer
+        self.nonce = nonce
+        self.gas_limit = gas_limit
+        self.gas_price = gas_price
+        self.submitted_at = timezone.now()
+        self.save()
+
+    def mark_replaced(self, tx_hash, gas_price):
+        """Record a fee-bump replacement of the pending transaction"""
+        self.replaced_tx_hashes = [*self.replaced_tx_hashes, self.tx_hash]
+        self.tx_hash = tx_hash
+        self.gas_price = gas_price
+        self.save(update_fields=['replaced_tx_hashes', 'tx_hash', 'gas_price', 'updated_at'])
+
+    def mark_confirmed(self, receipt):
+        """Record a successful receipt and how long it took to arrive"""
+        self.status = 'confirmed'
+        self._mined_hash(receipt)
+        self.block_number = receipt.blockNumber
+        self.gas_used = receipt.gasUsed
+        if 'effectiveGasPrice' in receipt:
+            # What was actually paid, rather than the max fee it was sent with
+            self.gas_price = receipt.effectiveGasPrice
+        self.confirmed_at = timezone.now()
+        if self.submitted_at:
+            self.latency_ms = int((self.confirmed_at - self.submitted_at).total_seconds() * 1000)
+        self.save()
+
+    def mark_failed(self, error, receipt=None):
+        """Record a transaction that was rejected, reverted or never mined"""
+        self.status = 'failed'
+        self.error = str(error)
+        if receipt is not None:
+            self._mined_hash(receipt)
+            self.block_number = receipt.blockNumber
+            self.gas_used = receipt.gasUsed
+        self.save()
+
+    def _mined_hash(self, receipt):
+        """Point tx_hash at the broadcast that was mined, if an earlier one beat its replacement"""
+        if 'transactionHash' not in receipt:
+            return
+        mined = receipt.transactionHash.to_0x_hex()
+        if mined in self.replaced_tx_hashes:
+            self.replaced_tx_hashes = [
+                tx_hash for tx_hash in self.replaced_tx_hashes if tx_hash != mined
+            ] + [self.tx_hash]
+            self.tx_hash = mined
+
+
+class OutboxEntry(models.Model):
+    """
+    A blockchain operation committed by a request and carried out by the
+    process_outbox worker, so no database transaction stays open while a
+    receipt is awaited.
+    """
+
+    KIND_CHOICES = [
+        ('mint_signup', 'Signup Mint'),
+        ('lock', 'Lock'),
+        ('reset_portfolio', 'Reset Portfolio'),
+        ('burn_account', 'Burn Account'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('submitted', 'Submitted'),
+        ('confirmed', 'Confirmed'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='outbox_entries'
+    )
+    wallet_address = models.CharField(max_length=42)
+    amount = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Amount of $NUC for locks"
+    )
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Database records to finalize or compensate, e.g. the investment id"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    tx_hash = models.CharField(max_length=66, blank=True)
+    error = models.TextField(blank=True)
+    transaction = models.OneToOneField(
+        BlockchainTransaction,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='outbox_entry',
+        help_text="Tracking record returned to the client"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = "Outbox Entry"
+        verbose_name_plural = "Outbox Entries"
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.wallet_address}: {self.status}"
+
+
+class PooledWallet(models.Model):
+    """
+    A wallet generated ahead of signup, optionally with its 25,000 NUC already
+    minted, so registration only has to claim one.
+    """
+
+    STATUS_CHOICES = [
+        ('available', 'Available'),
+        ('minting', 'Minting'),
+        ('minted', 'Minted'),
+        ('claimed', 'Claimed'),
+        ('discarded', 'Discarded'),
+    ]
+
+    address = models.CharField(max_length=42, unique=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='available', db_index=True)
+    mint_transaction = models.OneToOneField(
+        BlockchainTransaction,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='pooled_wallet',
+        help_text="Pre-mint of the signup allowance"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = "Pooled Wallet"
+        verbose_name_plural = "Pooled Wallets"
+
+    def __str__(self):
+        return f"{self.address}: {self.status}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    A client's Idempotency-Key for a chain-mutating request, holding the
+    response it got so a retry is answered without sending another
+    transaction.
+    """
+
+    STATUS_CHOICES = [
+        ('in_progress', 'In Progress'),
+        ('completed', 'Completed'),
+    ]
+
+    key = models.CharField(max_length=255)
+    scope = models.CharField(
+        max_length=64,
+        help_text="Who the key belongs to: user:<id>, or anonymous:<fingerprint> for signup"
+    )
+    fingerprint = models.CharField(
+        max_length=64,
+        help_text="SHA-256 of the method, path and body the key was first used with"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='in_progress')
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Idempotency Key"
+        verbose_name_plural = "Idempotency Keys"
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='unique_idempotency_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.key}: {self.status}"
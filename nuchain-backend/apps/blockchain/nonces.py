@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from .models import AdminNonce
+
+NONCE_ERRORS = (
+    'nonce too low',
+    'already known',
+    'replacement transaction underpriced',
+)
+
+def is_nonce_error(error):
+    """Check whether the node rejected a transaction because its nonce is already used"""
+    message = str(error).lower()
+    return any(text in message for text in NONCE_ERRORS)
+
+
+class NonceManager:
+    """
+    Reserves nonces for one signing account locally instead of asking the node
+    before every transaction, so many transactions can be in flight at once.
+
+    The counter lives in an AdminNonce row that is locked for the duration of
+    a reservation, which keeps gunicorn workers from handing out the same nonce.
+    Reservations run on the BLOCKCHAIN_NONCE_DATABASE connection rather than
+    the caller's, so the lock ends with the reservation instead of being held
+    until the request's own transaction commits.
+    """
+
+    def __init__(self, address, fetch_pending_nonce, using=None):
+        self.address = address
+        # Callable returning the node's pending transaction count for the address
+        self.fetch_pending_nonce = fetch_pending_nonce
+        self.using = using or settings.BLOCKCHAIN_NONCE_DATABASE
+
+    def _locked_row(self):
+        """Lock the nonce row, seeding it from the node the first time it is used"""
+        rows = AdminNonce.objects.using(self.using)
+        row = rows.select_for_update().filter(address=self.address).first()
+        if row is not None:
+            return row
+
+        try:
+            with transaction.atomic(using=self.using):
+                return rows.create(
+                    address=self.address,
+                    next_nonce=self.fetch_pending_nonce()
+                )
+        except IntegrityError:
+            # Another worker seeded it first
+            return rows.select_for_update().get(address=self.address)
+
+    def reserve(self):
+        """Hand out the next nonce"""
+        with transaction.atomic(using=self.using):
+            row = self._locked_row()
+            nonce = row.next_nonce
+            row.next_nonce = nonce + 1
+            row.save(update_fields=['next_nonce', 'updated_at'])
+        return nonce
+
+    def release(self, nonce):
+        """
+        Give back a nonce that was never broadcast.
+        Only the most recent reservation can be returned; anything older is
+        left for resync() to repair.
+        """
+        return AdminNonce.objects.using(self.using).filter(
+            address=self.address,
+            next_nonce=nonce + 1
+        ).update(next_nonce=nonce) == 1
+
+    def resync(self):
+        """
+        Realign the counter with the node after a nonce was rejected, or after
+        transactions were sent from this account outside the service.
+        """
+        with transaction.atomic(using=self.using):
+            row = self._locked_row()
+            row.next_nonce = self.fetch_pending_nonce()
+            row.save(update_fields=['next_nonce', 'updated_at'])
+        return row.next_nonce
@@ -0,0 +1,226 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.investments.models import Investment
+from apps.users.models import UserProfile
+from .exceptions import BlockchainError, ConnectionError, InsufficientGasError
+from .models import BlockchainTransaction, OutboxEntry
+
+# Failures worth another attempt: the node was unreachable or the admin wallet ran out of gas money
+RETRYABLE_ERRORS = (ConnectionError, InsufficientGasError)
+
+
+def enqueue(kind, wallet_address, user=None, amount=None, **payload):
+    """
+    Record a blockchain operation for the outbox worker.
+    Call inside the same database transaction as the records it finalizes.
+
+    Returns:
+        OutboxEntry: the queued entry; its `transaction` is the record clients track
+    """
+    record = BlockchainTransaction.objects.create(
+        kind=kind,
+        user=user,
+        wallet_address=wallet_address
+    )
+    return OutboxEntry.objects.create(
+        kind=kind,
+        user=user,
+        wallet_address=wallet_address,
+        amount=amount,
+        payload=payload,
+        transaction=record
+    )
+
+
+class OutboxProcessor:
+    """
+    Carries out pending outbox entries.
+
+    Entries are claimed with SELECT ... FOR UPDATE SKIP LOCKED so several
+    workers can run side by side, then submitted and confirmed outside any
+    database transaction. An entry left in `processing` by a worker that died
+    is picked up again once its lease expires.
+
+    An entry whose transaction went out but whose wait failed, e.g. it was
+    not mined in time, is left `submitted` rather than failed: the
+    transaction may still be mined, so its receipt decides between
+    confirming and compensating.
+    """
+
+    def __init__(self, service, max_attempts=5, lease_seconds=300, concurrency=1):
+        self.service = service
+        self.max_attempts = max_attempts
+        self.lease = timedelta(seconds=lease_seconds)
+        self.concurrency = concurrency
+
+    @transaction.atomic
+    def claim(self, limit):
+        """Mark up to `limit` runnable entries as processing and return them"""
+        expired = timezone.now() - self.lease
+        entries = list(
+            OutboxEntry.objects.select_for_update(skip_locked=True)
+            .filter(Q(status='pending') | Q(status='processing', updated_at__lt=expired))
+            .order_by('created_at')[:limit]
+        )
+        for entry in entries:
+            entry.status = 'processing'
+            entry.attempts += 1
+            entry.save(update_fields=['status', 'attempts', 'updated_at'])
+        return entries
+
+    def run_once(self, limit=20):
+        """
+        Claim and process one batch of entries.
+
+        Returns:
+            int: number of entries processed
+        """
+        entries = self.claim(limit)
+        if self.concurrency <= 1:
+            for entry in entries:
+                self.process(entry)
+        else:
+            # Transactions from different entries are broadcast and confirmed side by side
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                list(executor.map(self._process_in_thread, entries))
+        return len(entries)
+
+    def _process_in_thread(self, entry):
+        try:
+            self.process(entry)
+        finally:
+            connection.close()
+
+    def process(self, entry):
+        """Submit one entry's transaction, wait for it and finalize the database"""
+        record = entry.transaction
+        if record is not None:
+            record.refresh_from_db()
+            # Re-claimed after a worker stopped past the broadcast: sending again would repeat it
+            if record.tx_hash:
+                self._hold(entry, record, 'Already broadcast')
+                return
+        try:
+            tx_hash = self._submit(entry)
+        except RETRYABLE_ERRORS as e:
+            if entry.attempts < self.max_attempts:
+                entry.status = 'pending'
+                entry.error = str(e)
+                entry.save(update_fields=['status', 'error', 'updated_at'])
+                if entry.transaction is not None:
+                    entry.transaction.status = 'queued'
+                    entry.transaction.save(update_fields=['status', 'updated_at'])
+            else:
+                self._fail(entry, e)
+        except BlockchainError as e:
+            self._fail(entry, e)
+        else:
+            self._confirm(entry, tx_hash)
+
+    def _submit(self, entry):
+        record = entry.transaction
+        if entry.kind == 'mint_signup':
+            return self.service.mint_signup_to(entry.wallet_address, record=record)
+        if entry.kind == 'lock':
+            return self.service.lock_tokens(entry.wallet_address, entry.amount, record=record)
+        if entry.kind == 'reset_portfolio':
+            return self.service.reset_portfolio(entry.wallet_address, record=record)
+        if entry.kind == 'burn_account':
+            return self.service.burn_account(entry.wallet_address, record=record)
+        raise BlockchainError(f"Unknown outbox operation: {entry.kind}")
+
+    @transaction.atomic
+    def _confirm(self, entry, tx_hash):
+        # The database side of a reset only happens once the unlock is on chain
+        if entry.kind == 'reset_portfolio' and entry.user is not None:
+            entry.user.profile.reset_wallet()
+
+        entry.status = 'confirmed'
+        entry.tx_hash = tx_hash
+        entry.error = ''
+        entry.save(update_fields=['status', 'tx_hash', 'error', 'updated_at'])
+
+    def _fail(self, entry, error):
+        record = entry.transaction
+        if record is not None:
+            record.refresh_from_db()
+            # Broadcast, and no receipt says it reverted: it may still be mined
+            if record.tx_hash and record.block_number is None:
+                self._hold(entry, record, error)
+                return
+        self._compensate(entry, error)
+
+    def _hold(self, entry, record, error):
+        """Leave a broadcast entry to its receipt instead of settling it now"""
+        entry.status = 'submitted'
+        entry.tx_hash = record.tx_hash
+        entry.error = str(error)
+        entry.save(update_fields=['status', 'tx_hash', 'error', 'updated_at'])
+        transaction.on_commit(lambda: self._watch(entry))
+
+    @transaction.atomic
+    def _compensate(self, entry, error):
+        # A lock that never happened must not leave its investment behind
+        if entry.kind == 'lock':
+            investment = Investment.objects.filter(id=entry.payload.get('investment_id')).first()
+            if investment is not None:
+                investment.cancel()
+        # The signup grant was never minted, so the account has nothing to spend
+        elif entry.kind == 'mint_signup' and entry.user is not None:
+            UserProfile.objects.filter(user=entry.user).update(balance=0)
+        # A failed burn_account has no database side left to undo: the account is already gone,
+        # so the failed entry stays for an operator to retry
+
+        entry.status = 'failed'
+        entry.error = str(error)
+        entry.save(update_fields=['status', 'error', 'updated_at'])
+
+    def resume(self):
+        """
+        Wait again for the receipts of submitted entries, e.g. after a restart.
+
+        Returns:
+            int: number of entries waiting
+        """
+        entries = list(OutboxEntry.objects.filter(status='submitted').select_related('transaction', 'user'))
+        for entry in entries:
+            self._watch(entry)
+        return len(entries)
+
+    def _watch(self, entry):
+        """Settle a submitted entry once any broadcast of its transaction is mined"""
+        record = entry.transaction
+        tx_hashes = [record.tx_hash, *record.replaced_tx_hashes] if record is not None else [entry.tx_hash]
+
+        def settle(future):
+            if future.exception() is not None:
+                return
+            # Only one broadcast of a nonce can be mined; stop polling for the others
+            for tx_hash in tx_hashes:
+                self.service.receipts.forget(tx_hash)
+            self._settle(entry, future.result())
+
+        for tx_hash in tx_hashes:
+            self.service.receipts.watch(tx_hash).add_done_callback(settle)
+
+    def _settle(self, entry, receipt):
+        """Confirm or compensate a submitted entry from its transaction's receipt"""
+        with transaction.atomic():
+            # The first receipt to arrive settles the entry; a later one finds it settled
+            entry = OutboxEntry.objects.select_for_update().select_related('transaction', 'user').filter(
+                pk=entry.pk, status='submitted'
+            ).first()
+            if entry is None:
+                return
+            record = entry.transaction
+            if receipt.status == 1:
+                if record is not None:
+                    record.mark_confirmed(receipt)
+                self._confirm(entry, receipt.transactionHash.to_0x_hex())
+            else:
+                if record is not None:
+                    record.mark_failed("Transaction reverted", receipt)
+                self._compensate(entry, "Transaction reverted")
@@ -0,0 +1,160 @@
+import threading
+import time
+from concurrent.futures import Future
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+
+
+def _key(tx_hash):
+    return tx_hash.to_0x_hex() if hasattr(tx_hash, 'to_0x_hex') else tx_hash
+
+
+class InFlightTransaction:
+    """A broadcast transaction, kept so it can be re-signed with higher fees"""
+
+    def __init__(self, transaction, lane, record=None):
+        self.transaction = transaction
+        self.lane = lane
+        self.record = record
+        # Head block when the current broadcast was first seen unmined
+        self.waiting_since = None
+
+
+class ReceiptWatcher:
+    """
+    Waits for receipts of every in-flight transaction in the process at once.
+
+    Callers register a tx hash and get a Future back. A single background
+    thread polls eth_blockNumber and, whenever a new block appears, asks for
+    the receipts of all pending hashes in one JSON-RPC batch. RPC load
+    therefore follows the block rate, not the number of waiting requests.
+    The thread exits when nothing is pending and restarts on the next watch.
+
+    Transactions registered with track() are also checked for being stuck:
+    one still unmined `stuck_after_blocks` blocks after it was first seen is
+    handed to the service to be replaced at the same nonce with higher fees.
+    Every broadcast of that nonce then resolves the same Future, whichever
+    of them is mined.
+    """
+
+    def __init__(self, service, poll_interval=1.0, stuck_after_blocks=0):
+        self.service = service
+        self.poll_interval = poll_interval
+        self.stuck_after_blocks = stuck_after_blocks
+        self._pending = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._last_block = None
+
+    def watch(self, tx_hash):
+        """
+        Start waiting for a transaction's receipt.
+
+        Returns:
+            Future: resolves to the receipt once the transaction is mined
+        """
+        with self._lock:
+            future = self._pending.setdefault(_key(tx_hash), Future())
+            self._start()
+        return future
+
+    def track(self, tx_hash, transaction, lane, record=None):
+        """
+        Register a just-broadcast transaction for stuck detection.
+        Its receipt is collected on the next poll even if nobody calls watch().
+        """
+        key = _key(tx_hash)
+        with self._lock:
+            self._pending.setdefault(key, Future())
+            self._inflight[key] = InFlightTransaction(transaction, lane, record)
+            self._start()
+
+    def _start(self):
+        """Start the polling thread if it isn't running; the lock must be held"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def forget(self, tx_hash):
+        """Stop waiting for a transaction, e.g. after its caller timed out"""
+        with self._lock:
+            self._drop(self._pending.get(_key(tx_hash)))
+
+    def _drop(self, future):
+        """Remove every hash waiting on `future`; the lock must be held"""
+        if future is None:
+            return
+        for key in [key for key, pending in self._pending.items() if pending is future]:
+            del self._pending[key]
+            self._inflight.pop(key, None)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+            try:
+                self.poll()
+            except Exception:
+                # Transient RPC failures are retried on the next tick; callers time out on their own
+                pass
+            time.sleep(self.poll_interval)
+
+    def poll(self):
+        """Fetch receipts for every pending transaction if a new block has appeared"""
+        block_number = self.service.w3.eth.block_number
+        if block_number == self._last_block:
+            return
+        self._last_block = block_number
+
+        with self._lock:
+            hashes = list(self._pending)
+        if not hashes:
+            return
+
+        responses = self.service.w3.provider.make_batch_request([
+            ('eth_getTransactionReceipt', [tx_hash]) for tx_hash in hashes
+        ])
+        for tx_hash, response in zip(hashes, sorted(responses, key=lambda response: response['id'])):
+            receipt = response.get('result')
+            if receipt is None:
+                continue
+            with self._lock:
+                future = self._pending.get(tx_hash)
+                self._drop(future)
+            if future is not None and not future.done():
+                future.set_result(AttributeDict.recursive(receipt_formatter(receipt)))
+
+        if self.stuck_after_blocks:
+            self._replace_stuck(block_number)
+
+    def _replace_stuck(self, block_number):
+        """Have the service re-send transactions left unmined for too many blocks"""
+        with self._lock:
+            inflight = list(self._inflight.items())
+
+        for tx_hash, transaction in inflight:
+            if transaction.waiting_since is None:
+                transaction.waiting_since = block_number
+                continue
+            if block_number - transaction.waiting_since < self.stuck_after_blocks:
+                continue
+
+            # Whether or not it goes out, wait another stretch before bumping again
+            transaction.waiting_since = block_number
+            new_hash = self.service.replace_transaction(transaction)
+            if new_hash is None:
+                continue
+            with self._lock:
+                future = self._pending.get(tx_hash)
+                if future is None:
+                    # Mined or forgotten in the meantime
+                    continue
+                self._pending[new_hash] = future
+                self._inflight[new_hash] = self._inflight.pop(tx_hash)
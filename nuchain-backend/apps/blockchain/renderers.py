@@ -0,0 +1,17 @@
+import json
+from rest_framework.renderers import BaseRenderer
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets DRF negotiate `Accept: text/event-stream` for server-sent-event views.
+    The stream itself is written by the view; this only renders error
+    responses (e.g. 401) as a single `error` event.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return f"event: error\ndata: {json.dumps(data, default=str)}\n\n".encode(self.charset)
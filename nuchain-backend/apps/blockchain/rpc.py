@@ -0,0 +1,241 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+from web3._utils.http_session_manager import HTTPSessionManager
+from web3.providers import JSONBaseProvider
+from . import deadlines
+from .exceptions import DeadlineExceeded
+
+# Weight of the newest sample in an endpoint's latency average
+LATENCY_EWMA_WEIGHT = 0.2
+
+# Sent to every endpoint at once instead of the fastest one
+BROADCAST_METHODS = {'eth_sendRawTransaction'}
+
+
+def build_http_session(pool_size, hosts=1):
+    """
+    Build a keep-alive HTTP session whose connection pool is shared by every
+    thread in the worker. pool_block makes extra threads wait for a free
+    connection instead of opening throwaway sockets. Each RPC host gets its
+    own pool of `pool_size` connections.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=hosts, pool_maxsize=pool_size, pool_block=True)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class SharedSessionManager(HTTPSessionManager):
+    """Session manager that hands the same session to every thread"""
+
+    def __init__(self, session):
+        super().__init__(cache_size=1, session_pool_max_workers=1)
+        self.session = session
+
+    def cache_and_return_session(self, endpoint_uri, session=None, request_timeout=None):
+        return self.session
+
+
+class PooledHTTPProvider(Web3.HTTPProvider):
+    """
+    HTTPProvider backed by a single pooled session.
+
+    The stock provider caches one session per thread, so a threaded gunicorn
+    worker ends up with an unbounded number of pools and cold connections.
+    The chain id never changes, so it is cached instead of being re-fetched
+    by web3's validation middleware around every call.
+    """
+
+    def __init__(self, endpoint_uri, session, timeout=10, **kwargs):
+        kwargs.setdefault('cache_allowed_requests', True)
+        kwargs.setdefault('cacheable_requests', {'eth_chainId', 'net_version'})
+        super().__init__(endpoint_uri, request_kwargs={'timeout': timeout}, **kwargs)
+        self._request_session_manager = SharedSessionManager(session)
+
+    def get_request_kwargs(self):
+        # Never wait on a socket past the request's deadline
+        kwargs = super().get_request_kwargs()
+        kwargs['timeout'] = deadlines.bounded(kwargs['timeout'])
+        return kwargs
+
+    def close(self):
+        self._request_session_manager.session.close()
+
+
+class Endpoint:
+    """
+    One RPC provider with a moving average of its latency and a circuit breaker.
+
+    After `failure_threshold` consecutive transport failures the circuit opens
+    and the endpoint is skipped for `cooldown` seconds. Its latency average is
+    forgotten at the same time, so once the cooldown ends it ranks first and
+    the next request probes it; a failure there reopens the circuit at once.
+    """
+
+    def __init__(self, provider, failure_threshold=3, cooldown=30):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.latency = None
+        self.failures = 0
+        self.open_until = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'Endpoint({self.provider.endpoint_uri})'
+
+    @property
+    def available(self):
+        return time.monotonic() >= self.open_until
+
+    def record(self, elapsed, ok):
+        with self._lock:
+            if ok:
+                # Only answers count towards latency; an endpoint refusing connections fails fast
+                if self.latency is None:
+                    self.latency = elapsed
+                else:
+                    self.latency += LATENCY_EWMA_WEIGHT * (elapsed - self.latency)
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.open_until = time.monotonic() + self.cooldown
+                self.latency = None
+
+    def status(self):
+        return {
+            'url': str(self.provider.endpoint_uri),
+            'latency_ms': None if self.latency is None else round(self.latency * 1000, 1),
+            'failures': self.failures,
+            'circuit_open': not self.available,
+        }
+
+
+class RoutingProvider(JSONBaseProvider):
+    """
+    Spreads JSON-RPC traffic over several endpoints.
+
+    Reads and batches go to the available endpoint with the lowest latency
+    average. If it has not answered after `hedge_after` seconds, or fails,
+    the same request goes to the next endpoint and whichever answers first
+    wins, so one slow provider cannot hold a request for the full timeout.
+    Raw transactions are broadcast to every available endpoint so they reach
+    the mempool through whichever provider is healthy. JSON-RPC error
+    responses (reverts, nonce errors) are answers, not endpoint failures.
+    """
+
+    def __init__(self, providers, hedge_after=0.5, failure_threshold=3, cooldown=30, max_workers=None):
+        super().__init__()
+        if not providers:
+            raise ValueError("At least one RPC endpoint is required")
+        self.endpoints = [Endpoint(provider, failure_threshold, cooldown) for provider in providers]
+        self.hedge_after = hedge_after
+        self._executor = None
+        if len(providers) > 1:
+            # Failing over to another endpoint replaces web3's in-place retries
+            for provider in providers:
+                provider.exception_retry_configuration = None
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers or 4 * len(providers),
+                thread_name_prefix='rpc-hedge'
+            )
+
+    def __str__(self):
+        return f"RPC endpoints {', '.join(str(endpoint.provider.endpoint_uri) for endpoint in self.endpoints)}"
+
+    def ranked(self):
+        """Available endpoints, untried or fastest first"""
+        endpoints = [endpoint for endpoint in self.endpoints if endpoint.available]
+        if not endpoints:
+            # OSError, so web3's is_connected reports a plain disconnect
+            raise requests.ConnectionError("Every RPC endpoint's circuit breaker is open")
+        return sorted(endpoints, key=lambda endpoint: endpoint.latency or 0)
+
+    def make_request(self, method, params):
+        if method in BROADCAST_METHODS:
+            # Checked before sending, but a raw transaction cut off mid-send would leave its nonce in doubt
+            deadlines.check()
+            with deadlines.unbounded():
+                return self._broadcast(lambda provider: provider.make_request(method, params))
+        return self._hedged(lambda provider: provider.make_request(method, params))
+
+    def make_batch_request(self, batch_requests):
+        return self._hedged(lambda provider: provider.make_batch_request(batch_requests))
+
+    def _send(self, endpoint, request):
+        deadlines.check()
+        start = time.monotonic()
+        try:
+            response = request(endpoint.provider)
+        except Exception as e:
+            if deadlines.expired():
+                # Cut short by the request's deadline, not the endpoint's fault
+                raise DeadlineExceeded("Request deadline exceeded during an RPC call") from e
+            endpoint.record(time.monotonic() - start, ok=False)
+            raise
+        endpoint.record(time.monotonic() - start, ok=True)
+        return response
+
+    def _submit(self, endpoint, request):
+        # The pool thread inherits the caller's deadline
+        return self._executor.submit(contextvars.copy_context().run, self._send, endpoint, request)
+
+    def _hedged(self, request):
+        endpoints = self.ranked()
+        if len(endpoints) == 1:
+            return self._send(endpoints[0], request)
+
+        backups = iter(endpoints[1:])
+        pending = {self._submit(endpoints[0], request)}
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=deadlines.bounded(self.hedge_after), return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    error = error or e
+            deadlines.check()
+            # Slow or failed: bring in the next endpoint alongside any still running
+            backup = next(backups, None)
+            if backup is not None:
+                pending.add(self._submit(backup, request))
+        raise error
+
+    def _broadcast(self, request):
+        endpoints = self.ranked()
+        if len(endpoints) == 1:
+            return self._send(endpoints[0], request)
+
+        futures = [self._submit(endpoint, request) for endpoint in endpoints]
+        rejection = error = None
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            if 'error' not in response:
+                return response
+            rejection = rejection or response
+        # Every endpoint refused it: report the node's reason over a transport error
+        if rejection is not None:
+            return rejection
+        raise error
+
+    def status(self):
+        """Latency average and breaker state of each endpoint"""
+        return [endpoint.status() for endpoint in self.endpoints]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        for endpoint in self.endpoints:
+            endpoint.provider.close()
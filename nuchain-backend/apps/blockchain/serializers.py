@@ -0,0 +1,33 @@
+from rest_framework import serializers
+from .models import BlockchainTransaction
+
+class BlockchainTransactionSerializer(serializers.ModelSerializer):
+    tx_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BlockchainTransaction
+        fields = [
+            'id',
+            'kind',
+            'status',
+            'wallet_address',
+            'tx_hash',
+            'tx_url',
+            'replaced_tx_hashes',
+            'nonce',
+            'gas_limit',
+            'gas_price',
+            'gas_used',
+            'block_number',
+            'error',
+            'latency_ms',
+            'submitted_at',
+            'confirmed_at',
+            'created_at',
+            'updated_at'
+        ]
+
+    def get_tx_url(self, obj):
+        if not obj.tx_hash:
+            return None
+        return f"https://sepolia.basescan.org/tx/{obj.tx_hash}"
@@ -1,37 +1,207 @@
+import os
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from web3 import Web3
+from web3.exceptions import ContractLogicError
 from eth_account import Account
+from datetime import timedelta
 from decimal import Decimal
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from . import deadlines
 from .abi import NUC_TOKEN_ABI
+from .cache import BalanceCache
+from .fees import GAS_ESTIMATE_HEADROOM, FeeOracle, GasEstimates, bump_fees, is_fee_error
+from .lanes import LaneRouter, SignerLane
+from .models import BlockchainTransaction, IndexerCheckpoint, TokenBalance
+from .nonces import is_nonce_error
+from .receipts import ReceiptWatcher
+from .rpc import PooledHTTPProvider, RoutingProvider, build_http_session
+from .singleflight import SingleFlight
 from .exceptions import (
+    BlockchainError,
     ConnectionError,
+    DeadlineExceeded,
     TransactionError,
     InsufficientBalanceError,
     InsufficientGasError
 )
 
+BASE_SEPOLIA_CHAIN_ID = 84532
+
+# Every signup mints 25,000 NUC
+SIGNUP_AMOUNT = Decimal('25000')
+
+# Gas limit of a batch write: a fixed overhead plus an upper bound per entry
+BATCH_GAS_OVERHEAD = 40000
+BATCH_GAS_PER_ENTRY = {
+    'mintSignupBatch': 30000,
+    'lockBatch': 30000,
+    'resetPortfolioBatch': 10000,
+}
+
+# How long a request waits for its transaction to be mined
+RECEIPT_TIMEOUT = 120
+
+# BlockchainTransaction kind for each contract write
+TRANSACTION_KINDS = {
+    'mintSignup': 'mint_signup',
+    'lock': 'lock',
+    'resetPortfolio': 'reset_portfolio',
+    'burnAccount': 'burn_account',
+    'mintSignupBatch': 'mint_signup_batch',
+    'lockBatch': 'lock_batch',
+    'resetPortfolioBatch': 'reset_portfolio_batch',
+}
+
+# NucToken.lock reverts with this when the wallet's unlocked balance is too low
+INSUFFICIENT_BALANCE_REASON = 'Insufficient unlocked balance'
+
+# A signer below this much ETH stops sending transactions
+MIN_SIGNER_BALANCE_ETH = 0.001
+
+# Gas of a plain ETH transfer, used to fill a nonce left unsent
+TRANSFER_GAS = 21000
+
 class BlockchainService:
     """Service for interacting with NUC Token smart contract on Base Sepolia"""
     
-    def __init__(self):
-        # Connect to Base Sepolia
-        self.w3 = Web3(Web3.HTTPProvider(settings.BASE_SEPOLIA_RPC_URL))
-        
-        if not self.w3.is_connected():
-            raise ConnectionError("Failed to connect to Base Sepolia")
+    def __init__(self, rpc_urls=None, pool_size=None):
+        self.rpc_urls = list(rpc_urls or settings.BASE_SEPOLIA_RPC_URLS or [settings.BASE_SEPOLIA_RPC_URL])
+        self.pool_size = pool_size or settings.BLOCKCHAIN_HTTP_POOL_SIZE
         
-        # Load NucToken contract
+        # Contract address and signer accounts only need deriving once per process
         self.contract_address = Web3.to_checksum_address(settings.NUC_CONTRACT_ADDRESS)
+        self.lanes = LaneRouter([
+            SignerLane(
+                private_key,
+                self._pending_nonce,
+                self._signer_balance,
+                settings.BLOCKCHAIN_SIGNER_BALANCE_REFRESH_INTERVAL
+            )
+            for private_key in settings.ADMIN_PRIVATE_KEYS or [settings.ADMIN_PRIVATE_KEY]
+        ])
+        self.admin = self.lanes.primary.account
+        self.fees = FeeOracle(self, settings.BLOCKCHAIN_FEE_REFRESH_INTERVAL)
+        self.gas_estimates = GasEstimates()
+        
+        # Token decimals (18 decimals for NUC)
+        self.decimals = 18
+        
+        self.balance_cache = BalanceCache(
+            max_entries=settings.BLOCKCHAIN_BALANCE_CACHE_SIZE,
+            ttl=settings.BLOCKCHAIN_BALANCE_CACHE_TTL,
+            stale_ttl=settings.BLOCKCHAIN_BALANCE_CACHE_STALE_TTL,
+            cache_alias=settings.BLOCKCHAIN_BALANCE_CACHE_ALIAS or None
+        )
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        # In-memory chain of the 'evm' backend: (Web3, token address)
+        self._evm_chain = None
+        # Identical reads from concurrent requests share one RPC call
+        self.reads = SingleFlight()
+        self.receipts = ReceiptWatcher(
+            self,
+            settings.BLOCKCHAIN_RECEIPT_POLL_INTERVAL,
+            settings.BLOCKCHAIN_STUCK_AFTER_BLOCKS
+        )
+        
+        self._connect()
+    
+    def _connect(self):
+        """Open pooled connections to the Base Sepolia endpoints and bind the contract to them"""
+        if settings.BLOCKCHAIN_BACKEND == 'evm':
+            self._connect_evm()
+            return
+        
+        self.chain_id = BASE_SEPOLIA_CHAIN_ID
+        self.session = build_http_session(self.pool_size, hosts=len(self.rpc_urls))
+        self.w3 = Web3(RoutingProvider(
+            [
+                PooledHTTPProvider(url, self.session, timeout=settings.BLOCKCHAIN_RPC_TIMEOUT)
+                for url in self.rpc_urls
+            ],
+            hedge_after=settings.BLOCKCHAIN_RPC_HEDGE_AFTER,
+            failure_threshold=settings.BLOCKCHAIN_RPC_FAILURE_THRESHOLD,
+            cooldown=settings.BLOCKCHAIN_RPC_CIRCUIT_COOLDOWN,
+            # A request can be in flight on every endpoint at once while it is hedged
+            max_workers=self.pool_size * len(self.rpc_urls)
+        ))
         self.contract = self.w3.eth.contract(
             address=self.contract_address,
             abi=NUC_TOKEN_ABI
         )
+        # Connection is probed lazily on first use, not on construction
+        self._healthy_until = 0
+    
+    def _connect_evm(self):
+        """
+        Run against an in-memory EVM with NucToken deployed and every
+        transaction mined on arrival, for local runs and CI without network
+        access. The chain lives as long as the process; forked workers each
+        continue their own copy.
+        """
+        fresh = self._evm_chain is None
+        if fresh:
+            from .evm import start_chain
+            self._evm_chain = start_chain(settings.BLOCKCHAIN_EVM_ARTIFACT, [lane.account for lane in self.lanes])
         
-        # Load admin account
-        self.admin = Account.from_key(settings.ADMIN_PRIVATE_KEY)
+        self.w3, self.contract_address = self._evm_chain
+        if fresh:
+            # Stored nonces belong to whatever chain ran before
+            for lane in self.lanes:
+                lane.nonces.resync()
+        self.chain_id = self.w3.eth.chain_id
+        self.contract = self.w3.eth.contract(
+            address=self.contract_address,
+            abi=NUC_TOKEN_ABI
+        )
+        self._healthy_until = 0
+    
+    def reset_connection(self):
+        """
+        Drop the HTTP pool and reconnect.
+        Called in forked children, which must not share sockets with the parent.
+        """
+        self.w3.provider.close()
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self.reads = SingleFlight()
+        self.receipts = ReceiptWatcher(
+            self,
+            settings.BLOCKCHAIN_RECEIPT_POLL_INTERVAL,
+            settings.BLOCKCHAIN_STUCK_AFTER_BLOCKS
+        )
+        self._connect()
+    
+    def ensure_connected(self):
+        """Probe the RPC node at most once per health check interval"""
+        now = time.monotonic()
+        if now < self._healthy_until:
+            return
         
-        # Token decimals (18 decimals for NUC)
-        self.decimals = 18
+        if not self.w3.is_connected():
+            raise ConnectionError("Failed to connect to Base Sepolia")
+        
+        self._healthy_until = now + settings.BLOCKCHAIN_HEALTH_CHECK_INTERVAL
+    
+    def _call(self, contract_call):
+        """
+        Run a read-only contract call, surfacing RPC failures as BlockchainErrors.
+        Concurrent calls of the same function with the same arguments share one request.
+        """
+        self.ensure_connected()
+        key = ('call', contract_call.address, contract_call.fn_name, repr(contract_call.args), 'latest')
+        try:
+            return self.reads.do(key, contract_call.call)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            # Force a fresh health probe on the next call
+            self._healthy_until = 0
+            raise ConnectionError(f"RPC call failed: {str(e)}")
     
     def _to_wei(self, amount):
         """Convert NUC amount to wei (smallest unit of NUC)"""
@@ -41,143 +211,769 @@ class BlockchainService:
         """Convert wei to NUC amount"""
         return Decimal(wei_amount) / Decimal(10 ** self.decimals)
     
-    def _send_transaction(self, function, *args):
-        """Send a transaction to the blockchain"""
+    def _pending_nonce(self, address):
+        """Signer transaction count including transactions still in the mempool"""
+        return self.w3.eth.get_transaction_count(address, 'pending')
+    
+    def _signer_balance(self, address):
+        """Signer ETH balance in wei, as the node sees it now"""
+        return self.w3.eth.get_balance(address)
+    
+    def _simulate(self, contract_function, sender):
+        """
+        Run a transaction as an eth_call against the pending block before it is
+        signed, so a revert is reported straight away instead of after waiting
+        for a receipt.
+        
+        Returns:
+            int: gas limit to send the transaction with
+        """
+        params = {'from': sender}
         try:
-            # Check admin has enough ETH for gas
-            admin_balance = self.w3.eth.get_balance(self.admin.address)
-            if admin_balance < self.w3.to_wei(0.001, 'ether'):
-                raise InsufficientGasError("Admin wallet has insufficient ETH for gas")
-            
-            # Build transaction
-            nonce = self.w3.eth.get_transaction_count(self.admin.address)
-            gas_price = self.w3.eth.gas_price
-            
-            transaction = function(*args).build_transaction({
-                'from': self.admin.address,
-                'nonce': nonce,
-                'gas': 300000,
-                'gasPrice': gas_price,
-                'chainId': 84532  # Base Sepolia
-            })
-            
-            # Sign transaction
-            signed = self.w3.eth.account.sign_transaction(transaction, self.admin.key)
-            
-            # Send transaction
-            tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-            
-            # Wait for confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+            contract_function.call(params, block_identifier='pending')
+            if settings.BLOCKCHAIN_ESTIMATE_GAS:
+                estimate = contract_function.estimate_gas(params, block_identifier='pending')
+                return int(estimate * GAS_ESTIMATE_HEADROOM)
+            if contract_function.fn_name in BATCH_GAS_PER_ENTRY:
+                return self._batch_gas_limit(contract_function)
+            # Estimated once per contract function, then served from memory
+            return self.gas_estimates.gas_limit(contract_function, params)
+        except ContractLogicError as e:
+            reason = str(e.message or e)
+            if INSUFFICIENT_BALANCE_REASON in reason:
+                raise InsufficientBalanceError(f"Insufficient balance: {reason}")
+            raise TransactionError(f"Transaction would revert: {reason}")
+    
+    def _batch_gas_limit(self, contract_function):
+        """Gas limit of a batch write, sized to its number of entries"""
+        per_entry = BATCH_GAS_PER_ENTRY[contract_function.fn_name]
+        return BATCH_GAS_OVERHEAD + per_entry * len(contract_function.args[0])
+    
+    @staticmethod
+    def _routing_wallet(args):
+        """Wallet that picks a write's signer lane; a batch goes by its first entry"""
+        return args[0][0] if isinstance(args[0], list) else args[0]
+    
+    def _broadcast_transaction(self, function, *args, record=None):
+        """
+        Simulate, sign and broadcast a transaction without waiting for it to be mined.
+        It is signed by the lane that owns the wallet in args[0].
+        The BlockchainTransaction `record`, if given, is marked submitted.
+        """
+        self.ensure_connected()
+        lane = self.lanes.lane_for(self._routing_wallet(args))
+        try:
+            # Check this lane's signer has enough ETH for gas, from its in-memory balance
+            if lane.balance.current() < self.w3.to_wei(MIN_SIGNER_BALANCE_ETH, 'ether'):
+                raise InsufficientGasError(f"Signer {lane.address} has insufficient ETH for gas")
             
-            if receipt.status != 1:
-                raise TransactionError("Transaction reverted")
+            # Fail fast on reverts before a nonce is reserved
+            gas = self._simulate(function(*args), lane.address)
+            fees = self.fees.fees()
             
-            return tx_hash.hex()
+            # A stale counter gets one resync and retry, while the request's deadline allows
+            for attempt in range(2):
+                deadlines.check()
+                nonce = lane.nonces.reserve()
+                
+                try:
+                    transaction = function(*args).build_transaction({
+                        'from': lane.address,
+                        'nonce': nonce,
+                        'gas': gas,
+                        'maxFeePerGas': fees['maxFeePerGas'],
+                        'maxPriorityFeePerGas': fees['maxPriorityFeePerGas'],
+                        'chainId': self.chain_id
+                    })
+                    
+                    # Sign transaction
+                    signed = self.w3.eth.account.sign_transaction(transaction, lane.account.key)
+                    
+                    tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
+                except Exception as e:
+                    if is_nonce_error(e) and attempt == 0:
+                        lane.nonces.resync()
+                        continue
+                    if not lane.nonces.release(nonce):
+                        # Later nonces are out already and can't be mined until this one is
+                        self._fill_nonce(lane, nonce, fees)
+                    # Cached fees or balance were wrong; re-read them for the next send
+                    if is_fee_error(e):
+                        self.fees.invalidate()
+                    if 'insufficient funds' in str(e).lower():
+                        lane.balance.invalidate()
+                    raise
+                
+                lane.balance.charge(gas * fees['maxFeePerGas'])
+                if record is not None:
+                    record.mark_submitted(tx_hash.to_0x_hex(), nonce, gas, fees['maxFeePerGas'], signer=lane.address)
+                self.receipts.track(tx_hash, transaction, lane, record)
+                return tx_hash
         
         except Exception as e:
-            if isinstance(e, (InsufficientGasError, TransactionError)):
+            if isinstance(e, (InsufficientGasError, InsufficientBalanceError, TransactionError, DeadlineExceeded)):
                 raise
             raise TransactionError(f"Transaction failed: {str(e)}")
     
+    def _fill_nonce(self, lane, nonce, fees):
+        """
+        Send a zero-value transfer from a signer to itself at a nonce that was
+        reserved but never broadcast, so the transactions after it can be
+        mined. If the filler can't be sent either, the counter is resynced
+        with the node, which hands the gap out again.
+        """
+        transaction = {
+            'from': lane.address,
+            'to': lane.address,
+            'value': 0,
+            'nonce': nonce,
+            'gas': TRANSFER_GAS,
+            'maxFeePerGas': fees['maxFeePerGas'],
+            'maxPriorityFeePerGas': fees['maxPriorityFeePerGas'],
+            'chainId': self.chain_id
+        }
+        signed = self.w3.eth.account.sign_transaction(transaction, lane.account.key)
+        try:
+            tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception as e:
+            # A nonce error means the original broadcast reached the node after all
+            if not is_nonce_error(e):
+                lane.nonces.resync()
+            return
+        
+        lane.balance.charge(TRANSFER_GAS * fees['maxFeePerGas'])
+        # Watched like any broadcast, so a stuck filler is re-sent with higher fees
+        self.receipts.track(tx_hash, transaction, lane)
+    
+    def replace_transaction(self, inflight):
+        """
+        Re-sign a stuck transaction at the same nonce with bumped fees and broadcast it.
+        Called by the ReceiptWatcher; whichever broadcast is mined resolves the wait.
+        
+        Args:
+            inflight: InFlightTransaction, updated to the replacement when it goes out
+        
+        Returns:
+            str: the replacement's tx hash, or None if it could not be sent
+        """
+        previous = inflight.transaction
+        fees = bump_fees(
+            previous,
+            self.fees.fees(),
+            settings.BLOCKCHAIN_FEE_BUMP_PERCENT,
+            self.w3.to_wei(settings.BLOCKCHAIN_MAX_FEE_PER_GAS_GWEI, 'gwei')
+        )
+        if fees is None:
+            # Already at the fee cap; keep waiting on the last broadcast
+            return None
+        
+        transaction = {**previous, **fees}
+        signed = self.w3.eth.account.sign_transaction(transaction, inflight.lane.account.key)
+        try:
+            tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction).to_0x_hex()
+        except Exception:
+            # 'nonce too low' means an earlier broadcast was mined; its receipt ends the wait.
+            # Anything else is retried after another stretch of blocks
+            return None
+        
+        inflight.lane.balance.charge(transaction['gas'] * (fees['maxFeePerGas'] - previous['maxFeePerGas']))
+        inflight.transaction = transaction
+        if inflight.record is not None:
+            inflight.record.mark_replaced(tx_hash, fees['maxFeePerGas'])
+        return tx_hash
+    
+    def _await_receipt(self, tx_hash, future=None, record=None):
+        """
+        Wait for a broadcast transaction to be mined and check it succeeded.
+        Receipts come from the shared ReceiptWatcher rather than a polling
+        loop per request. The wait ends early, with DeadlineExceeded, when
+        the request's deadline runs out first; the transaction stays watched.
+        """
+        future = future or self.receipts.watch(tx_hash)
+        try:
+            receipt = future.result(timeout=deadlines.bounded(RECEIPT_TIMEOUT))
+        except FutureTimeoutError:
+            if deadlines.expired():
+                raise DeadlineExceeded(
+                    f"Request deadline exceeded while {tx_hash.to_0x_hex()} is pending",
+                    tx_hash=tx_hash.to_0x_hex(),
+                    receipt=future
+                )
+            self.receipts.forget(tx_hash)
+            raise TransactionError(
+                f"Transaction failed: {tx_hash.to_0x_hex()} not mined after {RECEIPT_TIMEOUT} seconds"
+            )
+        
+        if receipt.status != 1:
+            if record is not None:
+                record.mark_failed("Transaction reverted", receipt)
+            raise TransactionError("Transaction reverted")
+        
+        if record is not None:
+            record.mark_confirmed(receipt)
+        # A fee-bump replacement may be what got mined
+        if 'transactionHash' in receipt:
+            return receipt.transactionHash.to_0x_hex()
+        return tx_hash.to_0x_hex()
+    
+    def _track(self, function, args, record=None):
+        """
+        BlockchainTransaction for a contract write: the caller's record, filled
+        in with the wallet, or a new one for writes nobody asked to track.
+        Batch writes cover many wallets and leave it blank.
+        """
+        wallet_address = '' if isinstance(args[0], list) else args[0]
+        if record is None:
+            return BlockchainTransaction.objects.create(
+                kind=TRANSACTION_KINDS[function.fn_name],
+                wallet_address=wallet_address
+            )
+        if not record.wallet_address:
+            record.wallet_address = wallet_address
+            record.save(update_fields=['wallet_address', 'updated_at'])
+        return record
+    
+    def _settle_later(self, receipt, record):
+        """
+        Record the outcome of a transaction nobody is waiting for any more.
+        Starts once the caller's database transaction commits, so the record
+        row exists for the receipt watcher's thread.
+        """
+        def settle(future):
+            record.refresh_from_db()
+            if future.exception() is not None:
+                record.mark_failed(future.exception())
+            elif future.result().status != 1:
+                record.mark_failed("Transaction reverted", future.result())
+            else:
+                record.mark_confirmed(future.result())
+        
+        transaction.on_commit(lambda: receipt.add_done_callback(settle))
+    
+    def _send_transaction(self, function, *args, record=None):
+        """Send a transaction to the blockchain and wait for confirmation"""
+        record = self._track(function, args, record)
+        try:
+            tx_hash = self._broadcast_transaction(function, *args, record=record)
+            return self._await_receipt(tx_hash, record=record)
+        except DeadlineExceeded as e:
+            if e.receipt is None:
+                record.mark_failed(e)
+            else:
+                self._settle_later(e.receipt, record)
+            raise
+        except BlockchainError as e:
+            if record.status != 'failed':
+                record.mark_failed(e)
+            raise
+    
+    def _send_transactions(self, calls, records=None):
+        """
+        Broadcast several transactions back to back, then wait for all of them.
+        They are mined in the same few blocks instead of one block each.
+        
+        Args:
+            calls: list of (contract function, *args) tuples
+            records: optional BlockchainTransactions, one per call
+        
+        Returns:
+            list: tx hashes in the same order as calls
+        """
+        records = [
+            self._track(function, args, record)
+            for (function, *args), record in zip(calls, records or [None] * len(calls))
+        ]
+        tx_hashes = []
+        try:
+            for (function, *args), record in zip(calls, records):
+                tx_hashes.append(self._broadcast_transaction(function, *args, record=record))
+            futures = [self.receipts.watch(tx_hash) for tx_hash in tx_hashes]
+            return [
+                self._await_receipt(tx_hash, future, record)
+                for tx_hash, future, record in zip(tx_hashes, futures, records)
+            ]
+        except DeadlineExceeded as e:
+            # Out of time: whatever was broadcast is still on its way, the rest never will be
+            unsent = records[len(tx_hashes):]
+            pending = [
+                (tx_hash, record) for tx_hash, record in zip(tx_hashes, records)
+                if record.status == 'submitted'
+            ]
+            for record in unsent:
+                record.mark_failed(e)
+            for tx_hash, record in pending:
+                self._settle_later(self.receipts.watch(tx_hash), record)
+            if e.receipt is None and pending:
+                tx_hash = pending[0][0]
+                raise DeadlineExceeded(str(e), tx_hash=tx_hash.to_0x_hex(), receipt=self.receipts.watch(tx_hash))
+            raise
+        except BlockchainError as e:
+            for record in records:
+                if record.status in ('queued', 'submitted'):
+                    record.mark_failed(e)
+            raise
+    
+    def _batch_calls(self, function, entries):
+        """
+        Split entries for a batch function into as few calls as the gas budget allows.
+        Entries are grouped by signer lane first, so every wallet in a batch
+        keeps its own lane and its ordering with single writes.
+        
+        Args:
+            function: mintSignupBatch, lockBatch or resetPortfolioBatch
+            entries: list of argument tuples, wallet first, e.g. (address, wei_amount)
+        
+        Returns:
+            list: (function, column, ...) calls for _send_transactions
+        """
+        budget = settings.BLOCKCHAIN_BATCH_GAS_BUDGET - BATCH_GAS_OVERHEAD
+        per_batch = max(budget // BATCH_GAS_PER_ENTRY[function.fn_name], 1)
+        
+        by_lane = {}
+        for entry in entries:
+            by_lane.setdefault(self.lanes.lane_for(entry[0]), []).append(entry)
+        
+        calls = []
+        for lane_entries in by_lane.values():
+            for start in range(0, len(lane_entries), per_batch):
+                chunk = lane_entries[start:start + per_batch]
+                calls.append((function, *[list(column) for column in zip(*chunk)]))
+        return calls
+    
+    def _signup_balances(self):
+        """Balances of a freshly minted signup wallet"""
+        return {'total': SIGNUP_AMOUNT, 'locked': Decimal('0'), 'available': SIGNUP_AMOUNT}
+    
+    def _apply_lock(self, wei_amount):
+        """Cache update for a confirmed lock of wei_amount"""
+        amount = self._from_wei(wei_amount)
+        return lambda balances: {
+            **balances,
+            'locked': balances['locked'] + amount,
+            'available': balances['available'] - amount
+        }
+    
     # === WRITE FUNCTIONS ===
     
-    def mint_signup(self):
+    def mint_signup(self, record=None):
         """
         Generate a new wallet and mint 25,000 NUC tokens to it.
         Called during user signup.
         
+        Args:
+            record: optional BlockchainTransaction to track the mint with
+        
         Returns:
             tuple: (wallet_address, tx_hash)
         """
         # Generate new wallet for user
-        new_account = Account.create()
-        wallet_address = new_account.address
+        wallet_address = self.new_wallet_address()
+        return (wallet_address, self.mint_signup_to(wallet_address, record=record))
+    
+    def new_wallet_address(self):
+        """Generate a fresh wallet locally; nothing is sent to the chain"""
+        return Account.create().address
+    
+    def mint_signup_to(self, wallet_address, record=None):
+        """
+        Mint the 25,000 NUC signup allowance to an existing wallet.
+        Used by the outbox worker, which generates the wallet at signup time.
         
-        # Mint tokens to new wallet
-        tx_hash = self._send_transaction(
-            self.contract.functions.mintSignup, 
-            wallet_address
-        )
+        Returns:
+            str: tx hash
+        """
+        address = Web3.to_checksum_address(wallet_address)
+        tx_hash = self._send_transaction(self.contract.functions.mintSignup, address, record=record)
+        self.balance_cache.set(address, self._signup_balances())
+        return tx_hash
+    
+    def mint_signup_many(self, count):
+        """
+        Generate several wallets and mint 25,000 NUC to each, broadcasting
+        the mints back to back.
         
-        return (wallet_address, tx_hash)
+        Returns:
+            list: (wallet_address, tx_hash) tuples
+        """
+        wallet_addresses = [self.new_wallet_address() for _ in range(count)]
+        tx_hashes = self.mint_signup_to_many(wallet_addresses)
+        return list(zip(wallet_addresses, tx_hashes))
     
-    def lock_tokens(self, wallet_address, amount):
+    def mint_signup_to_many(self, wallet_addresses, records=None):
+        """
+        Mint the signup allowance to several existing wallets, broadcasting
+        the mints back to back.
+        
+        Returns:
+            list: tx hashes in the same order as wallet_addresses
+        """
+        addresses = [Web3.to_checksum_address(wallet_address) for wallet_address in wallet_addresses]
+        tx_hashes = self._send_transactions([
+            (self.contract.functions.mintSignup, address)
+            for address in addresses
+        ], records)
+        for address in addresses:
+            self.balance_cache.set(address, self._signup_balances())
+        return tx_hashes
+    
+    def mint_signup_batch(self, wallet_addresses):
+        """
+        Mint the signup allowance to many wallets with mintSignupBatch,
+        in as few transactions as BLOCKCHAIN_BATCH_GAS_BUDGET allows.
+        Each batch succeeds or reverts as a whole.
+        
+        Returns:
+            list: tx hashes, one per batch
+        """
+        addresses = [Web3.to_checksum_address(wallet_address) for wallet_address in wallet_addresses]
+        tx_hashes = self._send_transactions(self._batch_calls(
+            self.contract.functions.mintSignupBatch,
+            [(address,) for address in addresses]
+        ))
+        for address in addresses:
+            self.balance_cache.set(address, self._signup_balances())
+        return tx_hashes
+    
+    def lock_tokens(self, wallet_address, amount, record=None):
         """
         Lock tokens when user invests in a reactor.
         
         Args:
             wallet_address: User's Ethereum address
             amount: Amount of NUC to lock (Decimal or float)
+            record: optional BlockchainTransaction to track the lock with
         """
         address = Web3.to_checksum_address(wallet_address)
         wei_amount = self._to_wei(amount)
         
-        # Check if user has sufficient available balance
-        available = self.get_available_balance(address)
-        if available < Decimal(amount):
-            raise InsufficientBalanceError(
-                f"Insufficient balance. Available: {available} NUC, Required: {amount} NUC"
-            )
+        # The preflight simulation raises InsufficientBalanceError if the lock would revert
+        tx_hash = self._send_transaction(self.contract.functions.lock, address, wei_amount, record=record)
+        self.balance_cache.update(address, self._apply_lock(wei_amount))
+        return tx_hash
+    
+    def lock_tokens_many(self, locks):
+        """
+        Lock tokens for several investments, broadcasting the locks back to back.
+        
+        Args:
+            locks: list of (wallet_address, amount) tuples
+        
+        Returns:
+            list: tx hashes in the same order as locks
+        """
+        locks = [
+            (Web3.to_checksum_address(wallet_address), self._to_wei(amount))
+            for wallet_address, amount in locks
+        ]
+        tx_hashes = self._send_transactions([
+            (self.contract.functions.lock, address, wei_amount)
+            for address, wei_amount in locks
+        ])
+        for address, wei_amount in locks:
+            self.balance_cache.update(address, self._apply_lock(wei_amount))
+        return tx_hashes
+    
+    def lock_tokens_batch(self, locks):
+        """
+        Lock tokens for many investments with lockBatch. A batch reverts as a
+        whole if any wallet in it lacks the unlocked balance.
         
-        return self._send_transaction(self.contract.functions.lock, address, wei_amount)
+        Args:
+            locks: list of (wallet_address, amount) tuples
+        
+        Returns:
+            list: tx hashes, one per batch
+        """
+        locks = [
+            (Web3.to_checksum_address(wallet_address), self._to_wei(amount))
+            for wallet_address, amount in locks
+        ]
+        tx_hashes = self._send_transactions(self._batch_calls(self.contract.functions.lockBatch, locks))
+        for address, wei_amount in locks:
+            self.balance_cache.update(address, self._apply_lock(wei_amount))
+        return tx_hashes
     
-    def reset_portfolio(self, wallet_address):
+    def reset_portfolio(self, wallet_address, record=None):
         """
         Unlock all locked tokens for a user.
         Called when user resets their wallet.
         """
         address = Web3.to_checksum_address(wallet_address)
-        return self._send_transaction(self.contract.functions.resetPortfolio, address)
+        tx_hash = self._send_transaction(self.contract.functions.resetPortfolio, address, record=record)
+        self.balance_cache.update(address, lambda balances: {
+            **balances,
+            'locked': Decimal('0'),
+            'available': balances['total']
+        })
+        return tx_hash
     
-    def burn_account(self, wallet_address):
+    def reset_portfolio_batch(self, wallet_addresses):
+        """
+        Unlock all locked tokens for many users with resetPortfolioBatch.
+        
+        Returns:
+            list: tx hashes, one per batch
+        """
+        addresses = [Web3.to_checksum_address(wallet_address) for wallet_address in wallet_addresses]
+        tx_hashes = self._send_transactions(self._batch_calls(
+            self.contract.functions.resetPortfolioBatch,
+            [(address,) for address in addresses]
+        ))
+        for address in addresses:
+            self.balance_cache.update(address, lambda balances: {
+                **balances,
+                'locked': Decimal('0'),
+                'available': balances['total']
+            })
+        return tx_hashes
+    
+    def burn_account(self, wallet_address, record=None):
         """
         Burn all tokens for a user.
         Called when user deletes their account.
         """
         address = Web3.to_checksum_address(wallet_address)
-        return self._send_transaction(self.contract.functions.burnAccount, address)
+        tx_hash = self._send_transaction(self.contract.functions.burnAccount, address, record=record)
+        self.balance_cache.set(address, {
+            'total': Decimal('0'),
+            'locked': Decimal('0'),
+            'available': Decimal('0')
+        })
+        return tx_hash
+    
+    def signer_status(self):
+        """
+        Gas balance and operator authorization of every signer lane, read in one batch.
+        
+        Returns:
+            list: {'address', 'eth_balance', 'is_operator', 'low_balance'} dicts in lane order
+        """
+        self.ensure_connected()
+        functions = self.contract.functions
+        try:
+            operator_role = functions.OPERATOR_ROLE().call()
+            with self.w3.batch_requests() as batch:
+                for lane in self.lanes:
+                    batch.add(self.w3.eth.get_balance(lane.address))
+                    batch.add(functions.hasRole(operator_role, lane.address))
+                results = batch.execute()
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            self._healthy_until = 0
+            raise ConnectionError(f"RPC batch failed: {str(e)}")
+        
+        minimum = self.w3.to_wei(MIN_SIGNER_BALANCE_ETH, 'ether')
+        return [
+            {
+                'address': lane.address,
+                'eth_balance': Decimal(self.w3.from_wei(balance, 'ether')),
+                'is_operator': is_operator,
+                'low_balance': balance < minimum
+            }
+            for lane, balance, is_operator in zip(self.lanes, results[0::2], results[1::2])
+        ]
+    
+    def _call_batch(self, contract_calls):
+        """Run read-only contract calls as one JSON-RPC batch (one HTTP round trip)"""
+        self.ensure_connected()
+        try:
+            with self.w3.batch_requests() as batch:
+                for contract_call in contract_calls:
+                    batch.add(contract_call)
+                return batch.execute()
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            self._healthy_until = 0
+            raise ConnectionError(f"RPC batch failed: {str(e)}")
     
     # ==== READ FUNCTIONS (no gas required) ====
     
     def get_balance(self, wallet_address):
         """Get total balance for a user (in NUC)"""
         address = Web3.to_checksum_address(wallet_address)
-        balance_wei = self.contract.functions.balanceOf(address).call()
+        balance_wei = self._call(self.contract.functions.balanceOf(address))
         return self._from_wei(balance_wei)
     
     def get_locked_balance(self, wallet_address):
         """Get locked balance for a user (in NUC)"""
         address = Web3.to_checksum_address(wallet_address)
-        locked_wei = self.contract.functions.lockedBalances(address).call()
+        locked_wei = self._call(self.contract.functions.lockedBalances(address))
         return self._from_wei(locked_wei)
     
     def get_available_balance(self, wallet_address):
         """Get available (unlocked) balance for a user (in NUC)"""
         address = Web3.to_checksum_address(wallet_address)
-        available_wei = self.contract.functions.availableBalanceOf(address).call()
+        available_wei = self._call(self.contract.functions.availableBalanceOf(address))
         return self._from_wei(available_wei)
     
     def get_all_balances(self, wallet_address):
         """
-        Get all balance information for a user.
+        Get all balance information for a user in a single RPC round trip.
         
         Returns:
             dict: {'total': Decimal, 'locked': Decimal, 'available': Decimal}
         """
         address = Web3.to_checksum_address(wallet_address)
-        return {
-            'total': self.get_balance(address),
-            'locked': self.get_locked_balance(address),
-            'available': self.get_available_balance(address)
-        }
+        return self.get_balances_many([address])[address]
+    
+    def get_balances_many(self, wallet_addresses):
+        """
+        Get all balance information for many wallets at once.
+        Cached balances are served without touching the node; stale ones are
+        returned immediately and refreshed in the background. Everything else
+        is read through JSON-RPC batches.
+        
+        Returns:
+            dict: checksummed address -> {'total': Decimal, 'locked': Decimal, 'available': Decimal}
+        """
+        addresses = list(dict.fromkeys(
+            Web3.to_checksum_address(wallet_address) for wallet_address in wallet_addresses
+        ))
+        
+        balances = {}
+        missing = []
+        stale = []
+        for address in addresses:
+            cached = self.balance_cache.get(address)
+            if cached is None:
+                missing.append(address)
+                continue
+            balances[address], is_fresh = cached
+            if not is_fresh:
+                stale.append(address)
+        
+        if missing and settings.BLOCKCHAIN_READ_FROM_INDEX:
+            indexed = self._indexed_balances(missing)
+            balances.update(indexed)
+            missing = [address for address in missing if address not in indexed]
+        if missing:
+            balances.update(self._fetch_balances(missing))
+        if stale:
+            self._refresh_in_background(stale)
+        
+        return balances
+    
+    def _indexed_balances(self, addresses):
+        """
+        Read balances from the local event index instead of the node.
+        Returns an empty dict when the indexer has fallen behind, so callers
+        fall back to RPC.
+        """
+        checkpoint = IndexerCheckpoint.objects.filter(contract_address=self.contract_address).first()
+        max_age = timedelta(seconds=settings.BLOCKCHAIN_INDEX_MAX_AGE)
+        if checkpoint is None or timezone.now() - checkpoint.updated_at > max_age:
+            return {}
+        
+        rows = {row.address: row for row in TokenBalance.objects.filter(address__in=addresses)}
+        balances = {}
+        for address in addresses:
+            row = rows.get(address)
+            # A wallet with no indexed events holds nothing
+            balances[address] = {
+                'total': row.total if row else Decimal('0'),
+                'locked': row.locked if row else Decimal('0'),
+                'available': row.available if row else Decimal('0')
+            }
+            self.balance_cache.set(address, balances[address])
+        return balances
+    
+    def _fetch_balances(self, addresses):
+        """
+        Read balances from the node. Wallets another thread is already reading
+        wait for its result; the rest are read here and shared with any thread
+        that asks for them in the meantime.
+        """
+        keys = {('balances', address): address for address in addresses}
+        leading, following = self.reads.claim(keys)
+        try:
+            balances = self._read_balances([keys[key] for key in leading])
+        except BaseException as e:
+            self.reads.fail(leading, e)
+            raise
+        self.reads.resolve({key: balances[keys[key]] for key in leading})
+        
+        for key, future in following.items():
+            try:
+                balances[keys[key]] = dict(self.reads.wait(future))
+            except DeadlineExceeded:
+                # The leader's deadline may have been shorter than ours
+                if deadlines.expired():
+                    raise
+                balances.update(self._fetch_balances([keys[key]]))
+        
+        return balances
+    
+    def _read_balances(self, addresses):
+        """
+        Read balances from the node, packing the balanceOf, lockedBalances and
+        availableBalanceOf calls into batches of BLOCKCHAIN_RPC_BATCH_SIZE calls.
+        """
+        functions = self.contract.functions
+        per_batch = max(settings.BLOCKCHAIN_RPC_BATCH_SIZE // 3, 1)
+        
+        balances = {}
+        for start in range(0, len(addresses), per_batch):
+            chunk = addresses[start:start + per_batch]
+            results = self._call_batch([
+                contract_call
+                for address in chunk
+                for contract_call in (
+                    functions.balanceOf(address),
+                    functions.lockedBalances(address),
+                    functions.availableBalanceOf(address)
+                )
+            ])
+            for index, address in enumerate(chunk):
+                total, locked, available = results[index * 3:index * 3 + 3]
+                balances[address] = {
+                    'total': self._from_wei(total),
+                    'locked': self._from_wei(locked),
+                    'available': self._from_wei(available)
+                }
+                self.balance_cache.set(address, balances[address])
+        
+        return balances
+    
+    def _refresh_in_background(self, addresses):
+        """Re-read stale balances on a background thread, once per wallet at a time"""
+        with self._refresh_lock:
+            addresses = [address for address in addresses if address not in self._refreshing]
+            self._refreshing.update(addresses)
+        if not addresses:
+            return
+        
+        def refresh():
+            try:
+                self._fetch_balances(addresses)
+            except BlockchainError:
+                # Keep serving the stale entries until they expire
+                pass
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.difference_update(addresses)
+        
+        threading.Thread(target=refresh, daemon=True).start()
 
-# Singleton instance
+# Per-process instance, shared by all threads of a worker
 _service = None
+_service_lock = threading.Lock()
 
 def get_blockchain_service():
-    """Get or create singleton blockchain service instance"""
+    """Get or create the per-process blockchain service instance"""
     global _service
     if _service is None:
-        _service = BlockchainService()
-    return _service
\ No newline at end of file
+        with _service_lock:
+            if _service is None:
+                _service = BlockchainService()
+    return _service
+
+def _reinitialize_after_fork():
+    """Give forked workers a fresh lock and their own connection pool"""
+    global _service_lock
+    _service_lock = threading.Lock()
+    if _service is not None:
+        _service.reset_connection()
+
+os.register_at_fork(after_in_child=_reinitialize_after_fork)
@@ -0,0 +1,93 @@
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from . import deadlines
+from .exceptions import DeadlineExceeded
+
+
+class SingleFlight:
+    """
+    Shares in-flight reads between threads of a worker.
+
+    A thread that asks for a key nobody is reading becomes its leader and
+    runs the read; threads asking for the same key before it finishes wait
+    on the leader's future instead of sending an identical RPC call. Nothing
+    is kept once the read completes, so this only removes duplicate work
+    that overlaps in time, e.g. parallel portfolio_summary requests from
+    several tabs.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._counters = {'calls': 0, 'coalesced': 0}
+
+    def claim(self, keys):
+        """
+        Register interest in `keys`.
+
+        Returns:
+            tuple: (leading, following). `leading` lists the keys this thread
+            must read and then pass to resolve() or fail(); `following` maps
+            keys another thread is already reading to their futures.
+        """
+        leading = []
+        following = {}
+        with self._lock:
+            for key in keys:
+                future = self._inflight.get(key)
+                if future is None:
+                    self._inflight[key] = Future()
+                    leading.append(key)
+                else:
+                    following[key] = future
+            self._counters['calls'] += len(leading) + len(following)
+            self._counters['coalesced'] += len(following)
+        return leading, following
+
+    def resolve(self, results):
+        """Hand each led key's result (dict of key -> result) to its waiters"""
+        with self._lock:
+            futures = [(self._inflight.pop(key), result) for key, result in results.items()]
+        for future, result in futures:
+            future.set_result(result)
+
+    def fail(self, keys, error):
+        """Raise `error` in every thread waiting on the led `keys`"""
+        with self._lock:
+            futures = [self._inflight.pop(key) for key in keys]
+        for future in futures:
+            future.set_exception(error)
+
+    def wait(self, future):
+        """The leader's result, waiting no longer than the current request's deadline"""
+        try:
+            return future.result(timeout=deadlines.remaining())
+        except FutureTimeoutError:
+            raise DeadlineExceeded("Request deadline exceeded")
+
+    def do(self, key, read):
+        """Run `read()`, or share the result of an identical one already in flight"""
+        while True:
+            leading, following = self.claim([key])
+            if leading:
+                break
+            try:
+                return self.wait(following[key])
+            except DeadlineExceeded:
+                # The leader's deadline may have been shorter than ours
+                if deadlines.expired():
+                    raise
+
+        try:
+            result = read()
+        except BaseException as e:
+            self.fail(leading, e)
+            raise
+        self.resolve({key: result})
+        return result
+
+    def stats(self):
+        """Reads requested, how many were served by another thread's read, and reads in flight"""
+        with self._lock:
+            return dict(self._counters, in_flight=len(self._inflight))
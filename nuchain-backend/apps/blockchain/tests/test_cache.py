@@ -0,0 +1,107 @@
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from apps.blockchain.cache import BalanceCache
+from apps.blockchain.services import BlockchainService
+
+WALLET = '0x1234567890AbcdEF1234567890aBcdef12345678'
+BALANCES = {'total': Decimal('25000'), 'locked': Decimal('5000'), 'available': Decimal('20000')}
+
+
+class BalanceCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.cache = BalanceCache(max_entries=2, ttl=30, stale_ttl=60)
+
+    @patch('apps.blockchain.cache.time.time')
+    def test_fresh_stale_and_expired(self, mock_time):
+        """Test that entries are fresh, then stale, then dropped"""
+        mock_time.return_value = 1000
+        self.cache.set(WALLET, BALANCES)
+
+        mock_time.return_value = 1010
+        self.assertEqual(self.cache.get(WALLET), (BALANCES, True))
+
+        mock_time.return_value = 1050
+        self.assertEqual(self.cache.get(WALLET), (BALANCES, False))
+
+        mock_time.return_value = 1100
+        self.assertIsNone(self.cache.get(WALLET))
+
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['stale_hits'], stats['misses']), (1, 1, 1))
+
+    def test_least_recently_used_entry_evicted(self):
+        """Test that the LRU drops the wallet that was read longest ago"""
+        self.cache.set('0xa', BALANCES)
+        self.cache.set('0xb', BALANCES)
+        self.cache.get('0xa')
+        self.cache.set('0xc', BALANCES)
+
+        self.assertIsNotNone(self.cache.get('0xa'))
+        self.assertIsNone(self.cache.get('0xb'))
+
+    def test_update_in_place(self):
+        """Test that cached wallets are updated and uncached ones ignored"""
+        self.cache.set(WALLET, BALANCES)
+        self.cache.update(WALLET, lambda balances: {**balances, 'locked': Decimal('0')})
+        self.cache.update('0xother', lambda balances: {**balances, 'locked': Decimal('0')})
+
+        self.assertEqual(self.cache.get(WALLET)[0]['locked'], Decimal('0'))
+        self.assertIsNone(self.cache.get('0xother'))
+
+    def test_shared_backend(self):
+        """Test that another worker's cache picks up entries from the shared backend"""
+        self.addCleanup(cache.clear)
+        BalanceCache(max_entries=10, ttl=30, stale_ttl=60, cache_alias='default').set(WALLET, BALANCES)
+
+        other_worker = BalanceCache(max_entries=10, ttl=30, stale_ttl=60, cache_alias='default')
+        self.assertEqual(other_worker.get(WALLET), (BALANCES, True))
+
+
+class ServiceBalanceCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+        self.service._healthy_until = float('inf')
+        # Stand in for the node: every wallet holds BALANCES
+        wei = [int(BALANCES[key] * 10 ** 18) for key in ('total', 'locked', 'available')]
+        self.fetch = MagicMock(side_effect=lambda contract_calls: wei * (len(contract_calls) // 3))
+        self.service._call_batch = self.fetch
+
+    def test_second_read_served_from_cache(self):
+        """Test that repeated dashboard loads don't go back to the node"""
+        self.service.get_all_balances(WALLET)
+        self.service.get_all_balances(WALLET.lower())
+
+        self.fetch.assert_called_once()
+
+    def test_stale_entry_served_while_refreshing(self):
+        """Test that a stale entry is returned immediately and refreshed in the background"""
+        self.service.balance_cache.ttl = 0
+        self.service.balance_cache.set(WALLET, BALANCES)
+
+        with patch.object(self.service, '_refresh_in_background') as mock_refresh:
+            self.assertEqual(self.service.get_all_balances(WALLET), BALANCES)
+
+        mock_refresh.assert_called_once_with([WALLET])
+        self.fetch.assert_not_called()
+
+    def test_writes_update_cache(self):
+        """Test that lock, reset and burn update the cached balances in place"""
+        self.service.get_all_balances(WALLET)
+
+        with patch.object(self.service, '_send_transaction', return_value='0xhash'):
+            self.service.lock_tokens(WALLET, Decimal('1500'))
+            self.assertEqual(self.service.get_all_balances(WALLET), {
+                'total': Decimal('25000'),
+                'locked': Decimal('6500'),
+                'available': Decimal('18500')
+            })
+
+            self.service.reset_portfolio(WALLET)
+            self.assertEqual(self.service.get_all_balances(WALLET)['available'], Decimal('25000'))
+
+            self.service.burn_account(WALLET)
+            self.assertEqual(self.service.get_all_balances(WALLET)['total'], Decimal('0'))
+
+        self.fetch.assert_called_once()
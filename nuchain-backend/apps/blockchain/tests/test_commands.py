@@ -0,0 +1,38 @@
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import MagicMock, patch
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from web3 import Web3
+
+
+class ReconcileBalancesCommandTest(TestCase):
+    def setUp(self):
+        self.wallets = {}
+        for index, balance in enumerate(['25000', '20000']):
+            user = User.objects.create_user(username=f'user{index}', password='testpass123')
+            user.profile.wallet_address = f'0x{index + 1:040x}'
+            user.profile.balance = Decimal(balance)
+            user.profile.save()
+            self.wallets[Web3.to_checksum_address(user.profile.wallet_address)] = Decimal(balance)
+
+    @patch('apps.blockchain.management.commands.reconcile_balances.get_blockchain_service')
+    def test_reports_mismatches(self, mock_get_service):
+        """Test that wallets whose on-chain balance differs from the database are reported"""
+        mock_service = MagicMock()
+        mock_service.w3 = Web3()
+        mock_service.get_balances_many.return_value = {
+            address: {'total': Decimal('25000'), 'locked': Decimal('0'), 'available': Decimal('25000')}
+            for address in self.wallets
+        }
+        mock_get_service.return_value = mock_service
+
+        out = StringIO()
+        call_command('reconcile_balances', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('user1', output)
+        self.assertNotIn('user0 ', output)
+        self.assertIn('Checked 2 wallets, found 1 mismatches', output)
+        mock_service.get_balances_many.assert_called_once()
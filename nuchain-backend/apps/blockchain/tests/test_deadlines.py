@@ -0,0 +1,93 @@
+import time
+from concurrent.futures import Future
+from unittest.mock import patch
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from apps.blockchain import deadlines
+from apps.blockchain.exceptions import DeadlineExceeded
+from apps.blockchain.middleware import DeadlineMiddleware
+from apps.blockchain.models import BlockchainTransaction
+from apps.blockchain.rpc import RoutingProvider
+from apps.blockchain.services import BlockchainService
+from .test_rpc import FakeProvider
+
+WALLET = '0x19E7E376E7C213B7E7e7e46cc70A5dD086DAff2A'
+TX_HASH = HexBytes('0x' + 'ab' * 32)
+
+
+class DeadlineTest(SimpleTestCase):
+    def test_no_deadline_outside_a_request(self):
+        self.assertIsNone(deadlines.remaining())
+        self.assertEqual(deadlines.bounded(120), 120)
+
+    def test_nested_deadline_only_shortens(self):
+        with deadlines.deadline(0.5):
+            with deadlines.deadline(60):
+                self.assertLessEqual(deadlines.remaining(), 0.5)
+            with deadlines.deadline(0):
+                with self.assertRaises(DeadlineExceeded):
+                    deadlines.check()
+            self.assertEqual(deadlines.bounded(0.1), 0.1)
+
+    @override_settings(
+        BLOCKCHAIN_REQUEST_DEADLINE=25,
+        BLOCKCHAIN_REQUEST_DEADLINES={'/api/investments/': 10, '/api/investments/portfolio_summary/': 3}
+    )
+    def test_middleware_uses_longest_matching_path(self):
+        """Test that each request gets its endpoint's budget for the duration of the view"""
+        seen = []
+        middleware = DeadlineMiddleware(lambda request: seen.append(deadlines.remaining()) or HttpResponse())
+
+        for path in ['/api/investments/portfolio_summary/', '/api/investments/', '/api/auth/register/']:
+            middleware(RequestFactory().get(path))
+
+        self.assertEqual([round(budget) for budget in seen], [3, 10, 25])
+        self.assertIsNone(deadlines.remaining())
+
+
+class DeadlineRpcTest(SimpleTestCase):
+    def test_slow_endpoints_cut_off_at_deadline(self):
+        """Test that a hedged read gives up when the budget ends, without blaming the endpoints"""
+        provider = RoutingProvider([FakeProvider('a', delay=0.5), FakeProvider('b', delay=0.5)], hedge_after=0.02)
+        self.addCleanup(provider.close)
+
+        start = time.monotonic()
+        with deadlines.deadline(0.1), self.assertRaises(DeadlineExceeded):
+            provider.make_request('eth_call', [])
+
+        self.assertLess(time.monotonic() - start, 0.3)
+        self.assertTrue(all(endpoint['failures'] == 0 for endpoint in provider.status()))
+
+
+class DeadlineReceiptTest(TestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+        self.receipt = Future()
+        for target, kwargs in [
+            (self.service, {'attribute': '_broadcast_transaction', 'return_value': TX_HASH}),
+            (self.service.receipts, {'attribute': 'watch', 'return_value': self.receipt}),
+        ]:
+            patcher = patch.object(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_pending_transaction_settles_after_request(self):
+        """Test that a receipt wait cut short leaves the record to be settled when the transaction is mined"""
+        record = BlockchainTransaction.objects.create(kind='reset_portfolio', wallet_address=WALLET)
+        record.mark_submitted(TX_HASH.to_0x_hex(), 4, 60000, 10 ** 9)
+
+        with self.captureOnCommitCallbacks(execute=True), deadlines.deadline(0.05):
+            with self.assertRaises(DeadlineExceeded) as raised:
+                self.service.reset_portfolio(WALLET, record=record)
+
+        self.assertEqual(raised.exception.tx_hash, TX_HASH.to_0x_hex())
+        record.refresh_from_db()
+        self.assertEqual(record.status, 'submitted')
+
+        self.receipt.set_result(AttributeDict({'status': 1, 'blockNumber': 12, 'gasUsed': 45000}))
+
+        record.refresh_from_db()
+        self.assertEqual(record.status, 'confirmed')
+        self.assertEqual(record.block_number, 12)
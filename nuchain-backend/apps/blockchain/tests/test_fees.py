@@ -0,0 +1,162 @@
+from unittest.mock import MagicMock, patch
+from django.test import SimpleTestCase, TestCase
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from apps.blockchain.fees import MIN_PRIORITY_FEE, FeeOracle, GasEstimates, bump_fees, is_fee_error
+from apps.blockchain.lanes import SignerBalance
+from apps.blockchain.models import BlockchainTransaction
+from apps.blockchain.services import BlockchainService
+
+WALLET = '0x19E7E376E7C213B7E7e7e46cc70A5dD086DAff2A'
+FEE_HISTORY = {'baseFeePerGas': [10 ** 9, 2 * 10 ** 9], 'reward': [[3 * 10 ** 6], [10 ** 6], [5 * 10 ** 6]]}
+
+
+class FeeOracleTest(SimpleTestCase):
+    def setUp(self):
+        self.service = MagicMock()
+        self.service.w3.eth.fee_history.return_value = FEE_HISTORY
+        self.oracle = FeeOracle(self.service, refresh_interval=60)
+
+    def test_fees_from_next_base_fee_and_median_tip(self):
+        """Test that the max fee covers a doubled base fee plus the median reward"""
+        self.assertEqual(self.oracle.fees(), {
+            'maxFeePerGas': 2 * 2 * 10 ** 9 + 3 * 10 ** 6,
+            'maxPriorityFeePerGas': 3 * 10 ** 6,
+        })
+
+    def test_fee_history_read_once_per_interval(self):
+        """Test that repeated sends reuse the fees until invalidated"""
+        for _ in range(5):
+            self.oracle.fees()
+        self.service.w3.eth.fee_history.assert_called_once()
+
+        self.oracle.invalidate()
+        self.oracle.fees()
+        self.assertEqual(self.service.w3.eth.fee_history.call_count, 2)
+
+    def test_priority_fee_floor(self):
+        """Test that blocks paying no tip still give a non-zero priority fee"""
+        self.service.w3.eth.fee_history.return_value = {'baseFeePerGas': [10 ** 9], 'reward': [[0]]}
+        self.assertEqual(self.oracle.fees()['maxPriorityFeePerGas'], MIN_PRIORITY_FEE)
+
+    def test_is_fee_error(self):
+        self.assertTrue(is_fee_error(ValueError({'code': -32000, 'message': 'transaction underpriced'})))
+        self.assertFalse(is_fee_error(ValueError('nonce too low')))
+
+
+class BumpFeesTest(SimpleTestCase):
+    PREVIOUS = {'maxFeePerGas': 1000, 'maxPriorityFeePerGas': 100}
+
+    def test_bumps_both_fields(self):
+        self.assertEqual(
+            bump_fees(self.PREVIOUS, {'maxFeePerGas': 900, 'maxPriorityFeePerGas': 50}, 15, 10 ** 6),
+            {'maxFeePerGas': 1150, 'maxPriorityFeePerGas': 115}
+        )
+
+    def test_follows_market_when_it_rose_further(self):
+        """Test that a fee spike beyond the bump step is matched"""
+        fees = bump_fees(self.PREVIOUS, {'maxFeePerGas': 5000, 'maxPriorityFeePerGas': 300}, 15, 10 ** 6)
+        self.assertEqual(fees, {'maxFeePerGas': 5000, 'maxPriorityFeePerGas': 300})
+
+    def test_capped(self):
+        """Test that the cap limits a bump and rules out one below the minimum step"""
+        current = {'maxFeePerGas': 5000, 'maxPriorityFeePerGas': 300}
+        self.assertEqual(bump_fees(self.PREVIOUS, current, 15, 2000)['maxFeePerGas'], 2000)
+        self.assertIsNone(bump_fees(self.PREVIOUS, current, 15, 1100))
+
+
+class GasEstimatesTest(SimpleTestCase):
+    def test_estimate_once_per_selector(self):
+        """Test that a function is estimated on first use and served from memory after"""
+        estimates = GasEstimates()
+        function = MagicMock(selector='0x282d3fdf')
+        function.estimate_gas.return_value = 50000
+
+        self.assertEqual(estimates.gas_limit(function, {}), 86520)
+        self.assertEqual(estimates.gas_limit(function, {}), 86520)
+        function.estimate_gas.assert_called_once()
+
+    def test_keeps_largest_observation(self):
+        estimates = GasEstimates()
+        estimates.observe('0x282d3fdf', 50000)
+        estimates.observe('0x282d3fdf', 40000)
+
+        self.assertEqual(estimates.gas_limit(MagicMock(selector='0x282d3fdf'), {}), 86520)
+
+
+    def test_cached_limit_covers_first_write_to_a_slot(self):
+        """Test that an estimate taken on a wallet with locked tokens still covers a wallet's first lock"""
+        estimates = GasEstimates()
+        estimates.observe('0x282d3fdf', 36269)
+
+        self.assertGreaterEqual(estimates.gas_limit(MagicMock(selector='0x282d3fdf'), {}), 36269 + 17100)
+
+
+class SignerBalanceTest(SimpleTestCase):
+    def test_charges_locally_until_refresh(self):
+        """Test that sends are deducted in memory and the node is asked again when stale"""
+        fetch = MagicMock(return_value=10 ** 18)
+        balance = SignerBalance(fetch, refresh_interval=60)
+
+        self.assertEqual(balance.current(), 10 ** 18)
+        balance.charge(10 ** 15)
+        self.assertEqual(balance.current(), 10 ** 18 - 10 ** 15)
+        fetch.assert_called_once()
+
+        balance.invalidate()
+        self.assertEqual(balance.current(), 10 ** 18)
+        self.assertEqual(fetch.call_count, 2)
+
+
+class CachedFeesBroadcastTest(TestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+        self.service._healthy_until = float('inf')
+        self.eth = self.service.w3.eth
+        self.mocks = {
+            name: self._patch(self.eth, name, **kwargs)
+            for name, kwargs in {
+                'get_transaction_count': {'return_value': 0},
+                'get_balance': {'return_value': 10 ** 18},
+                'call': {'return_value': b''},
+                'fee_history': {'return_value': FEE_HISTORY},
+                'estimate_gas': {'return_value': 50000},
+                'send_raw_transaction': {'side_effect': lambda raw: HexBytes(bytes(raw)[-32:])},
+            }.items()
+        }
+
+    def _patch(self, target, attribute, **kwargs):
+        patcher = patch.object(target, attribute, **kwargs)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_repeated_writes_reuse_fees_gas_and_balance(self):
+        """Test that only the first write pays for fee, estimate and balance reads"""
+        for _ in range(3):
+            self.service._broadcast_transaction(self.service.contract.functions.resetPortfolio, WALLET)
+
+        self.assertEqual(self.mocks['send_raw_transaction'].call_count, 3)
+        for name in ['fee_history', 'estimate_gas', 'get_balance']:
+            self.mocks[name].assert_called_once()
+
+        lane = self.service.lanes.primary
+        max_fee = 2 * 2 * 10 ** 9 + 3 * 10 ** 6
+        self.assertEqual(lane.balance.current(), 10 ** 18 - 3 * 86520 * max_fee)
+
+    def test_records_max_fee_then_effective_price(self):
+        """Test that a record keeps the max fee it was sent with until the receipt shows the real price"""
+        record = BlockchainTransaction.objects.create(kind='reset_portfolio', wallet_address=WALLET)
+        self.service._broadcast_transaction(self.service.contract.functions.resetPortfolio, WALLET, record=record)
+        self.assertEqual(record.gas_price, 2 * 2 * 10 ** 9 + 3 * 10 ** 6)
+
+        record.mark_confirmed(AttributeDict({'blockNumber': 5, 'gasUsed': 45000, 'effectiveGasPrice': 2 * 10 ** 9}))
+        self.assertEqual(record.gas_price, 2 * 10 ** 9)
+
+    def test_underpriced_rejection_refreshes_fees(self):
+        """Test that a fee the node rejects is not reused for the next send"""
+        self.mocks['send_raw_transaction'].side_effect = ValueError('transaction underpriced')
+        with self.assertRaises(Exception):
+            self.service._broadcast_transaction(self.service.contract.functions.resetPortfolio, WALLET)
+
+        self.service.fees.fees()
+        self.assertEqual(self.mocks['fee_history'].call_count, 2)
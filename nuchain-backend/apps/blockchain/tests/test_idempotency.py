@@ -0,0 +1,168 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import MagicMock, patch
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.blockchain.exceptions import DeadlineExceeded
+from apps.blockchain.models import IdempotencyKey
+from apps.investments.models import Investment
+from apps.reactors.models import Reactor
+
+TX_HASH = '0x' + 'ab' * 32
+WALLET = '0x1234567890abcdef1234567890abcdef12345678'
+
+
+class IdempotentInvestmentTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='investor', password='testpass123')
+        self.user.profile.wallet_address = WALLET
+        self.user.profile.save()
+        self.client.force_authenticate(user=self.user)
+        self.reactor = Reactor.objects.create(
+            name='Test Reactor',
+            slug='nuwave',
+            type='SMR',
+            description='Test reactor',
+            location='Test Location',
+            annual_roi_rate=Decimal('0.0450'),
+            carbon_offset_tonnes_co2_per_nuc_per_year=Decimal('0.8500'),
+            total_funding_needed=Decimal('180000'),
+            current_funding=Decimal('0')
+        )
+        self.service = MagicMock()
+        self.service.lock_tokens.return_value = TX_HASH
+        patcher = patch('apps.investments.views.get_blockchain_service', return_value=self.service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _invest(self, amount='10000', key='retry-1'):
+        return self.client.post(
+            reverse('investment-list'),
+            {'reactor_id': self.reactor.id, 'amount_invested': amount},
+            format='json',
+            HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retry_replays_response_without_second_lock(self):
+        """Test that a retried investment returns the first response and sends one transaction"""
+        first = self._invest()
+        retry = self._invest()
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.service.lock_tokens.assert_called_once()
+        self.assertEqual(Investment.objects.filter(user=self.user).count(), 1)
+
+    def test_key_reused_for_different_request(self):
+        self._invest()
+        response = self._invest(amount='2000')
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.service.lock_tokens.assert_called_once()
+
+    def test_duplicate_waits_for_in_flight_original(self):
+        """Test that a duplicate arriving mid-request gets the original's response once it finishes"""
+        self._invest(key='first')
+        record = IdempotencyKey.objects.get(key='first')
+        IdempotencyKey.objects.filter(pk=record.pk).update(
+            status='in_progress', response_status=None, response_body=None
+        )
+
+        def finish(seconds):
+            IdempotencyKey.objects.filter(pk=record.pk).update(
+                status='completed', response_status=201, response_body={'message': 'done'}
+            )
+
+        with patch('apps.blockchain.idempotency.time.sleep', side_effect=finish) as sleep:
+            response = self._invest(key='first')
+
+        sleep.assert_called_once()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'message': 'done'})
+        self.service.lock_tokens.assert_called_once()
+
+    def test_keys_are_per_user(self):
+        self._invest()
+        other = User.objects.create_user(username='other', password='testpass123')
+        other.profile.wallet_address = '0xabcdef1234567890abcdef1234567890abcdef12'
+        other.profile.save()
+        self.client.force_authenticate(user=other)
+
+        self.assertEqual(self._invest().status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.service.lock_tokens.call_count, 2)
+
+
+class IdempotentRegistrationTest(TestCase):
+    DATA = {
+        'username': 'newuser',
+        'email': 'newuser@example.com',
+        'password': 'strongpass123',
+        'password_confirm': 'strongpass123',
+    }
+
+    @patch('apps.users.views.get_blockchain_service')
+    def test_server_error_releases_key(self, mock_get_service):
+        """Test that a signup that sent nothing can be retried with the same key"""
+        mock_service = MagicMock()
+        mock_service.mint_signup.side_effect = [DeadlineExceeded('Request deadline exceeded'), (WALLET, TX_HASH)]
+        mock_get_service.return_value = mock_service
+        client = APIClient()
+
+        first = client.post(reverse('register'), self.DATA, format='json', HTTP_IDEMPOTENCY_KEY='signup-1')
+        retry = client.post(reverse('register'), self.DATA, format='json', HTTP_IDEMPOTENCY_KEY='signup-1')
+        again = client.post(reverse('register'), self.DATA, format='json', HTTP_IDEMPOTENCY_KEY='signup-1')
+
+        self.assertEqual(first.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertIn('access', retry.data)
+        # Tokens aren't stored, so the replay has the account but the client logs in for tokens
+        self.assertEqual(again.data['user'], retry.data['user'])
+        self.assertNotIn('access', again.data)
+        self.assertNotIn('refresh', again.data)
+        stored = IdempotencyKey.objects.get(key='signup-1').response_body
+        self.assertNotIn('access', stored)
+        self.assertNotIn('refresh', stored)
+        self.assertEqual(mock_service.mint_signup.call_count, 2)
+        self.assertEqual(User.objects.filter(username='newuser').count(), 1)
+
+    @patch('apps.users.views.get_blockchain_service')
+    def test_anonymous_keys_are_per_request(self, mock_get_service):
+        """Test that two signups that happen to pick the same key don't collide"""
+        mock_get_service.return_value.mint_signup.side_effect = [(WALLET, TX_HASH), ('0x' + 'cd' * 20, TX_HASH)]
+        other = {**self.DATA, 'username': 'otheruser', 'email': 'other@example.com'}
+
+        first = APIClient().post(reverse('register'), self.DATA, format='json', HTTP_IDEMPOTENCY_KEY='1')
+        second = APIClient().post(reverse('register'), other, format='json', HTTP_IDEMPOTENCY_KEY='1')
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('Idempotent-Replayed', second)
+        self.assertEqual(User.objects.filter(username__in=['newuser', 'otheruser']).count(), 2)
+
+
+class PurgeIdempotencyKeysTest(TestCase):
+    def test_purges_expired_and_abandoned_keys(self):
+        """Test that purge_idempotency_keys deletes only keys past the TTL or the lock timeout"""
+        for key, status_, age in [('old', 'completed', 2), ('fresh', 'completed', 0), ('stuck', 'in_progress', 2)]:
+            record = IdempotencyKey.objects.create(scope='user:1', key=key, fingerprint='f', status=status_)
+            then = timezone.now() - timedelta(days=age)
+            IdempotencyKey.objects.filter(pk=record.pk).update(created_at=then, updated_at=then)
+        IdempotencyKey.objects.create(scope='user:1', key='running', fingerprint='f')
+
+        out = StringIO()
+        call_command('purge_idempotency_keys', stdout=out)
+
+        self.assertIn('Deleted 2 expired idempotency keys', out.getvalue())
+        self.assertEqual(
+            sorted(IdempotencyKey.objects.values_list('key', flat=True)),
+            ['fresh', 'running']
+        )
@@ -0,0 +1,165 @@
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import MagicMock, patch
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from eth_abi import encode
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.datastructures import AttributeDict
+from apps.blockchain.indexer import EVENT_TOPICS, ZERO_ADDRESS, NucEventIndexer
+from apps.blockchain.models import IndexerCheckpoint, TokenBalance, TokenEvent
+from apps.blockchain.services import BlockchainService
+
+ALICE = Web3.to_checksum_address('0x000000000000000000000000000000000000a11c')
+BOB = Web3.to_checksum_address('0x0000000000000000000000000000000000000b0b')
+TOPICS = {name: topic for topic, name in EVENT_TOPICS.items()}
+NUC = 10 ** 18
+
+
+def block_hash(number, fork=''):
+    return HexBytes(f'{fork}{number}'.encode().rjust(32, b'\0'))
+
+
+def make_log(contract_address, event, block_number, log_index, *addresses, amount):
+    topics = [HexBytes(TOPICS[event])] + [HexBytes(encode(['address'], [address])) for address in addresses]
+    return AttributeDict({
+        'address': contract_address,
+        'topics': topics,
+        'data': HexBytes(encode(['uint256'], [amount])),
+        'blockNumber': block_number,
+        'blockHash': block_hash(block_number),
+        'transactionHash': HexBytes(f'tx{block_number}-{log_index}'.encode().rjust(32, b'\0')),
+        'transactionIndex': 0,
+        'logIndex': log_index,
+        'removed': False,
+    })
+
+
+class FakeChain:
+    """Just enough of w3.eth for the indexer: a head, logs by block and block hashes"""
+
+    def __init__(self, head, logs):
+        self.block_number = head
+        self.logs = logs
+        self.fork = ''
+        self.max_range = None
+        self.ranges = []
+
+    def get_logs(self, params):
+        if self.max_range and params['toBlock'] - params['fromBlock'] + 1 > self.max_range:
+            raise ValueError('block range too large')
+        self.ranges.append((params['fromBlock'], params['toBlock']))
+        return [log for log in self.logs if params['fromBlock'] <= log['blockNumber'] <= params['toBlock']]
+
+    def get_block(self, number):
+        return {'hash': block_hash(number, self.fork)}
+
+
+class NucEventIndexerTest(TestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+        address = self.service.contract_address
+        self.chain = FakeChain(head=20, logs=[
+            make_log(address, 'Transfer', 3, 0, ZERO_ADDRESS, ALICE, amount=25000 * NUC),
+            make_log(address, 'Transfer', 4, 0, ZERO_ADDRESS, BOB, amount=25000 * NUC),
+            make_log(address, 'TokensLocked', 6, 0, ALICE, amount=5000 * NUC),
+            make_log(address, 'TokensLocked', 9, 1, ALICE, amount=2500 * NUC),
+            make_log(address, 'TokensUnlocked', 12, 0, ALICE, amount=7500 * NUC),
+            make_log(address, 'Transfer', 14, 0, BOB, ZERO_ADDRESS, amount=25000 * NUC),
+            make_log(address, 'AccountDeleted', 14, 1, BOB, amount=25000 * NUC),
+        ])
+        self.indexer = NucEventIndexer(self.service, confirmations=5, start_block=1, initial_range=4)
+        self.indexer.w3 = MagicMock(eth=self.chain)
+
+    def test_indexes_confirmed_blocks_only(self):
+        """Test that events deeper than the confirmation depth are stored"""
+        stored = self.indexer.run_once()
+
+        self.assertEqual(stored, 7)
+        self.assertEqual(IndexerCheckpoint.objects.get().last_block, 15)
+        self.assertEqual(TokenEvent.objects.filter(event='TokensLocked').count(), 2)
+
+    def test_balances_follow_events(self):
+        """Test that mint, lock, unlock and burn events produce the on-chain balances"""
+        self.chain.block_number = 13
+        self.indexer.run_once()
+
+        alice = TokenBalance.objects.get(address=ALICE)
+        self.assertEqual(alice.total, Decimal('25000'))
+        self.assertEqual(alice.locked, Decimal('5000'))
+        self.assertEqual(alice.available, Decimal('20000'))
+
+        self.chain.block_number = 20
+        self.indexer.run_once()
+        alice.refresh_from_db()
+        self.assertEqual(alice.locked, Decimal('0'))
+        self.assertEqual(TokenBalance.objects.get(address=BOB).total, Decimal('0'))
+
+    def test_range_shrinks_when_node_rejects_it(self):
+        """Test that a rejected eth_getLogs range is halved and then grows back"""
+        self.indexer.block_range = 8
+        self.chain.max_range = 2
+
+        self.indexer.run_once()
+
+        self.assertEqual(self.chain.ranges[0], (1, 2))
+        self.assertTrue(all(end - start < 2 for start, end in self.chain.ranges))
+        self.assertEqual(IndexerCheckpoint.objects.get().last_block, 15)
+
+    def test_reorg_rewinds_and_replays(self):
+        """Test that a changed checkpoint hash drops recent events and replays them"""
+        self.indexer.run_once()
+
+        # Block 12's unlock is orphaned; the canonical chain has a different hash at every height
+        self.chain.logs = [log for log in self.chain.logs if log['blockNumber'] != 12]
+        self.chain.fork = 'fork'
+        self.indexer.run_once()
+
+        self.assertFalse(TokenEvent.objects.filter(block_number=12).exists())
+        alice = TokenBalance.objects.get(address=ALICE)
+        self.assertEqual(alice.total, Decimal('25000'))
+        self.assertEqual(alice.locked, Decimal('7500'))
+        self.assertEqual(IndexerCheckpoint.objects.get().last_block, 15)
+
+
+class IndexedReadTest(TestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+        IndexerCheckpoint.objects.create(contract_address=self.service.contract_address, last_block=10)
+        TokenBalance.objects.create(address=ALICE, total=Decimal('25000'), locked=Decimal('1000'))
+
+    @override_settings(BLOCKCHAIN_READ_FROM_INDEX=True)
+    def test_balances_served_from_index(self):
+        """Test that reads come from TokenBalance rows without touching the node"""
+        with patch.object(self.service, '_call_batch') as mock_batch:
+            balances = self.service.get_balances_many([ALICE, BOB])
+
+        mock_batch.assert_not_called()
+        self.assertEqual(balances[ALICE]['available'], Decimal('24000'))
+        self.assertEqual(balances[BOB]['total'], Decimal('0'))
+
+    @override_settings(BLOCKCHAIN_READ_FROM_INDEX=True, BLOCKCHAIN_INDEX_MAX_AGE=-1)
+    def test_lagging_index_falls_back_to_rpc(self):
+        """Test that a stale checkpoint sends reads back to the node"""
+        with patch.object(self.service, '_call_batch', return_value=[0, 0, 0]) as mock_batch:
+            self.service.get_all_balances(ALICE)
+
+        mock_batch.assert_called_once()
+
+
+class IndexNucEventsCommandTest(TestCase):
+    @patch('apps.blockchain.management.commands.index_nuc_events.NucEventIndexer')
+    @patch('apps.blockchain.management.commands.index_nuc_events.get_blockchain_service')
+    def test_once(self, mock_get_service, mock_indexer_class):
+        """Test that --once catches up a single time and reports progress"""
+        mock_indexer = mock_indexer_class.return_value
+        mock_indexer.run_once.return_value = 3
+        mock_indexer.checkpoint.return_value = MagicMock(last_block=42)
+
+        out = StringIO()
+        call_command('index_nuc_events', '--once', '--confirmations', '2', stdout=out)
+
+        mock_indexer.run_once.assert_called_once()
+        self.assertEqual(mock_indexer_class.call_args.kwargs['confirmations'], 2)
+        self.assertIn('Indexed 3 events through block 42', out.getvalue())
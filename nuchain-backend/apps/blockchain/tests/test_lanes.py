@@ -0,0 +1,139 @@
+from concurrent.futures import Future
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+from eth_account import Account
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from apps.blockchain.exceptions import InsufficientGasError
+from apps.blockchain.lanes import LaneRouter, SignerLane
+from apps.blockchain.models import BlockchainTransaction
+from apps.blockchain.services import BlockchainService
+from .test_nonces import nonce_of
+
+SIGNER_KEYS = ['0x' + digit * 64 for digit in '123']
+WALLETS = [Account.create().address for _ in range(200)]
+
+
+class LaneRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.lanes = [SignerLane(key, lambda address: 0, lambda address: 0) for key in SIGNER_KEYS]
+        self.router = LaneRouter(self.lanes)
+
+    def test_wallet_always_maps_to_same_lane(self):
+        """Test that routing is deterministic and ignores address case"""
+        for wallet in WALLETS[:20]:
+            self.assertIs(self.router.lane_for(wallet), self.router.lane_for(wallet.lower()))
+            self.assertIs(self.router.lane_for(wallet), LaneRouter(self.lanes).lane_for(wallet))
+
+    def test_wallets_spread_across_lanes(self):
+        """Test that every lane gets a share of the wallets"""
+        counts = {lane.address: 0 for lane in self.lanes}
+        for wallet in WALLETS:
+            counts[self.router.lane_for(wallet).address] += 1
+
+        self.assertTrue(all(count > len(WALLETS) / 10 for count in counts.values()), counts)
+
+    def test_adding_lane_only_moves_wallets_to_it(self):
+        """Test that a new signer takes wallets without reshuffling the others"""
+        new_lane = SignerLane('0x' + '4' * 64, lambda address: 0, lambda address: 0)
+        grown = LaneRouter(self.lanes + [new_lane])
+
+        moved = [wallet for wallet in WALLETS if grown.lane_for(wallet) is not self.router.lane_for(wallet)]
+
+        self.assertTrue(moved)
+        self.assertTrue(all(grown.lane_for(wallet) is new_lane for wallet in moved))
+        self.assertLess(len(moved), len(WALLETS) / 2)
+
+    def test_requires_a_signer(self):
+        with self.assertRaises(ValueError):
+            LaneRouter([])
+
+
+@override_settings(ADMIN_PRIVATE_KEYS=SIGNER_KEYS)
+class MultiSignerBroadcastTest(TestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+        self.service._healthy_until = float('inf')
+        self.eth = self.service.w3.eth
+        self.balances = {lane.address: 10 ** 18 for lane in self.service.lanes}
+        self._patch(self.eth, 'get_transaction_count', side_effect=self.transaction_count)
+        self._patch(self.eth, 'get_balance', side_effect=lambda address: self.balances[address])
+        self._patch(self.eth, 'call', return_value=b'')
+        self._patch(self.eth, 'fee_history', return_value={'baseFeePerGas': [10 ** 9], 'reward': [[10 ** 6]]})
+        self._patch(self.eth, 'estimate_gas', return_value=50000)
+        self.sent = []
+
+    def _patch(self, target, attribute, **kwargs):
+        patcher = patch.object(target, attribute, **kwargs)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def transaction_count(self, address, block_identifier):
+        # Each signer starts from a different nonce
+        return [lane.address for lane in self.service.lanes].index(address) * 10
+
+    def send_raw_transaction(self, raw):
+        self.sent.append((Account.recover_transaction(raw), nonce_of(raw)))
+        return HexBytes(len(self.sent).to_bytes(32, 'big'))
+
+    def watch(self, tx_hash):
+        future = Future()
+        future.set_result(AttributeDict({'status': 1, 'blockNumber': 10, 'gasUsed': 50000}))
+        return future
+
+    def test_each_wallet_signed_by_its_lane(self):
+        """Test that writes are signed by the wallet's lane with that lane's own nonces"""
+        self.assertEqual(len(self.service.lanes), 3)
+
+        with patch.object(self.eth, 'send_raw_transaction', side_effect=self.send_raw_transaction), \
+                patch.object(self.service.receipts, 'watch', side_effect=self.watch):
+            self.service.lock_tokens_many([(wallet, Decimal('10')) for wallet in WALLETS[:12]])
+
+        for wallet, (signer, _) in zip(WALLETS[:12], self.sent):
+            self.assertEqual(signer, self.service.lanes.lane_for(wallet).address)
+
+        for index, lane in enumerate(self.service.lanes):
+            nonces = [nonce for signer, nonce in self.sent if signer == lane.address]
+            self.assertEqual(nonces, list(range(index * 10, index * 10 + len(nonces))))
+
+        records = BlockchainTransaction.objects.all()
+        self.assertTrue(all(
+            record.signer == self.service.lanes.lane_for(record.wallet_address).address
+            for record in records
+        ))
+
+    def test_low_gas_only_blocks_its_lane(self):
+        """Test that a signer out of ETH stops its own wallets but not the others"""
+        drained = self.service.lanes.lane_for(WALLETS[0])
+        self.balances[drained.address] = 0
+        other = next(wallet for wallet in WALLETS if self.service.lanes.lane_for(wallet) is not drained)
+
+        with patch.object(self.eth, 'send_raw_transaction', side_effect=self.send_raw_transaction), \
+                patch.object(self.service.receipts, 'watch', side_effect=self.watch):
+            with self.assertRaisesRegex(InsufficientGasError, drained.address):
+                self.service.reset_portfolio(WALLETS[0])
+            self.service.reset_portfolio(other)
+
+        self.assertEqual([signer for signer, _ in self.sent], [self.service.lanes.lane_for(other).address])
+
+
+class SignerStatusCommandTest(SimpleTestCase):
+    @patch('apps.blockchain.management.commands.signer_status.get_blockchain_service')
+    def test_reports_signers_needing_attention(self, mock_get_service):
+        """Test that unauthorized or underfunded signers are listed and fail the command"""
+        mock_get_service.return_value.signer_status.return_value = [
+            {'address': '0xA', 'eth_balance': Decimal('0.5'), 'is_operator': True, 'low_balance': False},
+            {'address': '0xB', 'eth_balance': Decimal('0.0001'), 'is_operator': True, 'low_balance': True},
+            {'address': '0xC', 'eth_balance': Decimal('0.5'), 'is_operator': False, 'low_balance': False},
+        ]
+
+        out = StringIO()
+        with self.assertRaisesRegex(CommandError, '2 of 3 signers'):
+            call_command('signer_status', stdout=out)
+
+        self.assertIn('0xB: 0.000100 ETH, needs topping up', out.getvalue())
+        self.assertIn('0xC: 0.500000 ETH, missing OPERATOR_ROLE', out.getvalue())
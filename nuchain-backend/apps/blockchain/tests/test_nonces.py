@@ -0,0 +1,178 @@
+import rlp
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+from django.test import TestCase
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from apps.blockchain.exceptions import TransactionError
+from apps.blockchain.models import AdminNonce, BlockchainTransaction
+from apps.blockchain.nonces import NonceManager, is_nonce_error
+from apps.blockchain.services import BlockchainService
+
+ADMIN = '0x19E7E376E7C213B7E7e7e46cc70A5dD086DAff2A'
+
+
+def nonce_of(raw_transaction):
+    """Read the nonce out of a signed legacy or typed transaction"""
+    raw = bytes(raw_transaction)
+    if raw[0] <= 0x7f:
+        # Typed transaction: type byte, then [chainId, nonce, ...]
+        return int.from_bytes(rlp.decode(raw[1:])[1], 'big')
+    return int.from_bytes(rlp.decode(raw)[0], 'big')
+
+
+def self_transfer_of(raw_transaction, address):
+    """Whether a signed EIP-1559 transaction sends nothing from `address` to itself"""
+    # [chainId, nonce, maxPriorityFeePerGas, maxFeePerGas, gas, to, value, data, ...]
+    fields = rlp.decode(bytes(raw_transaction)[1:])
+    return fields[5] == HexBytes(address) and not fields[6] and not fields[7]
+
+
+class NonceManagerTest(TestCase):
+    def setUp(self):
+        self.fetch = MagicMock(return_value=7)
+        self.nonces = NonceManager(ADMIN, self.fetch)
+
+    def test_first_reservation_seeds_from_node(self):
+        """Test that the counter starts at the node's pending count"""
+        self.assertEqual(self.nonces.reserve(), 7)
+        self.assertEqual(AdminNonce.objects.get(address=ADMIN).next_nonce, 8)
+
+    def test_reservations_are_sequential_without_rpc(self):
+        """Test that later reservations don't ask the node again"""
+        reserved = [self.nonces.reserve() for _ in range(5)]
+
+        self.assertEqual(reserved, [7, 8, 9, 10, 11])
+        self.fetch.assert_called_once()
+
+    def test_release_last_reservation(self):
+        """Test that an unsent nonce can be handed out again"""
+        nonce = self.nonces.reserve()
+
+        self.assertTrue(self.nonces.release(nonce))
+        self.assertEqual(self.nonces.reserve(), nonce)
+
+    def test_release_older_reservation_is_ignored(self):
+        """Test that releasing a nonce with later reservations leaves the counter alone"""
+        first = self.nonces.reserve()
+        self.nonces.reserve()
+
+        self.assertFalse(self.nonces.release(first))
+        self.assertEqual(AdminNonce.objects.get(address=ADMIN).next_nonce, 9)
+
+    def test_resync(self):
+        """Test that resync realigns the counter with the node"""
+        self.nonces.reserve()
+        self.fetch.return_value = 20
+
+        self.assertEqual(self.nonces.resync(), 20)
+        self.assertEqual(self.nonces.reserve(), 20)
+
+    def test_is_nonce_error(self):
+        """Test detection of node errors caused by a reused nonce"""
+        self.assertTrue(is_nonce_error(ValueError({'code': -32000, 'message': 'nonce too low'})))
+        self.assertTrue(is_nonce_error(ValueError('already known')))
+        self.assertFalse(is_nonce_error(ValueError('insufficient funds for gas')))
+
+
+class PipelinedBroadcastTest(TestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+        self.service._healthy_until = float('inf')
+        self.eth = self.service.w3.eth
+        self.mock_count = self._patch(self.eth, 'get_transaction_count', return_value=3)
+        self._patch(self.eth, 'get_balance', return_value=10 ** 18)
+        self._patch(self.eth, 'call', return_value=b'')
+        self._patch(self.eth, 'fee_history', return_value={'baseFeePerGas': [10 ** 9], 'reward': [[10 ** 6]]})
+        self._patch(self.eth, 'estimate_gas', return_value=50000)
+
+    def _patch(self, target, attribute, **kwargs):
+        patcher = patch.object(target, attribute, **kwargs)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_transactions_broadcast_back_to_back(self):
+        """Test that several transactions go out with consecutive nonces before any receipt"""
+        sent_nonces = []
+
+        def send_raw_transaction(raw):
+            sent_nonces.append(nonce_of(raw))
+            return HexBytes(bytes([len(sent_nonces)]) * 32)
+
+        def watch(tx_hash):
+            # Every transaction is broadcast before the first receipt is awaited
+            self.assertEqual(len(sent_nonces), 3)
+            future = Future()
+            future.set_result(AttributeDict({'status': 1, 'blockNumber': 10, 'gasUsed': 50000}))
+            return future
+
+        with patch.object(self.eth, 'send_raw_transaction', side_effect=send_raw_transaction), \
+                patch.object(self.service.receipts, 'watch', side_effect=watch) as mock_watch:
+            results = self.service.mint_signup_many(3)
+
+        self.assertEqual(sent_nonces, [3, 4, 5])
+        self.assertEqual(len(results), 3)
+        self.assertEqual(mock_watch.call_count, 3)
+        
+        records = BlockchainTransaction.objects.order_by('nonce')
+        self.assertEqual([record.nonce for record in records], [3, 4, 5])
+        self.assertTrue(all(record.status == 'confirmed' for record in records))
+        self.assertTrue(all(record.latency_ms is not None for record in records))
+        self.assertEqual(records[0].wallet_address, results[0][0])
+        self.mock_count.assert_called_once()
+
+    def test_nonce_too_low_resyncs_and_retries(self):
+        """Test that a rejected nonce triggers a resync and a second attempt"""
+        sent_nonces = []
+
+        def send_raw_transaction(raw):
+            sent_nonces.append(nonce_of(raw))
+            if len(sent_nonces) == 1:
+                raise ValueError({'code': -32000, 'message': 'nonce too low'})
+            return HexBytes(b'\x01' * 32)
+
+        self.service.lanes.primary.nonces.reserve()
+        self.mock_count.return_value = 9
+        with patch.object(self.eth, 'send_raw_transaction', side_effect=send_raw_transaction):
+            self.service._broadcast_transaction(self.service.contract.functions.mintSignup, ADMIN)
+
+        self.assertEqual(sent_nonces, [4, 9])
+        self.assertEqual(AdminNonce.objects.get(address=self.service.admin.address).next_nonce, 10)
+
+    def test_failure_behind_later_nonce_fills_gap(self):
+        """Test that a send failing after a later nonce was reserved is replaced by a self-transfer"""
+        sent = []
+        lane = self.service.lanes.primary
+
+        def send_raw_transaction(raw):
+            sent.append(raw)
+            if len(sent) == 1:
+                # Another request reserves the next nonce while this one is on the wire
+                lane.nonces.reserve()
+                raise ValueError('connection reset by peer')
+            return HexBytes(b'\x02' * 32)
+
+        with patch.object(self.eth, 'send_raw_transaction', side_effect=send_raw_transaction), \
+                patch.object(self.service.receipts, 'track') as mock_track:
+            with self.assertRaises(TransactionError):
+                self.service._broadcast_transaction(self.service.contract.functions.mintSignup, ADMIN)
+
+        self.assertEqual([nonce_of(raw) for raw in sent], [3, 3])
+        self.assertTrue(self_transfer_of(sent[1], lane.address))
+        mock_track.assert_called_once()
+        # The later reservation keeps its nonce
+        self.assertEqual(AdminNonce.objects.get(address=lane.address).next_nonce, 5)
+
+    def test_unsendable_gap_resyncs(self):
+        """Test that a gap the filler can't close either is handed out again after a resync"""
+        lane = self.service.lanes.primary
+
+        def send_raw_transaction(raw):
+            lane.nonces.reserve()
+            raise ValueError('connection reset by peer')
+
+        with patch.object(self.eth, 'send_raw_transaction', side_effect=send_raw_transaction):
+            with self.assertRaises(TransactionError):
+                self.service._broadcast_transaction(self.service.contract.functions.mintSignup, ADMIN)
+
+        self.assertEqual(AdminNonce.objects.get(address=lane.address).next_nonce, 3)
@@ -0,0 +1,270 @@
+from concurrent.futures import Future
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import MagicMock, patch
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from apps.blockchain.exceptions import ConnectionError, InsufficientBalanceError, TransactionError
+from apps.blockchain.models import OutboxEntry
+from apps.blockchain.outbox import OutboxProcessor, enqueue
+from apps.investments.models import Investment
+from apps.reactors.models import Reactor
+
+WALLET = '0x1234567890abcdef1234567890abcdef12345678'
+TX_HASH = HexBytes('0x' + 'ab' * 32)
+
+
+class OutboxProcessorTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='investor', password='testpass123')
+        self.user.profile.wallet_address = WALLET
+        self.user.profile.balance = Decimal('15000')
+        self.user.profile.save()
+        self.reactor = Reactor.objects.create(
+            name='Test Reactor',
+            slug='nuwave',
+            type='SMR',
+            description='Test reactor',
+            location='Test Location',
+            annual_roi_rate=Decimal('0.0450'),
+            carbon_offset_tonnes_co2_per_nuc_per_year=Decimal('0.8500'),
+            total_funding_needed=Decimal('180000'),
+            current_funding=Decimal('10000')
+        )
+        self.investment = Investment.objects.create(
+            user=self.user,
+            reactor=self.reactor,
+            amount_invested=Decimal('10000')
+        )
+        self.service = MagicMock()
+        self.processor = OutboxProcessor(self.service, max_attempts=2)
+
+    def enqueue_lock(self):
+        return enqueue('lock', WALLET, user=self.user, amount=Decimal('10000'), investment_id=self.investment.id)
+
+    def test_confirmed_lock(self):
+        """Test that a confirmed lock records its tx hash and keeps the investment"""
+        entry = self.enqueue_lock()
+        self.service.lock_tokens.return_value = '0xlock'
+
+        self.assertEqual(self.processor.run_once(), 1)
+
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.tx_hash, entry.attempts), ('confirmed', '0xlock', 1))
+        self.service.lock_tokens.assert_called_once_with(WALLET, Decimal('10000'), record=entry.transaction)
+        self.assertTrue(Investment.objects.filter(id=self.investment.id).exists())
+
+    def test_failed_lock_cancels_investment(self):
+        """Test that a rejected lock refunds the user and the reactor"""
+        entry = self.enqueue_lock()
+        self.service.lock_tokens.side_effect = InsufficientBalanceError('Insufficient unlocked balance')
+
+        self.processor.run_once()
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, 'failed')
+        self.assertFalse(Investment.objects.filter(id=self.investment.id).exists())
+        self.user.profile.refresh_from_db()
+        self.reactor.refresh_from_db()
+        self.assertEqual(self.user.profile.balance, Decimal('25000'))
+        self.assertEqual(self.reactor.current_funding, Decimal('0'))
+
+    def test_failed_signup_mint_zeroes_balance(self):
+        """Test that a signup whose tokens were never minted is left with nothing to spend"""
+        entry = enqueue('mint_signup', WALLET, user=self.user)
+        self.service.mint_signup_to.side_effect = TransactionError('Transaction reverted')
+
+        self.processor.run_once()
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, 'failed')
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.balance, Decimal('0'))
+
+    def broadcast_then_fail(self, entry):
+        """Have lock_tokens send the transaction, then give up waiting for it"""
+        def lock_tokens(wallet_address, amount, record):
+            record.mark_submitted(TX_HASH.to_0x_hex(), 4, 60000, 10 ** 9)
+            record.mark_failed(TransactionError('Transaction failed: not mined after 120 seconds'))
+            raise TransactionError('Transaction failed: not mined after 120 seconds')
+
+        self.service.lock_tokens.side_effect = lock_tokens
+        self.service.receipts.watch.return_value = self.receipt = Future()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.processor.run_once()
+        entry.refresh_from_db()
+
+    def mined(self, status):
+        return AttributeDict({'status': status, 'transactionHash': TX_HASH, 'blockNumber': 7, 'gasUsed': 50000})
+
+    def test_broadcast_lock_waits_for_receipt(self):
+        """Test that a lock sent but not mined in time is confirmed by its receipt, not cancelled"""
+        entry = self.enqueue_lock()
+        self.broadcast_then_fail(entry)
+
+        self.assertEqual((entry.status, entry.tx_hash), ('submitted', TX_HASH.to_0x_hex()))
+        self.assertTrue(Investment.objects.filter(id=self.investment.id).exists())
+        self.assertEqual(self.processor.claim(10), [])
+
+        self.receipt.set_result(self.mined(1))
+
+        entry.refresh_from_db()
+        entry.transaction.refresh_from_db()
+        self.assertEqual(entry.status, 'confirmed')
+        self.assertEqual((entry.transaction.status, entry.transaction.block_number), ('confirmed', 7))
+        self.assertTrue(Investment.objects.filter(id=self.investment.id).exists())
+        self.service.receipts.forget.assert_called_with(TX_HASH.to_0x_hex())
+
+    def test_broadcast_lock_reverted_cancels_investment(self):
+        """Test that a lock sent but reverted once mined refunds the user and the reactor"""
+        entry = self.enqueue_lock()
+        self.broadcast_then_fail(entry)
+
+        self.receipt.set_result(self.mined(0))
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, 'failed')
+        self.assertFalse(Investment.objects.filter(id=self.investment.id).exists())
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.balance, Decimal('25000'))
+
+    def test_resume_watches_submitted_entries(self):
+        """Test that entries left submitted by an earlier worker are watched again"""
+        entry = self.enqueue_lock()
+        self.broadcast_then_fail(entry)
+        self.service.receipts.watch.reset_mock()
+
+        self.assertEqual(OutboxProcessor(self.service).resume(), 1)
+        self.service.receipts.watch.assert_called_once_with(TX_HASH.to_0x_hex())
+
+    def test_connection_errors_retried_then_failed(self):
+        """Test that an unreachable node is retried up to max_attempts"""
+        entry = self.enqueue_lock()
+        self.service.lock_tokens.side_effect = ConnectionError('RPC call failed')
+
+        self.processor.run_once()
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.attempts), ('pending', 1))
+
+        self.processor.run_once()
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.attempts), ('failed', 2))
+
+    def test_reset_finalized_after_confirmation(self):
+        """Test that the database reset runs once the unlock is on chain"""
+        enqueue('reset_portfolio', WALLET, user=self.user)
+        self.service.reset_portfolio.return_value = '0xreset'
+
+        self.processor.run_once()
+
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.balance, Decimal('25000'))
+        self.assertEqual(self.user.investments.count(), 0)
+
+    def test_claimed_entries_are_not_claimed_twice(self):
+        """Test that an entry another worker is processing is skipped until its lease expires"""
+        self.enqueue_lock()
+        self.assertEqual(len(self.processor.claim(10)), 1)
+        self.assertEqual(self.processor.claim(10), [])
+
+        OutboxEntry.objects.update(updated_at='2000-01-01T00:00:00Z')
+        self.assertEqual(len(self.processor.claim(10)), 1)
+
+    def test_reclaimed_broadcast_entry_is_not_resent(self):
+        """Test that an entry whose worker stopped after broadcasting waits for its receipt instead"""
+        entry = self.enqueue_lock()
+        self.processor.claim(10)
+        entry.transaction.mark_submitted(TX_HASH.to_0x_hex(), 4, 60000, 10 ** 9)
+        OutboxEntry.objects.update(updated_at='2000-01-01T00:00:00Z')
+        self.service.receipts.watch.return_value = Future()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.processor.run_once(), 1)
+
+        self.service.lock_tokens.assert_not_called()
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.tx_hash), ('submitted', TX_HASH.to_0x_hex()))
+        self.service.receipts.watch.assert_called_once()
+
+    @patch('apps.blockchain.management.commands.process_outbox.get_blockchain_service')
+    def test_command_once(self, mock_get_service):
+        """Test that process_outbox --once drains one batch"""
+        self.enqueue_lock()
+        mock_get_service.return_value.lock_tokens.return_value = '0xlock'
+
+        out = StringIO()
+        call_command('process_outbox', '--once', '--concurrency', '1', stdout=out)
+
+        self.assertIn('Processed 1 outbox entries', out.getvalue())
+        self.assertEqual(OutboxEntry.objects.get().status, 'confirmed')
+
+
+@override_settings(BLOCKCHAIN_OUTBOX_ENABLED=True)
+class QueuedViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='investor', password='testpass123')
+        self.user.profile.wallet_address = WALLET
+        self.user.profile.save()
+        self.client.force_authenticate(user=self.user)
+        self.reactor = Reactor.objects.create(
+            name='Test Reactor',
+            slug='nuwave',
+            type='SMR',
+            description='Test reactor',
+            location='Test Location',
+            annual_roi_rate=Decimal('0.0450'),
+            carbon_offset_tonnes_co2_per_nuc_per_year=Decimal('0.8500'),
+            total_funding_needed=Decimal('180000'),
+            current_funding=Decimal('0')
+        )
+
+    @patch('apps.investments.views.get_blockchain_service')
+    def test_investment_accepted_without_chain_call(self, mock_get_service):
+        """Test that investing commits the intent and returns 202 with a tracking id"""
+        response = self.client.post(
+            reverse('investment-list'),
+            {'reactor_id': self.reactor.id, 'amount_invested': '10000'},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        mock_get_service.assert_not_called()
+        entry = OutboxEntry.objects.get(transaction_id=response.data['transaction_id'])
+        self.assertEqual((entry.kind, entry.amount), ('lock', Decimal('10000')))
+        self.assertEqual(entry.payload['investment_id'], response.data['investment']['id'])
+
+    @patch('apps.users.views.get_blockchain_service')
+    def test_registration_accepted_without_mint(self, mock_get_service):
+        """Test that signup saves a local wallet and queues the mint"""
+        mock_get_service.return_value.new_wallet_address.return_value = '0xabcdef1234567890abcdef1234567890abcdef12'
+        self.client.force_authenticate(user=None)
+
+        response = self.client.post(reverse('register'), {
+            'username': 'newuser',
+            'email': 'newuser@example.com',
+            'password': 'strongpass123',
+            'password_confirm': 'strongpass123'
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIn('access', response.data)
+        mock_get_service.return_value.mint_signup.assert_not_called()
+        entry = OutboxEntry.objects.get(transaction_id=response.data['wallet']['transaction_id'])
+        self.assertEqual(entry.kind, 'mint_signup')
+        self.assertEqual(entry.user.username, 'newuser')
+
+    def test_delete_account_queues_burn(self):
+        """Test that account deletion removes the user immediately and burns later"""
+        response = self.client.delete(reverse('delete-account'))
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        entry = OutboxEntry.objects.get()
+        self.assertEqual((entry.kind, entry.wallet_address, entry.user), ('burn_account', WALLET, None))
+        self.assertFalse(User.objects.filter(username='investor').exists())
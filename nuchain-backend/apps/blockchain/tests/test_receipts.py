@@ -0,0 +1,193 @@
+from unittest.mock import MagicMock, patch
+from django.test import SimpleTestCase, TestCase
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from apps.blockchain import services
+from apps.blockchain.exceptions import TransactionError
+from apps.blockchain.models import BlockchainTransaction
+from apps.blockchain.receipts import InFlightTransaction, ReceiptWatcher
+from apps.blockchain.services import BlockchainService
+
+TX_A = HexBytes('0x' + 'aa' * 32)
+TX_B = HexBytes('0x' + 'bb' * 32)
+TX_C = HexBytes('0x' + 'cc' * 32)
+
+
+def raw_receipt(tx_hash, status=1):
+    return {
+        'transactionHash': tx_hash.to_0x_hex(),
+        'blockNumber': '0x10',
+        'status': hex(status),
+        'gasUsed': '0x5208',
+        'logs': [],
+    }
+
+
+class ReceiptWatcherTest(SimpleTestCase):
+    def setUp(self):
+        self.service = MagicMock()
+        self.service.w3.eth.block_number = 16
+        self.mined = {}
+        self.batches = []
+        self.service.w3.provider.make_batch_request.side_effect = self.fake_batch
+        self.watcher = ReceiptWatcher(self.service, poll_interval=0.01)
+
+    def fake_batch(self, requests):
+        self.batches.append(requests)
+        return [
+            {'jsonrpc': '2.0', 'id': index, 'result': self.mined.get(params[0])}
+            for index, (_, params) in enumerate(requests)
+        ]
+
+    def test_one_batch_per_block(self):
+        """Test that all pending hashes share one batch, and an unchanged head skips the poll"""
+        with patch.object(self.watcher, '_thread', 'running'):
+            first = self.watcher.watch(TX_A)
+            second = self.watcher.watch(TX_B)
+        self.mined[TX_A.to_0x_hex()] = raw_receipt(TX_A)
+
+        self.watcher.poll()
+        self.watcher.poll()
+
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(len(self.batches[0]), 2)
+        self.assertEqual(first.result(timeout=0).status, 1)
+        self.assertFalse(second.done())
+        self.assertEqual(self.watcher.pending_count(), 1)
+
+    def test_same_hash_shares_a_future(self):
+        """Test that watching a hash twice doesn't poll for it twice"""
+        with patch.object(self.watcher, '_thread', 'running'):
+            self.assertIs(self.watcher.watch(TX_A), self.watcher.watch(TX_A))
+
+    def test_background_thread_resolves_and_exits(self):
+        """Test that the polling thread wakes callers and stops once nothing is pending"""
+        self.mined[TX_A.to_0x_hex()] = raw_receipt(TX_A, status=0)
+
+        future = self.watcher.watch(TX_A)
+        thread = self.watcher._thread
+        receipt = future.result(timeout=5)
+        thread.join(timeout=5)
+
+        self.assertEqual(receipt.status, 0)
+        self.assertEqual(receipt.gasUsed, 21000)
+        self.assertIsNone(self.watcher._thread)
+
+    def test_tracked_transaction_polled_without_watch(self):
+        """Test that tracking a transaction starts the polling thread, so nobody has to watch it"""
+        self.watcher.track(TX_A, {'nonce': 4}, lane=MagicMock())
+        future = self.watcher._pending[TX_A.to_0x_hex()]
+        thread = self.watcher._thread
+        self.mined[TX_A.to_0x_hex()] = raw_receipt(TX_A)
+
+        self.assertEqual(future.result(timeout=5).status, 1)
+        thread.join(timeout=5)
+        self.assertEqual(self.watcher.pending_count(), 0)
+
+    def test_stuck_transaction_replaced_and_either_hash_resolves(self):
+        """Test that a transaction unmined for N blocks is re-sent and the replacement's receipt wakes the caller"""
+        self.watcher.stuck_after_blocks = 2
+        self.service.replace_transaction.return_value = TX_B.to_0x_hex()
+        with patch.object(self.watcher, '_thread', 'running'):
+            self.watcher.track(TX_A, {'nonce': 4}, lane=None)
+            future = self.watcher.watch(TX_A)
+
+        for block in (16, 17):
+            self.service.w3.eth.block_number = block
+            self.watcher.poll()
+        self.service.replace_transaction.assert_not_called()
+
+        self.service.w3.eth.block_number = 18
+        self.watcher.poll()
+        self.service.replace_transaction.assert_called_once()
+
+        self.mined[TX_B.to_0x_hex()] = raw_receipt(TX_B)
+        self.service.w3.eth.block_number = 19
+        self.watcher.poll()
+
+        self.assertEqual(self.batches[-1], [
+            ('eth_getTransactionReceipt', [TX_A.to_0x_hex()]),
+            ('eth_getTransactionReceipt', [TX_B.to_0x_hex()]),
+        ])
+        self.assertEqual(future.result(timeout=0).transactionHash, TX_B)
+        self.assertEqual(self.watcher.pending_count(), 0)
+        self.assertEqual(self.watcher._inflight, {})
+
+
+class TransactionReplacementTest(TestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+        self.lane = self.service.lanes.primary
+        self.lane.balance._balance = 10 ** 18
+        self.lane.balance._fresh_until = float('inf')
+        self.record = BlockchainTransaction.objects.create(kind='lock', tx_hash=TX_A.to_0x_hex())
+        self.transaction = {
+            'to': self.service.contract_address,
+            'data': '0x',
+            'value': 0,
+            'nonce': 7,
+            'gas': 60000,
+            'maxFeePerGas': 2 * 10 ** 9,
+            'maxPriorityFeePerGas': 10 ** 6,
+            'chainId': 84532,
+        }
+        self.inflight = InFlightTransaction(self.transaction, self.lane, self.record)
+        patcher = patch.object(self.service.fees, 'fees', return_value={
+            'maxFeePerGas': 10 ** 9,
+            'maxPriorityFeePerGas': 10 ** 6,
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_replacement_bumps_fees_at_same_nonce(self):
+        """Test that a stuck transaction is re-signed with higher fees and recorded"""
+        with patch.object(self.service.w3.eth, 'send_raw_transaction', return_value=TX_B) as mock_send:
+            tx_hash = self.service.replace_transaction(self.inflight)
+
+        self.assertEqual(tx_hash, TX_B.to_0x_hex())
+        mock_send.assert_called_once()
+        self.assertEqual(self.inflight.transaction['nonce'], 7)
+        self.assertEqual(self.inflight.transaction['maxFeePerGas'], 23 * 10 ** 8)
+        self.assertEqual(self.inflight.transaction['maxPriorityFeePerGas'], 115 * 10 ** 4)
+        self.assertEqual(self.lane.balance.current(), 10 ** 18 - 60000 * 3 * 10 ** 8)
+
+        self.record.refresh_from_db()
+        self.assertEqual(self.record.tx_hash, TX_B.to_0x_hex())
+        self.assertEqual(self.record.replaced_tx_hashes, [TX_A.to_0x_hex()])
+        self.assertEqual(self.record.gas_price, 23 * 10 ** 8)
+
+    @patch.object(services.settings, 'BLOCKCHAIN_MAX_FEE_PER_GAS_GWEI', 2)
+    def test_no_replacement_past_fee_cap(self):
+        with patch.object(self.service.w3.eth, 'send_raw_transaction') as mock_send:
+            self.assertIsNone(self.service.replace_transaction(self.inflight))
+        mock_send.assert_not_called()
+
+    def test_original_mined_after_replacement(self):
+        """Test that the record ends up with whichever hash was actually mined"""
+        self.record.mark_replaced(TX_B.to_0x_hex(), 23 * 10 ** 8)
+        self.record.mark_confirmed(AttributeDict({'transactionHash': TX_A, 'blockNumber': 9, 'gasUsed': 45000}))
+
+        self.assertEqual(self.record.tx_hash, TX_A.to_0x_hex())
+        self.assertEqual(self.record.replaced_tx_hashes, [TX_B.to_0x_hex()])
+
+
+class ServiceReceiptTest(SimpleTestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+
+    @patch.object(services, 'RECEIPT_TIMEOUT', 0.01)
+    def test_timeout_stops_watching(self):
+        """Test that a transaction that isn't mined in time raises and is no longer polled"""
+        with patch.object(self.service.receipts, 'poll'):
+            with self.assertRaisesRegex(TransactionError, 'not mined'):
+                self.service._await_receipt(TX_A)
+
+        self.assertEqual(self.service.receipts.pending_count(), 0)
+
+    def test_reverted_receipt(self):
+        """Test that a mined but reverted transaction raises"""
+        with patch.object(self.service.w3.provider, 'make_batch_request',
+                          return_value=[{'jsonrpc': '2.0', 'id': 0, 'result': raw_receipt(TX_A, status=0)}]), \
+                patch('web3.eth.Eth.block_number', 1):
+            with self.assertRaisesRegex(TransactionError, 'reverted'):
+                self.service._await_receipt(TX_A)
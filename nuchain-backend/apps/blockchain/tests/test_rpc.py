@@ -0,0 +1,133 @@
+import time
+from unittest.mock import patch
+import requests
+from django.test import SimpleTestCase, override_settings
+from apps.blockchain.rpc import RoutingProvider
+from apps.blockchain.services import BlockchainService
+
+
+class FakeProvider:
+    """Endpoint that answers after `delay` seconds, or raises `error`"""
+
+    def __init__(self, name, delay=0, error=None, response=None):
+        self.endpoint_uri = f'http://{name}'
+        self.delay = delay
+        self.error = error
+        self.response = response or {'jsonrpc': '2.0', 'id': 1, 'result': name}
+        self.calls = []
+        self.exception_retry_configuration = 'default'
+
+    def make_request(self, method, params):
+        self.calls.append(method)
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.response
+
+    def make_batch_request(self, batch_requests):
+        return [self.make_request(method, params) for method, params in batch_requests]
+
+    def close(self):
+        pass
+
+
+class RoutingProviderTest(SimpleTestCase):
+    def _provider(self, *providers, **kwargs):
+        kwargs.setdefault('hedge_after', 0.05)
+        provider = RoutingProvider(list(providers), **kwargs)
+        self.addCleanup(provider.close)
+        return provider
+
+    def test_reads_go_to_lowest_latency(self):
+        """Test that once both endpoints are measured, reads stick to the faster one"""
+        slow, fast = FakeProvider('slow', delay=0.02), FakeProvider('fast')
+        provider = self._provider(slow, fast, hedge_after=1)
+        for endpoint in provider.endpoints:
+            endpoint.record(endpoint.provider.delay, ok=True)
+
+        for _ in range(5):
+            self.assertEqual(provider.make_request('eth_blockNumber', [])['result'], 'fast')
+        self.assertEqual(slow.calls, [])
+        self.assertIsNone(slow.exception_retry_configuration)
+
+    def test_slow_read_is_hedged(self):
+        """Test that a read stuck on a degraded endpoint is answered by the next one"""
+        degraded, healthy = FakeProvider('degraded', delay=1), FakeProvider('healthy')
+        provider = self._provider(degraded, healthy)
+        provider.endpoints[1].record(0.01, ok=True)
+        provider.endpoints[0].record(0.001, ok=True)
+
+        start = time.monotonic()
+        response = provider.make_request('eth_call', [])
+
+        self.assertEqual(response['result'], 'healthy')
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(degraded.calls, ['eth_call'])
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        """Test that a failing endpoint is skipped until its cooldown ends"""
+        down, up = FakeProvider('down', error=requests.ConnectionError('refused')), FakeProvider('up')
+        provider = self._provider(down, up, failure_threshold=2, cooldown=60)
+
+        for _ in range(4):
+            self.assertEqual(provider.make_request('eth_blockNumber', [])['result'], 'up')
+
+        self.assertEqual(len(down.calls), 2)
+        self.assertTrue(provider.status()[0]['circuit_open'])
+
+    def test_all_circuits_open_fails_fast(self):
+        down = FakeProvider('down', error=requests.ConnectionError('refused'))
+        provider = self._provider(down, failure_threshold=1, cooldown=60)
+
+        with self.assertRaises(requests.ConnectionError):
+            provider.make_request('eth_blockNumber', [])
+        with self.assertRaisesRegex(requests.ConnectionError, 'circuit breaker'):
+            provider.make_request('eth_blockNumber', [])
+        self.assertEqual(len(down.calls), 1)
+        self.assertFalse(provider.is_connected())
+
+    def test_error_response_is_not_a_failure(self):
+        """Test that a revert answered by the node does not count against the endpoint"""
+        reverting = FakeProvider('node', response={'jsonrpc': '2.0', 'id': 1, 'error': {'message': 'reverted'}})
+        provider = self._provider(reverting, failure_threshold=1)
+
+        for _ in range(3):
+            self.assertIn('error', provider.make_request('eth_call', []))
+        self.assertEqual(provider.status()[0]['failures'], 0)
+
+    def test_raw_transactions_broadcast_to_every_endpoint(self):
+        """Test that a transaction is sent everywhere and the first acceptance wins"""
+        rejecting = FakeProvider('a', response={'jsonrpc': '2.0', 'id': 1, 'error': {'message': 'already known'}})
+        accepting = FakeProvider('b', delay=0.01)
+        down = FakeProvider('c', error=requests.Timeout('timed out'))
+        provider = self._provider(rejecting, accepting, down)
+
+        response = provider.make_request('eth_sendRawTransaction', ['0x00'])
+
+        self.assertEqual(response['result'], 'b')
+        for fake in (rejecting, accepting, down):
+            self.assertEqual(fake.calls, ['eth_sendRawTransaction'])
+
+    def test_broadcast_rejected_everywhere_returns_node_error(self):
+        rejecting = FakeProvider('a', response={'jsonrpc': '2.0', 'id': 1, 'error': {'message': 'nonce too low'}})
+        down = FakeProvider('b', error=requests.Timeout('timed out'))
+        provider = self._provider(rejecting, down)
+
+        response = provider.make_request('eth_sendRawTransaction', ['0x00'])
+
+        self.assertEqual(response['error']['message'], 'nonce too low')
+
+
+class ServiceEndpointsTest(SimpleTestCase):
+    @override_settings(BASE_SEPOLIA_RPC_URLS=['https://a.example', 'https://b.example'])
+    def test_service_routes_over_configured_urls(self):
+        """Test that every configured URL becomes an endpoint sharing the service's session"""
+        service = BlockchainService(pool_size=2)
+        self.addCleanup(service.w3.provider.close)
+
+        self.assertEqual(
+            [str(endpoint.provider.endpoint_uri) for endpoint in service.w3.provider.endpoints],
+            ['https://a.example', 'https://b.example']
+        )
+        with patch.object(service.w3.provider, 'make_request', return_value={'jsonrpc': '2.0', 'id': 1, 'result': '0x10'}):
+            self.assertEqual(service.w3.eth.block_number, 16)
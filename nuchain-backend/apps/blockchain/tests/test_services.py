@@ -0,0 +1,252 @@
+import threading
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from eth_account import Account
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+from apps.blockchain import services
+from apps.blockchain.exceptions import ConnectionError, InsufficientBalanceError, TransactionError
+from apps.blockchain.services import BlockchainService, get_blockchain_service
+
+WALLET = '0x1234567890AbcdEF1234567890aBcdef12345678'
+
+
+class BlockchainServicePoolTest(SimpleTestCase):
+    def setUp(self):
+        services._service = None
+
+    def tearDown(self):
+        services._service = None
+
+    def test_construction_makes_no_rpc_calls(self):
+        """Test that building the service does not probe the RPC node"""
+        with patch('web3.Web3.is_connected') as mock_is_connected:
+            BlockchainService()
+        mock_is_connected.assert_not_called()
+
+    def test_singleton_shared_across_threads(self):
+        """Test that every thread in a worker gets the same service"""
+        results = []
+
+        def worker():
+            results.append(get_blockchain_service())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(map(id, results))), 1)
+
+    def test_provider_shares_one_session_across_threads(self):
+        """Test that all threads reuse the pooled keep-alive session"""
+        service = BlockchainService(pool_size=4)
+        [endpoint] = service.w3.provider.endpoints
+        manager = endpoint.provider._request_session_manager
+        url = service.rpc_urls[0]
+        sessions = []
+
+        thread = threading.Thread(
+            target=lambda: sessions.append(manager.cache_and_return_session(url))
+        )
+        thread.start()
+        thread.join()
+        sessions.append(manager.cache_and_return_session(url))
+
+        self.assertIs(sessions[0], service.session)
+        self.assertIs(sessions[1], service.session)
+        self.assertEqual(service.session.get_adapter(url)._pool_maxsize, 4)
+
+    def test_health_check_is_cached(self):
+        """Test that the connection is probed at most once per interval"""
+        service = BlockchainService()
+        with patch.object(service.w3, 'is_connected', return_value=True) as mock_is_connected:
+            service.ensure_connected()
+            service.ensure_connected()
+        mock_is_connected.assert_called_once()
+
+    def test_health_check_failure(self):
+        """Test that an unreachable node raises a ConnectionError"""
+        service = BlockchainService()
+        with patch.object(service.w3, 'is_connected', return_value=False):
+            with self.assertRaises(ConnectionError):
+                service.ensure_connected()
+
+    def test_reinitialize_after_fork(self):
+        """Test that a forked child gets a fresh connection pool"""
+        service = get_blockchain_service()
+        old_session = service.session
+
+        services._reinitialize_after_fork()
+
+        self.assertIs(get_blockchain_service(), service)
+        self.assertIsNot(service.session, old_session)
+
+
+class BatchedBalanceReadTest(SimpleTestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+        self.service._healthy_until = float('inf')
+        self.batches = []
+
+    def fake_batch(self, requests):
+        self.batches.append(requests)
+        return [
+            {'jsonrpc': '2.0', 'id': index, 'result': '0x' + format(10 ** 18 * (index + 1), '064x')}
+            for index, _ in enumerate(requests)
+        ]
+
+    def test_all_balances_in_one_round_trip(self):
+        """Test that the three balance reads for a wallet share one batch"""
+        with patch.object(self.service.w3.provider, 'make_batch_request', side_effect=self.fake_batch):
+            balances = self.service.get_all_balances('0x1234567890abcdef1234567890abcdef12345678')
+
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual([method for method, _ in self.batches[0]], ['eth_call'] * 3)
+        self.assertEqual(balances, {
+            'total': Decimal('1'),
+            'locked': Decimal('2'),
+            'available': Decimal('3')
+        })
+
+    def test_many_wallets_chunked_by_batch_size(self):
+        """Test that large wallet lists are split into batches of whole wallets"""
+        addresses = [f'0x{index:040x}' for index in range(1, 6)]
+
+        with self.settings(BLOCKCHAIN_RPC_BATCH_SIZE=6), \
+                patch.object(self.service.w3.provider, 'make_batch_request', side_effect=self.fake_batch):
+            balances = self.service.get_balances_many(addresses)
+
+        self.assertEqual([len(batch) for batch in self.batches], [6, 6, 3])
+        self.assertEqual(len(balances), 5)
+        self.assertEqual(balances[Web3.to_checksum_address(addresses[2])]['total'], Decimal('1'))
+
+    def test_batch_failure_raises_connection_error(self):
+        """Test that a failed batch surfaces as a BlockchainError"""
+        with patch.object(self.service.w3.provider, 'make_batch_request', side_effect=OSError('timeout')):
+            with self.assertRaises(ConnectionError):
+                self.service.get_all_balances('0x1234567890abcdef1234567890abcdef12345678')
+
+
+class PreflightSimulationTest(TestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+        self.service._healthy_until = float('inf')
+        self.eth = self.service.w3.eth
+        patcher = patch.object(self.eth, 'get_balance', return_value=10 ** 18)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_revert_raises_before_nonce_or_broadcast(self):
+        """Test that a lock the contract would reject fails without reserving a nonce"""
+        revert = ContractLogicError('execution reverted: Insufficient unlocked balance')
+
+        with patch.object(self.eth, 'call', side_effect=revert) as mock_call, \
+                patch.object(self.service.lanes.primary, 'nonces') as mock_nonces, \
+                patch.object(self.eth, 'send_raw_transaction') as mock_send:
+            with self.assertRaises(InsufficientBalanceError):
+                self.service.lock_tokens(WALLET, Decimal('30000'))
+
+        self.assertEqual(mock_call.call_args.kwargs['block_identifier'], 'pending')
+        mock_nonces.reserve.assert_not_called()
+        mock_send.assert_not_called()
+
+    def test_other_revert_raises_transaction_error(self):
+        """Test that any other revert reason surfaces as a TransactionError"""
+        revert = ContractLogicError('execution reverted: Ownable: caller is not the owner')
+
+        with patch.object(self.eth, 'call', side_effect=revert):
+            with self.assertRaisesRegex(TransactionError, 'caller is not the owner'):
+                self.service.burn_account(WALLET)
+
+    def test_lock_makes_no_separate_balance_read(self):
+        """Test that the old availableBalanceOf precheck is folded into the simulation"""
+        with patch.object(self.eth, 'call', return_value=b'') as mock_call, \
+                patch.object(self.service, '_broadcast_transaction', return_value=b'\x01' * 32), \
+                patch.object(self.service, '_await_receipt', return_value='0xhash'):
+            self.service.lock_tokens(WALLET, Decimal('100'))
+
+        mock_call.assert_not_called()
+
+    @patch('apps.blockchain.services.settings.BLOCKCHAIN_ESTIMATE_GAS', True)
+    def test_estimated_gas_with_headroom(self):
+        """Test that the gas limit comes from eth_estimateGas when enabled"""
+        with patch.object(self.eth, 'call', return_value=b''), \
+                patch.object(self.eth, 'estimate_gas', return_value=50000):
+            gas = self.service._simulate(self.service.contract.functions.mintSignup(WALLET), self.service.admin.address)
+
+        self.assertEqual(gas, 60000)
+
+
+@override_settings(ADMIN_PRIVATE_KEYS=['0x' + '1' * 64, '0x' + '2' * 64])
+class BatchWriteTest(SimpleTestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+        self.wallets = [Account.create().address for _ in range(40)]
+
+    @override_settings(BLOCKCHAIN_BATCH_GAS_BUDGET=services.BATCH_GAS_OVERHEAD + 30000 * 8)
+    def test_batches_split_by_lane_and_gas_budget(self):
+        """Test that each batch fits the gas budget and only holds wallets of one signer lane"""
+        with patch.object(self.service, '_send_transactions', return_value=['0xhash']) as mock_send:
+            self.service.mint_signup_batch(self.wallets)
+
+        calls = mock_send.call_args.args[0]
+        self.assertEqual(sum(len(addresses) for _, addresses in calls), 40)
+        for function, addresses in calls:
+            self.assertEqual(function.fn_name, 'mintSignupBatch')
+            self.assertLessEqual(len(addresses), 8)
+            self.assertEqual(len({self.service.lanes.lane_for(address) for address in addresses}), 1)
+
+    def test_lock_batch_passes_columns(self):
+        """Test that lockBatch gets parallel address and wei amount lists"""
+        locks = [(self.wallets[0], Decimal('100')), (self.wallets[0], Decimal('2.5'))]
+        with patch.object(self.service, '_send_transactions', return_value=['0xhash']) as mock_send:
+            self.service.lock_tokens_batch(locks)
+
+        [(function, addresses, amounts)] = mock_send.call_args.args[0]
+        self.assertEqual(function.fn_name, 'lockBatch')
+        self.assertEqual(addresses, [self.wallets[0]] * 2)
+        self.assertEqual(amounts, [100 * 10 ** 18, 25 * 10 ** 17])
+
+    def test_batch_gas_limit_scales_with_entries(self):
+        """Test that a batch gets gas for every entry"""
+        batch = self.service.contract.functions.resetPortfolioBatch(self.wallets[:10])
+        self.assertEqual(self.service._batch_gas_limit(batch), services.BATCH_GAS_OVERHEAD + 10 * 10000)
+
+
+class ResetPortfoliosCommandTest(TestCase):
+    def setUp(self):
+        for index, username in enumerate(['alice', 'bob', 'carol']):
+            user = User.objects.create_user(username=username, password='pw')
+            user.profile.wallet_address = '0x' + str(index + 1) * 40
+            user.profile.balance = Decimal('100')
+            user.profile.save()
+
+    @patch('apps.blockchain.management.commands.reset_portfolios.get_blockchain_service')
+    def test_resets_named_users_in_batches(self, mock_get_service):
+        """Test that the chain is reset in one batched call before the database"""
+        mock_get_service.return_value.reset_portfolio_batch.return_value = ['0xhash']
+
+        out = StringIO()
+        call_command('reset_portfolios', 'alice', 'bob', stdout=out)
+
+        mock_get_service.return_value.reset_portfolio_batch.assert_called_once_with(['0x' + '1' * 40, '0x' + '2' * 40])
+        self.assertEqual(User.objects.get(username='alice').profile.balance, Decimal('25000'))
+        self.assertEqual(User.objects.get(username='carol').profile.balance, Decimal('100'))
+        self.assertIn('Reset 2 portfolios in 1 transactions', out.getvalue())
+
+    @patch('apps.blockchain.management.commands.reset_portfolios.get_blockchain_service')
+    def test_chain_failure_leaves_database(self, mock_get_service):
+        """Test that nothing is reset in the database when the batch fails"""
+        mock_get_service.return_value.reset_portfolio_batch.side_effect = TransactionError('reverted')
+
+        err = StringIO()
+        call_command('reset_portfolios', '--all', stdout=StringIO(), stderr=err)
+
+        self.assertEqual(User.objects.get(username='alice').profile.balance, Decimal('100'))
+        self.assertIn('Blockchain error: reverted', err.getvalue())
@@ -0,0 +1,144 @@
+import threading
+import time
+from decimal import Decimal
+from unittest.mock import MagicMock
+from django.test import SimpleTestCase
+from apps.blockchain import deadlines
+from apps.blockchain.exceptions import ConnectionError, DeadlineExceeded
+from apps.blockchain.services import BlockchainService
+from apps.blockchain.singleflight import SingleFlight
+
+WALLET = '0x1234567890AbcdEF1234567890aBcdef12345678'
+OTHER_WALLET = '0xabcdef1234567890abcdef1234567890abcdef12'
+
+
+def run_concurrently(target, count):
+    """Start `count` threads running target(); returns them and the list their results land in"""
+    results = [None] * count
+
+    def worker(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+class SingleFlightTest(SimpleTestCase):
+    def setUp(self):
+        self.reads = SingleFlight()
+        self.release = threading.Event()
+        self.read = MagicMock(side_effect=lambda: self.release.wait(5) and 42)
+
+    def _wait_for_followers(self, threads, count):
+        while self.reads.stats()['coalesced'] < count:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+    def test_concurrent_identical_reads_share_one_call(self):
+        threads, results = run_concurrently(lambda: self.reads.do('balanceOf', self.read), 5)
+        self._wait_for_followers(threads, 4)
+
+        self.assertEqual(results, [42] * 5)
+        self.read.assert_called_once()
+        self.assertEqual(self.reads.stats(), {'calls': 5, 'coalesced': 4, 'in_flight': 0})
+
+    def test_leader_error_reaches_followers(self):
+        def fail():
+            self.release.wait(5)
+            raise ValueError('boom')
+
+        self.read.side_effect = fail
+        threads, results = run_concurrently(lambda: self.reads.do('balanceOf', self.read), 3)
+        self._wait_for_followers(threads, 2)
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.read.assert_called_once()
+
+    def test_completed_reads_are_not_reused(self):
+        """Test that only overlapping reads are shared, never a finished result"""
+        self.release.set()
+        self.reads.do('balanceOf', self.read)
+        self.reads.do('balanceOf', self.read)
+
+        self.assertEqual(self.read.call_count, 2)
+        self.assertEqual(self.reads.stats()['coalesced'], 0)
+
+    def test_follower_stops_waiting_at_its_deadline(self):
+        self.reads.claim(['balanceOf'])
+        with deadlines.deadline(0.01), self.assertRaises(DeadlineExceeded):
+            self.reads.do('balanceOf', self.read)
+        self.read.assert_not_called()
+        self.reads.resolve({'balanceOf': 42})
+
+
+class ServiceSingleFlightTest(SimpleTestCase):
+    def setUp(self):
+        self.service = BlockchainService()
+        self.service._healthy_until = float('inf')
+        self.release = threading.Event()
+        wei = [25000 * 10 ** 18, 5000 * 10 ** 18, 20000 * 10 ** 18]
+
+        def call_batch(contract_calls):
+            self.release.wait(5)
+            return wei * (len(contract_calls) // 3)
+
+        self.fetch = MagicMock(side_effect=call_batch)
+        self.service._call_batch = self.fetch
+
+    def test_parallel_portfolio_reads_share_one_batch(self):
+        """Test that tabs loading the same wallet at once send one balance batch"""
+        threads, results = run_concurrently(lambda: self.service.get_all_balances(WALLET), 6)
+        while self.service.reads.stats()['coalesced'] < 5:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.fetch.assert_called_once()
+        self.assertTrue(all(result['locked'] == Decimal('5000') for result in results))
+
+    def test_only_wallets_already_in_flight_are_shared(self):
+        """Test that a read covering a new wallet fetches just that one"""
+        threads, results = run_concurrently(lambda: self.service.get_all_balances(WALLET), 1)
+        while self.service.reads.stats()['in_flight'] < 1:
+            time.sleep(0.001)
+        others, other_results = run_concurrently(
+            lambda: self.service.get_balances_many([WALLET, OTHER_WALLET]), 1
+        )
+        while self.service.reads.stats()['coalesced'] < 1:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads + others:
+            thread.join()
+
+        self.assertEqual(self.fetch.call_count, 2)
+        self.assertEqual(len(self.fetch.call_args_list[1].args[0]), 3)
+        self.assertEqual(len(other_results[0]), 2)
+
+    def test_contract_calls_coalesced(self):
+        contract_call = MagicMock(address='0xtoken', fn_name='balanceOf', args=(WALLET,))
+        contract_call.call.side_effect = lambda: self.release.wait(5) and 7
+        threads, results = run_concurrently(lambda: self.service._call(contract_call), 4)
+        while self.service.reads.stats()['coalesced'] < 3:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [7] * 4)
+        contract_call.call.assert_called_once()
+
+    def test_failed_read_is_released(self):
+        contract_call = MagicMock(address='0xtoken', fn_name='balanceOf', args=(WALLET,))
+        contract_call.call.side_effect = ValueError('node down')
+
+        with self.assertRaises(ConnectionError):
+            self.service._call(contract_call)
+        self.assertEqual(self.service.reads.stats()['in_flight'], 0)
@@ -0,0 +1,116 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.blockchain.models import BlockchainTransaction
+from apps.blockchain.views import transaction_events
+
+WALLET = '0x1234567890abcdef1234567890abcdef12345678'
+
+
+class BlockchainTransactionViewSetTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='user1', password='testpass123')
+        self.other = User.objects.create_user(username='user2', password='testpass123')
+        self.lock = BlockchainTransaction.objects.create(
+            kind='lock',
+            user=self.user,
+            wallet_address=WALLET,
+            status='confirmed',
+            tx_hash='0x' + 'ab' * 32,
+            latency_ms=2100
+        )
+        BlockchainTransaction.objects.create(kind='mint_signup', user=self.user, wallet_address=WALLET)
+        BlockchainTransaction.objects.create(kind='lock', user=self.other, wallet_address=WALLET)
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_own_transactions(self):
+        """Test that users only see their own transactions"""
+        response = self.client.get(reverse('transaction-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_filter_by_status(self):
+        """Test filtering the list by status"""
+        response = self.client.get(reverse('transaction-list'), {'status': 'confirmed'})
+
+        self.assertEqual([item['id'] for item in response.data['results']], [self.lock.id])
+        self.assertEqual(response.data['results'][0]['latency_ms'], 2100)
+        self.assertIn(self.lock.tx_hash, response.data['results'][0]['tx_url'])
+
+    def test_detail(self):
+        """Test retrieving a transaction, and that another user's is hidden"""
+        response = self.client.get(reverse('transaction-detail', args=[self.lock.id]))
+        self.assertEqual(response.data['kind'], 'lock')
+
+        foreign = BlockchainTransaction.objects.get(user=self.other)
+        response = self.client.get(reverse('transaction-detail', args=[foreign.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_requires_authentication(self):
+        """Test that unauthenticated requests are rejected"""
+        self.client.force_authenticate(user=None)
+        response = self.client.get(reverse('transaction-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(BLOCKCHAIN_EVENT_STREAM_POLL_INTERVAL=0.01, BLOCKCHAIN_EVENT_STREAM_DURATION=0.05)
+    def test_stream_sends_changes_after_last_event_id(self):
+        """Test that the stream replays status changes since the client's Last-Event-ID"""
+        since = (timezone.now() - timedelta(minutes=1)).isoformat()
+        response = self.client.get(
+            reverse('transaction-stream'),
+            HTTP_ACCEPT='text/event-stream',
+            HTTP_LAST_EVENT_ID=since
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(body.count('event: status'), 2)
+        self.assertIn('"status": "confirmed"', body)
+
+    @override_settings(BLOCKCHAIN_EVENT_STREAM_POLL_INTERVAL=0.01, BLOCKCHAIN_EVENT_STREAM_DURATION=0.03)
+    def test_stream_ignores_invalid_last_event_id(self):
+        """Test that an out-of-range Last-Event-ID starts a fresh stream instead of failing"""
+        response = self.client.get(
+            reverse('transaction-stream'),
+            HTTP_ACCEPT='text/event-stream',
+            HTTP_LAST_EVENT_ID='2024-13-45T00:00:00'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('event: status', b''.join(response.streaming_content).decode())
+
+    def test_stream_only_new_changes(self):
+        """Test that a fresh connection only gets changes made after it opened"""
+        events = transaction_events(self.user, timezone.now(), poll_interval=0.01, duration=0.05)
+        next(events)  # retry hint
+
+        self.lock.status = 'failed'
+        self.lock.save()
+
+        body = ''.join(events)
+        self.assertEqual(body.count('event: status'), 1)
+        self.assertIn(f'"id": {self.lock.id}', body)
+
+    def test_stream_ends_with_resume_point(self):
+        """Test that a stream with nothing to send still hands the reconnect a Last-Event-ID past its polls"""
+        opened = timezone.now()
+        body = ''.join(transaction_events(self.user, opened, poll_interval=0.01, duration=0.03))
+
+        self.assertNotIn('event: status', body)
+        last = body.strip().splitlines()[-1]
+        self.assertTrue(last.startswith('id: '))
+        resume = parse_datetime(last[len('id: '):])
+        self.assertGreater(resume, opened)
+
+        self.lock.status = 'failed'
+        self.lock.save()
+        body = ''.join(transaction_events(self.user, resume, poll_interval=0.01, duration=0.03))
+        self.assertEqual(body.count('event: status'), 1)
@@ -0,0 +1,155 @@
+from io import StringIO
+from unittest.mock import MagicMock, patch
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.blockchain import wallets
+from apps.blockchain.exceptions import BlockchainError, TransactionError
+from apps.blockchain.models import BlockchainTransaction, PooledWallet
+
+
+def fake_mint(outcomes):
+    """Stand-in for mint_signup_to_many that settles each record as `outcomes` says"""
+    def mint_signup_to_many(addresses, records):
+        for record, outcome in zip(records, outcomes):
+            if outcome == 'confirmed':
+                record.mark_submitted('0x' + record.wallet_address[2:].rjust(64, '0'), 1, 300000, 10 ** 9)
+                record.mark_confirmed(MagicMock(blockNumber=10, gasUsed=50000))
+            elif outcome == 'timeout':
+                record.mark_submitted('0x' + 'ff' * 32, 2, 300000, 10 ** 9)
+                record.mark_failed('not mined')
+            else:
+                record.mark_failed('RPC call failed')
+        if 'confirmed' not in outcomes:
+            raise TransactionError('Transaction failed')
+        return [record.tx_hash for record in records]
+    return mint_signup_to_many
+
+
+class WalletPoolTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='newuser', password='testpass123')
+        self.service = MagicMock()
+
+    def test_generate_and_claim(self):
+        """Test that generated wallets are claimed once each"""
+        wallets.generate(2)
+        self.assertEqual(wallets.ready_count(), 2)
+
+        first = wallets.claim(self.user)
+        second = wallets.claim(self.user)
+
+        self.assertNotEqual(first.address, second.address)
+        self.assertIsNone(wallets.claim(self.user))
+        self.assertEqual(PooledWallet.objects.filter(status='claimed').count(), 2)
+
+    def test_premint_then_claim_prefers_minted(self):
+        """Test that pre-minted wallets are handed out first and their mint is attributed to the user"""
+        wallets.generate(3)
+        passes = [fake_mint(['confirmed', 'timeout', 'rpc']), fake_mint(['rpc'])]
+        self.service.mint_signup_to_many.side_effect = lambda *args: passes.pop(0)(*args)
+
+        with self.assertRaises(BlockchainError):
+            # The second pass only has the never-broadcast wallet left and it fails again
+            wallets.premint(self.service, batch_size=3)
+
+        self.assertEqual(
+            sorted(PooledWallet.objects.values_list('status', flat=True)),
+            ['available', 'discarded', 'minted']
+        )
+
+        wallet = wallets.claim(self.user)
+        self.assertIsNotNone(wallet.mint_transaction_id)
+        self.assertEqual(BlockchainTransaction.objects.get(id=wallet.mint_transaction_id).user, self.user)
+
+        # The unminted wallet is next; the discarded one is never handed out
+        self.assertIsNone(wallets.claim(self.user).mint_transaction_id)
+        self.assertIsNone(wallets.claim(self.user))
+
+    def test_premint_failure_reports_every_error(self):
+        """Test that a failed batch reports each of its wallets' errors, not just the last one's"""
+        wallets.generate(2)
+        self.service.mint_signup_to_many.side_effect = fake_mint(['timeout', 'rpc'])
+
+        with self.assertRaises(BlockchainError) as raised:
+            wallets.premint(self.service, batch_size=2)
+
+        self.assertIn('not mined', str(raised.exception))
+        self.assertIn('RPC call failed', str(raised.exception))
+
+    def test_premint_returns_count(self):
+        """Test that a fully successful pre-mint reports every wallet"""
+        wallets.generate(2)
+        self.service.mint_signup_to_many.side_effect = fake_mint(['confirmed', 'confirmed'])
+
+        self.assertEqual(wallets.premint(self.service), 2)
+
+    def test_wallet_being_minted_is_not_claimed(self):
+        """Test that a signup during a pre-mint can't take a wallet being minted, nor be overwritten by it"""
+        wallets.generate(2)
+        claimed = []
+
+        def mint_signup_to_many(addresses, records):
+            claimed.append(wallets.claim(self.user))
+            # As if a signup had claimed this wallet just before the pre-mint locked the batch
+            PooledWallet.objects.filter(address=addresses[0]).update(status='claimed')
+            return fake_mint(['confirmed', 'confirmed'])(addresses, records)
+
+        self.service.mint_signup_to_many.side_effect = mint_signup_to_many
+
+        self.assertEqual(wallets.premint(self.service), 1)
+        self.assertEqual(claimed, [None])
+        self.assertEqual(sorted(PooledWallet.objects.values_list('status', flat=True)), ['claimed', 'minted'])
+
+    def test_refill_command(self):
+        """Test that refill_wallet_pool --once tops the pool up to its size"""
+        wallets.generate(3)
+
+        out = StringIO()
+        call_command('refill_wallet_pool', '--once', '--size', '10', stdout=out)
+
+        self.assertEqual(wallets.ready_count(), 10)
+        self.assertIn('Generated 7 wallets', out.getvalue())
+
+
+class PooledRegistrationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.data = {
+            'username': 'newuser',
+            'email': 'newuser@example.com',
+            'password': 'strongpass123',
+            'password_confirm': 'strongpass123'
+        }
+
+    @patch('apps.users.views.get_blockchain_service')
+    def test_premint_wallet_needs_no_transaction(self, mock_get_service):
+        """Test that signup with a pre-minted wallet makes no blockchain calls"""
+        wallets.generate(1)
+        wallets.premint(MagicMock(mint_signup_to_many=MagicMock(side_effect=fake_mint(['confirmed']))))
+        wallet = PooledWallet.objects.get()
+
+        response = self.client.post(reverse('register'), self.data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        mock_get_service.assert_not_called()
+        self.assertEqual(response.data['wallet']['address'], wallet.address)
+        self.assertEqual(response.data['wallet']['status'], 'confirmed')
+        self.assertEqual(User.objects.get(username='newuser').profile.wallet_address, wallet.address)
+
+    @patch('apps.users.views.get_blockchain_service')
+    def test_unminted_pool_wallet_is_minted(self, mock_get_service):
+        """Test that a pooled wallet without a pre-mint skips key generation but still mints"""
+        wallets.generate(1)
+        wallet = PooledWallet.objects.get()
+        mock_get_service.return_value.mint_signup_to.return_value = '0xmint'
+
+        response = self.client.post(reverse('register'), self.data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        mock_get_service.return_value.mint_signup.assert_not_called()
+        self.assertEqual(mock_get_service.return_value.mint_signup_to.call_args.args[0], wallet.address)
+        self.assertEqual(response.data['wallet']['tx_hash'], '0xmint')
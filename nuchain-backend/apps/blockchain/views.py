@@ -0,0 +1,97 @@
+import json
+import time
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from .models import BlockchainTransaction
+from .renderers import EventStreamRenderer
+from .serializers import BlockchainTransactionSerializer
+
+# Comment line sent when nothing changed, so proxies don't close an idle stream
+HEARTBEAT_INTERVAL = 15
+
+
+def transaction_events(user, since, poll_interval, duration):
+    """
+    Yield a server-sent event for each of the user's transactions whose
+    status changes after `since`. The stream ends after `duration` seconds,
+    a few by default, so it only holds a worker thread briefly; EventSource
+    reconnects after the `retry:` delay and resumes from the Last-Event-ID
+    it was sent. The stream closes with a bare id line, so that is where the
+    last poll left off even when nothing changed.
+    """
+    deadline = time.monotonic() + duration
+    last_heartbeat = time.monotonic()
+    checkpoint = since
+    yield f"retry: {int(poll_interval * 1000)}\n\n"
+    
+    while time.monotonic() < deadline:
+        # Taken before the query, so a change saved while it runs is sent after reconnecting rather than missed
+        polled_at = timezone.now()
+        changed = BlockchainTransaction.objects.filter(
+            user=user,
+            updated_at__gt=since
+        ).order_by('updated_at')
+        
+        for record in changed:
+            since = record.updated_at
+            data = json.dumps(BlockchainTransactionSerializer(record).data, default=str)
+            yield f"id: {since.isoformat()}\nevent: status\ndata: {data}\n\n"
+            last_heartbeat = time.monotonic()
+        checkpoint = max(since, polled_at)
+        
+        if time.monotonic() - last_heartbeat >= HEARTBEAT_INTERVAL:
+            yield ": keep-alive\n\n"
+            last_heartbeat = time.monotonic()
+        
+        time.sleep(poll_interval)
+    
+    yield f"id: {checkpoint.isoformat()}\n\n"
+
+
+class BlockchainTransactionViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Admin transactions sent on behalf of the current user
+    GET /api/transactions/?status=submitted&kind=lock
+    """
+    serializer_class = BlockchainTransactionSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        """Return transactions for the current user only"""
+        queryset = BlockchainTransaction.objects.filter(user=self.request.user)
+        for field in ('status', 'kind'):
+            value = self.request.query_params.get(field)
+            if value:
+                queryset = queryset.filter(**{field: value})
+        return queryset
+    
+    @action(detail=False, methods=['get'], renderer_classes=[EventStreamRenderer, JSONRenderer])
+    def stream(self, request):
+        """
+        Server-sent events with every status change of the user's transactions.
+        GET /api/transactions/stream/
+        """
+        try:
+            since = parse_datetime(request.headers.get('Last-Event-ID', '')) or timezone.now()
+        except ValueError:
+            # Well formed but not a real date, e.g. month 13
+            since = timezone.now()
+        response = StreamingHttpResponse(
+            transaction_events(
+                request.user,
+                since,
+                settings.BLOCKCHAIN_EVENT_STREAM_POLL_INTERVAL,
+                settings.BLOCKCHAIN_EVENT_STREAM_DURATION
+            ),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx-style proxies from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -0,0 +1,119 @@
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .exceptions import BlockchainError
+from .models import BlockchainTransaction, PooledWallet
+
+# Pre-minted wallets first, then ones with no mint started
+CLAIM_ORDER = [
+    Q(status='minted'),
+    Q(status='available', mint_transaction=None),
+]
+
+
+def ready_count():
+    """Wallets that can still be claimed"""
+    return PooledWallet.objects.filter(status__in=['available', 'minted']).count()
+
+
+def generate(count):
+    """
+    Add `count` freshly generated wallets to the pool.
+    Key generation happens here, off the signup path.
+    """
+    # Imported here so the signup view doesn't load eth_account just to claim a wallet
+    from eth_account import Account
+
+    wallets = [PooledWallet(address=Account.create().address) for _ in range(count)]
+    PooledWallet.objects.bulk_create(wallets)
+    return len(wallets)
+
+
+def premint(service, batch_size=20):
+    """
+    Mint the signup allowance to every unminted pooled wallet, broadcasting
+    each batch back to back.
+
+    Each batch is taken with SELECT ... FOR UPDATE SKIP LOCKED and moved to
+    `minting`, which claim() never hands out, so a signup can't take a
+    wallet whose mint is under way. Every later change is conditional on
+    the wallet still being `minting`.
+
+    A wallet whose mint failed or timed out is discarded rather than retried:
+    the mint may still land, and minting twice would give it 50,000 NUC.
+
+    Returns:
+        int: number of wallets minted
+    """
+    minted = 0
+    while True:
+        with transaction.atomic():
+            wallets = list(
+                PooledWallet.objects.select_for_update(skip_locked=True)
+                .filter(status='available', mint_transaction=None)[:batch_size]
+            )
+            if not wallets:
+                return minted
+
+            records = []
+            for wallet in wallets:
+                wallet.status = 'minting'
+                wallet.mint_transaction = BlockchainTransaction.objects.create(
+                    kind='mint_signup',
+                    wallet_address=wallet.address
+                )
+                wallet.save(update_fields=['status', 'mint_transaction'])
+                records.append(wallet.mint_transaction)
+
+        try:
+            service.mint_signup_to_many([wallet.address for wallet in wallets], records)
+        except BlockchainError:
+            # Each record shows how far its own mint got
+            pass
+
+        batch_minted = 0
+        errors = []
+        for wallet in wallets:
+            record = wallet.mint_transaction
+            record.refresh_from_db()
+            minting = PooledWallet.objects.filter(pk=wallet.pk, status='minting')
+            if record.status == 'confirmed':
+                batch_minted += minting.update(status='minted')
+                continue
+            errors.append(record.error)
+            if record.tx_hash:
+                minting.update(status='discarded')
+            else:
+                # Never broadcast, so it is safe to mint later
+                minting.update(status='available', mint_transaction=None)
+        minted += batch_minted
+
+        # Stop instead of spinning while the node is down
+        if not batch_minted:
+            raise BlockchainError(f"Pre-minting failed: {'; '.join(sorted(set(errors)))}")
+
+
+def claim(user):
+    """
+    Take a wallet from the pool for a new user, preferring pre-minted ones.
+    Concurrent signups skip each other's locked rows instead of waiting.
+    Call inside the registration transaction so the claim rolls back with it.
+    A claimed wallet with a mint_transaction already holds its 25,000 NUC.
+
+    Returns:
+        PooledWallet: the claimed wallet, or None if the pool is empty
+    """
+    with transaction.atomic():
+        for claimable in CLAIM_ORDER:
+            wallet = PooledWallet.objects.select_for_update(skip_locked=True).filter(claimable).first()
+            if wallet is not None:
+                break
+        else:
+            return None
+
+        wallet.status = 'claimed'
+        wallet.claimed_at = timezone.now()
+        wallet.save(update_fields=['status', 'claimed_at'])
+        if wallet.mint_transaction_id:
+            BlockchainTransaction.objects.filter(id=wallet.mint_transaction_id).update(user=user)
+        return wallet
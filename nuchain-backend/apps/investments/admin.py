@@ -1,8 +1,33 @@
 from django.contrib import admin
-from .models import Investment
+from .models import Investment, PortfolioPosition
+
+
+class ReadOnlyAdmin(admin.ModelAdmin):
+    """
+    Investments move $NUC on chain and positions total them up; adding or
+    editing either here would leave balances, funding and positions out of
+    step. Deleting stays allowed, for users and reactors whose deletion
+    cascades to these rows, and recomputes the positions involved.
+    """
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        PortfolioPosition.refresh(obj.user_id, obj.reactor_id)
+
+    def delete_queryset(self, request, queryset):
+        pairs = set(queryset.values_list('user_id', 'reactor_id'))
+        super().delete_queryset(request, queryset)
+        for user_id, reactor_id in pairs:
+            PortfolioPosition.refresh(user_id, reactor_id)
 
 @admin.register(Investment)
-class InvestmentAdmin(admin.ModelAdmin):
+class InvestmentAdmin(ReadOnlyAdmin):
     list_display = [
         'user', 
         'reactor', 
@@ -11,4 +36,17 @@ class InvestmentAdmin(admin.ModelAdmin):
     ]
     list_filter = ['created_at', 'reactor']
     search_fields = ['user__username', 'reactor__name']
-    readonly_fields = ['created_at', 'updated_at']
\ No newline at end of file
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(PortfolioPosition)
+class PortfolioPositionAdmin(ReadOnlyAdmin):
+    list_display = [
+        'user',
+        'reactor',
+        'principal',
+        'investment_count',
+        'last_invested_at'
+    ]
+    list_filter = ['reactor']
+    search_fields = ['user__username', 'reactor__name']
+    readonly_fields = ['first_invested_at', 'last_invested_at', 'updated_at']
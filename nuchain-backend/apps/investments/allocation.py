@@ -0,0 +1,146 @@
+import threading
+import time
+from decimal import ROUND_DOWN, Decimal
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.reactors.models import Reactor
+
+# Columns of the coefficient matrix
+ROI_RATE, CARBON_RATE, ROI_SCORE, CARBON_SCORE, AVAILABLE = range(5)
+
+_cached = None
+_lock = threading.Lock()
+
+
+def coefficients():
+    """
+    Active reactors' coefficients, loaded once and shared between requests.
+
+    Reloaded when a reactor is saved or deleted in this process, which every
+    investment, cancellation and wallet reset does, and otherwise after
+    PORTFOLIO_ALLOCATION_CACHE_TTL seconds to pick up other workers' changes.
+
+    Returns:
+        dict: ids and names of the reactors, and matrix, one row per reactor
+        with ROI_RATE, CARBON_RATE, their ROI_SCORE and CARBON_SCORE scaled
+        to the best reactor's, and AVAILABLE funding
+    """
+    global _cached
+    with _lock:
+        if _cached is None or time.monotonic() - _cached['loaded_at'] > settings.PORTFOLIO_ALLOCATION_CACHE_TTL:
+            rows = list(
+                Reactor.objects.filter(is_active=True).order_by('display_order', 'name').values_list(
+                    'id', 'name', 'annual_roi_rate', 'carbon_offset_tonnes_co2_per_nuc_per_year',
+                    'total_funding_needed', 'current_funding'
+                )
+            )
+            # Rates, funding needed and funded, one row per reactor
+            values = np.array([row[2:] for row in rows], dtype=float).reshape(len(rows), 4)
+            matrix = np.zeros((len(rows), 5))
+            matrix[:, ROI_RATE] = values[:, 0]
+            matrix[:, CARBON_RATE] = values[:, 1]
+            matrix[:, AVAILABLE] = np.maximum(values[:, 2] - values[:, 3], 0)
+            # ROI is a fraction and carbon tonnes per $NUC; scaling each by the largest
+            # puts them on one footing before they are weighed against each other
+            for rate, score in [(ROI_RATE, ROI_SCORE), (CARBON_RATE, CARBON_SCORE)]:
+                largest = np.abs(matrix[:, rate]).max(initial=0)
+                if largest > 0:
+                    matrix[:, score] = matrix[:, rate] / largest
+            _cached = {
+                'ids': [row[0] for row in rows],
+                'names': [row[1] for row in rows],
+                'matrix': matrix,
+                'loaded_at': time.monotonic(),
+            }
+        return _cached
+
+
+@receiver(post_save, sender=Reactor)
+@receiver(post_delete, sender=Reactor)
+def forget_coefficients(sender, **kwargs):
+    """A reactor's funding or rates changed; reload the coefficients on next use"""
+    def forget():
+        global _cached
+        with _lock:
+            _cached = None
+
+    forget()
+    # Again once committed, in case another thread reloaded the old rows meanwhile
+    transaction.on_commit(forget)
+
+
+def solve(matrix, budget, roi_weight, limits):
+    """
+    The allocation maximizing roi_weight * ROI score + (1 - roi_weight) *
+    carbon score per $NUC, spending at most `budget` and at most `limits[i]`
+    on reactor i.
+
+    With a single budget constraint and per-reactor bounds the linear
+    program is a fractional knapsack: filling reactors in order of score
+    until the budget runs out is optimal. Reactors scoring zero or less
+    would only lower the objective, so part of the budget may stay unspent.
+
+    Returns:
+        numpy.ndarray: $NUC per reactor row
+    """
+    score = roi_weight * matrix[:, ROI_SCORE] + (1 - roi_weight) * matrix[:, CARBON_SCORE]
+    upper = np.where(score > 0, limits, 0)
+    order = np.argsort(-score, kind='stable')
+    spent_before = np.cumsum(upper[order]) - upper[order]
+    amounts = np.empty_like(upper)
+    amounts[order] = np.clip(budget - spent_before, 0, upper[order])
+    return amounts
+
+
+def allocate(budget, roi_weight, caps=None):
+    """
+    Split a budget across active reactors, within their remaining funding
+    and any per-reactor caps.
+
+    Args:
+        budget: Decimal $NUC to spend
+        roi_weight: 1 to rank reactors by ROI alone, 0 by carbon offset alone
+        caps: optional dict of reactor id -> most $NUC to put in it
+
+    Returns:
+        dict: the fields of AllocationSerializer
+    """
+    reactors = coefficients()
+    matrix = reactors['matrix']
+    limits = matrix[:, AVAILABLE].copy()
+    for index, reactor_id in enumerate(reactors['ids']):
+        if caps and reactor_id in caps:
+            limits[index] = min(limits[index], float(caps[reactor_id]))
+
+    amounts = solve(matrix, float(budget), roi_weight, limits)
+
+    allocations = []
+    for index in np.flatnonzero(amounts > 0):
+        # Rounded down to the cent so the total never exceeds the budget or a limit
+        amount = Decimal(str(round(amounts[index], 6))).quantize(Decimal('0.01'), rounding=ROUND_DOWN)
+        if amount == 0:
+            continue
+        roi_rate = Decimal(str(matrix[index, ROI_RATE]))
+        carbon_rate = Decimal(str(matrix[index, CARBON_RATE]))
+        allocations.append({
+            'reactor_id': reactors['ids'][index],
+            'reactor_name': reactors['names'][index],
+            'amount': amount,
+            'annual_roi': amount * roi_rate,
+            'annual_carbon_offset': amount * carbon_rate,
+        })
+    allocations.sort(key=lambda allocation: -allocation['amount'])
+
+    allocated = sum((allocation['amount'] for allocation in allocations), Decimal('0'))
+    return {
+        'budget': budget,
+        'roi_weight': roi_weight,
+        'allocated': allocated,
+        'unallocated': budget - allocated,
+        'annual_roi': sum((allocation['annual_roi'] for allocation in allocations), Decimal('0')),
+        'annual_carbon_offset': sum((allocation['annual_carbon_offset'] for allocation in allocations), Decimal('0')),
+        'allocations': allocations,
+    }
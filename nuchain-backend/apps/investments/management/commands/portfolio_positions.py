@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.investments.portfolio import fix_positions, position_differences
+
+class Command(BaseCommand):
+    help = "Rebuild portfolio positions from investments, or with --verify only report the ones that differ"
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*', help='Users to check; every user by default')
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Report positions that differ from the investments without changing them'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Users checked per transaction'
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('id')
+        if options['usernames']:
+            users = users.filter(username__in=options['usernames'])
+        user_ids = list(users.values_list('id', flat=True))
+        chunk_size = options['chunk_size']
+        found = 0
+
+        for start in range(0, len(user_ids), chunk_size):
+            with transaction.atomic():
+                differences = position_differences(user_ids[start:start + chunk_size])
+                found += len(differences)
+                for user_id, reactor_id, totals, position in differences:
+                    expected = f"{totals['principal']:,.2f} $NUC in {totals['investment_count']}" if totals else 'nothing'
+                    stored = f'{position.principal:,.2f} $NUC in {position.investment_count}' if position else 'nothing'
+                    self.stdout.write(self.style.WARNING(
+                        f'user {user_id}, reactor {reactor_id}: investments {expected}, position {stored}'
+                    ))
+                if not options['verify']:
+                    fix_positions(differences)
+
+        action = 'found' if options['verify'] else 'fixed'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {len(user_ids)} users, {action} {found} positions out of step'
+        ))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 06:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0002_remove_investment_time_period_years'),
+        ('reactors', '0003_reactor_display_order_alter_reactor_slug'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(fields=['user', 'reactor', 'amount_invested'], name='investment_user_reactor_amount'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.4 on 2026-10-18 06:26
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_positions(apps, schema_editor):
+    """Positions for the investments made before the table existed"""
+    Investment = apps.get_model('investments', 'Investment')
+    PortfolioPosition = apps.get_model('investments', 'PortfolioPosition')
+    totals = (
+        Investment.objects.order_by()
+        .values('user_id', 'reactor_id')
+        .annotate(
+            principal=models.Sum('amount_invested'),
+            investment_count=models.Count('id'),
+            first_invested_at=models.Min('created_at'),
+            last_invested_at=models.Max('created_at'),
+        )
+    )
+    PortfolioPosition.objects.bulk_create((PortfolioPosition(**row) for row in totals.iterator()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investments', '0003_investment_user_reactor_amount_index'),
+        ('reactors', '0003_reactor_display_order_alter_reactor_slug'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioPosition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('principal', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Total $NUC invested in this reactor', max_digits=15)),
+                ('investment_count', models.PositiveIntegerField(default=0)),
+                ('first_invested_at', models.DateTimeField()),
+                ('last_invested_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('reactor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='portfolio_positions', to='reactors.reactor')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='portfolio_positions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Portfolio Position',
+                'verbose_name_plural': 'Portfolio Positions',
+                'ordering': ['reactor__name'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'reactor'), name='unique_portfolio_position')],
+            },
+        ),
+        migrations.RunPython(build_positions, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
 from decimal import Decimal
+from apps.reactors.models import Reactor
+from apps.users.models import UserProfile
 
 class Investment(models.Model):
     user = models.ForeignKey(
@@ -27,6 +29,112 @@ class Investment(models.Model):
         ordering = ['-created_at']
         verbose_name = "Investment"
         verbose_name_plural = "Investments"
+        indexes = [
+            # Covers the per-reactor totals of a user's portfolio without reading the table
+            models.Index(fields=['user', 'reactor', 'amount_invested'], name='investment_user_reactor_amount'),
+        ]
     
     def __str__(self):
-        return f"{self.user.username} → {self.reactor.name}: {self.amount_invested:,.2f} $NUC invested"
\ No newline at end of file
+        return f"{self.user.username} → {self.reactor.name}: {self.amount_invested:,.2f} $NUC invested"
+    
+    @transaction.atomic
+    def cancel(self):
+        """
+        Undo an investment whose tokens could not be locked on chain.
+        Refunds the user's balance and the reactor's funding, then deletes the record
+        and updates the user's position in the reactor.
+
+        Runs from receipt watcher and outbox threads alongside requests, so the
+        investment, profile and reactor rows are locked and re-read first. An
+        investment another cancel or a reset already removed is left alone.
+        """
+        if not Investment.objects.select_for_update().filter(pk=self.pk).exists():
+            return
+
+        profile = UserProfile.objects.select_for_update().get(user_id=self.user_id)
+        profile.balance += self.amount_invested
+        profile.save()
+        
+        reactor = Reactor.objects.select_for_update().get(pk=self.reactor_id)
+        reactor.current_funding -= self.amount_invested
+        reactor.save()
+        
+        self.delete()
+        PortfolioPosition.refresh(self.user_id, self.reactor_id)
+
+
+class PortfolioPosition(models.Model):
+    """
+    A user's holding in one reactor, kept in step with their investments.
+
+    Updated in the same transaction that creates, cancels or resets
+    investments, so portfolio_summary reads one row per reactor however long
+    the history is. `manage.py portfolio_positions` rebuilds or verifies the
+    table from the investments themselves.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='portfolio_positions'
+    )
+    reactor = models.ForeignKey(
+        'reactors.Reactor',
+        on_delete=models.CASCADE,
+        related_name='portfolio_positions'
+    )
+    principal = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="Total $NUC invested in this reactor"
+    )
+    investment_count = models.PositiveIntegerField(default=0)
+    first_invested_at = models.DateTimeField()
+    last_invested_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['reactor__name']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'reactor'], name='unique_portfolio_position'),
+        ]
+        verbose_name = "Portfolio Position"
+        verbose_name_plural = "Portfolio Positions"
+
+    def __str__(self):
+        return f"{self.user.username} → {self.reactor.name}: {self.principal:,.2f} $NUC in {self.investment_count} investments"
+
+    @classmethod
+    def record(cls, investment):
+        """Add a new investment to its position"""
+        position, created = cls.objects.get_or_create(
+            user_id=investment.user_id,
+            reactor_id=investment.reactor_id,
+            defaults={
+                'principal': investment.amount_invested,
+                'investment_count': 1,
+                'first_invested_at': investment.created_at,
+                'last_invested_at': investment.created_at,
+            }
+        )
+        if not created:
+            # F() so concurrent investments in the same reactor both count
+            cls.objects.filter(pk=position.pk).update(
+                principal=models.F('principal') + investment.amount_invested,
+                investment_count=models.F('investment_count') + 1,
+                last_invested_at=investment.created_at
+            )
+
+    @classmethod
+    def refresh(cls, user_id, reactor_id):
+        """Recompute one position from the investments left, e.g. after one is cancelled"""
+        totals = Investment.objects.filter(user_id=user_id, reactor_id=reactor_id).aggregate(
+            principal=models.Sum('amount_invested'),
+            investment_count=models.Count('id'),
+            first_invested_at=models.Min('created_at'),
+            last_invested_at=models.Max('created_at'),
+        )
+        if not totals['investment_count']:
+            cls.objects.filter(user_id=user_id, reactor_id=reactor_id).delete()
+            return
+        cls.objects.update_or_create(user_id=user_id, reactor_id=reactor_id, defaults=totals)
@@ -0,0 +1,135 @@
+from decimal import Decimal
+import numpy as np
+from django.db.models import Count, F, Max, Min, Sum
+from .models import Investment, PortfolioPosition
+from .projections import SIMPLE, project
+
+# Years the portfolio summary projects returns and carbon offset over
+PROJECTION_YEARS = [1, 2, 5, 10]
+
+
+def positions(user):
+    """
+    A user's holdings per reactor, read from their PortfolioPosition rows in one query.
+
+    Returns:
+        list: dicts with reactor_name, annual_roi_rate, carbon_rate,
+        roi_volatility, market_correlation, principal and investment_count,
+        one per reactor, ordered by reactor name
+    """
+    return list(
+        PortfolioPosition.objects.filter(user=user).values(
+            'principal',
+            'investment_count',
+            reactor_name=F('reactor__name'),
+            annual_roi_rate=F('reactor__annual_roi_rate'),
+            carbon_rate=F('reactor__carbon_offset_tonnes_co2_per_nuc_per_year'),
+            roi_volatility=F('reactor__roi_volatility'),
+            market_correlation=F('reactor__market_correlation'),
+        )
+    )
+
+
+def investment_totals(investments):
+    """
+    What each PortfolioPosition should hold, computed from investment rows
+    with one grouped query.
+
+    Returns:
+        dict: (user_id, reactor_id) -> principal, investment_count,
+        first_invested_at and last_invested_at
+    """
+    rows = (
+        # order_by() drops Investment's default ordering, which would split the groups
+        investments.order_by()
+        .values('user_id', 'reactor_id')
+        .annotate(
+            principal=Sum('amount_invested'),
+            investment_count=Count('id'),
+            first_invested_at=Min('created_at'),
+            last_invested_at=Max('created_at'),
+        )
+    )
+    return {(row.pop('user_id'), row.pop('reactor_id')): row for row in rows}
+
+
+def position_differences(user_ids):
+    """
+    Positions of the given users that disagree with their investments.
+
+    Returns:
+        list: (user_id, reactor_id, expected totals or None, stored
+        PortfolioPosition or None), one per position to create, fix or delete
+    """
+    expected = investment_totals(Investment.objects.filter(user_id__in=user_ids))
+    stored = {
+        (position.user_id, position.reactor_id): position
+        for position in PortfolioPosition.objects.filter(user_id__in=user_ids)
+    }
+    differences = []
+    for key in sorted(expected.keys() | stored.keys()):
+        totals, position = expected.get(key), stored.get(key)
+        if totals and position and all(getattr(position, field) == value for field, value in totals.items()):
+            continue
+        differences.append((*key, totals, position))
+    return differences
+
+
+def fix_positions(differences):
+    """Bring the positions listed by position_differences() in line with the investments"""
+    for user_id, reactor_id, totals, position in differences:
+        if totals is None:
+            position.delete()
+        else:
+            PortfolioPosition.objects.update_or_create(user_id=user_id, reactor_id=reactor_id, defaults=totals)
+
+
+def summarize(positions, years=PROJECTION_YEARS, mode=SIMPLE):
+    """
+    Portfolio totals and projections from per-reactor positions.
+
+    Every horizon is projected in one vectorized pass (see projections.project),
+    so the work grows with the number of reactors held and horizons asked for,
+    not the number of investments. Amounts come back as Decimal rounded to six
+    places, and total_return is the exact Decimal sum of what was invested and
+    the ROI.
+
+    Args:
+        years: horizons in years; fractions such as 1.5 are allowed
+        mode: SIMPLE interest, like Reactor.calculate_roi_projection, or COMPOUND
+
+    Returns:
+        dict: the fields of PortfolioSummarySerializer
+    """
+    total_invested = sum((position['principal'] for position in positions), Decimal('0'))
+    projected = project(
+        [position['principal'] for position in positions],
+        [position['annual_roi_rate'] for position in positions],
+        [position['carbon_rate'] for position in positions],
+        years,
+        mode,
+    )
+    # One portfolio, so row 0; tolist() hands back plain floats for Decimal(str())
+    total_roi, total_carbon_offset, roi_percentage = (
+        np.round(projected[field][0], 6).tolist() for field in ('total_roi', 'total_carbon_offset', 'roi_percentage')
+    )
+
+    projections = []
+    for index, horizon in enumerate(years):
+        roi = Decimal(str(total_roi[index]))
+        projections.append({
+            'time_period_years': horizon,
+            'time_period_months': round(horizon * 12),
+            'total_roi': roi,
+            'total_carbon_offset': Decimal(str(total_carbon_offset[index])),
+            'total_return': total_invested + roi,
+            'roi_percentage': Decimal(str(roi_percentage[index])),
+        })
+
+    return {
+        'total_invested': total_invested,
+        'investment_count': sum(position['investment_count'] for position in positions),
+        'reactors_invested_in': [position['reactor_name'] for position in positions],
+        'mode': mode,
+        'projections': projections,
+    }
@@ -0,0 +1,148 @@
+import numpy as np
+
+SIMPLE = 'simple'
+COMPOUND = 'compound'
+MODES = [SIMPLE, COMPOUND]
+
+# Horizons are whole months, up to 30 years
+MAX_HORIZON_MONTHS = 30 * 12
+
+# Percentile bands of a risk simulation
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def parse_horizons(value):
+    """
+    Horizons from a ?horizons= query parameter, as whole months.
+
+    Accepts comma-separated years ("1,2.5,10"), months with an m suffix
+    ("6m,18m"), or "monthly" for every month up to 30 years. Duplicates are
+    dropped and the rest returned in ascending order.
+
+    Raises:
+        ValueError: a horizon is malformed, not a whole number of months, or
+        outside one month to 30 years
+    """
+    if value.strip() == 'monthly':
+        return list(range(1, MAX_HORIZON_MONTHS + 1))
+
+    months = set()
+    for token in value.split(','):
+        token = token.strip().lower()
+        try:
+            count = float(token[:-1]) if token.endswith('m') else float(token) * 12
+        except ValueError:
+            raise ValueError(f"Invalid horizon '{token}': use years (2.5) or months (30m)")
+        if abs(count - round(count)) > 1e-9:
+            raise ValueError(f"Horizon '{token}' is not a whole number of months")
+        count = round(count)
+        if not 1 <= count <= MAX_HORIZON_MONTHS:
+            raise ValueError(f"Horizon '{token}' is outside 1 month to {MAX_HORIZON_MONTHS // 12} years")
+        months.add(count)
+    return sorted(months)
+
+
+def project(principal, roi_rates, carbon_rates, years, mode=SIMPLE):
+    """
+    ROI, total return and carbon offset of many positions over many horizons
+    in one vectorized pass.
+
+    Simple growth earns the annual rate on the principal each year, as
+    Reactor.calculate_roi_projection does; compound growth reinvests it once
+    a year, (1 + rate) ** years, with a loss capped at the whole principal.
+    Carbon offset accrues on the principal either way.
+
+    Args:
+        principal: (positions, reactors) $NUC held; a single portfolio may be a 1-d row
+        roi_rates: (reactors,) annual ROI as a fraction, may be negative
+        carbon_rates: (reactors,) tonnes CO₂ offset per $NUC per year
+        years: (horizons,) horizon lengths in years, fractions allowed
+        mode: SIMPLE or COMPOUND
+
+    Returns:
+        dict: total_roi, total_return, total_carbon_offset and roi_percentage,
+        each a float array of shape (positions, horizons)
+    """
+    principal = np.atleast_2d(np.asarray(principal, dtype=float))
+    roi_rates = np.asarray(roi_rates, dtype=float)
+    carbon_rates = np.asarray(carbon_rates, dtype=float)
+    years = np.asarray(years, dtype=float)
+    invested = principal.sum(axis=1, keepdims=True)
+
+    if mode == SIMPLE:
+        total_roi = np.outer(principal @ roi_rates, years)
+    elif mode == COMPOUND:
+        # (reactors, horizons) growth factor of one $NUC
+        growth = np.power(np.maximum(1 + roi_rates, 0)[:, None], years)
+        total_roi = principal @ growth - invested
+    else:
+        raise ValueError(f"Unknown projection mode '{mode}': use one of {', '.join(MODES)}")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roi_percentage = np.where(invested > 0, total_roi / invested * 100, 0.0)
+    return {
+        'total_roi': total_roi,
+        'total_return': invested + total_roi,
+        'total_carbon_offset': np.outer(principal @ carbon_rates, years),
+        'roi_percentage': roi_percentage,
+    }
+
+
+def simulate(principal, roi_rates, volatilities, correlations, years, paths, seed, percentiles=PERCENTILES):
+    """
+    Monte Carlo paths of a portfolio's value, compounded once a year.
+
+    Each year a reactor returns its annual ROI rate plus a normal shock of its
+    volatility. The shock is split between a market draw shared by every
+    reactor on the path, weighted by the reactor's correlation, and one of its
+    own, so two reactors correlate by the product of their correlations. A
+    position that loses everything stays at zero. All paths advance together,
+    one year per step; the same seed gives the same result.
+
+    Args:
+        principal: (reactors,) $NUC held
+        roi_rates: (reactors,) mean annual ROI as a fraction
+        volatilities: (reactors,) standard deviation of the annual ROI
+        correlations: (reactors,) correlation with the market draw, -1 to 1
+        years: number of yearly steps
+        paths: number of simulated paths
+        seed: seed of the random generator
+
+    Returns:
+        dict: percentiles, a (years, len(percentiles)) array of portfolio
+        value at the end of each year; mean, a (years,) array; and
+        loss_probability, the share of paths worth less than the principal
+        at the end
+    """
+    principal = np.asarray(principal, dtype=float)
+    roi_rates = np.asarray(roi_rates, dtype=float)
+    volatilities = np.asarray(volatilities, dtype=float)
+    correlations = np.asarray(correlations, dtype=float)
+    rng = np.random.default_rng(seed)
+
+    # Reactors by paths, so each reactor's paths sit together in memory, and the
+    # per-reactor scales broadcast down the rows; updated in place every year
+    market_scale = (volatilities * correlations)[:, None]
+    own_scale = (volatilities * np.sqrt(1 - correlations ** 2))[:, None]
+    growth = (1 + roi_rates)[:, None]
+    values = np.repeat(principal[:, None], paths, axis=1)
+    bands = np.empty((years, len(percentiles)))
+    mean = np.empty(years)
+    for year in range(years):
+        # Row 0 is the market draw, the rest one per reactor
+        draws = rng.standard_normal((len(principal) + 1, paths))
+        factors = draws[1:]
+        factors *= own_scale
+        factors += market_scale * draws[0]
+        factors += growth
+        np.maximum(factors, 0, out=factors)
+        values *= factors
+        totals = values.sum(axis=0)
+        bands[year] = np.percentile(totals, percentiles)
+        mean[year] = totals.mean()
+
+    return {
+        'percentiles': bands,
+        'mean': mean,
+        'loss_probability': float((totals < principal.sum()).mean()),
+    }
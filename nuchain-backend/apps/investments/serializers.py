@@ -1,3 +1,4 @@
+from decimal import Decimal
 from rest_framework import serializers
 from .models import Investment
 from apps.reactors.serializers import ReactorSerializer
@@ -52,9 +53,15 @@ class CreateInvestmentSerializer(serializers.ModelSerializer):
         data['reactor'] = reactor
         return data
     
+class HorizonYearsField(serializers.Field):
+    """Horizon length in years: whole years as integers, monthly ones like 1.5 or 0.0833 as numbers"""
+    def to_representation(self, value):
+        return int(value) if value == int(value) else round(float(value), 4)
+
 class PortfolioProjectionSerializer(serializers.Serializer):
-    """Serializer for portfolio projections across time periods: 1, 2, 5, 10 years"""
-    time_period_years = serializers.IntegerField()
+    """Serializer for portfolio projections, by default over 1, 2, 5, 10 years"""
+    time_period_years = HorizonYearsField()
+    time_period_months = serializers.IntegerField(required=False)
     total_roi = serializers.DecimalField(max_digits=15, decimal_places=2)
     total_carbon_offset = serializers.DecimalField(max_digits=12, decimal_places=4)
     total_return = serializers.DecimalField(max_digits=15, decimal_places=2)
@@ -65,4 +72,76 @@ class PortfolioSummarySerializer(serializers.Serializer):
     total_invested = serializers.DecimalField(max_digits=15, decimal_places=2)
     investment_count = serializers.IntegerField()
     reactors_invested_in = serializers.ListField(child=serializers.CharField())
-    projections = PortfolioProjectionSerializer(many=True)
\ No newline at end of file
+    mode = serializers.CharField(required=False)
+    projections = PortfolioProjectionSerializer(many=True)
+
+class RiskBandSerializer(serializers.Serializer):
+    """Spread of simulated portfolio values at the end of one year"""
+    year = serializers.IntegerField()
+    mean = serializers.DecimalField(max_digits=15, decimal_places=2)
+    p5 = serializers.DecimalField(max_digits=15, decimal_places=2)
+    p25 = serializers.DecimalField(max_digits=15, decimal_places=2)
+    p50 = serializers.DecimalField(max_digits=15, decimal_places=2)
+    p75 = serializers.DecimalField(max_digits=15, decimal_places=2)
+    p95 = serializers.DecimalField(max_digits=15, decimal_places=2)
+
+class RiskSimulationSerializer(serializers.Serializer):
+    """Serializer for a Monte Carlo simulation of the user's portfolio"""
+    total_invested = serializers.DecimalField(max_digits=15, decimal_places=2)
+    years = serializers.IntegerField()
+    paths = serializers.IntegerField()
+    seed = serializers.IntegerField()
+    loss_probability = serializers.DecimalField(max_digits=5, decimal_places=4)
+    bands = RiskBandSerializer(many=True)
+    cached = serializers.BooleanField()
+
+class AllocationRequestSerializer(serializers.Serializer):
+    """Budget to split across reactors; defaults to the user's whole balance"""
+    budget = serializers.DecimalField(max_digits=15, decimal_places=2, min_value=Decimal('0.01'), required=False)
+    roi_weight = serializers.FloatField(min_value=0, max_value=1, default=0.5)
+    caps = serializers.DictField(
+        child=serializers.DecimalField(max_digits=15, decimal_places=2, min_value=Decimal('0')),
+        required=False,
+        default=dict
+    )
+
+    def validate_caps(self, caps):
+        """Caps are keyed by reactor id, which must be an active reactor"""
+        from .allocation import coefficients
+
+        active = set(coefficients()['ids'])
+        try:
+            caps = {int(reactor_id): cap for reactor_id, cap in caps.items()}
+        except ValueError:
+            raise serializers.ValidationError("Caps must be keyed by reactor id")
+        unknown = sorted(set(caps) - active)
+        if unknown:
+            raise serializers.ValidationError(f"Reactor not found or inactive: {', '.join(map(str, unknown))}")
+        return caps
+
+    def validate(self, attrs):
+        profile = self.context['request'].user.profile
+        budget = attrs.setdefault('budget', profile.balance)
+        if not profile.can_afford(budget):
+            raise serializers.ValidationError({
+                'budget': f"Insufficient balance. Budget: {budget:,.2f} $NUC; Your balance: {profile.balance:,.2f} $NUC"
+            })
+        return attrs
+
+class AllocationEntrySerializer(serializers.Serializer):
+    """$NUC suggested for one reactor and what it earns per year"""
+    reactor_id = serializers.IntegerField()
+    reactor_name = serializers.CharField()
+    amount = serializers.DecimalField(max_digits=15, decimal_places=2)
+    annual_roi = serializers.DecimalField(max_digits=15, decimal_places=2)
+    annual_carbon_offset = serializers.DecimalField(max_digits=15, decimal_places=4)
+
+class AllocationSerializer(serializers.Serializer):
+    """Serializer for the suggested split of a budget across reactors"""
+    budget = serializers.DecimalField(max_digits=15, decimal_places=2)
+    roi_weight = serializers.FloatField()
+    allocated = serializers.DecimalField(max_digits=15, decimal_places=2)
+    unallocated = serializers.DecimalField(max_digits=15, decimal_places=2)
+    annual_roi = serializers.DecimalField(max_digits=15, decimal_places=2)
+    annual_carbon_offset = serializers.DecimalField(max_digits=15, decimal_places=4)
+    allocations = AllocationEntrySerializer(many=True)
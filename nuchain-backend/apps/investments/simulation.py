@@ -0,0 +1,105 @@
+import hashlib
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.core.cache import caches
+from apps.blockchain.singleflight import SingleFlight
+from .projections import PERCENTILES, simulate
+
+CACHE_KEY_PREFIX = 'portfolio-sim:'
+
+# Identical simulations requested at the same time run once
+flights = SingleFlight()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def executor():
+    """
+    Process pool simulations run in, started on first use; None when
+    PORTFOLIO_SIMULATION_WORKERS is 0 and they run in the request thread.
+
+    Workers are spawned rather than forked: the web worker has threads
+    (RPC hedging, receipt watchers) whose locks a fork could copy mid-use.
+    They only import NumPy and the projection engine.
+    """
+    global _executor
+    if settings.PORTFOLIO_SIMULATION_WORKERS <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PORTFOLIO_SIMULATION_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executor
+
+
+def fingerprint(holdings, years, paths, seed):
+    """
+    Key of everything a simulation's result depends on: each position's
+    principal and its reactor's parameters, the horizon, paths and seed.
+    Users holding the same amounts in the same reactors share it.
+    """
+    payload = json.dumps([
+        [
+            [holding['reactor_name'], str(holding['principal']), str(holding['annual_roi_rate']),
+             str(holding['roi_volatility']), str(holding['market_correlation'])]
+            for holding in holdings
+        ],
+        years, paths, seed,
+    ])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def run(holdings, years, paths, seed):
+    """
+    Simulate a portfolio from its positions, reusing a cached result for the
+    same fingerprint.
+
+    Raises:
+        concurrent.futures.TimeoutError: the pool gave no result within
+        PORTFOLIO_SIMULATION_TIMEOUT seconds
+
+    Returns:
+        tuple: (result, cached). result has a band per year (year, mean and a
+        value per percentile) and loss_probability.
+    """
+    cache = caches[settings.PORTFOLIO_SIMULATION_CACHE_ALIAS]
+    key = CACHE_KEY_PREFIX + fingerprint(holdings, years, paths, seed)
+    result = cache.get(key)
+    if result is not None:
+        return result, True
+
+    def compute():
+        args = (
+            [float(holding['principal']) for holding in holdings],
+            [float(holding['annual_roi_rate']) for holding in holdings],
+            [float(holding['roi_volatility']) for holding in holdings],
+            [float(holding['market_correlation']) for holding in holdings],
+            years, paths, seed,
+        )
+        pool = executor()
+        if pool is None:
+            simulated = simulate(*args)
+        else:
+            simulated = pool.submit(simulate, *args).result(timeout=settings.PORTFOLIO_SIMULATION_TIMEOUT)
+        mean = simulated['mean'].tolist()
+        result = {
+            'bands': [
+                {
+                    'year': year + 1,
+                    'mean': mean[year],
+                    **{f'p{percentile}': value for percentile, value in zip(PERCENTILES, row)},
+                }
+                for year, row in enumerate(simulated['percentiles'].tolist())
+            ],
+            'loss_probability': simulated['loss_probability'],
+        }
+        cache.set(key, result, settings.PORTFOLIO_SIMULATION_CACHE_TTL)
+        return result
+
+    return flights.do(key, compute), False
@@ -0,0 +1,124 @@
+from decimal import Decimal
+from unittest.mock import patch
+import numpy as np
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.investments.allocation import CARBON_SCORE, ROI_SCORE, solve
+from apps.reactors.models import Reactor
+
+
+class SolveTest(SimpleTestCase):
+    def setUp(self):
+        self.matrix = np.zeros((3, 5))
+        self.matrix[:, ROI_SCORE] = [1, 0.5, -0.25]
+        self.matrix[:, CARBON_SCORE] = [0.2, 0.4, 1]
+
+    def test_fills_best_score_first(self):
+        amounts = solve(self.matrix, 1500, 1, np.array([1000, 1000, 1000]))
+
+        np.testing.assert_array_equal(amounts, [1000, 500, 0])
+
+    def test_weight_moves_towards_carbon(self):
+        amounts = solve(self.matrix, 1500, 0, np.array([1000, 1000, 1000]))
+
+        np.testing.assert_array_equal(amounts, [0, 500, 1000])
+
+    def test_leaves_budget_unspent_rather_than_lose(self):
+        amounts = solve(self.matrix, 5000, 1, np.array([1000, 1000, 1000]))
+
+        np.testing.assert_array_equal(amounts, [1000, 1000, 0])
+
+    def test_matches_brute_force(self):
+        """Test that no split on a 50 $NUC grid beats the solver's objective"""
+        rng = np.random.default_rng(0)
+        limits = np.array([300, 200, 250])
+        grid = [(a, b, c) for a in range(0, 301, 50) for b in range(0, 201, 50) for c in range(0, 251, 50)
+                if a + b + c <= 500]
+        for weight in rng.uniform(0, 1, 5):
+            score = weight * self.matrix[:, ROI_SCORE] + (1 - weight) * self.matrix[:, CARBON_SCORE]
+            best = max(np.dot(score, split) for split in grid)
+            self.assertGreaterEqual(np.dot(score, solve(self.matrix, 500, weight, limits)) + 1e-9, best)
+
+
+@patch('apps.investments.views.get_blockchain_service')
+class OptimizeViewTest(TestCase):
+    def setUp(self):
+        self.nuwave = self._reactor('NuWave', 'nuwave', '0.0450', '0.8500', '180000', '170000')
+        self.helios = self._reactor('Helios FusionDrive', 'helios_fusiondrive', '-0.0150', '3.1500', '95000', '0')
+        self.phoenix = self._reactor('Phoenix RegenX-7', 'phoenix_regenx7', '0.0680', '1.1500', '150000', '0')
+        self.user = User.objects.create_user(username='investor', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('investment-optimize')
+
+    def _reactor(self, name, slug, roi, carbon, needed, funded):
+        return Reactor.objects.create(
+            name=name,
+            slug=slug,
+            type='SMR',
+            description='Test reactor',
+            location='Test Location',
+            annual_roi_rate=Decimal(roi),
+            carbon_offset_tonnes_co2_per_nuc_per_year=Decimal(carbon),
+            total_funding_needed=Decimal(needed),
+            current_funding=Decimal(funded)
+        )
+
+    def _split(self, response):
+        return {allocation['reactor_name']: Decimal(allocation['amount']) for allocation in response.data['allocations']}
+
+    def test_roi_only_within_capacity(self, mock_get_service):
+        response = self.client.post(self.url, {'budget': '20000', 'roi_weight': 1}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._split(response), {'Phoenix RegenX-7': Decimal('20000')})
+        self.assertEqual(Decimal(response.data['annual_roi']), Decimal('1360'))
+
+        # Phoenix's cap spills over into NuWave, which only has 10,000 left; Helios loses money
+        response = self.client.post(
+            self.url, {'budget': '20000', 'roi_weight': 1, 'caps': {str(self.phoenix.id): '5000'}}, format='json'
+        )
+        self.assertEqual(self._split(response), {'NuWave': Decimal('10000'), 'Phoenix RegenX-7': Decimal('5000')})
+        self.assertEqual(Decimal(response.data['unallocated']), Decimal('5000'))
+
+    def test_carbon_only(self, mock_get_service):
+        response = self.client.post(self.url, {'budget': '1000', 'roi_weight': 0}, format='json')
+
+        self.assertEqual(self._split(response), {'Helios FusionDrive': Decimal('1000')})
+        self.assertEqual(Decimal(response.data['annual_carbon_offset']), Decimal('3150'))
+
+    def test_budget_defaults_to_balance(self, mock_get_service):
+        response = self.client.post(self.url, {}, format='json')
+
+        self.assertEqual(Decimal(response.data['budget']), self.user.profile.balance)
+        self.assertEqual(Decimal(response.data['allocated']), Decimal('25000'))
+
+    def test_budget_over_balance(self, mock_get_service):
+        response = self.client.post(self.url, {'budget': '30000'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('budget', response.data)
+
+    def test_invalid_input(self, mock_get_service):
+        for data in [{'roi_weight': 2}, {'budget': '-5'}, {'caps': {'999': '10'}}, {'caps': {'nuwave': '10'}}]:
+            with self.subTest(data=data):
+                response = self.client.post(self.url, data, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_coefficients_cached_until_a_reactor_changes(self, mock_get_service):
+        data = {'budget': '20000', 'roi_weight': 1}
+        self.client.post(self.url, data, format='json')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, data, format='json')
+        self.assertFalse(any('reactors_reactor' in query['sql'] for query in queries))
+
+        self.phoenix.current_funding = Decimal('140000')
+        self.phoenix.save()
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(self._split(response), {'Phoenix RegenX-7': Decimal('10000'), 'NuWave': Decimal('10000')})
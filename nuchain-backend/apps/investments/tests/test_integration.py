@@ -37,8 +37,8 @@ class InvestmentIntegrationTest(TestCase):
             total_funding_needed=Decimal('150000')
         )
     
-    @patch('apps.users.views.BlockchainService')
-    @patch('apps.investments.views.BlockchainService')
+    @patch('apps.users.views.get_blockchain_service')
+    @patch('apps.investments.views.get_blockchain_service')
     def test_complete_investment_flow(self, mock_investment_blockchain, mock_user_blockchain):
         """Test complete user journey from registration to investment"""
         # Setup user blockchain mock (for registration and reset)
@@ -53,9 +53,11 @@ class InvestmentIntegrationTest(TestCase):
         # Setup investment blockchain mock
         mock_invest_service = MagicMock()
         mock_invest_service.lock_tokens.return_value = '0xlock_tx_hash'
-        mock_invest_service.get_balance.return_value = Decimal('25000')
-        mock_invest_service.get_locked_balance.return_value = Decimal('15000')
-        mock_invest_service.get_available_balance.return_value = Decimal('10000')
+        mock_invest_service.get_all_balances.return_value = {
+            'total': Decimal('25000'),
+            'locked': Decimal('15000'),
+            'available': Decimal('10000')
+        }
         mock_investment_blockchain.return_value = mock_invest_service
         
         # 1. Register a new user
@@ -125,8 +127,11 @@ class InvestmentIntegrationTest(TestCase):
         self.assertEqual(Decimal(one_year['total_roi']), expected_roi)
         
         # 8. Reset wallet - update mock for reset
-        mock_invest_service.get_locked_balance.return_value = Decimal('0')
-        mock_invest_service.get_available_balance.return_value = Decimal('25000')
+        mock_invest_service.get_all_balances.return_value = {
+            'total': Decimal('25000'),
+            'locked': Decimal('0'),
+            'available': Decimal('25000')
+        }
         
         response = self.client.post(reverse('reset-wallet'))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -143,14 +148,14 @@ class InvestmentIntegrationTest(TestCase):
         self.assertEqual(self.reactor1.current_funding, Decimal('0'))
         self.assertEqual(self.reactor2.current_funding, Decimal('0'))
     
-    @patch('apps.users.views.BlockchainService')
-    @patch('apps.investments.views.BlockchainService')
+    @patch('apps.users.views.get_blockchain_service')
+    @patch('apps.investments.views.get_blockchain_service')
     def test_multiple_users_investing_in_same_reactor(self, mock_investment_blockchain, mock_user_blockchain):
         """Test multiple users investing in the same reactor"""
         # Setup mocks
         mock_user_service = MagicMock()
         wallet_counter = [0]
-        def mock_mint():
+        def mock_mint(**kwargs):
             wallet_counter[0] += 1
             return (f'0x{wallet_counter[0]:040d}', f'0xtx{wallet_counter[0]}')
         mock_user_service.mint_signup.side_effect = mock_mint
@@ -201,12 +206,12 @@ class InvestmentIntegrationTest(TestCase):
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['amount_invested'], '2500.00')
     
-    @patch('apps.investments.views.BlockchainService')
-    def test_reactor_capacity_limits(self, mock_blockchain_class):
+    @patch('apps.investments.views.get_blockchain_service')
+    def test_reactor_capacity_limits(self, mock_get_service):
         """Test that reactor capacity limits are enforced across users"""
         mock_service = MagicMock()
         mock_service.lock_tokens.return_value = '0xlock_tx_hash'
-        mock_blockchain_class.return_value = mock_service
+        mock_get_service.return_value = mock_service
         
         # Set reactor close to capacity
         self.reactor1.current_funding = Decimal('179000')
@@ -71,3 +71,20 @@ class InvestmentModelTest(TestCase):
         self.assertFalse(
             Investment.objects.filter(id=investment_id).exists()
         )
+
+    def test_cancel_refunds_onto_current_balances(self):
+        """Test that a cancel adds to balances changed since the investment was loaded, and only once"""
+        stale = Investment.objects.select_related('user__profile', 'reactor').get(id=self.investment.id)
+        self.user.profile.balance = Decimal('12000')
+        self.user.profile.save()
+        self.reactor.current_funding = Decimal('8000')
+        self.reactor.save()
+
+        stale.cancel()
+        stale.cancel()
+
+        self.user.profile.refresh_from_db()
+        self.reactor.refresh_from_db()
+        self.assertEqual(self.user.profile.balance, Decimal('17000'))
+        self.assertEqual(self.reactor.current_funding, Decimal('3000'))
+        self.assertFalse(Investment.objects.filter(id=self.investment.id).exists())
@@ -0,0 +1,205 @@
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.investments.models import Investment, PortfolioPosition
+from apps.investments.portfolio import positions, summarize
+from apps.reactors.models import Reactor
+
+
+class PortfolioEngineTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='investor', password='testpass123')
+        self.nuwave = Reactor.objects.create(
+            name='NuWave',
+            slug='nuwave',
+            type='SMR',
+            description='Test reactor',
+            location='Test Location',
+            annual_roi_rate=Decimal('0.0450'),
+            carbon_offset_tonnes_co2_per_nuc_per_year=Decimal('0.8500'),
+            total_funding_needed=Decimal('180000')
+        )
+        self.helios = Reactor.objects.create(
+            name='Helios FusionDrive',
+            slug='helios_fusiondrive',
+            type='Fusion',
+            description='Test reactor',
+            location='Test Location',
+            annual_roi_rate=Decimal('-0.0200'),
+            carbon_offset_tonnes_co2_per_nuc_per_year=Decimal('1.5000'),
+            total_funding_needed=Decimal('500000')
+        )
+
+    def _invest(self, reactor, *amounts):
+        investments = Investment.objects.bulk_create([
+            Investment(user=self.user, reactor=reactor, amount_invested=Decimal(amount)) for amount in amounts
+        ])
+        for investment in investments:
+            PortfolioPosition.record(investment)
+
+    def test_positions_grouped_per_reactor(self):
+        self._invest(self.nuwave, '1000', '2500.50')
+        self._invest(self.helios, '400')
+
+        holdings = positions(self.user)
+
+        self.assertEqual([(h['reactor_name'], h['principal'], h['investment_count']) for h in holdings], [
+            ('Helios FusionDrive', Decimal('400'), 1),
+            ('NuWave', Decimal('3500.50'), 2),
+        ])
+
+    def test_summary_matches_per_investment_projection(self):
+        """Test that per-reactor projections equal the sum of each investment's own projection"""
+        self._invest(self.nuwave, '1000', '2500.50')
+        self._invest(self.helios, '400')
+
+        summary = summarize(positions(self.user))
+
+        self.assertEqual(summary['total_invested'], Decimal('3900.50'))
+        self.assertEqual(summary['investment_count'], 3)
+        for projection in summary['projections']:
+            years = projection['time_period_years']
+            expected_roi = sum(
+                Decimal(str(investment.reactor.calculate_roi_projection(investment.amount_invested, years)))
+                for investment in Investment.objects.filter(user=self.user)
+            )
+            self.assertAlmostEqual(projection['total_roi'], expected_roi, places=6)
+            self.assertEqual(projection['total_return'], summary['total_invested'] + projection['total_roi'])
+        self.assertEqual([p['time_period_years'] for p in summary['projections']], [1, 2, 5, 10])
+
+    def test_cancel_and_reset_update_positions(self):
+        self._invest(self.nuwave, '1000', '2500')
+        self._invest(self.helios, '400')
+
+        Investment.objects.get(reactor=self.nuwave, amount_invested=Decimal('2500')).cancel()
+        position = PortfolioPosition.objects.get(user=self.user, reactor=self.nuwave)
+        self.assertEqual((position.principal, position.investment_count), (Decimal('1000'), 1))
+
+        Investment.objects.get(reactor=self.helios).cancel()
+        self.assertFalse(PortfolioPosition.objects.filter(reactor=self.helios).exists())
+
+        self.user.profile.reset_wallet()
+        self.assertFalse(PortfolioPosition.objects.filter(user=self.user).exists())
+
+    def test_investments_cannot_be_changed_behind_positions(self):
+        """Test that the API and admin offer no delete or edit that would skip PortfolioPosition"""
+        self._invest(self.nuwave, '1000')
+        investment = Investment.objects.get()
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        url = reverse('investment-detail', args=[investment.id])
+
+        for method in ('delete', 'put', 'patch'):
+            with self.subTest(method=method):
+                response = getattr(client, method)(url, {'amount_invested': '5'}, format='json')
+                self.assertEqual(response.status_code, 405)
+        self.assertTrue(Investment.objects.filter(id=investment.id).exists())
+        position = PortfolioPosition.objects.get(user=self.user, reactor=self.nuwave)
+        self.assertEqual(position.principal, Decimal('1000'))
+
+        admin_user = User.objects.create_superuser(username='admin', password='testpass123')
+        client.force_login(admin_user)
+        for name, pk in (('investment', investment.id), ('portfolioposition', position.id)):
+            with self.subTest(admin=name):
+                response = client.post(reverse(f'admin:investments_{name}_change', args=[pk]), {'principal': '5'})
+                self.assertEqual(response.status_code, 403)
+        position.refresh_from_db()
+        self.assertEqual(position.principal, Decimal('1000'))
+
+    def test_admin_deletes_keep_positions_in_step(self):
+        """Test that admin deletes of investments, positions, users and reactors leave positions matching"""
+        self._invest(self.nuwave, '1000', '2500')
+        self._invest(self.helios, '400')
+        client = APIClient()
+        client.force_login(User.objects.create_superuser(username='admin', password='testpass123'))
+
+        investment = Investment.objects.get(amount_invested=Decimal('2500'))
+        response = client.post(reverse('admin:investments_investment_delete', args=[investment.id]), {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        position = PortfolioPosition.objects.get(reactor=self.nuwave)
+        self.assertEqual((position.principal, position.investment_count), (Decimal('1000'), 1))
+
+        # A position with investments behind it is rebuilt from them
+        response = client.post(reverse('admin:investments_portfolioposition_delete', args=[position.id]), {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(PortfolioPosition.objects.get(reactor=self.nuwave).principal, Decimal('1000'))
+
+        response = client.post(reverse('admin:reactors_reactor_delete', args=[self.helios.id]), {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        response = client.post(reverse('admin:auth_user_delete', args=[self.user.id]), {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Investment.objects.exists())
+        self.assertFalse(PortfolioPosition.objects.exists())
+
+    @patch('apps.investments.views.get_blockchain_service')
+    def test_summary_queries_do_not_grow_with_investments(self, mock_get_service):
+        """Test that portfolio_summary issues the same queries for 2 investments as for 200"""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        url = reverse('investment-portfolio-summary')
+
+        self._invest(self.nuwave, '100')
+        self._invest(self.helios, '100')
+        with CaptureQueriesContext(connection) as few:
+            client.get(url)
+
+        self._invest(self.nuwave, *['100'] * 99)
+        self._invest(self.helios, *['100'] * 99)
+        with CaptureQueriesContext(connection) as many:
+            response = client.get(url)
+
+        self.assertEqual(response.data['investment_count'], 200)
+        self.assertEqual(len(many), len(few))
+
+
+class PortfolioPositionsCommandTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='investor', password='testpass123')
+        self.reactors = [
+            Reactor.objects.create(
+                name=name,
+                slug=slug,
+                type='SMR',
+                description='Test reactor',
+                location='Test Location',
+                annual_roi_rate=Decimal('0.0450'),
+                carbon_offset_tonnes_co2_per_nuc_per_year=Decimal('0.8500'),
+                total_funding_needed=Decimal('180000')
+            )
+            for name, slug in [('NuWave', 'nuwave'), ('Fermi-III', 'fermi_iii'), ('Nexus CORE', 'nexus_core')]
+        ]
+        for reactor in self.reactors[:2]:
+            PortfolioPosition.record(
+                Investment.objects.create(user=self.user, reactor=reactor, amount_invested=Decimal('1000'))
+            )
+        # Out of step three ways: wrong totals, a missing position and a stray one
+        PortfolioPosition.objects.filter(reactor=self.reactors[0]).update(principal=Decimal('5'))
+        PortfolioPosition.objects.filter(reactor=self.reactors[1]).delete()
+        stray = PortfolioPosition.objects.get(reactor=self.reactors[0])
+        stray.pk, stray.reactor = None, self.reactors[2]
+        stray.save()
+
+    def test_verify_reports_without_changing(self):
+        out = StringIO()
+        call_command('portfolio_positions', '--verify', stdout=out)
+
+        self.assertIn('found 3 positions out of step', out.getvalue())
+        self.assertEqual(PortfolioPosition.objects.get(reactor=self.reactors[0]).principal, Decimal('5'))
+
+    def test_rebuild_matches_investments(self):
+        call_command('portfolio_positions', stdout=StringIO())
+
+        self.assertEqual(
+            sorted(PortfolioPosition.objects.values_list('reactor__name', 'principal', 'investment_count')),
+            [('Fermi-III', Decimal('1000'), 1), ('NuWave', Decimal('1000'), 1)]
+        )
+        out = StringIO()
+        call_command('portfolio_positions', '--verify', stdout=out)
+        self.assertIn('found 0 positions out of step', out.getvalue())
@@ -0,0 +1,117 @@
+from decimal import Decimal
+from unittest.mock import patch
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.investments.models import Investment, PortfolioPosition
+from apps.investments.projections import COMPOUND, SIMPLE, parse_horizons, project
+from apps.reactors.models import Reactor
+
+
+class ProjectTest(SimpleTestCase):
+    def test_simple_matches_reactor_projection(self):
+        """Test that simple growth is the annual rate times the years, for every portfolio and horizon"""
+        principal = [[1000, 0], [2500, 400]]
+        years = [1 / 12, 1, 2.5, 30]
+
+        result = project(principal, [0.045, -0.02], [0.85, 1.5], years, SIMPLE)
+
+        self.assertEqual(result['total_roi'].shape, (2, 4))
+        expected_roi = np.array([[45 * y for y in years], [(112.5 - 8) * y for y in years]])
+        np.testing.assert_allclose(result['total_roi'], expected_roi)
+        np.testing.assert_allclose(result['total_return'], expected_roi + [[1000], [2900]])
+        np.testing.assert_allclose(result['total_carbon_offset'][1], [(2125 + 600) * y for y in years])
+        np.testing.assert_allclose(result['roi_percentage'][0], [4.5 * y for y in years])
+
+    def test_compound_reinvests_yearly(self):
+        result = project([1000, 400], [0.05, -0.02], [0.85, 1.5], [1, 10], COMPOUND)
+
+        expected_total = [1000 * 1.05 + 400 * 0.98, 1000 * 1.05 ** 10 + 400 * 0.98 ** 10]
+        np.testing.assert_allclose(result['total_return'][0], expected_total)
+        np.testing.assert_allclose(result['total_roi'][0], np.array(expected_total) - 1400)
+        # One year of compounding is the same as one year of simple interest
+        np.testing.assert_allclose(
+            result['total_roi'][0][0], project([1000, 400], [0.05, -0.02], [0, 0], [1], SIMPLE)['total_roi'][0][0]
+        )
+        # Carbon accrues on the principal, not the reinvested returns
+        np.testing.assert_allclose(result['total_carbon_offset'][0], [1450, 14500])
+
+    def test_compound_loss_stops_at_principal(self):
+        result = project([1000], [-1.5], [0], [2], COMPOUND)
+
+        self.assertEqual(result['total_return'][0][0], 0)
+
+    def test_empty_portfolio_has_zero_percentage(self):
+        result = project([[0, 0]], [0.05, 0.04], [1, 1], [1, 5], SIMPLE)
+
+        np.testing.assert_array_equal(result['roi_percentage'], [[0, 0]])
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            project([1000], [0.05], [1], [1], 'continuous')
+
+
+class ParseHorizonsTest(SimpleTestCase):
+    def test_years_and_months(self):
+        self.assertEqual(parse_horizons('10, 1,18m,2.5,1'), [12, 18, 30, 120])
+        self.assertEqual(parse_horizons('monthly'), list(range(1, 361)))
+
+    def test_rejects_bad_horizons(self):
+        for value in ['abc', '1.3', '0', '31', '361m', '', '1,,2']:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_horizons(value)
+
+
+@patch('apps.investments.views.get_blockchain_service')
+class PortfolioSummaryHorizonsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='investor', password='testpass123')
+        self.reactor = Reactor.objects.create(
+            name='NuWave',
+            slug='nuwave',
+            type='SMR',
+            description='Test reactor',
+            location='Test Location',
+            annual_roi_rate=Decimal('0.0500'),
+            carbon_offset_tonnes_co2_per_nuc_per_year=Decimal('0.8500'),
+            total_funding_needed=Decimal('180000')
+        )
+        PortfolioPosition.record(
+            Investment.objects.create(user=self.user, reactor=self.reactor, amount_invested=Decimal('1000'))
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('investment-portfolio-summary')
+
+    def test_default_horizons(self, mock_get_service):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['mode'], SIMPLE)
+        self.assertEqual([p['time_period_years'] for p in response.data['projections']], [1, 2, 5, 10])
+
+    def test_monthly_compound(self, mock_get_service):
+        response = self.client.get(self.url, {'horizons': '6m,2', 'mode': 'compound'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        half_year, two_years = response.data['projections']
+        self.assertEqual((half_year['time_period_years'], half_year['time_period_months']), (0.5, 6))
+        self.assertEqual(Decimal(half_year['total_return']), Decimal(str(round(1000 * 1.05 ** 0.5, 2))))
+        self.assertEqual(Decimal(two_years['total_roi']), Decimal('102.50'))
+        self.assertEqual(Decimal(two_years['total_carbon_offset']), Decimal('1700'))
+
+    def test_full_monthly_grid(self, mock_get_service):
+        response = self.client.get(self.url, {'horizons': 'monthly'})
+
+        self.assertEqual(len(response.data['projections']), 360)
+        self.assertEqual(response.data['projections'][0]['time_period_years'], 0.0833)
+        self.assertEqual(Decimal(response.data['projections'][-1]['total_roi']), Decimal('1500'))
+
+    def test_invalid_parameters(self, mock_get_service):
+        for params in [{'mode': 'continuous'}, {'horizons': '40'}, {'horizons': 'soon'}]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('error', response.data)
@@ -0,0 +1,137 @@
+from decimal import Decimal
+from unittest.mock import patch
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.investments import simulation
+from apps.investments.models import Investment, PortfolioPosition
+from apps.investments.projections import simulate
+from apps.reactors.models import Reactor
+
+
+class SimulateTest(SimpleTestCase):
+    def test_without_volatility_every_path_compounds_the_rate(self):
+        result = simulate([1000, 400], [0.05, -0.02], [0, 0], [0.5, 0.5], years=3, paths=200, seed=1)
+
+        expected = [1000 * 1.05 ** year + 400 * 0.98 ** year for year in (1, 2, 3)]
+        np.testing.assert_allclose(result['percentiles'], np.repeat(np.array(expected)[:, None], 5, axis=1))
+        np.testing.assert_allclose(result['mean'], expected)
+        self.assertEqual(result['loss_probability'], 0)
+
+    def test_seed_reproducible(self):
+        args = ([1000, 400], [0.05, -0.02], [0.1, 0.3], [0.5, 0.2])
+
+        first = simulate(*args, years=5, paths=1000, seed=7)
+        again = simulate(*args, years=5, paths=1000, seed=7)
+        other = simulate(*args, years=5, paths=1000, seed=8)
+
+        np.testing.assert_array_equal(first['percentiles'], again['percentiles'])
+        self.assertFalse(np.array_equal(first['percentiles'], other['percentiles']))
+
+    def test_bands_widen_and_order(self):
+        result = simulate([1000], [0.04], [0.2], [0], years=10, paths=20000, seed=0)
+
+        bands = result['percentiles']
+        self.assertTrue((np.diff(bands, axis=1) > 0).all())
+        self.assertGreater(bands[-1, -1] - bands[-1, 0], bands[0, -1] - bands[0, 0])
+        # The mean of a year's growth is the annual rate
+        self.assertAlmostEqual(result['mean'][0], 1040, delta=5)
+        self.assertGreater(result['loss_probability'], 0)
+
+    def test_correlation_widens_portfolio_spread(self):
+        """Test that two reactors moving together spread the portfolio more than independent ones"""
+        args = ([1000, 1000], [0.04, 0.04], [0.2, 0.2])
+
+        independent = simulate(*args, [0, 0], years=1, paths=20000, seed=0)['percentiles'][0]
+        correlated = simulate(*args, [1, 1], years=1, paths=20000, seed=0)['percentiles'][0]
+
+        self.assertGreater(correlated[-1] - correlated[0], (independent[-1] - independent[0]) * 1.3)
+
+
+@patch('apps.investments.views.get_blockchain_service')
+class RiskSimulationViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.reactor = Reactor.objects.create(
+            name='Helios FusionDrive',
+            slug='helios_fusiondrive',
+            type='Fusion',
+            description='Test reactor',
+            location='Test Location',
+            annual_roi_rate=Decimal('-0.0150'),
+            carbon_offset_tonnes_co2_per_nuc_per_year=Decimal('3.1500'),
+            roi_volatility=Decimal('0.1200'),
+            market_correlation=Decimal('0.2000'),
+            total_funding_needed=Decimal('95000')
+        )
+        self.user = self._investor('investor')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('investment-risk-simulation')
+
+    def _investor(self, username):
+        user = User.objects.create_user(username=username, password='testpass123')
+        PortfolioPosition.record(
+            Investment.objects.create(user=user, reactor=self.reactor, amount_invested=Decimal('1000'))
+        )
+        return user
+
+    def test_bands_per_year(self, mock_get_service):
+        response = self.client.get(self.url, {'years': 5, 'paths': 2000, 'seed': 3})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Decimal(response.data['total_invested']), Decimal('1000'))
+        self.assertEqual([band['year'] for band in response.data['bands']], [1, 2, 3, 4, 5])
+        last = response.data['bands'][-1]
+        self.assertLess(Decimal(last['p5']), Decimal(last['p50']))
+        self.assertLess(Decimal(last['p50']), Decimal(last['p95']))
+        self.assertGreater(Decimal(response.data['loss_probability']), Decimal('0.5'))
+        self.assertFalse(response.data['cached'])
+
+    def test_cached_by_portfolio_fingerprint(self, mock_get_service):
+        first = self.client.get(self.url, {'paths': 1000})
+
+        # Another user with the same holdings reuses the result
+        self.client.force_authenticate(user=self._investor('twin'))
+        with patch('apps.investments.simulation.simulate') as mock_simulate:
+            twin = self.client.get(self.url, {'paths': 1000})
+        mock_simulate.assert_not_called()
+        self.assertTrue(twin.data['cached'])
+        self.assertEqual(twin.data['bands'], first.data['bands'])
+
+        # A different seed or reactor parameters do not
+        self.assertFalse(self.client.get(self.url, {'paths': 1000, 'seed': 1}).data['cached'])
+        Reactor.objects.filter(pk=self.reactor.pk).update(roi_volatility=Decimal('0.0500'))
+        self.assertFalse(self.client.get(self.url, {'paths': 1000}).data['cached'])
+
+    def test_process_pool_matches_inline(self, mock_get_service):
+        inline = self.client.get(self.url, {'paths': 1000, 'years': 3})
+        cache.clear()
+
+        with override_settings(PORTFOLIO_SIMULATION_WORKERS=1):
+            # Cleanups run last first: shut the pool down, then forget it
+            self.addCleanup(setattr, simulation, '_executor', None)
+            self.addCleanup(lambda: simulation._executor and simulation._executor.shutdown())
+            pooled = self.client.get(self.url, {'paths': 1000, 'years': 3})
+
+        self.assertIsNotNone(simulation._executor)
+        self.assertEqual(pooled.data['bands'], inline.data['bands'])
+
+    def test_empty_portfolio(self, mock_get_service):
+        self.client.force_authenticate(user=User.objects.create_user(username='new', password='testpass123'))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['bands'], [])
+        self.assertEqual(response.data['years'], 10)
+
+    def test_invalid_parameters(self, mock_get_service):
+        for params in [{'years': 0}, {'years': 31}, {'paths': 10}, {'paths': 10 ** 6}, {'seed': -1}, {'seed': 'x'}]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('error', response.data)
@@ -1,3 +1,4 @@
+from concurrent.futures import Future
 from unittest.mock import patch, MagicMock
 from django.test import TestCase
 from django.urls import reverse
@@ -5,8 +6,10 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
 from decimal import Decimal
-from apps.investments.models import Investment
+from apps.investments.models import Investment, PortfolioPosition
 from apps.reactors.models import Reactor
+from apps.blockchain.exceptions import DeadlineExceeded, InsufficientBalanceError
+from web3.datastructures import AttributeDict
 
 
 class InvestmentViewSetTest(TestCase):
@@ -48,6 +51,7 @@ class InvestmentViewSetTest(TestCase):
             reactor=self.reactor,
             amount_invested=Decimal('5000')
         )
+        PortfolioPosition.record(self.investment)
         
         # Update reactor funding
         self.reactor.current_funding = Decimal('5000')
@@ -75,12 +79,12 @@ class InvestmentViewSetTest(TestCase):
             self.user1.username
         )
     
-    @patch('apps.investments.views.BlockchainService')
-    def test_create_investment_success(self, mock_blockchain_class):
+    @patch('apps.investments.views.get_blockchain_service')
+    def test_create_investment_success(self, mock_get_service):
         """Test successful investment creation with token locking"""
         mock_service = MagicMock()
         mock_service.lock_tokens.return_value = '0xabcdef1234567890abcdef1234567890abcdef1234567890abcdef1234567890'
-        mock_blockchain_class.return_value = mock_service
+        mock_get_service.return_value = mock_service
         
         url = reverse('investment-list')
         data = {
@@ -105,6 +109,11 @@ class InvestmentViewSetTest(TestCase):
         self.user1.profile.refresh_from_db()
         self.assertEqual(self.user1.profile.balance, Decimal('15000'))
         
+        # Check portfolio position updated
+        position = PortfolioPosition.objects.get(user=self.user1, reactor=self.reactor)
+        self.assertEqual(position.principal, Decimal('15000'))
+        self.assertEqual(position.investment_count, 2)
+        
         mock_service.lock_tokens.assert_called_once()
     
     def test_create_investment_insufficient_balance(self):
@@ -120,6 +129,90 @@ class InvestmentViewSetTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('Insufficient balance', str(response.data))
     
+    @patch('apps.investments.views.get_blockchain_service')
+    def test_create_investment_rejected_on_chain(self, mock_get_service):
+        """Test that a lock the preflight simulation rejects returns 400 and changes nothing"""
+        mock_service = MagicMock()
+        mock_service.lock_tokens.side_effect = InsufficientBalanceError(
+            'Insufficient balance: execution reverted: Insufficient unlocked balance'
+        )
+        mock_get_service.return_value = mock_service
+        
+        url = reverse('investment-list')
+        data = {
+            'reactor_id': self.reactor.id,
+            'amount_invested': '10000'
+        }
+        
+        response = self.client.post(url, data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Insufficient unlocked balance', response.data['error'])
+        self.user1.profile.refresh_from_db()
+        self.assertEqual(self.user1.profile.balance, Decimal('25000'))
+        self.assertEqual(Investment.objects.filter(user=self.user1).count(), 1)
+    
+    @patch('apps.investments.views.get_blockchain_service')
+    def test_create_investment_pending_past_deadline(self, mock_get_service):
+        """Test that a lock still unmined at the deadline answers 202 and is undone if it then fails"""
+        receipt = Future()
+        mock_get_service.return_value.lock_tokens.side_effect = DeadlineExceeded(
+            'Request deadline exceeded', tx_hash='0xabc', receipt=receipt
+        )
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('investment-list'),
+                {'reactor_id': self.reactor.id, 'amount_invested': '10000'},
+                format='json'
+            )
+        
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['tx_hash'], '0xabc')
+        self.assertEqual(Investment.objects.filter(user=self.user1).count(), 2)
+        
+        receipt.set_result(AttributeDict({'status': 0}))
+        
+        self.assertEqual(Investment.objects.filter(user=self.user1).count(), 1)
+        self.user1.profile.refresh_from_db()
+        self.assertEqual(self.user1.profile.balance, Decimal('25000'))
+    
+    @patch('apps.investments.views.get_blockchain_service')
+    def test_pending_investment_removed_before_lock_fails(self, mock_get_service):
+        """Test that a failed lock whose investment a reset already removed refunds nothing more"""
+        receipt = Future()
+        mock_get_service.return_value.lock_tokens.side_effect = DeadlineExceeded(
+            'Request deadline exceeded', tx_hash='0xabc', receipt=receipt
+        )
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('investment-list'),
+                {'reactor_id': self.reactor.id, 'amount_invested': '10000'},
+                format='json'
+            )
+        self.user1.profile.reset_wallet()
+        
+        # A callback that raises is only logged by the future
+        with self.assertNoLogs('concurrent.futures'):
+            receipt.set_result(AttributeDict({'status': 0}))
+        
+        self.user1.profile.refresh_from_db()
+        self.assertEqual(self.user1.profile.balance, Decimal('25000'))
+    
+    @patch('apps.investments.views.get_blockchain_service')
+    def test_create_investment_deadline_before_broadcast(self, mock_get_service):
+        """Test that running out of time before anything was sent asks the client to retry"""
+        mock_get_service.return_value.lock_tokens.side_effect = DeadlineExceeded('Request deadline exceeded')
+        
+        response = self.client.post(
+            reverse('investment-list'),
+            {'reactor_id': self.reactor.id, 'amount_invested': '10000'},
+            format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+    
     def test_create_investment_exceeds_reactor_capacity(self):
         """Test investment exceeding reactor capacity"""
         # Set reactor close to capacity
@@ -164,14 +257,16 @@ class InvestmentViewSetTest(TestCase):
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
     
-    @patch('apps.investments.views.BlockchainService')
-    def test_portfolio_summary_empty(self, mock_blockchain_class):
+    @patch('apps.investments.views.get_blockchain_service')
+    def test_portfolio_summary_empty(self, mock_get_service):
         """Test portfolio summary with no investments"""
         mock_service = MagicMock()
-        mock_service.get_balance.return_value = Decimal('25000')
-        mock_service.get_locked_balance.return_value = Decimal('0')
-        mock_service.get_available_balance.return_value = Decimal('25000')
-        mock_blockchain_class.return_value = mock_service
+        mock_service.get_all_balances.return_value = {
+            'total': Decimal('25000'),
+            'locked': Decimal('0'),
+            'available': Decimal('25000')
+        }
+        mock_get_service.return_value = mock_service
         
         # Authenticate as user2 (no investments)
         self.client.force_authenticate(user=self.user2)
@@ -187,14 +282,16 @@ class InvestmentViewSetTest(TestCase):
         self.assertIn('wallet', response.data)
         self.assertEqual(response.data['wallet']['available'], '25000')
     
-    @patch('apps.investments.views.BlockchainService')
-    def test_portfolio_summary_with_investments(self, mock_blockchain_class):
+    @patch('apps.investments.views.get_blockchain_service')
+    def test_portfolio_summary_with_investments(self, mock_get_service):
         """Test portfolio summary with investments includes blockchain balances"""
         mock_service = MagicMock()
-        mock_service.get_balance.return_value = Decimal('25000')
-        mock_service.get_locked_balance.return_value = Decimal('13000')
-        mock_service.get_available_balance.return_value = Decimal('12000')
-        mock_blockchain_class.return_value = mock_service
+        mock_service.get_all_balances.return_value = {
+            'total': Decimal('25000'),
+            'locked': Decimal('13000'),
+            'available': Decimal('12000')
+        }
+        mock_get_service.return_value = mock_service
         
         # Create another reactor and investment
         reactor2 = Reactor.objects.create(
@@ -208,11 +305,11 @@ class InvestmentViewSetTest(TestCase):
             total_funding_needed=Decimal('150000')
         )
         
-        Investment.objects.create(
+        PortfolioPosition.record(Investment.objects.create(
             user=self.user1,
             reactor=reactor2,
             amount_invested=Decimal('8000')
-        )
+        ))
         
         url = reverse('investment-portfolio-summary')
         response = self.client.get(url)
@@ -1,22 +1,32 @@
-from rest_framework import viewsets, status
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Sum
+from django.conf import settings
 from django.db import transaction
-from decimal import Decimal
-from .models import Investment
+from django.utils.decorators import method_decorator
+from .models import Investment, PortfolioPosition
 from .serializers import (
+    AllocationRequestSerializer,
+    AllocationSerializer,
     InvestmentSerializer,
     CreateInvestmentSerializer,
-    PortfolioSummarySerializer
+    PortfolioSummarySerializer,
+    RiskSimulationSerializer
 )
-from apps.blockchain.services import BlockchainService
-from apps.blockchain.exceptions import BlockchainError
+from apps.blockchain import get_blockchain_service
+from apps.blockchain.deadlines import SLOW_CHAIN_ERROR, after_receipt
+from apps.blockchain.exceptions import BlockchainError, DeadlineExceeded, InsufficientBalanceError
+from apps.blockchain.idempotency import idempotent
+from apps.blockchain.models import BlockchainTransaction
+from apps.blockchain.outbox import enqueue
 
-class InvestmentViewSet(viewsets.ModelViewSet):
+class InvestmentViewSet(mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet for managing investments
+    ViewSet for managing investments. Investments are only created and
+    cancelled through the chain, which keeps balances, reactor funding and
+    PortfolioPosition in step, so there is no update or delete.
     """
     serializer_class = InvestmentSerializer
     permission_classes = [IsAuthenticated]
@@ -31,6 +41,8 @@ class InvestmentViewSet(viewsets.ModelViewSet):
             return CreateInvestmentSerializer
         return InvestmentSerializer
     
+    # Outside the atomic block so the key is visible to retries while the lock is sent
+    @method_decorator(idempotent)
     @transaction.atomic
     def create(self, request, *args, **kwargs):
         """Create a new investment and lock tokens on blockchain"""
@@ -47,10 +59,25 @@ class InvestmentViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
+            if settings.BLOCKCHAIN_OUTBOX_ENABLED:
+                return self._create_queued(request, reactor, amount, wallet_address)
+            
             try:
                 # 1. Lock tokens on blockchain
-                blockchain = BlockchainService()
-                tx_hash = blockchain.lock_tokens(wallet_address, amount)
+                record = BlockchainTransaction.objects.create(
+                    kind='lock',
+                    user=request.user,
+                    wallet_address=wallet_address
+                )
+                blockchain = get_blockchain_service()
+                try:
+                    tx_hash = blockchain.lock_tokens(wallet_address, amount, record=record)
+                    pending = None
+                except DeadlineExceeded as e:
+                    # Broadcast but not mined in time: answer now, finish when it lands
+                    if e.tx_hash is None:
+                        raise
+                    tx_hash, pending = e.tx_hash, e
                 
                 # 2. Deduct balance in database
                 request.user.profile.deduct_balance(amount)
@@ -61,21 +88,46 @@ class InvestmentViewSet(viewsets.ModelViewSet):
                     reactor=reactor,
                     amount_invested=amount
                 )
+                PortfolioPosition.record(investment)
                 
                 # 4. Update reactor funding
                 reactor.current_funding += amount
                 reactor.save()
                 
                 response_serializer = InvestmentSerializer(investment)
-                return Response({
+                response = {
                     'investment': response_serializer.data,
                     'message': f'Successfully invested {amount:,.2f} $NUC in {reactor.name}',
                     'remaining_balance': float(request.user.profile.balance),
                     'amount_invested': float(amount),
                     'tx_hash': tx_hash,
                     'tx_url': f"https://sepolia.basescan.org/tx/{tx_hash}",
-                }, status=status.HTTP_201_CREATED)
+                    'transaction_id': record.id,
+                }
+                if pending is None:
+                    return Response(response, status=status.HTTP_201_CREATED)
+                
+                def cancel():
+                    # Like the outbox path, a lock that fails on chain cancels the investment,
+                    # unless a reset or another cancel removed it in the meantime
+                    failed = Investment.objects.filter(id=investment.id).first()
+                    if failed is not None:
+                        failed.cancel()
+                
+                after_receipt(pending, on_failed=cancel)
+                return Response({
+                    **response,
+                    'message': f'Investing {amount:,.2f} $NUC in {reactor.name}; tokens are being locked on chain',
+                    'status': record.status,
+                }, status=status.HTTP_202_ACCEPTED)
             
+            except InsufficientBalanceError as e:
+                return Response(
+                    {'error': str(e)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            except DeadlineExceeded:
+                return Response({'error': SLOW_CHAIN_ERROR}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
             except BlockchainError as e:
                 return Response(
                     {'error': f'Blockchain error: {str(e)}'},
@@ -84,26 +136,81 @@ class InvestmentViewSet(viewsets.ModelViewSet):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    def _create_queued(self, request, reactor, amount, wallet_address):
+        """
+        Record the investment and queue the token lock for the outbox worker.
+        The worker cancels the investment if the lock fails on chain.
+        """
+        request.user.profile.deduct_balance(amount)
+        
+        investment = Investment.objects.create(
+            user=request.user,
+            reactor=reactor,
+            amount_invested=amount
+        )
+        PortfolioPosition.record(investment)
+        
+        reactor.current_funding += amount
+        reactor.save()
+        
+        entry = enqueue(
+            'lock',
+            wallet_address,
+            user=request.user,
+            amount=amount,
+            investment_id=investment.id
+        )
+        
+        response_serializer = InvestmentSerializer(investment)
+        return Response({
+            'investment': response_serializer.data,
+            'message': f'Investing {amount:,.2f} $NUC in {reactor.name}; tokens are being locked on chain',
+            'remaining_balance': float(request.user.profile.balance),
+            'amount_invested': float(amount),
+            'transaction_id': entry.transaction_id,
+            'status': entry.status,
+        }, status=status.HTTP_202_ACCEPTED)
+    
     @action(detail=False, methods=['get'])
     def portfolio_summary(self, request):
         """
         Get complete portfolio summary with projections for all time periods (1, 2, 5, 10 years)
-            and blockchain balances.
+            and blockchain balances. Reads one pre-aggregated position per reactor however many investments the user holds.
         GET /api/investments/portfolio_summary/
+        GET /api/investments/portfolio_summary/?horizons=6m,1,2.5,30&mode=compound
+            horizons: comma-separated years or months (18m), or "monthly" for every month up to 30 years
+            mode: simple (default) or compound
         """
-        investments = self.get_queryset()
+        # NumPy loads with the first projection rather than with the URLconf
+        from .portfolio import PROJECTION_YEARS, positions, summarize
+        from .projections import MODES, SIMPLE, parse_horizons
+
+        mode = request.query_params.get('mode', SIMPLE)
+        if mode not in MODES:
+            return Response(
+                {'error': f"mode must be one of: {', '.join(MODES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        years = PROJECTION_YEARS
+        if 'horizons' in request.query_params:
+            try:
+                years = [months / 12 for months in parse_horizons(request.query_params['horizons'])]
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         wallet_address = request.user.profile.wallet_address
         
         # Get blockchain balances
         wallet_data = None
         if wallet_address:
             try:
-                blockchain = BlockchainService()
+                blockchain = get_blockchain_service()
+                balances = blockchain.get_all_balances(wallet_address)
                 wallet_data = {
                     'address': wallet_address,
-                    'total': str(blockchain.get_balance(wallet_address)),
-                    'locked': str(blockchain.get_locked_balance(wallet_address)),
-                    'available': str(blockchain.get_available_balance(wallet_address)),
+                    'total': str(balances['total']),
+                    'locked': str(balances['locked']),
+                    'available': str(balances['available']),
                     'basescan_url': f"https://sepolia.basescan.org/address/{wallet_address}",
                 }
             except BlockchainError:
@@ -116,7 +223,9 @@ class InvestmentViewSet(viewsets.ModelViewSet):
                     'basescan_url': f"https://sepolia.basescan.org/address/{wallet_address}",
                 }
         
-        if not investments.exists():
+        # Pre-aggregated rows, one per reactor; projections are computed per reactor, not per investment
+        holdings = positions(request.user)
+        if not holdings:
             return Response({
                 'total_invested': 0,
                 'investment_count': 0,
@@ -125,45 +234,81 @@ class InvestmentViewSet(viewsets.ModelViewSet):
                 'wallet': wallet_data
             })
         
-        total_invested = investments.aggregate(
-            total=Sum('amount_invested')
-        )['total'] or Decimal('0')
-        
-        reactors_invested_in = list(
-            investments.values_list('reactor__name', flat=True).distinct()
-        )
-        
-        time_periods = [1, 2, 5, 10]
-        projections = []
-        
-        for years in time_periods:
-            total_roi = Decimal('0')
-            total_carbon_offset = Decimal('0')
-            
-            for investment in investments:
-                total_roi += Decimal(str(investment.reactor.calculate_roi_projection(investment.amount_invested, years)))
-                total_carbon_offset += Decimal(str(investment.reactor.calculate_carbon_offset_projection(investment.amount_invested, years)))
-            
-            total_return = total_invested + total_roi
-            roi_percentage = (total_roi / total_invested * 100) if total_invested > 0 else Decimal('0')
-            
-            projections.append({
-                'time_period_years': years,
-                'total_roi': total_roi,
-                'total_carbon_offset': total_carbon_offset,
-                'total_return': total_return,
-                'roi_percentage': roi_percentage
-            })
-        
-        summary_data = {
-            'total_invested': total_invested,
-            'investment_count': investments.count(),
-            'reactors_invested_in': reactors_invested_in,
-            'projections': projections
-        }
+        summary_data = summarize(holdings, years, mode)
         
         serializer = PortfolioSummarySerializer(summary_data)
         return Response({
             **serializer.data,
             'wallet': wallet_data
-        })
\ No newline at end of file
+        })
+    
+    @action(detail=False, methods=['get'])
+    def risk_simulation(self, request):
+        """
+        Monte Carlo simulation of the user's portfolio: percentile bands of its value at the end of each year,
+            from yearly ROI drawn around each reactor's rate with its volatility and market correlation.
+            Results are cached per portfolio, horizon, paths and seed; the same inputs always give the same bands.
+        GET /api/investments/risk_simulation/?years=10&paths=10000&seed=0
+        """
+        from .portfolio import positions
+        from .projections import MAX_HORIZON_MONTHS
+        from .simulation import run as run_simulation
+
+        limits = {
+            'years': (10, 1, MAX_HORIZON_MONTHS // 12),
+            'paths': (10000, 100, settings.PORTFOLIO_SIMULATION_MAX_PATHS),
+            'seed': (0, 0, 2 ** 32 - 1),
+        }
+        params = {}
+        for name, (default, low, high) in limits.items():
+            value = request.query_params.get(name, str(default))
+            if not value.isdigit() or not low <= int(value) <= high:
+                return Response(
+                    {'error': f'{name} must be a whole number from {low} to {high}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            params[name] = int(value)
+
+        holdings = positions(request.user)
+        if not holdings:
+            return Response({
+                'total_invested': 0,
+                **params,
+                'loss_probability': 0,
+                'bands': [],
+                'cached': False
+            })
+
+        try:
+            result, cached = run_simulation(holdings, **params)
+        except FutureTimeoutError:
+            return Response(
+                {'error': 'The simulation is taking too long. Please try again or ask for fewer paths.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        serializer = RiskSimulationSerializer({
+            'total_invested': sum(holding['principal'] for holding in holdings),
+            **params,
+            **result,
+            'cached': cached,
+        })
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['post'])
+    def optimize(self, request):
+        """
+        Suggest how to split a budget across reactors, weighing ROI against carbon offset (roi_weight 1 is ROI
+            only, 0 carbon only), within each reactor's remaining funding, optional caps by reactor id and the
+            user's balance. Nothing is invested.
+        POST /api/investments/optimize/
+        {"budget": 10000, "roi_weight": 0.7, "caps": {"3": 2500}}
+        """
+        from .allocation import allocate
+
+        serializer = AllocationRequestSerializer(data=request.data, context={'request': request})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        allocation = allocate(**serializer.validated_data)
+        return Response(AllocationSerializer(allocation).data)
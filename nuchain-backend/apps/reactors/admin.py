@@ -20,7 +20,7 @@ class ReactorAdmin(admin.ModelAdmin):
             'fields': ('name', 'slug', 'description', 'location', 'is_active')
         }),
         ('Investment Parameters', {
-            'fields': ('annual_roi_rate', 'carbon_offset_tonnes_co2_per_nuc_per_year')
+            'fields': ('annual_roi_rate', 'carbon_offset_tonnes_co2_per_nuc_per_year', 'roi_volatility', 'market_correlation')
         }),
         ('Capacity', {
             'fields': ('total_capacity', 'current_funding')
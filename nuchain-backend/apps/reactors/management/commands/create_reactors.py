@@ -15,6 +15,8 @@ class Command(BaseCommand):
                 'location': 'Cascadia Basin, Washington, USA',
                 'annual_roi_rate': Decimal('0.0450'),
                 'carbon_offset_tonnes_co2_per_nuc_per_year': Decimal('0.8500'),
+                'roi_volatility': Decimal('0.0200'),
+                'market_correlation': Decimal('0.5000'),
                 'total_funding_needed': 180000,
                 'display_order': 1
             },
@@ -26,6 +28,8 @@ class Command(BaseCommand):
                 'location': 'Tokamak Research, Kagoshima Prefecture, Japan',
                 'annual_roi_rate': Decimal('-0.0150'),
                 'carbon_offset_tonnes_co2_per_nuc_per_year': Decimal('3.1500'),
+                'roi_volatility': Decimal('0.1200'),
+                'market_correlation': Decimal('0.2000'),
                 'total_funding_needed': 95000,
                 'display_order': 2
             },
@@ -37,6 +41,8 @@ class Command(BaseCommand):
                 'location': 'La Drôme Nucléaire, Normandy, France',
                 'annual_roi_rate': Decimal('0.0680'),
                 'carbon_offset_tonnes_co2_per_nuc_per_year': Decimal('1.15000'),
+                'roi_volatility': Decimal('0.0600'),
+                'market_correlation': Decimal('0.5000'),
                 'total_funding_needed': 150000,
                 'display_order': 3
             },
@@ -48,6 +54,8 @@ class Command(BaseCommand):
                 'location': 'Cobalt Energy Complex, Ontario, Canada',
                 'annual_roi_rate': Decimal('0.0220'),
                 'carbon_offset_tonnes_co2_per_nuc_per_year': Decimal('1.8500'),
+                'roi_volatility': Decimal('0.0300'),
+                'market_correlation': Decimal('0.6000'),
                 'total_funding_needed': 160000,
                 'display_order': 4
             },
@@ -59,6 +67,8 @@ class Command(BaseCommand):
                 'location': 'Frontera Energética del Sur, Mendoza, Argentina',
                 'annual_roi_rate': Decimal('0.0420'),
                 'carbon_offset_tonnes_co2_per_nuc_per_year': Decimal('1.6000'),
+                'roi_volatility': Decimal('0.0900'),
+                'market_correlation': Decimal('0.3000'),
                 'total_funding_needed': 175000,
                 'display_order': 5
             },
@@ -70,6 +80,8 @@ class Command(BaseCommand):
                 'location': 'NeueTech District, Hamburg, Germany',
                 'annual_roi_rate': Decimal('0.0380'),
                 'carbon_offset_tonnes_co2_per_nuc_per_year': Decimal('1.4000'),
+                'roi_volatility': Decimal('0.0400'),
+                'market_correlation': Decimal('0.6000'),
                 'total_funding_needed': 220000,
                 'display_order': 6
             }
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 06:31
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reactors', '0003_reactor_display_order_alter_reactor_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reactor',
+            name='market_correlation',
+            field=models.DecimalField(decimal_places=4, default=Decimal('0.0000'), help_text='Correlation of the yearly ROI with the shared market factor, -1 to 1; two reactors correlate by the product of theirs', max_digits=5, validators=[django.core.validators.MinValueValidator(Decimal('-1.0000')), django.core.validators.MaxValueValidator(Decimal('1.0000'))]),
+        ),
+        migrations.AddField(
+            model_name='reactor',
+            name='roi_volatility',
+            field=models.DecimalField(decimal_places=4, default=Decimal('0.0000'), help_text='Standard deviation of the yearly ROI around annual_roi_rate (ex: 0.0500 = ±5 points)', max_digits=6, validators=[django.core.validators.MinValueValidator(Decimal('0.0000'))]),
+        ),
+    ]
@@ -1,5 +1,5 @@
 from django.db import models
-from django.core.validators import MinValueValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
 from decimal import Decimal
 
 class Reactor(models.Model):
@@ -33,6 +33,23 @@ class Reactor(models.Model):
         help_text="Tonnes of CO₂ offset per $NUC invested per year"
     )
 
+    roi_volatility = models.DecimalField(
+        max_digits=6,
+        decimal_places=4,
+        default=Decimal('0.0000'),
+        validators=[MinValueValidator(Decimal('0.0000'))],
+        help_text="Standard deviation of the yearly ROI around annual_roi_rate (ex: 0.0500 = ±5 points)"
+    )
+
+    market_correlation = models.DecimalField(
+        max_digits=5,
+        decimal_places=4,
+        default=Decimal('0.0000'),
+        validators=[MinValueValidator(Decimal('-1.0000')), MaxValueValidator(Decimal('1.0000'))],
+        help_text="Correlation of the yearly ROI with the shared market factor, -1 to 1; "
+                  "two reactors correlate by the product of theirs"
+    )
+
     total_funding_needed = models.DecimalField(
     max_digits=15, 
     decimal_places=2,
@@ -18,6 +18,8 @@ class ReactorSerializer(serializers.ModelSerializer):
             'location',
             'annual_roi_rate',
             'carbon_offset_tonnes_co2_per_nuc_per_year',
+            'roi_volatility',
+            'market_correlation',
             'total_funding_needed',
             'current_funding',
             'funding_percentage',
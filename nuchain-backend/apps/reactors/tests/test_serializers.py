@@ -25,7 +25,7 @@ class ReactorSerializerTest(TestCase):
         expected_fields = [
             'id', 'name', 'slug', 'type', 'description', 'location',
             'annual_roi_rate', 'carbon_offset_tonnes_co2_per_nuc_per_year',
-            'total_funding_needed', 'current_funding', 'funding_percentage',
+            'roi_volatility', 'market_correlation', 'total_funding_needed', 'current_funding', 'funding_percentage',
             'available_funding', 'is_fully_funded', 'is_active',
             'created_at'
         ]
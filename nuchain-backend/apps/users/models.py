@@ -45,7 +45,7 @@ class UserProfile(models.Model):
     def reset_wallet(self):
         """
         Reset wallet to starting balance of 25,000 $NUC.
-        Clear all investments associated with user and reactor's current investments.
+        Clear all investments associated with user, their portfolio positions and reactor's current investments.
         """
         
         user_investments = self.user.investments.all()
@@ -55,6 +55,7 @@ class UserProfile(models.Model):
             reactor.save()
         
         user_investments.delete()
+        self.user.portfolio_positions.all().delete()
         
         self.balance = Decimal('25000.00')
         self.save()
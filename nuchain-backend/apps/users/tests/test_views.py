@@ -1,4 +1,4 @@
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APIClient
@@ -12,8 +12,8 @@ class UserRegistrationTest(TestCase):
         self.client = APIClient()
         self.register_url = reverse('register')
     
-    @patch('apps.users.views.BlockchainService')
-    def test_successful_registration(self, mock_blockchain_class):
+    @patch('apps.users.views.get_blockchain_service')
+    def test_successful_registration(self, mock_get_service):
         """Test successful user registration with blockchain wallet"""
         # Setup mock
         mock_service = MagicMock()
@@ -21,7 +21,7 @@ class UserRegistrationTest(TestCase):
             '0x1234567890abcdef1234567890abcdef12345678',
             '0xabcdef1234567890abcdef1234567890abcdef1234567890abcdef1234567890'
         )
-        mock_blockchain_class.return_value = mock_service
+        mock_get_service.return_value = mock_service
         
         data = {
             'username': 'newuser',
@@ -224,12 +224,12 @@ class WalletResetTest(TestCase):
         self.client.force_authenticate(user=self.user)
         self.reset_url = reverse('reset-wallet')
     
-    @patch('apps.users.views.BlockchainService')
-    def test_reset_wallet(self, mock_blockchain_class):
+    @patch('apps.users.views.get_blockchain_service')
+    def test_reset_wallet(self, mock_get_service):
         """Test wallet reset functionality with blockchain unlock"""
         mock_service = MagicMock()
         mock_service.reset_portfolio.return_value = '0xabcdef1234567890abcdef1234567890abcdef1234567890abcdef1234567890'
-        mock_blockchain_class.return_value = mock_service
+        mock_get_service.return_value = mock_service
         
         # First reduce balance
         self.user.profile.deduct_balance(Decimal('10000'))
@@ -248,7 +248,8 @@ class WalletResetTest(TestCase):
         self.user.profile.refresh_from_db()
         self.assertEqual(self.user.profile.balance, Decimal('25000'))
         mock_service.reset_portfolio.assert_called_once_with(
-            '0x1234567890abcdef1234567890abcdef12345678'
+            '0x1234567890abcdef1234567890abcdef12345678',
+            record=ANY
         )
     
     def test_reset_wallet_no_wallet_address(self):
@@ -338,12 +339,12 @@ class DeleteAccountTest(TestCase):
         self.client.force_authenticate(user=self.user)
         self.delete_account_url = reverse('delete-account')
     
-    @patch('apps.users.views.BlockchainService')
-    def test_delete_account(self, mock_blockchain_class):
+    @patch('apps.users.views.get_blockchain_service')
+    def test_delete_account(self, mock_get_service):
         """Test account deletion with token burn"""
         mock_service = MagicMock()
         mock_service.burn_account.return_value = '0xabcdef1234567890abcdef1234567890abcdef1234567890abcdef1234567890'
-        mock_blockchain_class.return_value = mock_service
+        mock_get_service.return_value = mock_service
         
         user_id = self.user.id
         
@@ -358,8 +359,8 @@ class DeleteAccountTest(TestCase):
         self.assertFalse(User.objects.filter(id=user_id).exists())
         mock_service.burn_account.assert_called_once()
     
-    @patch('apps.users.views.BlockchainService')
-    def test_delete_account_no_wallet(self, mock_blockchain_class):
+    @patch('apps.users.views.get_blockchain_service')
+    def test_delete_account_no_wallet(self, mock_get_service):
         """Test account deletion when user has no wallet"""
         self.user.profile.wallet_address = None
         self.user.profile.save()
@@ -373,4 +374,4 @@ class DeleteAccountTest(TestCase):
         
         # Verify user still deleted
         self.assertFalse(User.objects.filter(id=user_id).exists())
-        mock_blockchain_class.assert_not_called()
\ No newline at end of file
+        mock_get_service.assert_not_called()
\ No newline at end of file
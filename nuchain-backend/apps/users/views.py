@@ -3,6 +3,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import transaction
 from .serializers import (
@@ -11,8 +12,13 @@ from .serializers import (
     CustomTokenObtainPairSerializer,
     UserUpdateSerializer
 )
-from apps.blockchain.services import BlockchainService
-from apps.blockchain.exceptions import BlockchainError
+from apps.blockchain import get_blockchain_service
+from apps.blockchain.deadlines import SLOW_CHAIN_ERROR, after_receipt
+from apps.blockchain.exceptions import BlockchainError, DeadlineExceeded
+from apps.blockchain.idempotency import idempotent
+from apps.blockchain.models import BlockchainTransaction
+from apps.blockchain import wallets
+from apps.blockchain.outbox import enqueue
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     """Custom JWT login view that returns user info along with tokens"""
@@ -50,8 +56,41 @@ class CustomTokenObtainPairView(TokenObtainPairView):
         
         return response
 
+def _registration_response(user, wallet_address, record, tx_hash, status_code):
+    """Tokens, user info and wallet info returned after signup"""
+    refresh = RefreshToken.for_user(user)
+    access_token = refresh.access_token
+    access_token['username'] = user.username
+    access_token['email'] = user.email
+    
+    wallet = {
+        'address': wallet_address,
+        'basescan_url': f"https://sepolia.basescan.org/address/{wallet_address}",
+        'transaction_id': record.id,
+        'status': record.status,
+    }
+    if tx_hash:
+        wallet['tx_hash'] = tx_hash
+        wallet['tx_url'] = f"https://sepolia.basescan.org/tx/{tx_hash}"
+    
+    return Response({
+        'user': {
+            'id': user.id,
+            'username': user.username,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'balance': float(user.profile.balance)
+        },
+        'wallet': wallet,
+        'refresh': str(refresh),
+        'access': str(access_token),
+        'message': 'User created successfully with 25,000 $NUC tokens!'
+    }, status=status_code)
+
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@idempotent
 def register_user(request):
     """Register a new user with blockchain wallet and return JWT tokens"""
     serializer = UserRegistrationSerializer(data=request.data)
@@ -61,40 +100,45 @@ def register_user(request):
                 # 1. Create user (profile auto-created via signal)
                 user = serializer.save()
                 
-                # 2. Generate wallet and mint tokens on blockchain
-                blockchain = BlockchainService()
-                wallet_address, tx_hash = blockchain.mint_signup()
+                # 2. Take a pre-generated wallet; a pre-minted one needs no transaction at all
+                pooled = wallets.claim(user)
+                if pooled is not None and pooled.mint_transaction_id:
+                    wallet_address = pooled.address
+                    record = pooled.mint_transaction
+                    tx_hash = record.tx_hash
+                    status_code = status.HTTP_201_CREATED
+                elif settings.BLOCKCHAIN_OUTBOX_ENABLED:
+                    # The outbox worker mints the tokens
+                    wallet_address = pooled.address if pooled else get_blockchain_service().new_wallet_address()
+                    record = enqueue('mint_signup', wallet_address, user=user).transaction
+                    tx_hash = None
+                    status_code = status.HTTP_202_ACCEPTED
+                else:
+                    record = BlockchainTransaction.objects.create(kind='mint_signup', user=user)
+                    blockchain = get_blockchain_service()
+                    status_code = status.HTTP_201_CREATED
+                    try:
+                        if pooled is not None:
+                            wallet_address = pooled.address
+                            tx_hash = blockchain.mint_signup_to(wallet_address, record=record)
+                        else:
+                            wallet_address, tx_hash = blockchain.mint_signup(record=record)
+                    except DeadlineExceeded as e:
+                        # Broadcast but not mined in time; the record settles once it is
+                        if e.tx_hash is None:
+                            raise
+                        wallet_address, tx_hash = record.wallet_address, e.tx_hash
+                        status_code = status.HTTP_202_ACCEPTED
                 
                 # 3. Save wallet address to profile
                 user.profile.wallet_address = wallet_address
                 user.profile.save()
-                
-                # 4. Generate JWT tokens
-                refresh = RefreshToken.for_user(user)
-                access_token = refresh.access_token
-                access_token['username'] = user.username
-                access_token['email'] = user.email
-                
-                return Response({
-                    'user': {
-                        'id': user.id,
-                        'username': user.username,
-                        'email': user.email,
-                        'first_name': user.first_name,
-                        'last_name': user.last_name,
-                        'balance': float(user.profile.balance)
-                    },
-                    'wallet': {
-                        'address': wallet_address,
-                        'basescan_url': f"https://sepolia.basescan.org/address/{wallet_address}",
-                        'tx_hash': tx_hash,
-                        'tx_url': f"https://sepolia.basescan.org/tx/{tx_hash}",
-                    },
-                    'refresh': str(refresh),
-                    'access': str(access_token),
-                    'message': 'User created successfully with 25,000 $NUC tokens!'
-                }, status=status.HTTP_201_CREATED)
+            
+            # 4. Generate JWT tokens
+            return _registration_response(user, wallet_address, record, tx_hash, status_code)
         
+        except DeadlineExceeded:
+            return Response({'error': SLOW_CHAIN_ERROR}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except BlockchainError as e:
             return Response(
                 {'error': f'Blockchain error: {str(e)}'},
@@ -141,6 +185,7 @@ def change_password(request):
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@idempotent
 def reset_wallet(request):
     """Reset user's wallet to starting balance (25,000 $NUC) and clear investments"""
     user = request.user
@@ -152,11 +197,38 @@ def reset_wallet(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
+    if settings.BLOCKCHAIN_OUTBOX_ENABLED:
+        # The outbox worker unlocks on chain, then resets the database records
+        entry = enqueue('reset_portfolio', wallet_address, user=user)
+        return Response({
+            'message': 'Wallet reset requested. Your balance will be 25,000 $NUC once it is confirmed.',
+            'transaction_id': entry.transaction_id,
+            'status': entry.status,
+        }, status=status.HTTP_202_ACCEPTED)
+    
     try:
         with transaction.atomic():
             # 1. Unlock tokens on blockchain
-            blockchain = BlockchainService()
-            tx_hash = blockchain.reset_portfolio(wallet_address)
+            record = BlockchainTransaction.objects.create(
+                kind='reset_portfolio',
+                user=user,
+                wallet_address=wallet_address
+            )
+            blockchain = get_blockchain_service()
+            try:
+                tx_hash = blockchain.reset_portfolio(wallet_address, record=record)
+            except DeadlineExceeded as e:
+                if e.tx_hash is None:
+                    raise
+                # As with the outbox, the database is reset once the unlock is on chain
+                after_receipt(e, on_confirmed=lambda: User.objects.get(id=user.id).profile.reset_wallet())
+                return Response({
+                    'message': 'Wallet reset requested. Your balance will be 25,000 $NUC once it is confirmed.',
+                    'tx_hash': e.tx_hash,
+                    'tx_url': f"https://sepolia.basescan.org/tx/{e.tx_hash}",
+                    'transaction_id': record.id,
+                    'status': record.status,
+                }, status=status.HTTP_202_ACCEPTED)
             
             # 2. Reset wallet in database (clears investments, resets balance)
             user.profile.reset_wallet()
@@ -171,8 +243,11 @@ def reset_wallet(request):
                 },
                 'tx_hash': tx_hash,
                 'tx_url': f"https://sepolia.basescan.org/tx/{tx_hash}",
+                'transaction_id': record.id,
             })
     
+    except DeadlineExceeded:
+        return Response({'error': SLOW_CHAIN_ERROR}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
     except BlockchainError as e:
         return Response(
             {'error': f'Blockchain error: {str(e)}'},
@@ -201,12 +276,36 @@ def delete_account(request):
     user = request.user
     wallet_address = user.profile.wallet_address
     
+    if settings.BLOCKCHAIN_OUTBOX_ENABLED:
+        # Delete the user now; the outbox worker burns the wallet's tokens
+        with transaction.atomic():
+            entry = enqueue('burn_account', wallet_address) if wallet_address else None
+            user.delete()
+        
+        response_data = {'message': 'Account deleted successfully'}
+        if entry:
+            response_data['transaction_id'] = entry.transaction_id
+            response_data['status'] = entry.status
+        return Response(response_data, status=status.HTTP_202_ACCEPTED if entry else status.HTTP_200_OK)
+    
     try:
         # 1. Burn tokens on blockchain (if wallet exists)
         tx_hash = None
+        status_code = status.HTTP_200_OK
         if wallet_address:
-            blockchain = BlockchainService()
-            tx_hash = blockchain.burn_account(wallet_address)
+            record = BlockchainTransaction.objects.create(
+                kind='burn_account',
+                user=user,
+                wallet_address=wallet_address
+            )
+            blockchain = get_blockchain_service()
+            try:
+                tx_hash = blockchain.burn_account(wallet_address, record=record)
+            except DeadlineExceeded as e:
+                # The burn is broadcast; the account goes now, as with the outbox
+                if e.tx_hash is None:
+                    raise
+                tx_hash, status_code = e.tx_hash, status.HTTP_202_ACCEPTED
         
         # 2. Delete user (cascades to profile and investments)
         user.delete()
@@ -215,9 +314,14 @@ def delete_account(request):
         if tx_hash:
             response_data['tx_hash'] = tx_hash
             response_data['tx_url'] = f"https://sepolia.basescan.org/tx/{tx_hash}"
+            response_data['transaction_id'] = record.id
+        if status_code == status.HTTP_202_ACCEPTED:
+            response_data['status'] = record.status
         
-        return Response(response_data, status=status.HTTP_200_OK)
+        return Response(response_data, status=status_code)
     
+    except DeadlineExceeded:
+        return Response({'error': SLOW_CHAIN_ERROR}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
     except BlockchainError as e:
         return Response(
             {'error': f'Blockchain error: {str(e)}'},
@@ -0,0 +1,98 @@
+"""
+optimize response time with the reactor coefficient matrix reloaded for
+every request and reused from the cache, for the six reactors and for
+larger synthetic catalogues, plus the solver on its own.
+
+The whole request goes through the test client, serializers included.
+Reactors beyond the six are copies with shifted rates; their slugs are
+outside Reactor's choices, which only forms validate.
+
+Usage (from nuchain-backend/):
+    python benchmarks/bench_allocation.py --reactors 6 100 1000 --runs 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nuchain_backend.test_settings')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+# Reactor rows need real tables; keep them out of the dev database
+settings.DATABASES['default']['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench_allocation.sqlite3')
+settings.ALLOWED_HOSTS = ['testserver']
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from apps.investments import allocation  # noqa: E402
+from apps.reactors.models import Reactor  # noqa: E402
+
+REACTORS = [
+    ('NuWave', '0.0450', '0.8500'),
+    ('Helios FusionDrive', '-0.0150', '3.1500'),
+    ('Phoenix RegenX-7', '0.0680', '1.1500'),
+    ('Fermi-III', '0.0220', '1.8500'),
+    ('Atucha Q-Tronix', '0.0420', '1.6000'),
+    ('Nexus CORE', '0.0380', '1.4000'),
+]
+
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--reactors', type=int, nargs='+', default=[6, 100, 1000])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    user = User.objects.create_user(username='investor', password='benchmark')
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = reverse('investment-optimize')
+    data = {'budget': '20000', 'roi_weight': 0.6}
+
+    def uncached():
+        allocation.forget_coefficients(Reactor)
+        assert client.post(url, data, format='json').status_code == 200
+
+    print(f'median of {args.runs} runs\n')
+    print(f'{"reactors":>9}  {"reload":>10}  {"cached":>10}  {"solver":>10}')
+    for size in args.reactors:
+        Reactor.objects.all().delete()
+        Reactor.objects.bulk_create([
+            Reactor(
+                name=f'{name} {index // len(REACTORS)}', slug=f'reactor_{index}', type='SMR', description='',
+                location='', annual_roi_rate=Decimal(roi) + Decimal(index % 7) / 1000,
+                carbon_offset_tonnes_co2_per_nuc_per_year=Decimal(carbon),
+                total_funding_needed=Decimal('150000'), display_order=index
+            )
+            for index, (name, roi, carbon) in ((index, REACTORS[index % len(REACTORS)]) for index in range(size))
+        ])
+        reload = timed(uncached, args.runs)
+        cached = timed(lambda: client.post(url, data, format='json'), args.runs)
+        matrix = allocation.coefficients()['matrix']
+        solver = timed(lambda: allocation.solve(matrix, 20000, 0.6, matrix[:, allocation.AVAILABLE]), args.runs)
+        print(f'{size:>9}  {reload:7.2f} ms  {cached:7.2f} ms  {solver:7.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
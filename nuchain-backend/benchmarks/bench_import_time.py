@@ -0,0 +1,101 @@
+"""
+Import-time report for worker boot, in the style of `python -X importtime`.
+
+Each stage runs in a fresh interpreter started with -X importtime:
+
+    setup        django.setup() (what every manage.py command pays)
+    worker boot  setup, WSGI application and URLconf with every view
+                 (what a gunicorn worker pays before serving a request)
+    first chain  worker boot plus get_blockchain_service(), where web3 and
+                 eth_account are now imported
+
+Import times are summed over top-level imports and the slowest packages are
+listed, so a module that starts pulling in web3 at load time again shows up
+as a jump in the worker boot row.
+
+Usage (from nuchain-backend/):
+    python benchmarks/bench_import_time.py --runs 5 --top 10
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SETUP = (
+    "import django; django.setup()\n"
+)
+WORKER_BOOT = SETUP + (
+    "from django.core.wsgi import get_wsgi_application; get_wsgi_application()\n"
+    "from django.urls import get_resolver; get_resolver().url_patterns\n"
+)
+FIRST_CHAIN = WORKER_BOOT + (
+    "from apps.blockchain import get_blockchain_service; get_blockchain_service()\n"
+)
+STAGES = [('setup', SETUP), ('worker boot', WORKER_BOOT), ('first chain', FIRST_CHAIN)]
+
+HEAVY = ['web3', 'eth_account', 'eth_abi', 'Crypto', 'aiohttp']
+
+# import time:      self [us] |    cumulative | imported package
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def profile(code):
+    """Run `code` under -X importtime; returns ({top-level module: cumulative us}, loaded heavy packages)"""
+    report = code + (
+        "import sys\n"
+        f"print(','.join(name for name in {HEAVY!r} if name in sys.modules))\n"
+    )
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'nuchain_backend.test_settings')
+    env.setdefault('SECRET_KEY', 'benchmark')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', report],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+    top_level = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        # Top-level imports are indented by a single space
+        if match and len(match.group(3)) == 1:
+            top_level[match.group(4)] = int(match.group(2))
+    loaded = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ''
+    return top_level, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f'median of {args.runs} fresh interpreters per stage\n')
+    slowest = {}
+    for label, code in STAGES:
+        totals = []
+        per_module = defaultdict(list)
+        for _ in range(args.runs):
+            top_level, loaded = profile(code)
+            totals.append(sum(top_level.values()))
+            for name, cumulative in top_level.items():
+                per_module[name].append(cumulative)
+        slowest[label] = sorted(
+            ((statistics.median(times), name) for name, times in per_module.items()),
+            reverse=True
+        )[:args.top]
+        print(f'{label:<12} imports {statistics.median(totals) / 1000:8.1f} ms   heavy packages loaded: {loaded or "none"}')
+
+    for label, modules in slowest.items():
+        print(f'\nslowest top-level imports, {label}:')
+        for cumulative, name in modules:
+            print(f'  {cumulative / 1000:8.1f} ms  {name}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Signup-mint throughput as the number of signer lanes grows, measured against
+the local RPC stand-in. Each request mints to a fresh wallet and waits for its
+receipt, like the outbox worker does.
+
+The stand-in mines at most --per-sender-per-block transactions from one
+sender per block, so a single signer tops out at that many per block time.
+Past a few lanes the benchmark's SQLite database, which serializes the nonce
+and transaction-record writes, becomes the limit rather than the chain.
+
+Usage (from nuchain-backend/):
+    python benchmarks/bench_lanes.py --transactions 240 --threads 64 --block-time 0.5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nuchain_backend.test_settings')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+# Nonce counters and transaction records need real tables; keep them out of the dev database.
+# IMMEDIATE transactions queue writers on SQLite's lock instead of failing with 'database is locked'
+settings.DATABASES['default'].update({
+    'NAME': os.path.join(tempfile.mkdtemp(), 'bench_lanes.sqlite3'),
+    'OPTIONS': {'timeout': 30, 'transaction_mode': 'IMMEDIATE'},
+})
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from apps.blockchain.models import AdminNonce  # noqa: E402
+from apps.blockchain.services import BlockchainService  # noqa: E402
+from rpc_standin import start_standin  # noqa: E402
+
+# Throwaway keys; the stand-in accepts any signer
+SIGNER_KEYS = ['0x' + f'{index:064x}' for index in range(1, 17)]
+
+
+def run(lanes, args):
+    server = start_standin(
+        latency_ms=args.latency_ms,
+        block_time=args.block_time,
+        per_sender_per_block=args.per_sender_per_block
+    )
+    settings.BASE_SEPOLIA_RPC_URL = f'http://127.0.0.1:{server.server_address[1]}'
+    settings.ADMIN_PRIVATE_KEYS = SIGNER_KEYS[:lanes]
+    # Every round gets a fresh chain, so nonce counters start over
+    AdminNonce.objects.all().delete()
+    service = BlockchainService(pool_size=args.threads)
+
+    def mint(_):
+        start = time.perf_counter()
+        try:
+            service.mint_signup_to(service.new_wallet_address())
+        finally:
+            connection.close()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        latencies = sorted(pool.map(mint, range(args.transactions)))
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f'{lanes:>3} lanes   {args.transactions / elapsed:8.1f} tx/s   '
+          f'mean {statistics.mean(latencies):6.2f} s   p95 {p95:6.2f} s')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--transactions', type=int, default=240)
+    parser.add_argument('--threads', type=int, default=64)
+    parser.add_argument('--lanes', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--latency-ms', type=float, default=2)
+    parser.add_argument('--block-time', type=float, default=0.5)
+    parser.add_argument('--per-sender-per-block', type=int, default=4)
+    args = parser.parse_args()
+
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    settings.BLOCKCHAIN_RECEIPT_POLL_INTERVAL = args.block_time / 4
+
+    print(f'{args.transactions} signup mints, {args.threads} threads, {args.block_time} s blocks, '
+          f'{args.per_sender_per_block} transactions per sender per block\n')
+    for lanes in args.lanes:
+        run(lanes, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+portfolio_summary response time as a user's investment history grows,
+comparing the per-investment loop it used to run (four passes over the
+queryset, a reactor query per row, float->str->Decimal per projection),
+the grouped per-reactor totals the positions are rebuilt from, and the
+view itself, which reads pre-aggregated PortfolioPosition rows. The
+"monthly" column asks the view for every month up to 30 years, compounded
+(?horizons=monthly&mode=compound), 360 projections in one NumPy pass.
+
+The old loop and grouped totals are timed on their own; the view column is the whole request
+through the test client, serializer included. The user has no wallet, so no
+blockchain call is made.
+
+Usage (from nuchain-backend/):
+    python benchmarks/bench_portfolio_summary.py --sizes 10 1000 10000 --runs 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nuchain_backend.test_settings')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+# Investment rows need real tables; keep them out of the dev database
+settings.DATABASES['default']['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench_portfolio.sqlite3')
+settings.ALLOWED_HOSTS = ['testserver']
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Sum  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from apps.investments.models import Investment  # noqa: E402
+from apps.investments.portfolio import fix_positions, investment_totals, position_differences  # noqa: E402
+from apps.reactors.models import Reactor  # noqa: E402
+
+REACTORS = [
+    ('NuWave', 'nuwave', '0.0450', '0.8500'),
+    ('Phoenix RegenX-7', 'phoenix_regenx7', '0.0680', '1.1500'),
+    ('Nexus CORE', 'nexus_core', '0.0520', '0.9200'),
+    ('Fermi-III', 'fermi_iii', '0.0390', '0.7800'),
+    ('Helios FusionDrive', 'helios_fusiondrive', '-0.0150', '1.4000'),
+    ('Atucha Q-Tronix', 'atucha_qtronix', '0.0600', '1.0500'),
+]
+MONTHLY = {'horizons': 'monthly', 'mode': 'compound'}
+
+
+def legacy_summary(investments):
+    """The projection loop portfolio_summary ran before the grouped engine"""
+    if not investments.exists():
+        return None
+    total_invested = investments.aggregate(total=Sum('amount_invested'))['total'] or Decimal('0')
+    list(investments.values_list('reactor__name', flat=True).distinct())
+    for years in [1, 2, 5, 10]:
+        total_roi = Decimal('0')
+        total_carbon_offset = Decimal('0')
+        for investment in investments:
+            total_roi += Decimal(str(investment.reactor.calculate_roi_projection(investment.amount_invested, years)))
+            total_carbon_offset += Decimal(str(investment.reactor.calculate_carbon_offset_projection(investment.amount_invested, years)))
+        total_invested + total_roi
+    investments.count()
+
+
+def count_queries(fn):
+    """Number of SQL statements fn() runs"""
+    executed = []
+
+    def record(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        fn()
+    return len(executed)
+
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 10000])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--legacy-limit', type=int, default=10000,
+                        help='skip the old loop above this many investments')
+    args = parser.parse_args()
+
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    reactors = [
+        Reactor.objects.create(
+            name=name, slug=slug, type='SMR', description='', location='',
+            annual_roi_rate=Decimal(roi), carbon_offset_tonnes_co2_per_nuc_per_year=Decimal(carbon),
+            total_funding_needed=Decimal('1000000000')
+        )
+        for name, slug, roi, carbon in REACTORS
+    ]
+    client = APIClient()
+    url = reverse('investment-portfolio-summary')
+
+    print(f'median of {args.runs} runs\n')
+    print(
+        f'{"investments":>12}  {"old loop":>12}  {"queries":>8}  {"grouped":>10}  {"view":>10}  {"queries":>8}'
+        f'  {"monthly":>10}'
+    )
+    for size in args.sizes:
+        user = User.objects.create_user(username=f'investor{size}', password='benchmark')
+        Investment.objects.bulk_create([
+            Investment(user=user, reactor=reactors[index % len(reactors)], amount_invested=Decimal('100') + index % 50)
+            for index in range(size)
+        ], batch_size=2000)
+        fix_positions(position_differences([user.id]))
+        client.force_authenticate(user=user)
+        investments = Investment.objects.filter(user=user)
+
+        legacy = legacy_queries = '-'
+        if size <= args.legacy_limit:
+            legacy_queries = count_queries(lambda: legacy_summary(investments))
+            legacy = f'{timed(lambda: legacy_summary(investments), args.runs):9.1f} ms'
+
+        grouped = timed(lambda: investment_totals(investments), args.runs)
+        assert client.get(url).data['investment_count'] == size
+        view_queries = count_queries(lambda: client.get(url))
+        view = timed(lambda: client.get(url), args.runs)
+        assert len(client.get(url, MONTHLY).data['projections']) == 360
+        monthly = timed(lambda: client.get(url, MONTHLY), args.runs)
+        print(
+            f'{size:>12}  {legacy:>12}  {legacy_queries:>8}  {grouped:7.1f} ms  {view:7.1f} ms  {view_queries:>8}'
+            f'  {monthly:7.1f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+risk_simulation response time for a six-reactor portfolio as the number of
+paths grows: the NumPy engine on its own, a cold request run in the request
+thread, a cold request handed to the process pool, and a repeat answered
+from the cache.
+
+The last table sends --requests cold simulations (distinct seeds) from
+--threads threads at once, in the request thread and through the pool, to
+show whether requests stay interactive while others are simulating.
+
+Usage (from nuchain-backend/):
+    python benchmarks/bench_risk_simulation.py --paths 1000 10000 50000 --years 30 --runs 5
+"""
+import argparse
+import itertools
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nuchain_backend.test_settings')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+# Position rows need real tables; keep them out of the dev database
+settings.DATABASES['default']['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench_risk.sqlite3')
+settings.ALLOWED_HOSTS = ['testserver']
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from apps.investments.models import Investment, PortfolioPosition  # noqa: E402
+from apps.investments.portfolio import positions  # noqa: E402
+from apps.investments.projections import simulate  # noqa: E402
+from apps.investments.simulation import executor  # noqa: E402
+from apps.reactors.models import Reactor  # noqa: E402
+
+REACTORS = [
+    ('NuWave', 'nuwave', '0.0450', '0.0200', '0.5000'),
+    ('Helios FusionDrive', 'helios_fusiondrive', '-0.0150', '0.1200', '0.2000'),
+    ('Phoenix RegenX-7', 'phoenix_regenx7', '0.0680', '0.0600', '0.5000'),
+    ('Fermi-III', 'fermi_iii', '0.0220', '0.0300', '0.6000'),
+    ('Atucha Q-Tronix', 'atucha_qtronix', '0.0420', '0.0900', '0.3000'),
+    ('Nexus CORE', 'nexus_core', '0.0380', '0.0400', '0.6000'),
+]
+
+seeds = itertools.count(1)
+
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def concurrent(client, url, params, requests, threads):
+    """Wall time and median latency of `requests` cold simulations sent from `threads` threads"""
+    latencies = []
+
+    def request(_):
+        start = time.perf_counter()
+        assert client.get(url, {**params, 'seed': next(seeds)}).status_code == 200
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(request, range(requests)))
+    return (time.perf_counter() - start) * 1000, statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--paths', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--years', type=int, default=30)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=16)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    user = User.objects.create_user(username='investor', password='benchmark')
+    for name, slug, roi, volatility, correlation in REACTORS:
+        reactor = Reactor.objects.create(
+            name=name, slug=slug, type='SMR', description='', location='',
+            annual_roi_rate=Decimal(roi), carbon_offset_tonnes_co2_per_nuc_per_year=Decimal('1'),
+            roi_volatility=Decimal(volatility), market_correlation=Decimal(correlation),
+            total_funding_needed=Decimal('1000000000')
+        )
+        PortfolioPosition.record(Investment.objects.create(user=user, reactor=reactor, amount_invested=Decimal('5000')))
+    holdings = positions(user)
+    engine_args = [[float(holding[field]) for holding in holdings]
+                   for field in ('principal', 'annual_roi_rate', 'roi_volatility', 'market_correlation')]
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = reverse('investment-risk-simulation')
+    settings.PORTFOLIO_SIMULATION_WORKERS = args.workers
+    executor().submit(sum, []).result()  # start the workers before timing
+
+    print(f'{args.years} years, {len(REACTORS)} reactors, {args.workers} workers, median of {args.runs} runs\n')
+    print(f'{"paths":>8}  {"engine":>10}  {"inline":>10}  {"pool":>10}  {"cached":>10}')
+    for paths in args.paths:
+        params = {'years': args.years, 'paths': paths}
+        engine = timed(lambda: simulate(*engine_args, args.years, paths, next(seeds)), args.runs)
+        settings.PORTFOLIO_SIMULATION_WORKERS = 0
+        inline = timed(lambda: client.get(url, {**params, 'seed': next(seeds)}), args.runs)
+        settings.PORTFOLIO_SIMULATION_WORKERS = args.workers
+        pooled = timed(lambda: client.get(url, {**params, 'seed': next(seeds)}), args.runs)
+        assert client.get(url, {**params, 'seed': 0}).status_code == 200
+        cached = timed(lambda: client.get(url, {**params, 'seed': 0}), args.runs)
+        print(f'{paths:>8}  {engine:7.1f} ms  {inline:7.1f} ms  {pooled:7.1f} ms  {cached:7.1f} ms')
+
+    params = {'years': args.years, 'paths': max(args.paths)}
+    print(f'\n{args.requests} cold requests of {max(args.paths)} paths from {args.threads} threads')
+    print(f'{"":>8}  {"wall":>10}  {"median":>10}')
+    for label, workers in [('inline', 0), ('pool', args.workers)]:
+        settings.PORTFOLIO_SIMULATION_WORKERS = workers
+        wall, median = concurrent(client, url, params, args.requests, args.threads)
+        print(f'{label:>8}  {wall:7.0f} ms  {median:7.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
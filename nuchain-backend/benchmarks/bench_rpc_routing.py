@@ -0,0 +1,112 @@
+"""
+Read latency through BlockchainService when an RPC provider degrades,
+measured against local RPC stand-ins.
+
+The degraded stand-in flips between normal latency and --slow-ms every
+--flap-seconds, like a provider having intermittent trouble. With a single
+endpoint every read that lands in a slow phase waits it out; with a second,
+healthy endpoint the routing provider moves reads away from the slow one and
+hedges those already in flight. The last round stops one endpoint entirely
+to show the circuit breaker taking it out of rotation.
+
+Usage (from nuchain-backend/):
+    python benchmarks/bench_rpc_routing.py --requests 2000 --threads 8 --slow-ms 800
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nuchain_backend.test_settings')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from apps.blockchain.services import BlockchainService  # noqa: E402
+from rpc_standin import start_standin  # noqa: E402
+
+WALLET = '0x1234567890AbcdEF1234567890aBcdef12345678'
+
+
+def flap(server, normal, slow, period, stop):
+    """Alternate a stand-in between normal and slow latency until stopped"""
+    while not stop.wait(period):
+        server.latency = slow if server.latency == normal else normal
+
+
+def url(server):
+    return f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def run(label, urls, args):
+    service = BlockchainService(rpc_urls=urls, pool_size=args.threads)
+    service.w3.eth.get_balance(WALLET)
+
+    def read(_):
+        start = time.perf_counter()
+        try:
+            service.w3.eth.get_balance(WALLET)
+        except Exception:
+            return None
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(read, range(args.requests)))
+    elapsed = time.perf_counter() - start
+    service.w3.provider.close()
+
+    latencies = sorted(latency for latency in results if latency is not None)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f'{label:<26} mean {statistics.mean(latencies):7.1f} ms   p99 {p99:7.1f} ms   '
+          f'max {latencies[-1]:7.1f} ms   {args.requests / elapsed:7.1f} req/s   '
+          f'failed {results.count(None)}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=5)
+    parser.add_argument('--slow-ms', type=float, default=800)
+    parser.add_argument('--flap-seconds', type=float, default=0.5)
+    parser.add_argument('--hedge-after', type=float, default=0.05)
+    args = parser.parse_args()
+
+    settings.BLOCKCHAIN_RPC_HEDGE_AFTER = args.hedge_after
+    settings.BLOCKCHAIN_RPC_TIMEOUT = 2
+    normal = args.latency_ms / 1000
+    healthy = start_standin(latency_ms=args.latency_ms)
+    degraded = start_standin(latency_ms=args.latency_ms)
+    stop = threading.Event()
+    threading.Thread(
+        target=flap,
+        args=(degraded, normal, args.slow_ms / 1000, args.flap_seconds, stop),
+        daemon=True
+    ).start()
+
+    print(f'{args.requests} balance reads, {args.threads} threads, {args.latency_ms} ms normal latency, '
+          f'degraded endpoint at {args.slow_ms} ms every other {args.flap_seconds} s, '
+          f'hedge after {args.hedge_after * 1000:.0f} ms\n')
+    run('healthy only', [url(healthy)], args)
+    run('degraded only', [url(degraded)], args)
+    run('degraded + healthy', [url(degraded), url(healthy)], args)
+
+    # Nothing listens on a stopped stand-in's port, so connections are refused
+    stop.set()
+    stopped = start_standin()
+    stopped.shutdown()
+    stopped.server_close()
+    run('stopped + healthy', [url(stopped), url(healthy)], args)
+
+
+if __name__ == '__main__':
+    main()
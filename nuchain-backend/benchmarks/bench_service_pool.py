@@ -0,0 +1,97 @@
+"""
+Per-request overhead of building BlockchainService per request versus the
+pooled per-process service, measured against the local RPC stand-in.
+
+Usage (from nuchain-backend/):
+    python benchmarks/bench_service_pool.py --requests 500 --threads 4 --latency-ms 2
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nuchain_backend.test_settings')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from eth_account import Account  # noqa: E402
+from web3 import Web3  # noqa: E402
+from apps.blockchain import services  # noqa: E402
+from apps.blockchain.abi import NUC_TOKEN_ABI  # noqa: E402
+from rpc_standin import start_standin  # noqa: E402
+
+WALLET = '0x1234567890abcdef1234567890abcdef12345678'
+
+
+def legacy_request():
+    """What every view did before: fresh provider, health probe, ABI parse, key derivation"""
+    w3 = Web3(Web3.HTTPProvider(settings.BASE_SEPOLIA_RPC_URL))
+    if not w3.is_connected():
+        raise RuntimeError('stand-in not reachable')
+    contract = w3.eth.contract(
+        address=Web3.to_checksum_address(settings.NUC_CONTRACT_ADDRESS),
+        abi=NUC_TOKEN_ABI
+    )
+    Account.from_key(settings.ADMIN_PRIVATE_KEY)
+    contract.functions.balanceOf(Web3.to_checksum_address(WALLET)).call()
+
+
+def pooled_request():
+    services.get_blockchain_service().get_balance(WALLET)
+
+
+def run(label, fn, requests, threads):
+    def timed(_):
+        start = time.perf_counter()
+        fn()
+        return (time.perf_counter() - start) * 1000
+
+    # Warm up imports and the pooled service
+    fn()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = sorted(pool.map(timed, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f'{label:<10} mean {statistics.mean(latencies):7.2f} ms   '
+          f'p95 {p95:7.2f} ms   throughput {requests / elapsed:8.1f} req/s')
+    return statistics.mean(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--latency-ms', type=float, default=2)
+    args = parser.parse_args()
+
+    server = start_standin(latency_ms=args.latency_ms)
+    settings.BASE_SEPOLIA_RPC_URL = f'http://127.0.0.1:{server.server_address[1]}'
+    settings.BLOCKCHAIN_HTTP_POOL_SIZE = args.threads
+
+    print(f'{args.requests} balance reads, {args.threads} threads, '
+          f'{args.latency_ms} ms simulated RPC latency\n')
+
+    connections = server.connections
+    legacy = run('per-request', legacy_request, args.requests, args.threads)
+    legacy_connections = server.connections - connections
+
+    connections = server.connections
+    pooled = run('pooled', pooled_request, args.requests, args.threads)
+    pooled_connections = server.connections - connections
+
+    print(f'\nTCP connections opened: per-request {legacy_connections}, pooled {pooled_connections}')
+    print(f'Overhead removed per request: {legacy - pooled:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
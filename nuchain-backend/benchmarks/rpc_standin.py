@@ -0,0 +1,695 @@
+"""
+Local JSON-RPC stand-in for benchmarking BlockchainService without touching
+Base Sepolia.
+
+It answers the methods the service uses (eth_call, eth_estimateGas,
+eth_sendRawTransaction, eth_getTransactionReceipt, eth_getTransactionCount,
+eth_gasPrice, eth_feeHistory, eth_getBalance, eth_getLogs, eth_getBlockByNumber
+and batches of them) and keeps NucToken's state in memory: balances, locked
+balances and operators, with the contract's revert reasons and events. Every
+contract address is treated as the token.
+
+Raw transactions are mined every --block-time seconds, taking at most
+--per-sender-per-block transactions from each sender per block in nonce
+order, which is what caps a single signer's throughput. A block time of 0
+mines each transaction as it arrives.
+
+Each HTTP request is delayed by a latency drawn from --latency-dist around
+--latency-ms, and can be failed on purpose: --error-rate answers calls with a
+JSON-RPC error, --http-error-rate with HTTP 503, --drop-rate closes the
+connection unanswered, and --rate-limit answers HTTP 429 once more calls per
+second arrive than a provider would allow. --seed makes the draws repeatable.
+
+Usage:
+    python benchmarks/rpc_standin.py --port 8545 --latency-ms 5 --block-time 2
+    python benchmarks/rpc_standin.py --latency-ms 40 --latency-dist lognormal --error-rate 0.01 --rate-limit 200
+"""
+import argparse
+import json
+import random
+import socket
+import sys
+import threading
+import time
+from collections import ChainMap, Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import rlp
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
+from web3 import Web3
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from apps.blockchain.abi import NUC_TOKEN_ABI  # noqa: E402
+
+CHAIN_ID = 84532
+GAS_PRICE = 10 ** 9
+PRIORITY_FEE = 10 ** 6
+GAS_USED = 50000
+# Gas of a batch write: a fixed part plus a share per entry, roughly what the compiled contract uses
+BATCH_GAS_BASE = 30000
+BATCH_GAS_PER_ENTRY = {'mintSignupBatch': 25000, 'lockBatch': 25000, 'resetPortfolioBatch': 8000}
+# ETH every account starts with, for gas
+STARTING_ETH_BALANCE = 100 * 10 ** 18
+
+ZERO_ADDRESS = '0x' + '0' * 40
+OPERATOR_ROLE = Web3.keccak(text='OPERATOR_ROLE')
+SIGNUP_AMOUNT = 25_000 * 10 ** 18
+
+# selector -> (name, input types, output types)
+FUNCTIONS = {
+    function_abi_to_4byte_selector(item): (
+        item['name'],
+        [param['type'] for param in item['inputs']],
+        [param['type'] for param in item['outputs']],
+    )
+    for item in NUC_TOKEN_ABI if item['type'] == 'function'
+}
+# Functions that change state, all restricted to OPERATOR_ROLE
+WRITES = {name for name, _, outputs in FUNCTIONS.values() if not outputs}
+TOPICS = {
+    item['name']: '0x' + event_abi_to_log_topic(item).hex()
+    for item in NUC_TOKEN_ABI if item['type'] == 'event'
+}
+
+ERROR_STRING_SELECTOR = Web3.keccak(text='Error(string)')[:4]
+ACCESS_CONTROL_SELECTOR = Web3.keccak(text='AccessControlUnauthorizedAccount(address,bytes32)')[:4]
+PANIC_SELECTOR = Web3.keccak(text='Panic(uint256)')[:4]
+PANIC_UNDERFLOW = 0x11
+
+LATENCY_DISTRIBUTIONS = ['fixed', 'uniform', 'exponential', 'lognormal']
+
+
+class Revert(Exception):
+    """A call reverted; carries the revert data a node would return"""
+
+    def __init__(self, reason, data):
+        super().__init__(reason)
+        self.data = '0x' + data.hex()
+
+    @classmethod
+    def require(cls, reason):
+        return cls(reason, ERROR_STRING_SELECTOR + encode(['string'], [reason]))
+
+
+def _decode(raw):
+    """Nonce, recipient, max fee per gas, gas limit and calldata of a signed legacy or typed transaction"""
+    data = bytes.fromhex(raw[2:])
+    if data[0] > 0x7f:
+        # [nonce, gasPrice, gas, to, value, data, ...]
+        fields = rlp.decode(data)
+        nonce, fee, gas, to, calldata = fields[0], fields[1], fields[2], fields[3], fields[5]
+    elif data[0] == 0x01:
+        # [chainId, nonce, gasPrice, gas, to, value, data, ...]
+        fields = rlp.decode(data[1:])
+        nonce, fee, gas, to, calldata = fields[1], fields[2], fields[3], fields[4], fields[6]
+    else:
+        # [chainId, nonce, maxPriorityFee, maxFee, gas, to, value, data, ...]
+        fields = rlp.decode(data[1:])
+        nonce, fee, gas, to, calldata = fields[1], fields[3], fields[4], fields[5], fields[7]
+    return (
+        int.from_bytes(nonce, 'big'),
+        Web3.to_checksum_address(to),
+        int.from_bytes(fee, 'big'),
+        int.from_bytes(gas, 'big'),
+        calldata,
+    )
+
+
+def _word(address):
+    """An address as an indexed log topic"""
+    return '0x' + bytes.fromhex(address[2:]).rjust(32, b'\0').hex()
+
+
+def _block_number(tag, head):
+    if tag in (None, 'latest', 'pending', 'safe', 'finalized'):
+        return head
+    if tag == 'earliest':
+        return 0
+    return int(tag, 16) if isinstance(tag, str) else tag
+
+
+class NucTokenState:
+    """
+    NucToken's storage and logic, as far as BlockchainService can observe it.
+
+    Writes run against a ChainMap overlay of the balances and are only
+    applied if the whole call succeeds, so a batch reverts as one and a
+    simulation leaves no trace.
+    """
+
+    def __init__(self, operators=None):
+        self.balances = {}
+        self.locked = {}
+        self.total_supply = 0
+        # None: every sender is an operator, so benchmarks can use throwaway keys
+        self.operators = {Web3.to_checksum_address(address) for address in operators} if operators else None
+
+    def is_operator(self, address):
+        return self.operators is None or Web3.to_checksum_address(address) in self.operators
+
+    def gas(self, data):
+        """Gas a call uses; batches grow with their entries"""
+        name, inputs, _ = FUNCTIONS.get(bytes(data[:4]), (None, None, None))
+        if name not in BATCH_GAS_PER_ENTRY:
+            return GAS_USED
+        entries = len(decode(inputs, bytes(data[4:]))[0])
+        return BATCH_GAS_BASE + BATCH_GAS_PER_ENTRY[name] * entries
+
+    def call(self, sender, data):
+        """
+        Run `data` against the token without keeping any changes.
+
+        Returns:
+            str: ABI-encoded return data
+        """
+        output, _ = self._run(sender, data)
+        return output
+
+    def transact(self, sender, data):
+        """
+        Run `data` as a mined transaction.
+
+        Returns:
+            list: (event name, topics, data) of the logs it emitted
+        """
+        _, logs = self._run(sender, data, commit=True)
+        return logs
+
+    def _run(self, sender, data, commit=False):
+        data = bytes(data)
+        selector = data[:4]
+        if selector not in FUNCTIONS:
+            raise Revert('function selector was not recognized', b'')
+        name, inputs, outputs = FUNCTIONS[selector]
+        try:
+            args = decode(inputs, data[4:]) if inputs else ()
+        except Exception:
+            raise Revert('invalid calldata', b'')
+
+        balances = ChainMap({}, self.balances)
+        locked = ChainMap({}, self.locked)
+        context = {'balances': balances, 'locked': locked, 'supply': 0, 'logs': []}
+
+        if name in WRITES and (sender is None or not self.is_operator(sender)):
+            raise Revert(
+                'AccessControlUnauthorizedAccount',
+                ACCESS_CONTROL_SELECTOR + encode(['address', 'bytes32'], [sender or ZERO_ADDRESS, OPERATOR_ROLE])
+            )
+        result = getattr(self, f'_{name}')(context, *args)
+
+        if commit:
+            self.balances.update(balances.maps[0])
+            self.locked.update(locked.maps[0])
+            self.total_supply += context['supply']
+        output = '0x' + (encode(outputs, [result]) if outputs else b'').hex()
+        return output, context['logs']
+
+    # --- views ---
+
+    def _balanceOf(self, context, account):
+        return context['balances'].get(Web3.to_checksum_address(account), 0)
+
+    def _lockedBalances(self, context, account):
+        return context['locked'].get(Web3.to_checksum_address(account), 0)
+
+    def _availableBalanceOf(self, context, account):
+        available = self._balanceOf(context, account) - self._lockedBalances(context, account)
+        if available < 0:
+            raise Revert('panic: arithmetic underflow', PANIC_SELECTOR + encode(['uint256'], [PANIC_UNDERFLOW]))
+        return available
+
+    def _OPERATOR_ROLE(self, context):
+        return OPERATOR_ROLE
+
+    def _hasRole(self, context, role, account):
+        return role == OPERATOR_ROLE and self.is_operator(account)
+
+    def _name(self, context):
+        return 'NucToken'
+
+    def _symbol(self, context):
+        return 'NUC'
+
+    def _decimals(self, context):
+        return 18
+
+    # --- writes ---
+
+    def _emit(self, context, event, topics, values):
+        context['logs'].append((event, [TOPICS[event], *topics], encode(['uint256'] * len(values), values)))
+
+    def _mint(self, context, to, amount):
+        to = Web3.to_checksum_address(to)
+        context['balances'][to] = context['balances'].get(to, 0) + amount
+        context['supply'] += amount
+        self._emit(context, 'Transfer', [_word(ZERO_ADDRESS), _word(to)], [amount])
+
+    def _mintSignup(self, context, to):
+        self._mint(context, to, SIGNUP_AMOUNT)
+
+    def _mintSignupBatch(self, context, recipients):
+        for to in recipients:
+            self._mint(context, to, SIGNUP_AMOUNT)
+
+    def _lock(self, context, user, amount):
+        if self._availableBalanceOf(context, user) < amount:
+            raise Revert.require('Insufficient unlocked balance')
+        user = Web3.to_checksum_address(user)
+        context['locked'][user] = context['locked'].get(user, 0) + amount
+        self._emit(context, 'TokensLocked', [_word(user)], [amount])
+
+    def _lockBatch(self, context, users, amounts):
+        if len(users) != len(amounts):
+            raise Revert.require('Array length mismatch')
+        for user, amount in zip(users, amounts):
+            self._lock(context, user, amount)
+
+    def _resetPortfolio(self, context, user):
+        user = Web3.to_checksum_address(user)
+        amount = context['locked'].get(user, 0)
+        if amount > 0:
+            context['locked'][user] = 0
+            self._emit(context, 'TokensUnlocked', [_word(user)], [amount])
+
+    def _resetPortfolioBatch(self, context, users):
+        for user in users:
+            self._resetPortfolio(context, user)
+
+    def _burnAccount(self, context, account):
+        account = Web3.to_checksum_address(account)
+        balance = context['balances'].get(account, 0)
+        context['balances'][account] = 0
+        context['supply'] -= balance
+        self._emit(context, 'Transfer', [_word(account), _word(ZERO_ADDRESS)], [balance])
+        self._emit(context, 'AccountDeleted', [_word(account)], [balance])
+
+
+class StandinChain:
+    """Just enough of a chain to mine signed NucToken transactions: nonces, a mempool, receipts and logs"""
+
+    def __init__(self, block_time=2.0, per_sender_per_block=16, operators=None):
+        self.block_time = block_time
+        self.per_sender_per_block = per_sender_per_block
+        self.started = time.monotonic()
+        self.head = 1
+        self.block_times = {0: int(time.time()), 1: int(time.time())}
+        self.mined_nonces = defaultdict(int)
+        self.mempool = defaultdict(dict)
+        self.receipts = {}
+        self.logs = defaultdict(list)
+        self.spent = defaultdict(int)
+        self.token = NucTokenState(operators)
+        self.sent = 0
+
+    def advance(self):
+        """Mine every block whose time has come"""
+        if self.block_time <= 0:
+            return
+        current = int((time.monotonic() - self.started) / self.block_time) + 1
+        while self.head < current:
+            self._mine(self.head + 1)
+
+    def _mine(self, number, per_sender=None):
+        self.head = number
+        self.block_times[number] = int(time.time())
+        block_hash = self.block_hash(number)
+        index = 0
+        cumulative = 0
+        for sender, queued in self.mempool.items():
+            for _ in range(per_sender or self.per_sender_per_block):
+                tx = queued.pop(self.mined_nonces[sender], None)
+                if tx is None:
+                    break
+                self.mined_nonces[sender] += 1
+                needed = self.token.gas(tx['data'])
+                gas_used = min(needed, tx['gas'])
+                try:
+                    if gas_used < needed:
+                        raise Revert('out of gas', b'')
+                    emitted = self.token.transact(sender, tx['data'])
+                    status = '0x1'
+                except Revert:
+                    emitted = []
+                    status = '0x0'
+                cumulative += gas_used
+                self.spent[sender] += gas_used * GAS_PRICE
+                logs = [
+                    {
+                        'address': tx['to'],
+                        'topics': topics,
+                        'data': '0x' + data.hex(),
+                        'blockNumber': hex(number),
+                        'blockHash': block_hash,
+                        'transactionHash': tx['hash'],
+                        'transactionIndex': hex(index),
+                        'logIndex': hex(len(self.logs[number]) + position),
+                        'removed': False,
+                    }
+                    for position, (_, topics, data) in enumerate(emitted)
+                ]
+                self.logs[number].extend(logs)
+                self.receipts[tx['hash']] = {
+                    'transactionHash': tx['hash'],
+                    'transactionIndex': hex(index),
+                    'blockHash': block_hash,
+                    'blockNumber': hex(number),
+                    'from': sender,
+                    'to': tx['to'],
+                    'cumulativeGasUsed': hex(cumulative),
+                    'gasUsed': hex(gas_used),
+                    'effectiveGasPrice': hex(GAS_PRICE),
+                    'contractAddress': None,
+                    'logs': logs,
+                    'logsBloom': '0x' + '0' * 512,
+                    'status': status,
+                    'type': '0x0',
+                }
+                index += 1
+
+    @staticmethod
+    def block_hash(number):
+        return '0x' + number.to_bytes(32, 'big').hex()
+
+    def block(self, tag):
+        number = _block_number(tag, self.head)
+        if number > self.head:
+            return None
+        return {
+            'number': hex(number),
+            'hash': self.block_hash(number),
+            'parentHash': self.block_hash(max(number - 1, 0)),
+            'timestamp': hex(self.block_times.get(number, self.block_times[0])),
+            'baseFeePerGas': hex(GAS_PRICE),
+            'gasLimit': hex(30_000_000),
+            'gasUsed': '0x0',
+            'transactions': [],
+        }
+
+    def transaction_count(self, address, block='latest'):
+        address = Web3.to_checksum_address(address)
+        nonce = self.mined_nonces[address]
+        if block == 'pending':
+            while nonce in self.mempool[address]:
+                nonce += 1
+        return nonce
+
+    def balance(self, address):
+        """ETH left for gas"""
+        return max(STARTING_ETH_BALANCE - self.spent[Web3.to_checksum_address(address)], 0)
+
+    def send_raw_transaction(self, raw):
+        """Queue a signed transaction; returns its hash or raises ValueError like a node would"""
+        sender = Account.recover_transaction(raw)
+        nonce, to, fee, gas, data = _decode(raw)
+        tx_hash = Web3.keccak(hexstr=raw).to_0x_hex()
+        if nonce < self.mined_nonces[sender]:
+            raise ValueError('nonce too low')
+        if gas * fee > self.balance(sender):
+            raise ValueError('insufficient funds for gas * price + value')
+        queued = self.mempool[sender].get(nonce)
+        if queued is not None:
+            if queued['hash'] == tx_hash:
+                raise ValueError('already known')
+            # Like geth, a replacement must raise the fee by at least 10%
+            if fee * 10 < queued['fee'] * 11:
+                raise ValueError('replacement transaction underpriced')
+        self.mempool[sender][nonce] = {'hash': tx_hash, 'to': to, 'fee': fee, 'gas': gas, 'data': data}
+        self.sent += 1
+        if self.block_time <= 0:
+            # Instant mining; a nonce gap still waits for the transactions before it
+            self._mine(self.head + 1, per_sender=len(self.mempool[sender]))
+        return tx_hash
+
+    def get_logs(self, query):
+        """Logs matching an eth_getLogs filter: block range, address and topics"""
+        if 'blockHash' in query:
+            first = last = int(query['blockHash'], 16)
+        else:
+            first = _block_number(query.get('fromBlock', 'latest'), self.head)
+            last = min(_block_number(query.get('toBlock', 'latest'), self.head), self.head)
+        addresses = query.get('address')
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = {Web3.to_checksum_address(address) for address in addresses} if addresses else None
+        topics = query.get('topics') or []
+
+        matched = []
+        for number in range(first, last + 1):
+            for log in self.logs.get(number, ()):
+                if addresses is not None and log['address'] not in addresses:
+                    continue
+                if not self._topics_match(log['topics'], topics):
+                    continue
+                matched.append(log)
+        return matched
+
+    @staticmethod
+    def _topics_match(log_topics, wanted):
+        for position, option in enumerate(wanted):
+            if option is None:
+                continue
+            if position >= len(log_topics):
+                return False
+            options = option if isinstance(option, list) else [option]
+            if log_topics[position].lower() not in {topic.lower() for topic in options}:
+                return False
+        return True
+
+    def simulate(self, call):
+        """eth_call / eth_estimateGas against the token; raises Revert"""
+        data = bytes.fromhex((call.get('data') or call.get('input') or '0x')[2:])
+        sender = call.get('from')
+        return self.token.call(sender, data), self.token.gas(data)
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    # Keep-alive, like a real RPC provider
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        payload = json.loads(body)
+        server = self.server
+        calls = len(payload) if isinstance(payload, list) else 1
+        time.sleep(server.sample_latency())
+
+        fault = server.fault(calls)
+        if fault == 'drop':
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        if fault == 'rate_limited':
+            self._respond(429, {'jsonrpc': '2.0', 'id': None, 'error': {'code': -32005, 'message': 'rate limit exceeded'}})
+            return
+        if fault == 'http_error':
+            self._respond(503, {'jsonrpc': '2.0', 'id': None, 'error': {'code': -32603, 'message': 'service unavailable'}})
+            return
+
+        if isinstance(payload, list):
+            response = [server.handle_rpc(item) for item in payload]
+        else:
+            response = server.handle_rpc(payload)
+        self._respond(200, response)
+
+    def _respond(self, status, response):
+        data = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for every benchmark thread to connect at once; the default of 5 resets connections
+    request_queue_size = 256
+
+    def __init__(self, address, latency_ms=0, block_time=2.0, per_sender_per_block=16,
+                 latency_dist='fixed', latency_sigma=0.5, error_rate=0.0, http_error_rate=0.0,
+                 drop_rate=0.0, rate_limit=0, operators=None, seed=None):
+        super().__init__(address, StandinHandler)
+        # Median latency in seconds; benchmarks may change it while running
+        self.latency = latency_ms / 1000
+        self.latency_dist = latency_dist
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.http_error_rate = http_error_rate
+        self.drop_rate = drop_rate
+        # JSON-RPC calls per second, counting each call in a batch; 0 for no limit
+        self.rate_limit = rate_limit
+        self._allowance = float(rate_limit)
+        self._refilled = time.monotonic()
+        self.random = random.Random(seed)
+        self.connections = 0
+        self.requests = 0
+        # Injected faults by kind
+        self.faults = Counter()
+        self.chain = StandinChain(block_time, per_sender_per_block, operators)
+        self._lock = threading.Lock()
+
+    def get_request(self):
+        with self._lock:
+            self.connections += 1
+        return super().get_request()
+
+    def sample_latency(self):
+        """Seconds to hold an HTTP request, drawn from the configured distribution around self.latency"""
+        median = self.latency
+        if median <= 0 or self.latency_dist == 'fixed':
+            return max(median, 0)
+        with self._lock:
+            if self.latency_dist == 'uniform':
+                return self.random.uniform(0, 2 * median)
+            if self.latency_dist == 'exponential':
+                return self.random.expovariate(1 / median)
+            # Lognormal with the given median; sigma sets how long the tail is
+            return median * self.random.lognormvariate(0, self.latency_sigma)
+
+    def fault(self, calls):
+        """Fault to inject into an HTTP request carrying `calls` JSON-RPC calls, or None"""
+        with self._lock:
+            kind = None
+            if self.rate_limit:
+                now = time.monotonic()
+                self._allowance = min(self.rate_limit, self._allowance + (now - self._refilled) * self.rate_limit)
+                self._refilled = now
+                if self._allowance < calls:
+                    kind = 'rate_limited'
+                else:
+                    self._allowance -= calls
+            if kind is None and self.drop_rate and self.random.random() < self.drop_rate:
+                kind = 'drop'
+            if kind is None and self.http_error_rate and self.random.random() < self.http_error_rate:
+                kind = 'http_error'
+            if kind is not None:
+                self.faults[kind] += 1
+            return kind
+
+    def handle_rpc(self, request):
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.faults['rpc_error'] += 1
+                return self._error(request, -32603, 'internal error')
+            self.chain.advance()
+            try:
+                result = self._result(request['method'], request.get('params', []))
+            except KeyError:
+                return self._error(request, -32601, f"Method not found: {request['method']}")
+            except Revert as e:
+                message = f'execution reverted: {e}' if str(e) else 'execution reverted'
+                return self._error(request, 3, message, data=e.data)
+            except ValueError as e:
+                return self._error(request, -32000, str(e))
+        return {'jsonrpc': '2.0', 'id': request.get('id'), 'result': result}
+
+    def _error(self, request, code, message, data=None):
+        error = {'code': code, 'message': message}
+        if data is not None:
+            error['data'] = data
+        return {'jsonrpc': '2.0', 'id': request.get('id'), 'error': error}
+
+    def _result(self, method, params):
+        chain = self.chain
+        if method == 'eth_blockNumber':
+            return hex(chain.head)
+        if method == 'eth_getTransactionCount':
+            return hex(chain.transaction_count(*params))
+        if method == 'eth_sendRawTransaction':
+            return chain.send_raw_transaction(params[0])
+        if method == 'eth_getTransactionReceipt':
+            return chain.receipts.get(params[0])
+        if method == 'eth_call':
+            output, _ = chain.simulate(params[0])
+            return output
+        if method == 'eth_estimateGas':
+            _, gas = chain.simulate(params[0])
+            return hex(gas)
+        if method == 'eth_getBalance':
+            return hex(chain.balance(params[0]))
+        if method == 'eth_getLogs':
+            return chain.get_logs(params[0])
+        if method == 'eth_getBlockByNumber':
+            return chain.block(params[0])
+        if method == 'eth_feeHistory':
+            # Flat base fee at the stand-in gas price and a constant tip
+            blocks = min(int(params[0], 16) if isinstance(params[0], str) else params[0], chain.head + 1)
+            return {
+                'oldestBlock': hex(chain.head + 1 - blocks),
+                'baseFeePerGas': [hex(GAS_PRICE)] * (blocks + 1),
+                'gasUsedRatio': [0.5] * blocks,
+                'reward': [[hex(PRIORITY_FEE)] for _ in range(blocks)],
+            }
+        return {
+            'web3_clientVersion': 'nuchain-standin/1.0',
+            'net_version': str(CHAIN_ID),
+            'eth_chainId': hex(CHAIN_ID),
+            'eth_gasPrice': hex(GAS_PRICE),
+            'eth_maxPriorityFeePerGas': hex(PRIORITY_FEE),
+        }[method]
+
+
+def start_standin(port=0, latency_ms=0, block_time=2.0, per_sender_per_block=16, **options):
+    """
+    Start the stand-in in a background thread and return the server.
+
+    `options` are StandinServer's latency, fault injection, operator and seed settings.
+    """
+    server = StandinServer(
+        ('127.0.0.1', port),
+        latency_ms=latency_ms,
+        block_time=block_time,
+        per_sender_per_block=per_sender_per_block,
+        **options
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8545)
+    parser.add_argument('--latency-ms', type=float, default=0, help='median latency of an HTTP request')
+    parser.add_argument('--latency-dist', choices=LATENCY_DISTRIBUTIONS, default='fixed')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='spread of the lognormal distribution')
+    parser.add_argument('--block-time', type=float, default=2.0, help='seconds per block; 0 mines on arrival')
+    parser.add_argument('--per-sender-per-block', type=int, default=16)
+    parser.add_argument('--error-rate', type=float, default=0, help='share of calls answered with a JSON-RPC error')
+    parser.add_argument('--http-error-rate', type=float, default=0, help='share of HTTP requests answered 503')
+    parser.add_argument('--drop-rate', type=float, default=0, help='share of connections closed unanswered')
+    parser.add_argument('--rate-limit', type=float, default=0, help='calls per second before answering 429')
+    parser.add_argument('--operator', action='append', dest='operators',
+                        help='address allowed to write; repeat for more. Default: any sender')
+    parser.add_argument('--seed', type=int, help='seed for latency and fault draws')
+    args = parser.parse_args()
+
+    server = StandinServer(
+        ('127.0.0.1', args.port),
+        latency_ms=args.latency_ms,
+        block_time=args.block_time,
+        per_sender_per_block=args.per_sender_per_block,
+        latency_dist=args.latency_dist,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        http_error_rate=args.http_error_rate,
+        drop_rate=args.drop_rate,
+        rate_limit=args.rate_limit,
+        operators=args.operators,
+        seed=args.seed
+    )
+    print(f'RPC stand-in listening on http://127.0.0.1:{args.port}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f'{server.requests} calls, injected faults: {dict(server.faults) or "none"}')
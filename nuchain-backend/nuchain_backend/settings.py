@@ -14,7 +14,8 @@ import os
 import dj_database_url
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
+from decouple import Csv, config
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -65,6 +66,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.blockchain.middleware.DeadlineMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -110,6 +112,13 @@ DATABASES = {
     )
 }
 
+# The same database on a connection of its own for nonce reservations, so the AdminNonce row lock is
+# released as soon as a nonce is handed out rather than when the request's transaction commits.
+# SQLite can't commit one connection while another holds a read transaction, so it shares the default
+if DATABASES['default']['ENGINE'] != 'django.db.backends.sqlite3':
+    DATABASES['nonces'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+BLOCKCHAIN_NONCE_DATABASE = 'nonces' if 'nonces' in DATABASES else 'default'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -204,6 +213,9 @@ CORS_ALLOWED_ORIGINS = config(
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Clients send Idempotency-Key on retried POSTs
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+
 if not DEBUG:
     # Security settings for production
     SECURE_SSL_REDIRECT = True
@@ -238,5 +250,94 @@ LOGGING = {
 # ==== BLOCKCHAIN CONFIGURATION ====
 
 BASE_SEPOLIA_RPC_URL = config('BASE_SEPOLIA_RPC_URL', default='https://sepolia.base.org')
+# Comma-separated RPC endpoints; reads go to the fastest healthy one, raw transactions to all. Defaults to BASE_SEPOLIA_RPC_URL alone
+BASE_SEPOLIA_RPC_URLS = config('BASE_SEPOLIA_RPC_URLS', default='', cast=Csv())
 NUC_CONTRACT_ADDRESS = config('NUC_CONTRACT_ADDRESS', default='0x7a8ed93c1eA030eC8F283e93Ff1BB008e57D4791')
-ADMIN_PRIVATE_KEY = config('ADMIN_PRIVATE_KEY', default='')
\ No newline at end of file
+ADMIN_PRIVATE_KEY = config('ADMIN_PRIVATE_KEY', default='')
+# Comma-separated signer keys holding OPERATOR_ROLE; wallets are spread across them. Defaults to ADMIN_PRIVATE_KEY alone
+ADMIN_PRIVATE_KEYS = config('ADMIN_PRIVATE_KEYS', default='', cast=Csv())
+# 'rpc' talks to the RPC endpoints above; 'evm' deploys NucToken to an in-memory chain
+# (pip install "web3[tester]") from the Hardhat artifact, for local runs and CI without network access
+BLOCKCHAIN_BACKEND = config('BLOCKCHAIN_BACKEND', default='rpc')
+BLOCKCHAIN_EVM_ARTIFACT = config(
+    'BLOCKCHAIN_EVM_ARTIFACT',
+    default=str(BASE_DIR.parent / 'nuchain-contracts' / 'artifacts' / 'contracts' / 'NucToken.sol' / 'NucToken.json')
+)
+
+# One pooled keep-alive connection per gunicorn thread
+GUNICORN_THREADS = config('GUNICORN_THREADS', default=1, cast=int)
+BLOCKCHAIN_HTTP_POOL_SIZE = config('BLOCKCHAIN_HTTP_POOL_SIZE', default=GUNICORN_THREADS, cast=int)
+BLOCKCHAIN_RPC_TIMEOUT = config('BLOCKCHAIN_RPC_TIMEOUT', default=10, cast=int)
+BLOCKCHAIN_HEALTH_CHECK_INTERVAL = config('BLOCKCHAIN_HEALTH_CHECK_INTERVAL', default=30, cast=int)
+BLOCKCHAIN_RPC_BATCH_SIZE = config('BLOCKCHAIN_RPC_BATCH_SIZE', default=300, cast=int)
+# With several endpoints: re-send a read elsewhere after this many seconds, and skip an
+# endpoint for the cooldown after that many consecutive failures
+BLOCKCHAIN_RPC_HEDGE_AFTER = config('BLOCKCHAIN_RPC_HEDGE_AFTER', default=0.5, cast=float)
+BLOCKCHAIN_RPC_FAILURE_THRESHOLD = config('BLOCKCHAIN_RPC_FAILURE_THRESHOLD', default=3, cast=int)
+BLOCKCHAIN_RPC_CIRCUIT_COOLDOWN = config('BLOCKCHAIN_RPC_CIRCUIT_COOLDOWN', default=30, cast=int)
+
+# Per-wallet balance cache; set BLOCKCHAIN_BALANCE_CACHE_ALIAS to share it across workers
+BLOCKCHAIN_BALANCE_CACHE_SIZE = config('BLOCKCHAIN_BALANCE_CACHE_SIZE', default=10000, cast=int)
+BLOCKCHAIN_BALANCE_CACHE_TTL = config('BLOCKCHAIN_BALANCE_CACHE_TTL', default=30, cast=int)
+BLOCKCHAIN_BALANCE_CACHE_STALE_TTL = config('BLOCKCHAIN_BALANCE_CACHE_STALE_TTL', default=300, cast=int)
+BLOCKCHAIN_BALANCE_CACHE_ALIAS = config('BLOCKCHAIN_BALANCE_CACHE_ALIAS', default='')
+
+# NucToken event indexer (python manage.py index_nuc_events)
+NUC_CONTRACT_DEPLOY_BLOCK = config('NUC_CONTRACT_DEPLOY_BLOCK', default=32358774, cast=int)
+BLOCKCHAIN_INDEXER_CONFIRMATIONS = config('BLOCKCHAIN_INDEXER_CONFIRMATIONS', default=5, cast=int)
+BLOCKCHAIN_READ_FROM_INDEX = config('BLOCKCHAIN_READ_FROM_INDEX', default=False, cast=bool)
+BLOCKCHAIN_INDEX_MAX_AGE = config('BLOCKCHAIN_INDEX_MAX_AGE', default=60, cast=int)
+# Run eth_estimateGas for every transaction instead of once per contract function
+BLOCKCHAIN_ESTIMATE_GAS = config('BLOCKCHAIN_ESTIMATE_GAS', default=False, cast=bool)
+# EIP-1559 fees are re-read from eth_feeHistory once per block time; signer ETH balances are tracked in memory
+BLOCKCHAIN_FEE_REFRESH_INTERVAL = config('BLOCKCHAIN_FEE_REFRESH_INTERVAL', default=2.0, cast=float)
+BLOCKCHAIN_SIGNER_BALANCE_REFRESH_INTERVAL = config('BLOCKCHAIN_SIGNER_BALANCE_REFRESH_INTERVAL', default=60, cast=int)
+# A transaction still unmined this many blocks after broadcast is re-sent at the same nonce
+# with fees raised by BLOCKCHAIN_FEE_BUMP_PERCENT, up to BLOCKCHAIN_MAX_FEE_PER_GAS_GWEI (0 disables)
+BLOCKCHAIN_STUCK_AFTER_BLOCKS = config('BLOCKCHAIN_STUCK_AFTER_BLOCKS', default=5, cast=int)
+BLOCKCHAIN_FEE_BUMP_PERCENT = config('BLOCKCHAIN_FEE_BUMP_PERCENT', default=15, cast=int)
+BLOCKCHAIN_MAX_FEE_PER_GAS_GWEI = config('BLOCKCHAIN_MAX_FEE_PER_GAS_GWEI', default=5, cast=float)
+# Seconds a request may spend on blockchain calls, kept under gunicorn's 30 s worker timeout.
+# Writes still pending when it runs out answer 202 with the transaction to poll. 0 disables
+BLOCKCHAIN_REQUEST_DEADLINE = config('BLOCKCHAIN_REQUEST_DEADLINE', default=25, cast=float)
+# Per-endpoint budgets by URL path prefix
+BLOCKCHAIN_REQUEST_DEADLINES = {
+    '/api/investments/portfolio_summary/': config('BLOCKCHAIN_PORTFOLIO_DEADLINE', default=3, cast=float),
+}
+# Idempotency-Key on signup, investments and wallet reset: how long responses are kept for
+# retries, how long a duplicate waits for the original, and when a key whose worker died is released
+BLOCKCHAIN_IDEMPOTENCY_KEY_TTL = config('BLOCKCHAIN_IDEMPOTENCY_KEY_TTL', default=86400, cast=int)
+BLOCKCHAIN_IDEMPOTENCY_WAIT = config('BLOCKCHAIN_IDEMPOTENCY_WAIT', default=20, cast=float)
+BLOCKCHAIN_IDEMPOTENCY_LOCK_TIMEOUT = config('BLOCKCHAIN_IDEMPOTENCY_LOCK_TIMEOUT', default=300, cast=int)
+# Gas each mintSignupBatch/lockBatch/resetPortfolioBatch transaction may use; larger lists are split
+BLOCKCHAIN_BATCH_GAS_BUDGET = config('BLOCKCHAIN_BATCH_GAS_BUDGET', default=5000000, cast=int)
+
+# How often the receipt watcher checks for a new block while transactions are in flight
+BLOCKCHAIN_RECEIPT_POLL_INTERVAL = config('BLOCKCHAIN_RECEIPT_POLL_INTERVAL', default=1.0, cast=float)
+
+# Transactional outbox: views commit the intent and return 202, process_outbox does the chain work
+BLOCKCHAIN_OUTBOX_ENABLED = config('BLOCKCHAIN_OUTBOX_ENABLED', default=False, cast=bool)
+BLOCKCHAIN_OUTBOX_MAX_ATTEMPTS = config('BLOCKCHAIN_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+BLOCKCHAIN_OUTBOX_CONCURRENCY = config('BLOCKCHAIN_OUTBOX_CONCURRENCY', default=8, cast=int)
+
+# Transaction status stream (GET /api/transactions/stream/). Each connection holds a worker thread,
+# so it closes after a few seconds and EventSource reconnects, resuming from its Last-Event-ID
+BLOCKCHAIN_EVENT_STREAM_POLL_INTERVAL = config('BLOCKCHAIN_EVENT_STREAM_POLL_INTERVAL', default=1.0, cast=float)
+BLOCKCHAIN_EVENT_STREAM_DURATION = config('BLOCKCHAIN_EVENT_STREAM_DURATION', default=5, cast=int)
+
+# Pre-generated signup wallets (python manage.py refill_wallet_pool [--premint])
+BLOCKCHAIN_WALLET_POOL_SIZE = config('BLOCKCHAIN_WALLET_POOL_SIZE', default=100, cast=int)
+BLOCKCHAIN_WALLET_POOL_LOW_WATER = config('BLOCKCHAIN_WALLET_POOL_LOW_WATER', default=20, cast=int)
+
+# Monte Carlo risk simulation (/api/investments/risk_simulation/): worker processes (0 runs it in the
+# request thread), the most paths a request may ask for, seconds to wait for a worker, and how long
+# results are cached per portfolio fingerprint
+PORTFOLIO_SIMULATION_WORKERS = config('PORTFOLIO_SIMULATION_WORKERS', default=2, cast=int)
+PORTFOLIO_SIMULATION_MAX_PATHS = config('PORTFOLIO_SIMULATION_MAX_PATHS', default=50000, cast=int)
+PORTFOLIO_SIMULATION_TIMEOUT = config('PORTFOLIO_SIMULATION_TIMEOUT', default=10, cast=float)
+PORTFOLIO_SIMULATION_CACHE_TTL = config('PORTFOLIO_SIMULATION_CACHE_TTL', default=3600, cast=int)
+PORTFOLIO_SIMULATION_CACHE_ALIAS = config('PORTFOLIO_SIMULATION_CACHE_ALIAS', default='default')
+
+# Seconds a worker reuses the reactor coefficients behind /api/investments/optimize/ before reloading
+# them; saving a reactor in the same worker reloads them at once
+PORTFOLIO_ALLOCATION_CACHE_TTL = config('PORTFOLIO_ALLOCATION_CACHE_TTL', default=30, cast=int)
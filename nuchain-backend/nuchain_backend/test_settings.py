@@ -8,6 +8,9 @@ DATABASES = {
     }
 }
 
+# TestCase only wraps the default connection, so nonce reservations share it
+BLOCKCHAIN_NONCE_DATABASE = 'default'
+
 # Disable migrations during tests
 class DisableMigrations:
     def __contains__(self, item):
@@ -33,4 +36,7 @@ CSRF_COOKIE_SECURE = False
 # Blockchain settings for testing (mocked)
 BASE_SEPOLIA_RPC_URL = 'https://sepolia.base.org'
 NUC_CONTRACT_ADDRESS = '0x7a8ed93c1eA030eC8F283e93Ff1BB008e57D4791'
-ADMIN_PRIVATE_KEY = '0x' + '1' * 64  # Fake key for testing
\ No newline at end of file
+ADMIN_PRIVATE_KEY = '0x' + '1' * 64  # Fake key for testing
+
+# Run risk simulations in the test process
+PORTFOLIO_SIMULATION_WORKERS = 0
@@ -22,4 +22,5 @@ urlpatterns = [
     path('api/auth/', include('apps.users.urls')),
     path('api/', include('apps.reactors.urls')),
     path('api/', include('apps.investments.urls')),
+    path('api/', include('apps.blockchain.urls')),
 ]
@@ -2,10 +2,16 @@
 pragma solidity ^0.8.28;
 
 import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
-import "@openzeppelin/contracts/access/Ownable.sol";
+import "@openzeppelin/contracts/access/AccessControl.sol";
 
 
-contract NucToken is ERC20, Ownable {
+contract NucToken is ERC20, AccessControl {
+    // Backend signer accounts allowed to mint, lock, unlock and burn
+    bytes32 public constant OPERATOR_ROLE = keccak256("OPERATOR_ROLE");
+
+    // Every signup receives 25,000 NUC (18 decimals)
+    uint256 public constant SIGNUP_AMOUNT = 25_000 * 10**18;
+
     // Track locked balances per user
     mapping(address => uint256) public lockedBalances;
 
@@ -14,20 +20,50 @@ contract NucToken is ERC20, Ownable {
         return balanceOf(account) - lockedBalances[account];
     }
 
-    // Signup: Admin mints 25,000 NUC to new users
-    function mintSignup(address to) external onlyOwner {
-        _mint(to, 25_000 * 10**18); // 25,000 NUC (18 decimals)
+    // Signup: Operator mints 25,000 NUC to new users
+    function mintSignup(address to) external onlyRole(OPERATOR_ROLE) {
+        _mint(to, SIGNUP_AMOUNT);
     }
 
-    // Invest: Admin locks user's tokens when they invest in a reactor
-    function lock(address user, uint256 amount) external onlyOwner {
+    // Invest: Operator locks user's tokens when they invest in a reactor
+    function lock(address user, uint256 amount) external onlyRole(OPERATOR_ROLE) {
+        _lock(user, amount);
+    }
+
+    // Reset: Operator unlocks ALL locked tokens for a user
+    function resetPortfolio(address user) external onlyRole(OPERATOR_ROLE) {
+        _resetPortfolio(user);
+    }
+
+    // --- Batch Operations ---
+    // One transaction for many users; if any entry reverts, the whole batch does
+
+    function mintSignupBatch(address[] calldata recipients) external onlyRole(OPERATOR_ROLE) {
+        for (uint256 i = 0; i < recipients.length; i++) {
+            _mint(recipients[i], SIGNUP_AMOUNT);
+        }
+    }
+
+    function lockBatch(address[] calldata users, uint256[] calldata amounts) external onlyRole(OPERATOR_ROLE) {
+        require(users.length == amounts.length, "Array length mismatch");
+        for (uint256 i = 0; i < users.length; i++) {
+            _lock(users[i], amounts[i]);
+        }
+    }
+
+    function resetPortfolioBatch(address[] calldata users) external onlyRole(OPERATOR_ROLE) {
+        for (uint256 i = 0; i < users.length; i++) {
+            _resetPortfolio(users[i]);
+        }
+    }
+
+    function _lock(address user, uint256 amount) internal {
         require(availableBalanceOf(user) >= amount, "Insufficient unlocked balance");
         lockedBalances[user] += amount;
         emit TokensLocked(user, amount);
     }
 
-    // Reset: Admin unlocks ALL locked tokens for a user
-    function resetPortfolio(address user) external onlyOwner {
+    function _resetPortfolio(address user) internal {
         uint256 amount = lockedBalances[user];
         if (amount > 0) {
             lockedBalances[user] = 0;
@@ -35,8 +71,8 @@ contract NucToken is ERC20, Ownable {
         }
     }
 
-    // Delete: Admin burns user's tokens (account deletion)
-    function burnAccount(address from) external onlyOwner {
+    // Delete: Operator burns user's tokens (account deletion)
+    function burnAccount(address from) external onlyRole(OPERATOR_ROLE) {
         uint256 balance = balanceOf(from);
         _burn(from, balance);
         emit AccountDeleted(from, balance);
@@ -60,9 +96,15 @@ contract NucToken is ERC20, Ownable {
     event AccountDeleted(address indexed user, uint256 amount);
 
     // --- Admin Safety ---
-    function renounceOwnership() public override onlyOwner view {
-        revert("Ownership cannot be renounced!");
+    // Operators may step down, but the admin role that grants operators cannot be given up
+    function renounceRole(bytes32 role, address callerConfirmation) public override {
+        require(role != DEFAULT_ADMIN_ROLE, "Admin role cannot be renounced!");
+        super.renounceRole(role, callerConfirmation);
     }
 
-    constructor() ERC20("NuChain Token", "NUC") Ownable(msg.sender) {}
-}
\ No newline at end of file
+    // The deployer administers roles and is the first operator
+    constructor() ERC20("NuChain Token", "NUC") {
+        _grantRole(DEFAULT_ADMIN_ROLE, msg.sender);
+        _grantRole(OPERATOR_ROLE, msg.sender);
+    }
+}
@@ -3,11 +3,14 @@ pragma solidity ^0.8.28;
 
 import {Test, console} from "forge-std/Test.sol";
 import {NucToken} from "./NucToken.sol";
-import {Ownable} from "@openzeppelin/contracts/access/Ownable.sol";
+import {IAccessControl} from "@openzeppelin/contracts/access/IAccessControl.sol";
 
 contract NucTokenTest is Test {
     NucToken public nucToken;
-    address public owner;
+    address public admin;
+    bytes32 public adminRole;
+    bytes32 public operatorRole;
+    address public operator = address(0x0b);
     address public user1 = address(0x1);
     address public user2 = address(0x2);
 
@@ -18,7 +21,10 @@ contract NucTokenTest is Test {
 
     function setUp() public {
         nucToken = new NucToken();
-        owner = nucToken.owner();
+        admin = address(this);
+        // Read once here: a call inside an expectRevert argument would use up vm.prank
+        adminRole = nucToken.DEFAULT_ADMIN_ROLE();
+        operatorRole = nucToken.OPERATOR_ROLE();
     }
 
     // --- Constructor and Initial State Tests ---
@@ -27,24 +33,27 @@ contract NucTokenTest is Test {
         assertEq(nucToken.name(), "NuChain Token", "Name should be correct");
         assertEq(nucToken.symbol(), "NUC", "Symbol should be correct");
         assertEq(nucToken.decimals(), 18, "Decimals should be 18");
-        assertEq(nucToken.owner(), address(this), "Owner should be the test contract");
+        assertTrue(nucToken.hasRole(adminRole, admin), "Deployer should be admin");
+        assertTrue(nucToken.hasRole(operatorRole, admin), "Deployer should be an operator");
     }
 
-    // --- Owner Function Tests ---
+    // --- Operator Function Tests ---
 
-    function test_OwnerCanMintSignup() public {
+    function test_OperatorCanMintSignup() public {
         uint256 expectedAmount = 25_000 * 1e18;
         nucToken.mintSignup(user1);
         assertEq(nucToken.balanceOf(user1), expectedAmount, "User1 balance should be 25,000 NUC");
     }
 
-    function test_Revert_NonOwnerCannotMintSignup() public {
+    function test_Revert_NonOperatorCannotMintSignup() public {
         vm.prank(user1);
-        vm.expectRevert(abi.encodeWithSelector(Ownable.OwnableUnauthorizedAccount.selector, user1));
+        vm.expectRevert(abi.encodeWithSelector(
+            IAccessControl.AccessControlUnauthorizedAccount.selector, user1, operatorRole
+        ));
         nucToken.mintSignup(user1);
     }
 
-    function test_OwnerCanBurnAccount() public {
+    function test_OperatorCanBurnAccount() public {
         uint256 initialAmount = 25_000 * 1e18;
         nucToken.mintSignup(user1);
         assertEq(nucToken.balanceOf(user1), initialAmount, "Pre-condition failed: balance not minted");
@@ -56,13 +65,119 @@ contract NucTokenTest is Test {
         assertEq(nucToken.balanceOf(user1), 0, "Balance was not zero after burn");
     }
 
-    function test_Revert_NonOwnerCannotBurnAccount() public {
+    function test_Revert_NonOperatorCannotBurnAccount() public {
         nucToken.mintSignup(user1);
         vm.prank(user1);
-        vm.expectRevert(abi.encodeWithSelector(Ownable.OwnableUnauthorizedAccount.selector, user1));
+        vm.expectRevert(abi.encodeWithSelector(
+            IAccessControl.AccessControlUnauthorizedAccount.selector, user1, operatorRole
+        ));
         nucToken.burnAccount(user1);
     }
 
+    // --- Role Management Tests ---
+
+    function test_GrantedOperatorCanMintAndLock() public {
+        nucToken.grantRole(operatorRole, operator);
+
+        vm.startPrank(operator);
+        nucToken.mintSignup(user1);
+        nucToken.lock(user1, 5_000 * 1e18);
+        vm.stopPrank();
+
+        assertEq(nucToken.lockedBalances(user1), 5_000 * 1e18, "Operator lock should apply");
+    }
+
+    function test_Revert_RevokedOperatorCannotMint() public {
+        nucToken.grantRole(operatorRole, operator);
+        nucToken.revokeRole(operatorRole, operator);
+
+        vm.prank(operator);
+        vm.expectRevert(abi.encodeWithSelector(
+            IAccessControl.AccessControlUnauthorizedAccount.selector, operator, operatorRole
+        ));
+        nucToken.mintSignup(user1);
+    }
+
+    function test_Revert_OperatorCannotGrantRoles() public {
+        nucToken.grantRole(operatorRole, operator);
+
+        vm.prank(operator);
+        vm.expectRevert(abi.encodeWithSelector(
+            IAccessControl.AccessControlUnauthorizedAccount.selector, operator, adminRole
+        ));
+        nucToken.grantRole(operatorRole, user1);
+    }
+
+    // --- Batch Operation Tests ---
+
+    function test_MintSignupBatch() public {
+        address[] memory recipients = new address[](3);
+        recipients[0] = user1;
+        recipients[1] = user2;
+        recipients[2] = operator;
+
+        nucToken.mintSignupBatch(recipients);
+
+        for (uint256 i = 0; i < recipients.length; i++) {
+            assertEq(nucToken.balanceOf(recipients[i]), 25_000 * 1e18, "Each recipient should get 25,000 NUC");
+        }
+        assertEq(nucToken.totalSupply(), 75_000 * 1e18, "Supply should cover the whole batch");
+    }
+
+    function test_LockBatchAndResetPortfolioBatch() public {
+        address[] memory users = new address[](2);
+        users[0] = user1;
+        users[1] = user2;
+        uint256[] memory amounts = new uint256[](2);
+        amounts[0] = 1_000 * 1e18;
+        amounts[1] = 2_000 * 1e18;
+        nucToken.mintSignupBatch(users);
+
+        vm.expectEmit(true, false, false, true);
+        emit TokensLocked(user1, amounts[0]);
+        vm.expectEmit(true, false, false, true);
+        emit TokensLocked(user2, amounts[1]);
+        nucToken.lockBatch(users, amounts);
+        assertEq(nucToken.lockedBalances(user2), 2_000 * 1e18, "Second entry should be locked");
+
+        nucToken.resetPortfolioBatch(users);
+        assertEq(nucToken.lockedBalances(user1), 0, "First entry should be unlocked");
+        assertEq(nucToken.lockedBalances(user2), 0, "Second entry should be unlocked");
+    }
+
+    function test_Revert_LockBatchIsAllOrNothing() public {
+        address[] memory users = new address[](2);
+        users[0] = user1;
+        users[1] = user2;
+        uint256[] memory amounts = new uint256[](2);
+        amounts[0] = 1_000 * 1e18;
+        amounts[1] = 30_000 * 1e18; // More than the signup allowance
+        nucToken.mintSignupBatch(users);
+
+        vm.expectRevert("Insufficient unlocked balance");
+        nucToken.lockBatch(users, amounts);
+        assertEq(nucToken.lockedBalances(user1), 0, "Earlier entries should be rolled back");
+    }
+
+    function test_Revert_LockBatchLengthMismatch() public {
+        address[] memory users = new address[](2);
+        uint256[] memory amounts = new uint256[](1);
+
+        vm.expectRevert("Array length mismatch");
+        nucToken.lockBatch(users, amounts);
+    }
+
+    function test_Revert_NonOperatorCannotMintSignupBatch() public {
+        address[] memory recipients = new address[](1);
+        recipients[0] = user1;
+
+        vm.prank(user1);
+        vm.expectRevert(abi.encodeWithSelector(
+            IAccessControl.AccessControlUnauthorizedAccount.selector, user1, operatorRole
+        ));
+        nucToken.mintSignupBatch(recipients);
+    }
+
     // --- Locking, Unlocking, and Transfer Logic Tests ---
 
     function test_LockAndResetPortfolio() public {
@@ -98,8 +213,17 @@ contract NucTokenTest is Test {
     }
 
     // --- Safety Feature Tests ---
-    function test_Revert_RenounceOwnership() public {
-        vm.expectRevert("Ownership cannot be renounced!");
-        nucToken.renounceOwnership();
+    function test_Revert_RenounceAdminRole() public {
+        vm.expectRevert("Admin role cannot be renounced!");
+        nucToken.renounceRole(adminRole, admin);
+    }
+
+    function test_OperatorCanRenounceOperatorRole() public {
+        nucToken.grantRole(operatorRole, operator);
+
+        vm.prank(operator);
+        nucToken.renounceRole(operatorRole, operator);
+
+        assertFalse(nucToken.hasRole(operatorRole, operator), "Operator role should be gone");
     }
 }
\ No newline at end of file